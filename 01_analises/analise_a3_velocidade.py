@@ -3,58 +3,55 @@ ANÁLISE ABA A3 - VELOCIDADE DA CONEXÃO DE INTERNET
 TIC Educação 2024
 """
 
+import argparse
+import sys
 import pandas as pd
 import json
 from pathlib import Path
 
+from banco_resultados import DIMENSOES, salvar_resultados_db, DB_PADRAO
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from tic.cli import ABAS_ANALISES, ARQUIVOS_PADRAO
+from tic.fatos import ano_do_arquivo, carregar_fatos_aba, pivotar_respostas
+from tic.instrumentacao import adicionar_argumento_perfil, configurar_perfil, instrumentar
+from tic.log import adicionar_argumentos_log, configurar_log_args, linha, obter_logger, titulo
+
+log = obter_logger('analise_a3')
+
+# Rótulo da resposta no cabeçalho da aba → coluna (o cabeçalho precisa ter
+# exatamente estas faixas: uma a mais ou a menos é erro, não deslocamento)
+FAIXAS_A3 = {
+    'Até 10 Mbps': 'ate_10_mbps',
+    'De 11 Mbps a 50 Mbps': 'de_11_a_50_mbps',
+    'De 51 Mbps a 100 Mbps': 'de_51_a_100_mbps',
+    'De 101 Mbps a 250 Mbps': 'de_101_a_250_mbps',
+    'De 251 Mbps a 500 Mbps': 'de_251_a_500_mbps',
+    'De 501 Mbps a 1 Gbps': 'de_501_a_1_gbps',
+    '1 Gbps ou mais': '1_gbps_ou_mais',
+    'Não sabe': 'nao_sabe',
+    'Não respondeu': 'nao_respondeu',
+    'Não se aplica': 'nao_se_aplica',
+}
+
+
+@instrumentar(categoria='analise')
 def analisar_a3_velocidade(arquivo_path, aba_nome='A3'):
     """
     Analisa a aba A3 - Velocidade da principal conexão de internet
     """
-    print(f"\n{'='*80}")
-    print(f"ANÁLISE ABA {aba_nome} - VELOCIDADE DA CONEXÃO DE INTERNET")
-    print(f"{'='*80}\n")
+    titulo(log, f"ANÁLISE ABA {aba_nome} - VELOCIDADE DA CONEXÃO DE INTERNET")
     
     # Carregar dados
-    print(f"📂 Carregando aba {aba_nome}...")
-    df = pd.read_excel(
-        arquivo_path, 
-        sheet_name=aba_nome,
-        skiprows=3,  # Pula título e cabeçalhos
-        header=None
-    )
-    
-    # Definir nomes das colunas baseado na estrutura da imagem
-    colunas = [
-        'categoria',
-        'subcategoria', 
-        'ate_10_mbps',
-        'de_11_a_50_mbps',
-        'de_51_a_100_mbps',
-        'de_101_a_250_mbps',
-        'de_251_a_500_mbps',
-        'de_501_a_1_gbps',
-        '1_gbps_ou_mais',
-        'nao_sabe',
-        'nao_respondeu',
-        'nao_se_aplica'
-    ]
-    
-    # Ajustar número de colunas
-    df = df.iloc[:, :len(colunas)]
-    df.columns = colunas
-    
-    # Limpar dados
-    df = df.dropna(subset=['categoria'])
-    df = df[~df['categoria'].astype(str).str.contains('Fonte:', na=False)]
-    
-    print(f"✅ {len(df)} linhas carregadas\n")
+    log.info(f"📂 Carregando aba {aba_nome}...")
+    fatos = carregar_fatos_aba(arquivo_path, aba_nome)
     
-    # TOTAL BRASIL
-    # Debug: mostrar primeiras linhas
-    print(f"🔍 Debug - Primeiras categorias: {df['categoria'].head().tolist()}\n")
+    # Tabela larga reconstruída dos fatos (colunas pelos rótulos do cabeçalho)
+    df = pivotar_respostas(fatos, FAIXAS_A3, aba_nome)
     
+    log.info(f"✅ {len(df)} linhas carregadas\n")
+    
+    # TOTAL BRASIL
     linha_brasil = df[df['categoria'].astype(str).str.strip() == 'TOTAL'].iloc[0]
     
     # Definir faixas de velocidade
@@ -77,68 +74,47 @@ def analisar_a3_velocidade(arquivo_path, aba_nome='A3'):
     conexao_adequada = total_rapidas + total_medias
     pct_adequada = (conexao_adequada / total) * 100 if total > 0 else 0
     
-    print(f"🇧🇷 BRASIL:")
-    print(f"  Total de escolas: {total:,.0f}")
-    print(f"\n  📶 VELOCIDADE DA CONEXÃO:")
-    print(f"  🚀 RÁPIDA (≥100 Mbps): {total_rapidas:,.0f} ({pct_rapidas:.1f}%)")
-    print(f"  ⚡ MÉDIA (51-100 Mbps): {total_medias:,.0f} ({pct_medias:.1f}%)")
-    print(f"  🐌 LENTA (≤50 Mbps): {total_lentas:,.0f} ({pct_lentas:.1f}%)")
-    print(f"\n  ✅ ADEQUADA para IA (≥51 Mbps): {conexao_adequada:,.0f} ({pct_adequada:.1f}%)")
-    print(f"  ❌ INADEQUADA para IA (≤50 Mbps): {total_lentas:,.0f} ({pct_lentas:.1f}%)")
-    
-    # REGIÕES
-    regioes = df[df['categoria'].astype(str).str.strip() == 'REGIÃO'].copy()
-    regioes_data = []
-    
-    if len(regioes) > 0:
-        print(f"\n📍 POR REGIÃO:")
-        for _, regiao in regioes.iterrows():
-            nome = regiao['subcategoria']
-            
-            rapidas = sum([regiao[col] for col in faixas_rapidas if pd.notna(regiao[col])])
-            medias = sum([regiao[col] for col in faixas_medias if pd.notna(regiao[col])])
-            lentas = sum([regiao[col] for col in faixas_lentas if pd.notna(regiao[col])])
-            
-            total_reg = rapidas + medias + lentas
-            adequada_reg = rapidas + medias
-            pct_adequada_reg = (adequada_reg / total_reg) * 100 if total_reg > 0 else 0
-            
-            print(f"  {nome}: {pct_adequada_reg:.1f}% com velocidade adequada (≥51 Mbps)")
-            
-            regioes_data.append({
-                'regiao': nome,
-                'total': int(total_reg),
-                'conexao_adequada': int(adequada_reg),
-                'conexao_inadequada': int(lentas),
-                'percentual_adequada': round(pct_adequada_reg, 1)
-            })
-    
-    # ÁREAS
-    areas = df[df['categoria'].astype(str).str.strip() == 'ÁREA'].copy()
-    areas_data = []
-    
-    if len(areas) > 0:
-        print(f"\n🏙️  POR ÁREA:")
-        for _, area in areas.iterrows():
-            nome = area['subcategoria']
-            
-            rapidas = sum([area[col] for col in faixas_rapidas if pd.notna(area[col])])
-            medias = sum([area[col] for col in faixas_medias if pd.notna(area[col])])
-            lentas = sum([area[col] for col in faixas_lentas if pd.notna(area[col])])
-            
-            total_area = rapidas + medias + lentas
-            adequada_area = rapidas + medias
-            pct_adequada_area = (adequada_area / total_area) * 100 if total_area > 0 else 0
-            
-            print(f"  {nome}: {pct_adequada_area:.1f}% com velocidade adequada")
-            
-            areas_data.append({
-                'area': nome,
-                'total': int(total_area),
-                'conexao_adequada': int(adequada_area),
-                'conexao_inadequada': int(lentas),
-                'percentual_adequada': round(pct_adequada_area, 1)
-            })
+    log.info(f"🇧🇷 BRASIL:")
+    log.info(f"  Total de escolas: {total:,.0f}")
+    log.info(f"\n  📶 VELOCIDADE DA CONEXÃO:")
+    log.info(f"  🚀 RÁPIDA (≥100 Mbps): {total_rapidas:,.0f} ({pct_rapidas:.1f}%)")
+    log.info(f"  ⚡ MÉDIA (51-100 Mbps): {total_medias:,.0f} ({pct_medias:.1f}%)")
+    log.info(f"  🐌 LENTA (≤50 Mbps): {total_lentas:,.0f} ({pct_lentas:.1f}%)")
+    log.info(f"\n  ✅ ADEQUADA para IA (≥51 Mbps): {conexao_adequada:,.0f} ({pct_adequada:.1f}%)")
+    log.info(f"  ❌ INADEQUADA para IA (≤50 Mbps): {total_lentas:,.0f} ({pct_lentas:.1f}%)")
+    
+    def registro(grupo):
+        """Métricas de uma linha de grupo (região, área, dependência, ...)"""
+        rapidas = sum([grupo[col] for col in faixas_rapidas if pd.notna(grupo[col])])
+        medias = sum([grupo[col] for col in faixas_medias if pd.notna(grupo[col])])
+        lentas = sum([grupo[col] for col in faixas_lentas if pd.notna(grupo[col])])
+        
+        total_grupo = rapidas + medias + lentas
+        adequada_grupo = rapidas + medias
+        pct_adequada_grupo = (adequada_grupo / total_grupo) * 100 if total_grupo > 0 else 0
+        
+        return {
+            'total': int(total_grupo),
+            'conexao_adequada': int(adequada_grupo),
+            'conexao_inadequada': int(lentas),
+            'percentual_adequada': round(pct_adequada_grupo, 1)
+        }
+    
+    # Grupos de todas as dimensões da aba (REGIÃO, ÁREA, DEPENDÊNCIA ADMINISTRATIVA, ...)
+    categorias = df['categoria'].astype(str).str.strip()
+    por_dimensao = {}
+    for chave_resultado, (dimensao, chave_nome) in DIMENSOES.items():
+        grupos = df[categorias == dimensao]
+        registros = []
+        if len(grupos) > 0:
+            log.debug(f"\n📊 POR {dimensao}:")
+        for _, grupo in grupos.iterrows():
+            registros.append({chave_nome: grupo['subcategoria'], **registro(grupo)})
+            log.debug(f"  {grupo['subcategoria']}: {registros[-1]['percentual_adequada']:.1f}% "
+                      f"com velocidade adequada (≥51 Mbps)",
+                      extra=linha(f"{aba_nome} - por {dimensao.lower()}", **registros[-1]))
+        if registros or chave_resultado in ('regioes', 'areas'):
+            por_dimensao[chave_resultado] = registros
     
     # Consolidar resultados
     resultados = {
@@ -156,48 +132,46 @@ def analisar_a3_velocidade(arquivo_path, aba_nome='A3'):
             'pct_media': round(pct_medias, 1),
             'pct_lenta': round(pct_lentas, 1)
         },
-        'regioes': regioes_data,
-        'areas': areas_data
+        **por_dimensao
     }
     
     return resultados
 
 
+@instrumentar('exportar_arquivos', 'escrita')
 def salvar_resultados(resultados, output_dir='./resultados'):
     """
     Salva resultados em JSON e CSV
     """
     Path(output_dir).mkdir(exist_ok=True)
     
-    print(f"\n{'='*80}")
-    print("SALVANDO RESULTADOS")
-    print(f"{'='*80}\n")
+    titulo(log, "SALVANDO RESULTADOS")
     
     # JSON completo
     json_path = f"{output_dir}/a3_velocidade_completo.json"
     with open(json_path, 'w', encoding='utf-8') as f:
         json.dump(resultados, f, ensure_ascii=False, indent=2)
-    print(f"✅ JSON completo salvo: {json_path}")
+    log.info(f"✅ JSON completo salvo: {json_path}")
     
     # CSV do Brasil
     df_brasil = pd.DataFrame([resultados['brasil']])
     csv_brasil_path = f"{output_dir}/a3_brasil.csv"
     df_brasil.to_csv(csv_brasil_path, index=False, encoding='utf-8-sig')
-    print(f"✅ CSV Brasil salvo: {csv_brasil_path}")
+    log.info(f"✅ CSV Brasil salvo: {csv_brasil_path}")
     
     # CSV das regiões
     if resultados['regioes']:
         df_regioes = pd.DataFrame(resultados['regioes'])
         csv_regioes_path = f"{output_dir}/a3_regioes.csv"
         df_regioes.to_csv(csv_regioes_path, index=False, encoding='utf-8-sig')
-        print(f"✅ CSV Regiões salvo: {csv_regioes_path}")
+        log.info(f"✅ CSV Regiões salvo: {csv_regioes_path}")
     
     # CSV das áreas
     if resultados['areas']:
         df_areas = pd.DataFrame(resultados['areas'])
         csv_areas_path = f"{output_dir}/a3_areas.csv"
         df_areas.to_csv(csv_areas_path, index=False, encoding='utf-8-sig')
-        print(f"✅ CSV Áreas salvo: {csv_areas_path}")
+        log.info(f"✅ CSV Áreas salvo: {csv_areas_path}")
     
     return {
         'json': json_path,
@@ -208,38 +182,46 @@ def salvar_resultados(resultados, output_dir='./resultados'):
 
 
 if __name__ == "__main__":
-    arquivo = 'tic_educacao_2024_escolas_tabela_total_v1.0.xlsx'
+    parser = argparse.ArgumentParser(description='Análise A3 - Velocidade da conexão')
+    parser.add_argument('--db', default=DB_PADRAO, help=f'Banco de resultados (padrão: {DB_PADRAO})')
+    parser.add_argument('--arquivo', default=ARQUIVOS_PADRAO['escolas'],
+                        help=f"Workbook de escolas (padrão: {ARQUIVOS_PADRAO['escolas']}; o ano vem do nome)")
+    parser.add_argument('--exportar-arquivos', action='store_true',
+                        help='Também exporta JSON/CSV em ./resultados (visão opcional)')
+    adicionar_argumento_perfil(parser, './resultados/perfil_a3.json')
+    adicionar_argumentos_log(parser)
+    args = parser.parse_args()
+    configurar_perfil(args)
+    configurar_log_args(args)
+    
+    arquivo = args.arquivo
     
     try:
         # Executar análise
-        resultados = analisar_a3_velocidade(arquivo, aba_nome='A3_1')
+        resultados = analisar_a3_velocidade(arquivo, aba_nome=ABAS_ANALISES['a3'][1])
         
-        # SALVAR RESULTADOS
-        arquivos_gerados = salvar_resultados(resultados)
+        # SALVAR NO BANCO DE RESULTADOS
+        salvar_resultados_db(resultados, indicador='a3', ano=ano_do_arquivo(arquivo), db_path=args.db)
         
-        print(f"\n{'='*80}")
-        print("✅ ANÁLISE A3 CONCLUÍDA!")
-        print(f"{'='*80}")
-        print(f"\n📊 Resultado principal:")
-        print(f"  • {resultados['brasil']['pct_adequada']:.1f}% das escolas têm velocidade ADEQUADA (≥51 Mbps)")
-        print(f"  • {resultados['brasil']['pct_lenta']:.1f}% têm velocidade LENTA (≤50 Mbps)")
+        # JSON/CSV (opcional)
+        arquivos_gerados = salvar_resultados(resultados) if args.exportar_arquivos else {}
         
-        print(f"\n📶 Detalhamento:")
-        print(f"  • Rápida (≥100 Mbps): {resultados['brasil']['pct_rapida']:.1f}%")
-        print(f"  • Média (51-100 Mbps): {resultados['brasil']['pct_media']:.1f}%")
-        print(f"  • Lenta (≤50 Mbps): {resultados['brasil']['pct_lenta']:.1f}%")
+        titulo(log, "✅ ANÁLISE A3 CONCLUÍDA!")
+        log.info(f"\n📊 Resultado principal:")
+        log.info(f"  • {resultados['brasil']['pct_adequada']:.1f}% das escolas têm velocidade ADEQUADA (≥51 Mbps)")
+        log.info(f"  • {resultados['brasil']['pct_lenta']:.1f}% têm velocidade LENTA (≤50 Mbps)")
         
-        if resultados['regioes']:
-            print(f"\n📍 Por região:")
-            for regiao in resultados['regioes']:
-                print(f"  • {regiao['regiao']}: {regiao['percentual_adequada']:.1f}%")
+        log.info(f"\n📶 Detalhamento:")
+        log.info(f"  • Rápida (≥100 Mbps): {resultados['brasil']['pct_rapida']:.1f}%")
+        log.info(f"  • Média (51-100 Mbps): {resultados['brasil']['pct_media']:.1f}%")
+        log.info(f"  • Lenta (≤50 Mbps): {resultados['brasil']['pct_lenta']:.1f}%")
         
-        print(f"\n📁 Arquivos gerados:")
+        log.info(f"\n📁 Arquivos gerados:")
+        log.info(f"  • banco: {args.db}")
         for tipo, caminho in arquivos_gerados.items():
             if caminho:
-                print(f"  • {tipo}: {caminho}")
+                log.info(f"  • {tipo}: {caminho}")
                 
     except Exception as e:
-        print(f"\n❌ ERRO: {e}")
-        import traceback
-        traceback.print_exc()
\ No newline at end of file
+        log.exception(f"\n❌ ERRO: {e}")
+        sys.exit(1)
@@ -3,10 +3,24 @@ ANÁLISE ABA A8 - ESCOLAS COM COMPUTADOR E INTERNET PARA ALUNOS
 TIC Educação 2024
 """
 
+import argparse
+import sys
 import pandas as pd
 import json
 from pathlib import Path
 
+from banco_resultados import DIMENSOES, salvar_resultados_db, DB_PADRAO
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from tic.cli import ABAS_ANALISES, ARQUIVOS_PADRAO
+from tic.fatos import ano_do_arquivo, carregar_fatos_aba, pivotar_respostas
+from tic.instrumentacao import adicionar_argumento_perfil, configurar_perfil, instrumentar
+from tic.log import adicionar_argumentos_log, configurar_log_args, linha, obter_logger, titulo
+
+log = obter_logger('analise_a8')
+
+
+@instrumentar(categoria='analise')
 def analisar_a8(arquivo_path, aba_nome='A8'):
     """
     Analisa a aba A8 - Acesso a computador + internet
@@ -15,25 +29,15 @@ def analisar_a8(arquivo_path, aba_nome='A8'):
     --------
     dict com os resultados da análise
     """
-    print(f"\n{'='*80}")
-    print(f"ANÁLISE ABA {aba_nome} - ACESSO A COMPUTADOR + INTERNET")
-    print(f"{'='*80}\n")
+    titulo(log, f"ANÁLISE ABA {aba_nome} - ACESSO A COMPUTADOR + INTERNET")
     
     # Carregar dados
-    print(f"📂 Carregando aba {aba_nome}...")
-    df = pd.read_excel(
-        arquivo_path, 
-        sheet_name=aba_nome,
-        skiprows=3,  # Pula título e cabeçalhos
-        usecols=[0, 1, 2, 3],
-        names=['categoria', 'subcategoria', 'sim', 'nao']
-    )
+    log.info(f"📂 Carregando aba {aba_nome}...")
+    fatos = carregar_fatos_aba(arquivo_path, aba_nome)
+    # Colunas Sim/Não pelos rótulos do cabeçalho (outras respostas são ignoradas)
+    df = pivotar_respostas(fatos, {'Sim': 'sim', 'Não': 'nao'}, aba_nome, estrito=False)
     
-    # Limpar dados
-    df = df.dropna(subset=['categoria'])
-    df = df[~df['categoria'].str.contains('Fonte:', na=False)]
-    
-    print(f"✅ {len(df)} linhas carregadas\n")
+    log.info(f"✅ {len(df)} linhas carregadas\n")
     
     # TOTAL BRASIL
     linha_brasil = df[df['categoria'] == 'TOTAL'].iloc[0]
@@ -44,55 +48,37 @@ def analisar_a8(arquivo_path, aba_nome='A8'):
     pct_com_acesso = (com_acesso / total) * 100
     pct_sem_acesso = (sem_acesso / total) * 100
     
-    print(f"🇧🇷 BRASIL:")
-    print(f"  Total de escolas: {total:,.0f}")
-    print(f"  ✅ COM acesso (PC+Internet): {com_acesso:,.0f} ({pct_com_acesso:.1f}%)")
-    print(f"  ❌ SEM acesso: {sem_acesso:,.0f} ({pct_sem_acesso:.1f}%)")
-    
-    # REGIÕES
-    regioes = df[df['categoria'] == 'REGIÃO'].copy()
-    regioes_data = []
-    
-    print(f"\n📍 POR REGIÃO:")
-    for _, regiao in regioes.iterrows():
-        nome = regiao['subcategoria']
-        com = regiao['sim']
-        sem = regiao['nao']
-        total_reg = com + sem
-        pct = (com / total_reg) * 100
-        
-        print(f"  {nome}: {com:,.0f} COM ({pct:.1f}%) | {sem:,.0f} SEM ({100-pct:.1f}%)")
-        
-        regioes_data.append({
-            'regiao': nome,
+    log.info(f"🇧🇷 BRASIL:")
+    log.info(f"  Total de escolas: {total:,.0f}")
+    log.info(f"  ✅ COM acesso (PC+Internet): {com_acesso:,.0f} ({pct_com_acesso:.1f}%)")
+    log.info(f"  ❌ SEM acesso: {sem_acesso:,.0f} ({pct_sem_acesso:.1f}%)")
+    
+    def registro(grupo):
+        """Métricas de uma linha de grupo (região, área, dependência, ...)"""
+        com = grupo['sim']
+        sem = grupo['nao']
+        total_grupo = com + sem
+        return {
             'com_acesso': int(com),
             'sem_acesso': int(sem),
-            'total': int(total_reg),
-            'percentual': round(pct, 1)
-        })
-    
-    # ÁREAS
-    areas = df[df['categoria'] == 'ÁREA'].copy()
-    areas_data = []
-    
-    if len(areas) > 0:
-        print(f"\n🏙️  POR ÁREA:")
-        for _, area in areas.iterrows():
-            nome = area['subcategoria']
-            com = area['sim']
-            sem = area['nao']
-            total_area = com + sem
-            pct = (com / total_area) * 100
-            
-            print(f"  {nome}: {com:,.0f} COM ({pct:.1f}%)")
-            
-            areas_data.append({
-                'area': nome,
-                'com_acesso': int(com),
-                'sem_acesso': int(sem),
-                'total': int(total_area),
-                'percentual': round(pct, 1)
-            })
+            'total': int(total_grupo),
+            'percentual': round((com / total_grupo) * 100, 1)
+        }
+    
+    # Grupos de todas as dimensões da aba (REGIÃO, ÁREA, DEPENDÊNCIA ADMINISTRATIVA, ...)
+    por_dimensao = {}
+    for chave_resultado, (dimensao, chave_nome) in DIMENSOES.items():
+        grupos = df[df['categoria'] == dimensao]
+        registros = []
+        if len(grupos) > 0:
+            log.debug(f"\n📊 POR {dimensao}:")
+        for _, grupo in grupos.iterrows():
+            registros.append({chave_nome: grupo['subcategoria'], **registro(grupo)})
+            log.debug(f"  {grupo['subcategoria']}: {registros[-1]['com_acesso']:,.0f} COM "
+                      f"({registros[-1]['percentual']:.1f}%) | {registros[-1]['sem_acesso']:,.0f} SEM",
+                      extra=linha(f"{aba_nome} - por {dimensao.lower()}", **registros[-1]))
+        if registros or chave_resultado in ('regioes', 'areas'):
+            por_dimensao[chave_resultado] = registros
     
     # Consolidar resultados
     resultados = {
@@ -106,48 +92,46 @@ def analisar_a8(arquivo_path, aba_nome='A8'):
             'pct_com_acesso': round(pct_com_acesso, 1),
             'pct_sem_acesso': round(pct_sem_acesso, 1)
         },
-        'regioes': regioes_data,
-        'areas': areas_data
+        **por_dimensao
     }
     
     return resultados
 
 
+@instrumentar('exportar_arquivos', 'escrita')
 def salvar_resultados(resultados, output_dir='./resultados'):
     """
     Salva resultados em JSON e CSV
     """
     Path(output_dir).mkdir(exist_ok=True)
     
-    print(f"\n{'='*80}")
-    print("SALVANDO RESULTADOS")
-    print(f"{'='*80}\n")
+    titulo(log, "SALVANDO RESULTADOS")
     
     # JSON completo
     json_path = f"{output_dir}/a8_acesso_completo.json"
     with open(json_path, 'w', encoding='utf-8') as f:
         json.dump(resultados, f, ensure_ascii=False, indent=2)
-    print(f"✅ JSON completo salvo: {json_path}")
+    log.info(f"✅ JSON completo salvo: {json_path}")
     
     # CSV do Brasil
     df_brasil = pd.DataFrame([resultados['brasil']])
     csv_brasil_path = f"{output_dir}/a8_brasil.csv"
     df_brasil.to_csv(csv_brasil_path, index=False, encoding='utf-8-sig')
-    print(f"✅ CSV Brasil salvo: {csv_brasil_path}")
+    log.info(f"✅ CSV Brasil salvo: {csv_brasil_path}")
     
     # CSV das regiões
     if resultados['regioes']:
         df_regioes = pd.DataFrame(resultados['regioes'])
         csv_regioes_path = f"{output_dir}/a8_regioes.csv"
         df_regioes.to_csv(csv_regioes_path, index=False, encoding='utf-8-sig')
-        print(f"✅ CSV Regiões salvo: {csv_regioes_path}")
+        log.info(f"✅ CSV Regiões salvo: {csv_regioes_path}")
     
     # CSV das áreas
     if resultados['areas']:
         df_areas = pd.DataFrame(resultados['areas'])
         csv_areas_path = f"{output_dir}/a8_areas.csv"
         df_areas.to_csv(csv_areas_path, index=False, encoding='utf-8-sig')
-        print(f"✅ CSV Áreas salvo: {csv_areas_path}")
+        log.info(f"✅ CSV Áreas salvo: {csv_areas_path}")
     
     return {
         'json': json_path,
@@ -158,34 +142,42 @@ def salvar_resultados(resultados, output_dir='./resultados'):
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Análise A8 - Acesso a computador + internet')
+    parser.add_argument('--db', default=DB_PADRAO, help=f'Banco de resultados (padrão: {DB_PADRAO})')
+    parser.add_argument('--arquivo', default=ARQUIVOS_PADRAO['escolas'],
+                        help=f"Workbook de escolas (padrão: {ARQUIVOS_PADRAO['escolas']}; o ano vem do nome)")
+    parser.add_argument('--exportar-arquivos', action='store_true',
+                        help='Também exporta JSON/CSV em ./resultados (visão opcional)')
+    adicionar_argumento_perfil(parser, './resultados/perfil_a8.json')
+    adicionar_argumentos_log(parser)
+    args = parser.parse_args()
+    configurar_perfil(args)
+    configurar_log_args(args)
+    
     # Configuração
-    arquivo = 'tic_educacao_2024_escolas_tabela_total_v1.0.xlsx'
+    arquivo = args.arquivo
     
     try:
         # Executar análise
-        resultados = analisar_a8(arquivo, aba_nome='A8')
+        resultados = analisar_a8(arquivo, aba_nome=ABAS_ANALISES['a8'][1])
         
-        # SALVAR RESULTADOS (esta linha é ESSENCIAL!)
-        arquivos_gerados = salvar_resultados(resultados)
+        # SALVAR NO BANCO DE RESULTADOS
+        salvar_resultados_db(resultados, indicador='a8', ano=ano_do_arquivo(arquivo), db_path=args.db)
         
-        print(f"\n{'='*80}")
-        print("✅ ANÁLISE A8 CONCLUÍDA!")
-        print(f"{'='*80}")
-        print(f"\n📊 Resultado principal:")
-        print(f"  • {resultados['brasil']['pct_com_acesso']:.1f}% das escolas TÊM acesso")
-        print(f"  • {resultados['brasil']['pct_sem_acesso']:.1f}% das escolas NÃO têm acesso")
+        # JSON/CSV (opcional)
+        arquivos_gerados = salvar_resultados(resultados) if args.exportar_arquivos else {}
         
-        if resultados['regioes']:
-            print(f"\n📍 Por região:")
-            for regiao in resultados['regioes']:
-                print(f"  • {regiao['regiao']}: {regiao['percentual']:.1f}%")
+        titulo(log, "✅ ANÁLISE A8 CONCLUÍDA!")
+        log.info(f"\n📊 Resultado principal:")
+        log.info(f"  • {resultados['brasil']['pct_com_acesso']:.1f}% das escolas TÊM acesso")
+        log.info(f"  • {resultados['brasil']['pct_sem_acesso']:.1f}% das escolas NÃO têm acesso")
         
-        print(f"\n📁 Arquivos gerados:")
+        log.info(f"\n📁 Arquivos gerados:")
+        log.info(f"  • banco: {args.db}")
         for tipo, caminho in arquivos_gerados.items():
             if caminho:
-                print(f"  • {tipo}: {caminho}")
+                log.info(f"  • {tipo}: {caminho}")
                 
     except Exception as e:
-        print(f"\n❌ ERRO: {e}")
-        import traceback
-        traceback.print_exc()
\ No newline at end of file
+        log.exception(f"\n❌ ERRO: {e}")
+        sys.exit(1)
@@ -3,56 +3,56 @@ ANÁLISE ABA B4A - PROPORÇÃO ALUNOS POR COMPUTADOR
 TIC Educação 2024
 """
 
+import argparse
+import sys
 import pandas as pd
 import json
 from pathlib import Path
 
+from banco_resultados import DIMENSOES, salvar_resultados_db, DB_PADRAO
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from tic.cli import ABAS_ANALISES, ARQUIVOS_PADRAO
+from tic.fatos import ano_do_arquivo, carregar_fatos_aba, pivotar_respostas
+from tic.instrumentacao import adicionar_argumento_perfil, configurar_perfil, instrumentar
+from tic.log import adicionar_argumentos_log, configurar_log_args, linha, obter_logger, titulo
+
+log = obter_logger('analise_b4a')
+
+# Rótulo da resposta no cabeçalho da aba → coluna (o cabeçalho precisa ter
+# exatamente estas faixas: uma a mais ou a menos é erro, não deslocamento)
+FAIXAS_B4A = {
+    'Até 5 alunos': 'ate_5_alunos',
+    'De 5,1 a 10': 'de_5_1_a_10',
+    'De 10,1 a 15': 'de_10_1_a_15',
+    'De 15,1 a 20': 'de_15_1_a_20',
+    'De 20,1 a 30': 'de_20_1_a_30',
+    'De 30,1 a 40': 'de_30_1_a_40',
+    'De 40,1 a 50': 'de_40_1_a_50',
+    'De 50,1 a 100': 'de_50_1_a_100',
+    '100 alunos ou mais': '100_alunos_ou_mais',
+    'Não possuem computador de mesa': 'nao_possuem_computador_mesa',
+    'Sem informação': 'sem_informacao_numero_alunos',
+}
+
+
+@instrumentar(categoria='analise')
 def analisar_b4a_proporcao(arquivo_path, aba_nome='B4A'):
     """
     Analisa a aba B4A - Proporção alunos por computador disponível
     """
-    print(f"\n{'='*80}")
-    print(f"ANÁLISE ABA {aba_nome} - PROPORÇÃO ALUNOS/COMPUTADOR")
-    print(f"{'='*80}\n")
+    titulo(log, f"ANÁLISE ABA {aba_nome} - PROPORÇÃO ALUNOS/COMPUTADOR")
     
     # Carregar dados
-    print(f"📂 Carregando aba {aba_nome}...")
-    df = pd.read_excel(
-        arquivo_path, 
-        sheet_name=aba_nome,
-        skiprows=3,
-        header=None
-    )
-    
-    # Definir nomes das colunas
-    colunas = [
-        'categoria',
-        'subcategoria',
-        'ate_5_alunos',
-        'de_5_1_a_10',
-        'de_10_1_a_15',
-        'de_15_1_a_20',
-        'de_20_1_a_30',
-        'de_30_1_a_40',
-        'de_40_1_a_50',
-        'de_50_1_a_100',
-        '100_alunos_ou_mais',
-        'nao_possuem_computador_mesa',
-        'sem_informacao_numero_alunos'
-    ]
-    
-    df = df.iloc[:, :len(colunas)]
-    df.columns = colunas
-    
-    # Limpar dados
-    df = df.dropna(subset=['categoria'])
-    df = df[~df['categoria'].astype(str).str.contains('Fonte:', na=False)]
-    
-    print(f"✅ {len(df)} linhas carregadas\n")
+    log.info(f"📂 Carregando aba {aba_nome}...")
+    fatos = carregar_fatos_aba(arquivo_path, aba_nome)
+    
+    # Tabela larga reconstruída dos fatos (colunas pelos rótulos do cabeçalho)
+    df = pivotar_respostas(fatos, FAIXAS_B4A, aba_nome)
+    
+    log.info(f"✅ {len(df)} linhas carregadas\n")
     
     # TOTAL BRASIL
-    print(f"🔍 Debug - Primeiras categorias: {df['categoria'].head().tolist()}\n")
     linha_brasil = df[df['categoria'].astype(str).str.strip() == 'TOTAL'].iloc[0]
     
     # Definir faixas adequadas e inadequadas
@@ -72,66 +72,45 @@ def analisar_b4a_proporcao(arquivo_path, aba_nome='B4A'):
     pct_inadequadas = (total_inadequadas / total) * 100 if total > 0 else 0
     pct_sem = (sem_computador / total) * 100 if total > 0 else 0
     
-    print(f"🇧🇷 BRASIL:")
-    print(f"  Total de escolas: {total:,.0f}")
-    print(f"\n  📊 PROPORÇÃO ALUNOS/COMPUTADOR:")
-    print(f"  ✅ ADEQUADA (≤20 alunos/PC): {total_adequadas:,.0f} ({pct_adequadas:.1f}%)")
-    print(f"  ⚠️  INADEQUADA (>20 alunos/PC): {total_inadequadas:,.0f} ({pct_inadequadas:.1f}%)")
-    print(f"  ❌ SEM computador: {sem_computador:,.0f} ({pct_sem:.1f}%)")
-    
-    # REGIÕES
-    regioes = df[df['categoria'].astype(str).str.strip() == 'REGIÃO'].copy()
-    regioes_data = []
-    
-    if len(regioes) > 0:
-        print(f"\n📍 POR REGIÃO:")
-        for _, regiao in regioes.iterrows():
-            nome = regiao['subcategoria']
-            
-            adequadas = sum([regiao[col] for col in faixas_adequadas if pd.notna(regiao[col])])
-            inadequadas = sum([regiao[col] for col in faixas_inadequadas if pd.notna(regiao[col])])
-            sem_pc = regiao['nao_possuem_computador_mesa'] if pd.notna(regiao['nao_possuem_computador_mesa']) else 0
-            
-            total_reg = adequadas + inadequadas + sem_pc
-            pct_adequada = (adequadas / total_reg) * 100 if total_reg > 0 else 0
-            
-            print(f"  {nome}: {pct_adequada:.1f}% com proporção adequada")
-            
-            regioes_data.append({
-                'regiao': nome,
-                'total': int(total_reg),
-                'proporcao_adequada': int(adequadas),
-                'proporcao_inadequada': int(inadequadas),
-                'sem_computador': int(sem_pc),
-                'percentual_adequada': round(pct_adequada, 1)
-            })
-    
-    # ÁREAS
-    areas = df[df['categoria'].astype(str).str.strip() == 'ÁREA'].copy()
-    areas_data = []
-    
-    if len(areas) > 0:
-        print(f"\n🏙️  POR ÁREA:")
-        for _, area in areas.iterrows():
-            nome = area['subcategoria']
-            
-            adequadas = sum([area[col] for col in faixas_adequadas if pd.notna(area[col])])
-            inadequadas = sum([area[col] for col in faixas_inadequadas if pd.notna(area[col])])
-            sem_pc = area['nao_possuem_computador_mesa'] if pd.notna(area['nao_possuem_computador_mesa']) else 0
-            
-            total_area = adequadas + inadequadas + sem_pc
-            pct_adequada = (adequadas / total_area) * 100 if total_area > 0 else 0
-            
-            print(f"  {nome}: {pct_adequada:.1f}% com proporção adequada")
-            
-            areas_data.append({
-                'area': nome,
-                'total': int(total_area),
-                'proporcao_adequada': int(adequadas),
-                'proporcao_inadequada': int(inadequadas),
-                'sem_computador': int(sem_pc),
-                'percentual_adequada': round(pct_adequada, 1)
-            })
+    log.info(f"🇧🇷 BRASIL:")
+    log.info(f"  Total de escolas: {total:,.0f}")
+    log.info(f"\n  📊 PROPORÇÃO ALUNOS/COMPUTADOR:")
+    log.info(f"  ✅ ADEQUADA (≤20 alunos/PC): {total_adequadas:,.0f} ({pct_adequadas:.1f}%)")
+    log.info(f"  ⚠️  INADEQUADA (>20 alunos/PC): {total_inadequadas:,.0f} ({pct_inadequadas:.1f}%)")
+    log.info(f"  ❌ SEM computador: {sem_computador:,.0f} ({pct_sem:.1f}%)")
+    
+    def registro(grupo):
+        """Métricas de uma linha de grupo (região, área, dependência, ...)"""
+        adequadas = sum([grupo[col] for col in faixas_adequadas if pd.notna(grupo[col])])
+        inadequadas = sum([grupo[col] for col in faixas_inadequadas if pd.notna(grupo[col])])
+        sem_pc = grupo['nao_possuem_computador_mesa'] if pd.notna(grupo['nao_possuem_computador_mesa']) else 0
+        
+        total_grupo = adequadas + inadequadas + sem_pc
+        pct_adequada = (adequadas / total_grupo) * 100 if total_grupo > 0 else 0
+        
+        return {
+            'total': int(total_grupo),
+            'proporcao_adequada': int(adequadas),
+            'proporcao_inadequada': int(inadequadas),
+            'sem_computador': int(sem_pc),
+            'percentual_adequada': round(pct_adequada, 1)
+        }
+    
+    # Grupos de todas as dimensões da aba (REGIÃO, ÁREA, DEPENDÊNCIA ADMINISTRATIVA, ...)
+    categorias = df['categoria'].astype(str).str.strip()
+    por_dimensao = {}
+    for chave_resultado, (dimensao, chave_nome) in DIMENSOES.items():
+        grupos = df[categorias == dimensao]
+        registros = []
+        if len(grupos) > 0:
+            log.debug(f"\n📊 POR {dimensao}:")
+        for _, grupo in grupos.iterrows():
+            registros.append({chave_nome: grupo['subcategoria'], **registro(grupo)})
+            log.debug(f"  {grupo['subcategoria']}: {registros[-1]['percentual_adequada']:.1f}% "
+                      f"com proporção adequada",
+                      extra=linha(f"{aba_nome} - por {dimensao.lower()}", **registros[-1]))
+        if registros or chave_resultado in ('regioes', 'areas'):
+            por_dimensao[chave_resultado] = registros
     
     # Consolidar resultados
     resultados = {
@@ -147,48 +126,46 @@ def analisar_b4a_proporcao(arquivo_path, aba_nome='B4A'):
             'pct_inadequada': round(pct_inadequadas, 1),
             'pct_sem': round(pct_sem, 1)
         },
-        'regioes': regioes_data,
-        'areas': areas_data
+        **por_dimensao
     }
     
     return resultados
 
 
+@instrumentar('exportar_arquivos', 'escrita')
 def salvar_resultados(resultados, output_dir='./resultados'):
     """
     Salva resultados em JSON e CSV
     """
     Path(output_dir).mkdir(exist_ok=True)
     
-    print(f"\n{'='*80}")
-    print("SALVANDO RESULTADOS")
-    print(f"{'='*80}\n")
+    titulo(log, "SALVANDO RESULTADOS")
     
     # JSON completo
     json_path = f"{output_dir}/b4a_proporcao_completo.json"
     with open(json_path, 'w', encoding='utf-8') as f:
         json.dump(resultados, f, ensure_ascii=False, indent=2)
-    print(f"✅ JSON completo salvo: {json_path}")
+    log.info(f"✅ JSON completo salvo: {json_path}")
     
     # CSV do Brasil
     df_brasil = pd.DataFrame([resultados['brasil']])
     csv_brasil_path = f"{output_dir}/b4a_brasil.csv"
     df_brasil.to_csv(csv_brasil_path, index=False, encoding='utf-8-sig')
-    print(f"✅ CSV Brasil salvo: {csv_brasil_path}")
+    log.info(f"✅ CSV Brasil salvo: {csv_brasil_path}")
     
     # CSV das regiões
     if resultados['regioes']:
         df_regioes = pd.DataFrame(resultados['regioes'])
         csv_regioes_path = f"{output_dir}/b4a_regioes.csv"
         df_regioes.to_csv(csv_regioes_path, index=False, encoding='utf-8-sig')
-        print(f"✅ CSV Regiões salvo: {csv_regioes_path}")
+        log.info(f"✅ CSV Regiões salvo: {csv_regioes_path}")
     
     # CSV das áreas
     if resultados['areas']:
         df_areas = pd.DataFrame(resultados['areas'])
         csv_areas_path = f"{output_dir}/b4a_areas.csv"
         df_areas.to_csv(csv_areas_path, index=False, encoding='utf-8-sig')
-        print(f"✅ CSV Áreas salvo: {csv_areas_path}")
+        log.info(f"✅ CSV Áreas salvo: {csv_areas_path}")
     
     return {
         'json': json_path,
@@ -199,34 +176,42 @@ def salvar_resultados(resultados, output_dir='./resultados'):
 
 
 if __name__ == "__main__":
-    arquivo = 'tic_educacao_2024_escolas_tabela_total_v1.0.xlsx'
+    parser = argparse.ArgumentParser(description='Análise B4A - Proporção alunos/computador')
+    parser.add_argument('--db', default=DB_PADRAO, help=f'Banco de resultados (padrão: {DB_PADRAO})')
+    parser.add_argument('--arquivo', default=ARQUIVOS_PADRAO['escolas'],
+                        help=f"Workbook de escolas (padrão: {ARQUIVOS_PADRAO['escolas']}; o ano vem do nome)")
+    parser.add_argument('--exportar-arquivos', action='store_true',
+                        help='Também exporta JSON/CSV em ./resultados (visão opcional)')
+    adicionar_argumento_perfil(parser, './resultados/perfil_b4a.json')
+    adicionar_argumentos_log(parser)
+    args = parser.parse_args()
+    configurar_perfil(args)
+    configurar_log_args(args)
+    
+    arquivo = args.arquivo
     
     try:
         # Executar análise
-        resultados = analisar_b4a_proporcao(arquivo, aba_nome='B4A')
+        resultados = analisar_b4a_proporcao(arquivo, aba_nome=ABAS_ANALISES['b4a'][1])
         
-        # SALVAR RESULTADOS
-        arquivos_gerados = salvar_resultados(resultados)
+        # SALVAR NO BANCO DE RESULTADOS
+        salvar_resultados_db(resultados, indicador='b4a', ano=ano_do_arquivo(arquivo), db_path=args.db)
         
-        print(f"\n{'='*80}")
-        print("✅ ANÁLISE B4A CONCLUÍDA!")
-        print(f"{'='*80}")
-        print(f"\n📊 Resultado principal:")
-        print(f"  • {resultados['brasil']['pct_adequada']:.1f}% das escolas têm proporção ADEQUADA (≤20 alunos/PC)")
-        print(f"  • {resultados['brasil']['pct_inadequada']:.1f}% têm proporção INADEQUADA (>20 alunos/PC)")
-        print(f"  • {resultados['brasil']['pct_sem']:.1f}% NÃO têm computador")
+        # JSON/CSV (opcional)
+        arquivos_gerados = salvar_resultados(resultados) if args.exportar_arquivos else {}
         
-        if resultados['regioes']:
-            print(f"\n📍 Por região:")
-            for regiao in resultados['regioes']:
-                print(f"  • {regiao['regiao']}: {regiao['percentual_adequada']:.1f}%")
+        titulo(log, "✅ ANÁLISE B4A CONCLUÍDA!")
+        log.info(f"\n📊 Resultado principal:")
+        log.info(f"  • {resultados['brasil']['pct_adequada']:.1f}% das escolas têm proporção ADEQUADA (≤20 alunos/PC)")
+        log.info(f"  • {resultados['brasil']['pct_inadequada']:.1f}% têm proporção INADEQUADA (>20 alunos/PC)")
+        log.info(f"  • {resultados['brasil']['pct_sem']:.1f}% NÃO têm computador")
         
-        print(f"\n📁 Arquivos gerados:")
+        log.info(f"\n📁 Arquivos gerados:")
+        log.info(f"  • banco: {args.db}")
         for tipo, caminho in arquivos_gerados.items():
             if caminho:
-                print(f"  • {tipo}: {caminho}")
+                log.info(f"  • {tipo}: {caminho}")
                 
     except Exception as e:
-        print(f"\n❌ ERRO: {e}")
-        import traceback
-        traceback.print_exc()
\ No newline at end of file
+        log.exception(f"\n❌ ERRO: {e}")
+        sys.exit(1)
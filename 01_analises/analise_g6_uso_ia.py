@@ -3,237 +3,153 @@ ANÁLISE ABA G6 - USO DE IA GENERATIVA POR ALUNOS
 TIC Educação 2024
 """
 
+import argparse
+import sys
 import pandas as pd
 import numpy as np
 import json
 from pathlib import Path
 
+from banco_resultados import DIMENSOES, salvar_resultados_db, DB_PADRAO
 
-def analisar_g6_uso_ia(arquivo, aba_nome='G6'):
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from tic.cli import ABAS_ANALISES, ARQUIVOS_PADRAO
+from tic.fatos import (ano_do_arquivo, carregar_fatos_aba, chave_questao, inteiro,
+                       proporcoes_respostas, registros_por_dimensao)
+from tic.instrumentacao import adicionar_argumento_perfil, configurar_perfil, instrumentar
+from tic.log import adicionar_argumentos_log, configurar_log_args, obter_logger, titulo
+
+log = obter_logger('analise_g6')
+
+
+# Recurso principal do indicador (as métricas sem sufixo são dele)
+RECURSO_IA = 'Inteligência Artificial'
+
+
+@instrumentar(categoria='analise')
+def analisar_g6_uso_ia(arquivo, aba_nome='G6', recursos=True):
     """
     Analisa a aba G6 - Uso de IA Generativa por alunos
+
+    Com recursos=True (padrão), calcula também o perfil completo: a proporção
+    de Sim de cada recurso digital do cabeçalho (sites de busca, vídeos, ...)
+    para cada grupo, como 'percentual_<recurso>', na mesma passada
     """
-    print(f"\n{'='*80}")
-    print(f"ANÁLISE ABA {aba_nome} - USO DE IA GENERATIVA POR ALUNOS")
-    print(f"{'='*80}\n")
+    titulo(log, f"ANÁLISE ABA {aba_nome} - USO DE IA GENERATIVA POR ALUNOS")
     
     # Carregar TODA a planilha
-    print(f"📂 Carregando aba {aba_nome}...")
-    df_raw = pd.read_excel(arquivo, sheet_name=aba_nome, header=None)
+    log.info(f"📂 Carregando aba {aba_nome}...")
+    fatos = carregar_fatos_aba(arquivo, aba_nome)
     
-    print(f"✅ Arquivo carregado: {df_raw.shape[0]} linhas x {df_raw.shape[1]} colunas\n")
+    log.info(f"✅ Aba carregada: {len(fatos)} fatos\n")
     
-    # Encontrar colunas de IA
-    linha_cabecalho = df_raw.iloc[2]
-    colunas_ia = []
-    for i, valor in enumerate(linha_cabecalho):
-        if pd.notna(valor) and 'Inteligência Artificial' in str(valor):
-            colunas_ia.append(i)
+    # Pares (recurso, Sim/Não) decodificados do cabeçalho → matrizes [linha, recurso]
+    nomes, linhas, sim, nao, pct = proporcoes_respostas(fatos)
     
-    if len(colunas_ia) == 0:
+    # Encontrar o recurso de IA (pela questão no cabeçalho)
+    eh_ia = [RECURSO_IA in nome for nome in nomes]
+    if not any(eh_ia):
         raise ValueError("Colunas de IA não encontradas!")
-    
-    col_sim = colunas_ia[0]
-    col_nao = colunas_ia[1]
-    
-    print(f"🔍 Colunas de IA encontradas:")
-    print(f"  • Coluna {col_sim}: Usam IA (Sim)")
-    print(f"  • Coluna {col_nao}: Não usam IA (Não)\n")
-    
-    # Criar DataFrame de dados
-    df = df_raw.iloc[4:].copy()
-    df.columns = range(len(df.columns))
-    df = df.reset_index(drop=True)
-    df = df.rename(columns={0: 'categoria', 1: 'subcategoria'})
-    
-    # Converter colunas numéricas
-    for col in df.columns[2:]:
-        df[col] = pd.to_numeric(
-            df[col].astype(str).str.replace(',', '').str.replace('-', ''), 
-            errors='coerce'
-        )
-    
-    # Limpar
-    df = df.dropna(subset=['categoria'])
-    df = df[~df['categoria'].str.contains('Fonte:', na=False)]
-    
-    print(f"✅ {len(df)} linhas de dados carregadas\n")
+    ia = eh_ia.index(True)
+    chaves = [chave_questao(nome, f'recurso_{j}') for j, nome in enumerate(nomes)] if recursos else []
+    
+    log.info(f"🔍 {len(nomes)} recurso(s) digitais no cabeçalho; IA: {nomes[ia]}")
+    if not recursos:
+        log.info("ℹ️  --so-ia: perfil dos demais recursos digitais não calculado")
+    log.info(f"✅ {len(linhas)} linhas de dados carregadas\n")
+    
+    def registro(i):
+        """Métricas de uma linha: IA e, no perfil completo, cada recurso"""
+        return {
+            'usam_ia': inteiro(sim[i, ia]),
+            'nao_usam': inteiro(nao[i, ia]),
+            'total': inteiro(sim[i, ia] + nao[i, ia]),
+            'percentual': round(float(pct[i, ia]), 1),
+            **{f'percentual_{chave}': round(float(pct[i, j]), 1) for j, chave in enumerate(chaves)},
+        }
     
     # TOTAL BRASIL
-    linha_total = df[df['categoria'] == 'TOTAL'].iloc[0]
-    
-    usam_ia = linha_total[col_sim]
-    nao_usam_ia = linha_total[col_nao]
-    total = usam_ia + nao_usam_ia
-    pct_usam = (usam_ia / total) * 100
-    pct_nao_usam = (nao_usam_ia / total) * 100
+    i_total = int(np.flatnonzero(linhas['dimensao'].to_numpy() == 'TOTAL')[0])
+    brasil = registro(i_total)
+    
+    log.info(f"🇧🇷 BRASIL - USO DE IA GENERATIVA:")
+    log.info(f"  Total de alunos: {brasil['total']:,.0f}")
+    log.info(f"  ✅ USAM IA: {brasil['usam_ia']:,.0f} ({brasil['percentual']:.1f}%)")
+    log.info(f"  ❌ NÃO USAM IA: {brasil['nao_usam']:,.0f} ({100 - brasil['percentual']:.1f}%)")
+    if chaves:
+        log.info(f"\n📚 PERFIL DE RECURSOS (BRASIL):")
+        for j in np.argsort(-pct[i_total]):
+            log.info(f"  • {nomes[j]}: {pct[i_total, j]:.1f}%")
     
-    print(f"🇧🇷 BRASIL - USO DE IA GENERATIVA:")
-    print(f"  Total de alunos: {total:,.0f}")
-    print(f"  ✅ USAM IA: {usam_ia:,.0f} ({pct_usam:.1f}%)")
-    print(f"  ❌ NÃO USAM IA: {nao_usam_ia:,.0f} ({pct_nao_usam:.1f}%)")
-    
-    # REGIÕES
-    regiao = df[df['categoria'] == 'REGIÃO'].copy()
-    regiao_data = []
-    
-    if len(regiao) > 0:
-        print(f"\n📍 POR REGIÃO:")
-        for _, row in regiao.iterrows():
-            nome = row['subcategoria']
-            usam = row[col_sim]
-            nao_usam = row[col_nao]
-            total_grupo = usam + nao_usam
-            pct = (usam / total_grupo * 100) if total_grupo > 0 else 0
-            
-            print(f"  {nome}: {usam:,.0f} usam ({pct:.1f}%)")
-            
-            regiao_data.append({
-                'regiao': nome,
-                'usam_ia': int(usam),
-                'nao_usam': int(nao_usam),
-                'total': int(total_grupo),
-                'percentual': round(pct, 1)
-            })
-    
-    # ETAPA DE ENSINO
-    etapa = df[df['categoria'] == 'ETAPA DE ENSINO'].copy()
-    etapa_data = []
-    
-    if len(etapa) > 0:
-        print(f"\n📚 POR ETAPA DE ENSINO:")
-        for _, row in etapa.iterrows():
-            nome = row['subcategoria']
-            usam = row[col_sim]
-            nao_usam = row[col_nao]
-            total_grupo = usam + nao_usam
-            pct = (usam / total_grupo * 100) if total_grupo > 0 else 0
-            
-            print(f"  {nome}: {usam:,.0f} usam ({pct:.1f}%)")
-            
-            etapa_data.append({
-                'etapa': nome,
-                'usam_ia': int(usam),
-                'nao_usam': int(nao_usam),
-                'total': int(total_grupo),
-                'percentual': round(pct, 1)
-            })
-    
-    # FAIXA ETÁRIA
-    faixa_etaria = df[df['categoria'] == 'FAIXA ETÁRIA'].copy()
-    faixa_etaria_data = []
-    
-    if len(faixa_etaria) > 0:
-        print(f"\n📅 POR FAIXA ETÁRIA:")
-        for _, row in faixa_etaria.iterrows():
-            nome = row['subcategoria']
-            usam = row[col_sim]
-            nao_usam = row[col_nao]
-            total_grupo = usam + nao_usam
-            pct = (usam / total_grupo * 100) if total_grupo > 0 else 0
-            
-            print(f"  {nome}: {usam:,.0f} usam ({pct:.1f}%)")
-            
-            faixa_etaria_data.append({
-                'faixa_etaria': nome,
-                'usam_ia': int(usam),
-                'nao_usam': int(nao_usam),
-                'total': int(total_grupo),
-                'percentual': round(pct, 1)
-            })
-    
-    # SEXO
-    sexo = df[df['categoria'] == 'SEXO'].copy()
-    sexo_data = []
-    
-    if len(sexo) > 0:
-        print(f"\n👥 POR SEXO:")
-        for _, row in sexo.iterrows():
-            nome = row['subcategoria']
-            usam = row[col_sim]
-            nao_usam = row[col_nao]
-            total_grupo = usam + nao_usam
-            pct = (usam / total_grupo * 100) if total_grupo > 0 else 0
-            
-            print(f"  {nome}: {usam:,.0f} usam ({pct:.1f}%)")
-            
-            sexo_data.append({
-                'sexo': nome,
-                'usam_ia': int(usam),
-                'nao_usam': int(nao_usam),
-                'total': int(total_grupo),
-                'percentual': round(pct, 1)
-            })
-    
-    # Consolidar resultados
     resultados = {
         'aba': aba_nome,
         'indicador': 'Uso de IA Generativa (ChatGPT, Copilot, Gemini) em Pesquisas Escolares',
         'fonte': 'TIC Educação 2024 - Alunos',
+        'recursos': [{'recurso': nome, 'metrica': f'percentual_{chave}'} for nome, chave in zip(nomes, chaves)],
         'brasil': {
-            'total_alunos': int(total),
-            'usam_ia': int(usam_ia),
-            'nao_usam': int(nao_usam_ia),
-            'percentual': round(pct_usam, 1)
+            'total_alunos': brasil['total'],
+            'usam_ia': brasil['usam_ia'],
+            'nao_usam': brasil['nao_usam'],
+            **{k: v for k, v in brasil.items() if k.startswith('percentual')}
         },
-        'etapas': etapa_data,
-        'regioes': regiao_data,
-        'faixa_etaria': faixa_etaria_data,
-        'sexo': sexo_data
     }
     
+    # Grupos de todas as dimensões da aba (REGIÃO, ETAPA DE ENSINO, FAIXA ETÁRIA, SEXO, ...)
+    resultados.update(registros_por_dimensao(
+        linhas, registro, DIMENSOES, aba_nome,
+        lambda r: f"{r['usam_ia']:,.0f} usam ({r['percentual']:.1f}%)", log))
+    
     return resultados
 
 
+@instrumentar('exportar_arquivos', 'escrita')
 def salvar_resultados(resultados, output_dir='./resultados'):
     """
     Salva resultados em JSON e CSV
     """
     Path(output_dir).mkdir(exist_ok=True)
     
-    print(f"\n{'='*80}")
-    print("SALVANDO RESULTADOS")
-    print(f"{'='*80}\n")
+    titulo(log, "SALVANDO RESULTADOS")
     
     # JSON completo
     json_path = f"{output_dir}/g6_uso_ia_completo.json"
     with open(json_path, 'w', encoding='utf-8') as f:
         json.dump(resultados, f, ensure_ascii=False, indent=2)
-    print(f"✅ JSON completo salvo: {json_path}")
+    log.info(f"✅ JSON completo salvo: {json_path}")
     
     # CSV do Brasil
     df_brasil = pd.DataFrame([resultados['brasil']])
     csv_brasil_path = f"{output_dir}/g6_brasil.csv"
     df_brasil.to_csv(csv_brasil_path, index=False, encoding='utf-8-sig')
-    print(f"✅ CSV Brasil salvo: {csv_brasil_path}")
+    log.info(f"✅ CSV Brasil salvo: {csv_brasil_path}")
     
     # CSV das regiões
     if resultados['regioes']:
         df_regioes = pd.DataFrame(resultados['regioes'])
         csv_regioes_path = f"{output_dir}/g6_regioes.csv"
         df_regioes.to_csv(csv_regioes_path, index=False, encoding='utf-8-sig')
-        print(f"✅ CSV Regiões salvo: {csv_regioes_path}")
+        log.info(f"✅ CSV Regiões salvo: {csv_regioes_path}")
     
     # CSV etapas de ensino
     if resultados['etapas']:
         df_etapas = pd.DataFrame(resultados['etapas'])
         csv_etapas_path = f"{output_dir}/g6_etapas.csv"
         df_etapas.to_csv(csv_etapas_path, index=False, encoding='utf-8-sig')
-        print(f"✅ CSV Etapas salvo: {csv_etapas_path}")
+        log.info(f"✅ CSV Etapas salvo: {csv_etapas_path}")
     
     # CSV faixa etária
     if resultados['faixa_etaria']:
         df_faixa = pd.DataFrame(resultados['faixa_etaria'])
         csv_faixa_path = f"{output_dir}/g6_faixa_etaria.csv"
         df_faixa.to_csv(csv_faixa_path, index=False, encoding='utf-8-sig')
-        print(f"✅ CSV Faixa Etária salvo: {csv_faixa_path}")
+        log.info(f"✅ CSV Faixa Etária salvo: {csv_faixa_path}")
     
     # CSV sexo
     if resultados['sexo']:
         df_sexo = pd.DataFrame(resultados['sexo'])
         csv_sexo_path = f"{output_dir}/g6_sexo.csv"
         df_sexo.to_csv(csv_sexo_path, index=False, encoding='utf-8-sig')
-        print(f"✅ CSV Sexo salvo: {csv_sexo_path}")
+        log.info(f"✅ CSV Sexo salvo: {csv_sexo_path}")
     
     return {
         'json': json_path,
@@ -246,42 +162,43 @@ def salvar_resultados(resultados, output_dir='./resultados'):
 
 
 if __name__ == "__main__":
-    arquivo = 'tic_educacao_2024_alunos_tabela_total_v1.0.xlsx'
+    parser = argparse.ArgumentParser(description='Análise G6 - Uso de IA generativa')
+    parser.add_argument('--db', default=DB_PADRAO, help=f'Banco de resultados (padrão: {DB_PADRAO})')
+    parser.add_argument('--arquivo', default=ARQUIVOS_PADRAO['alunos'],
+                        help=f"Workbook de alunos (padrão: {ARQUIVOS_PADRAO['alunos']}; o ano vem do nome)")
+    parser.add_argument('--exportar-arquivos', action='store_true',
+                        help='Também exporta JSON/CSV em ./resultados (visão opcional)')
+    parser.add_argument('--so-ia', action='store_true',
+                        help='Grava só as métricas de IA: o perfil dos demais recursos digitais '
+                             '(percentual_<recurso>) não é calculado nem gravado no banco/arquivos')
+    adicionar_argumento_perfil(parser, './resultados/perfil_g6.json')
+    adicionar_argumentos_log(parser)
+    args = parser.parse_args()
+    configurar_perfil(args)
+    configurar_log_args(args)
+    
+    arquivo = args.arquivo
     
     try:
         # Executar análise
-        resultados = analisar_g6_uso_ia(arquivo, aba_nome='G6')
-        
-        # SALVAR RESULTADOS (esta linha é ESSENCIAL!)
-        arquivos_gerados = salvar_resultados(resultados)
-        
-        print(f"\n{'='*80}")
-        print("✅ ANÁLISE G6 CONCLUÍDA!")
-        print(f"{'='*80}")
-        print(f"\n📊 Resultado principal:")
-        print(f"  • {resultados['brasil']['percentual']:.1f}% dos alunos USAM IA generativa")
+        resultados = analisar_g6_uso_ia(arquivo, aba_nome=ABAS_ANALISES['g6'][1], recursos=not args.so_ia)
         
-        if resultados['etapas']:
-            print(f"\n📚 Por etapa de ensino:")
-            for etapa in resultados['etapas']:
-                print(f"  • {etapa['etapa']}: {etapa['percentual']:.1f}%")
+        # SALVAR NO BANCO DE RESULTADOS
+        salvar_resultados_db(resultados, indicador='g6', ano=ano_do_arquivo(arquivo), db_path=args.db)
         
-        if resultados['faixa_etaria']:
-            print(f"\n📅 Por faixa etária:")
-            for faixa in resultados['faixa_etaria']:
-                print(f"  • {faixa['faixa_etaria']}: {faixa['percentual']:.1f}%")
+        # JSON/CSV (opcional)
+        arquivos_gerados = salvar_resultados(resultados) if args.exportar_arquivos else {}
         
-        if resultados['regioes']:
-            print(f"\n📍 Por região:")
-            for regiao in resultados['regioes']:
-                print(f"  • {regiao['regiao']}: {regiao['percentual']:.1f}%")
+        titulo(log, "✅ ANÁLISE G6 CONCLUÍDA!")
+        log.info(f"\n📊 Resultado principal:")
+        log.info(f"  • {resultados['brasil']['percentual']:.1f}% dos alunos USAM IA generativa")
         
-        print(f"\n📁 Arquivos gerados:")
+        log.info(f"\n📁 Arquivos gerados:")
+        log.info(f"  • banco: {args.db}")
         for tipo, caminho in arquivos_gerados.items():
             if caminho:
-                print(f"  • {tipo}: {caminho}")
+                log.info(f"  • {tipo}: {caminho}")
                 
     except Exception as e:
-        print(f"\n❌ ERRO: {e}")
-        import traceback
-        traceback.print_exc()
\ No newline at end of file
+        log.exception(f"\n❌ ERRO: {e}")
+        sys.exit(1)
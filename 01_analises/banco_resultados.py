@@ -0,0 +1,301 @@
+"""
+BANCO DE RESULTADOS - SQLITE
+TIC Educação 2024
+Armazena as saídas de todas as análises em um único banco local
+(tabela de fatos em formato longo, indexada por indicador, dimensão, grupo e ano)
+"""
+
+import json
+import sqlite3
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from tic.instrumentacao import adicionar_argumento_perfil, configurar_perfil, instrumentar, span
+from tic.log import adicionar_argumentos_log, configurar_log_args, obter_logger
+
+log = obter_logger('banco_resultados')
+
+DB_PADRAO = './resultados/resultados.sqlite'
+ANO_PADRAO = 2024
+
+# Listas de grupos nos resultados das análises:
+# chave no dict → (dimensão da tabela TIC, chave com o nome do grupo)
+DIMENSOES = {
+    'regioes': ('REGIÃO', 'regiao'),
+    'areas': ('ÁREA', 'area'),
+    'etapas': ('ETAPA DE ENSINO', 'etapa'),
+    'faixa_etaria': ('FAIXA ETÁRIA', 'faixa_etaria'),
+    'sexo': ('SEXO', 'sexo'),
+    'dependencias': ('DEPENDÊNCIA ADMINISTRATIVA', 'dependencia'),
+}
+
+# O bloco 'brasil' dos resultados vira a dimensão TOTAL
+DIMENSAO_TOTAL = 'TOTAL'
+GRUPO_BRASIL = 'Brasil'
+
+# Chaves de metadados dos resultados (colunas da tabela indicadores); as demais
+# chaves que não são 'brasil' nem DIMENSOES (ex.: 'blocos' da H4D, 'recursos'
+# da G6) vão como JSON na coluna indicadores.extras
+CHAVES_METADADOS = ('aba', 'indicador', 'fonte')
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS fatos (
+    indicador TEXT NOT NULL,
+    dimensao  TEXT NOT NULL,
+    grupo     TEXT NOT NULL,
+    ano       INTEGER NOT NULL,
+    metrica   TEXT NOT NULL,
+    valor     REAL,
+    inteiro   INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_fatos_chave ON fatos (indicador, dimensao, grupo, ano);
+
+CREATE TABLE IF NOT EXISTS indicadores (
+    indicador     TEXT NOT NULL,
+    ano           INTEGER NOT NULL,
+    aba           TEXT,
+    descricao     TEXT,
+    fonte         TEXT,
+    atualizado_em TEXT,
+    extras        TEXT,
+    PRIMARY KEY (indicador, ano)
+);
+"""
+
+
+def conectar(db_path=DB_PADRAO):
+    """
+    Abre (e cria, se necessário) o banco de resultados
+    """
+    Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+    con = sqlite3.connect(db_path)
+    con.execute('PRAGMA journal_mode=WAL')
+    con.execute('PRAGMA synchronous=NORMAL')
+    con.executescript(ESQUEMA)
+    # Bancos criados antes da coluna extras
+    if 'extras' not in {coluna[1] for coluna in con.execute('PRAGMA table_info(indicadores)')}:
+        con.execute('ALTER TABLE indicadores ADD COLUMN extras TEXT')
+    return con
+
+
+def achatar_resultados(resultados, indicador, ano=ANO_PADRAO):
+    """
+    Converte o dict de uma análise (brasil, regioes, areas, ...) em linhas
+    (indicador, dimensao, grupo, ano, metrica, valor, inteiro)
+
+    As demais chaves não viram fatos: veja extras_resultados
+    """
+    linhas = []
+
+    def adicionar(dimensao, grupo, registro, ignorar=None):
+        for metrica, valor in registro.items():
+            if metrica == ignorar:
+                continue
+            inteiro = isinstance(valor, int) and not isinstance(valor, bool)
+            linhas.append((indicador, dimensao, str(grupo), int(ano), metrica,
+                           None if valor is None else float(valor), int(inteiro)))
+
+    if resultados.get('brasil'):
+        adicionar(DIMENSAO_TOTAL, GRUPO_BRASIL, resultados['brasil'])
+
+    for chave, (dimensao, chave_nome) in DIMENSOES.items():
+        for registro in resultados.get(chave) or []:
+            adicionar(dimensao, registro[chave_nome], registro, ignorar=chave_nome)
+
+    return linhas
+
+
+def extras_resultados(resultados):
+    """
+    Chaves do dict de uma análise que não são metadados, 'brasil' nem
+    DIMENSOES (ex.: 'blocos', 'recursos'), gravadas como JSON em
+    indicadores.extras. Valores não serializáveis levantam TypeError.
+    """
+    conhecidas = {*CHAVES_METADADOS, 'brasil', *DIMENSOES}
+    extras = {chave: valor for chave, valor in resultados.items() if chave not in conhecidas}
+    json.dumps(extras, ensure_ascii=False)
+    return extras
+
+
+def salvar_resultados_db(resultados, indicador, ano=ANO_PADRAO, db_path=DB_PADRAO):
+    """
+    Grava os resultados de uma análise no banco, em uma única transação.
+    Resultados anteriores do mesmo indicador/ano são substituídos.
+    """
+    linhas = achatar_resultados(resultados, indicador, ano)
+    extras = extras_resultados(resultados)
+
+    con = conectar(db_path)
+    try:
+        with span('escrever_db', 'escrita', indicador=indicador, linhas=len(linhas)), con:
+            con.execute('DELETE FROM fatos WHERE indicador = ? AND ano = ?', (indicador, ano))
+            con.executemany('INSERT INTO fatos VALUES (?, ?, ?, ?, ?, ?, ?)', linhas)
+            con.execute(
+                'INSERT OR REPLACE INTO indicadores '
+                '(indicador, ano, aba, descricao, fonte, atualizado_em, extras) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (indicador, ano, resultados.get('aba'), resultados.get('indicador'),
+                 resultados.get('fonte'), datetime.now().isoformat(),
+                 json.dumps(extras, ensure_ascii=False) if extras else None)
+            )
+    finally:
+        con.close()
+
+    log.info(f"✅ {len(linhas)} fatos salvos no banco: {db_path} (indicador '{indicador}', {ano})")
+    return len(linhas)
+
+
+def remover_indicador(indicador, db_path=DB_PADRAO):
+    """
+    Remove os fatos e os metadados de um indicador em todos os anos (ex.:
+    antes de regravar um resultado derivado que pode ter menos anos).
+    Retorna o número de fatos removidos.
+    """
+    if not Path(db_path).exists():
+        return 0
+    con = conectar(db_path)
+    try:
+        with con:
+            removidos = con.execute('DELETE FROM fatos WHERE indicador = ?', (indicador,)).rowcount
+            con.execute('DELETE FROM indicadores WHERE indicador = ?', (indicador,))
+    finally:
+        con.close()
+    return removidos
+
+
+@instrumentar('ler_db', 'leitura')
+def carregar_resultados_db(indicador, ano=ANO_PADRAO, db_path=DB_PADRAO):
+    """
+    Reconstrói o dict de resultados de uma análise a partir do banco
+    (mesmo formato do antigo *_completo.json). Retorna None se não existir.
+    """
+    if not Path(db_path).exists():
+        return None
+
+    con = conectar(db_path)
+    try:
+        meta = con.execute(
+            'SELECT aba, descricao, fonte, extras FROM indicadores WHERE indicador = ? AND ano = ?',
+            (indicador, ano)
+        ).fetchone()
+        if meta is None:
+            return None
+
+        linhas = con.execute(
+            'SELECT dimensao, grupo, metrica, valor, inteiro FROM fatos '
+            'WHERE indicador = ? AND ano = ? ORDER BY rowid',
+            (indicador, ano)
+        ).fetchall()
+    finally:
+        con.close()
+
+    resultados = {'aba': meta[0], 'indicador': meta[1], 'fonte': meta[2]}
+    if meta[3]:
+        resultados.update(json.loads(meta[3]))
+    chaves_por_dimensao = {dim: (chave, nome) for chave, (dim, nome) in DIMENSOES.items()}
+    registros = {}
+    ignoradas = set()
+
+    for dimensao, grupo, metrica, valor, inteiro in linhas:
+        if valor is not None and inteiro:
+            valor = int(valor)
+
+        if dimensao == DIMENSAO_TOTAL:
+            resultados.setdefault('brasil', {})[metrica] = valor
+            continue
+
+        if dimensao not in chaves_por_dimensao:
+            ignoradas.add(dimensao)
+            continue
+        chave, chave_nome = chaves_por_dimensao[dimensao]
+        if (dimensao, grupo) not in registros:
+            registros[(dimensao, grupo)] = {chave_nome: grupo}
+            resultados.setdefault(chave, []).append(registros[(dimensao, grupo)])
+        registros[(dimensao, grupo)][metrica] = valor
+
+    if ignoradas:
+        log.warning(f"⚠️  {indicador} ({ano}): dimensão(ões) sem chave em DIMENSOES ignorada(s): "
+                    f"{', '.join(sorted(ignoradas))}")
+    return resultados
+
+
+@instrumentar('consultar_db', 'leitura')
+def consultar_fatos(indicador=None, dimensao=None, grupo=None, ano=None, metrica=None,
+                    db_path=DB_PADRAO):
+    """
+    Consulta ad-hoc à tabela de fatos (filtros opcionais, usando o índice)
+
+    Returns:
+        DataFrame com as colunas indicador, dimensao, grupo, ano, metrica, valor
+    """
+    filtros = {'indicador': indicador, 'dimensao': dimensao, 'grupo': grupo,
+               'ano': ano, 'metrica': metrica}
+    condicoes = [f"{coluna} = ?" for coluna, valor in filtros.items() if valor is not None]
+    parametros = [valor for valor in filtros.values() if valor is not None]
+
+    sql = 'SELECT indicador, dimensao, grupo, ano, metrica, valor FROM fatos'
+    if condicoes:
+        sql += ' WHERE ' + ' AND '.join(condicoes)
+    sql += ' ORDER BY rowid'
+
+    con = conectar(db_path)
+    try:
+        return pd.read_sql_query(sql, con, params=parametros)
+    finally:
+        con.close()
+
+
+def descricoes_indicadores(db_path=DB_PADRAO):
+    """
+    Descrição e fonte de cada indicador gravado (ano mais recente)
+
+    Returns:
+        dict indicador → {'descricao', 'fonte', 'aba'}
+    """
+    con = conectar(db_path)
+    try:
+        linhas = con.execute(
+            'SELECT indicador, descricao, fonte, aba FROM indicadores ORDER BY indicador, ano'
+        ).fetchall()
+    finally:
+        con.close()
+    return {indicador: {'descricao': descricao, 'fonte': fonte, 'aba': aba}
+            for indicador, descricao, fonte, aba in linhas}
+
+
+def exportar_json(indicador, caminho, ano=ANO_PADRAO, db_path=DB_PADRAO):
+    """
+    Exporta um indicador do banco como JSON (visão opcional, formato antigo)
+    """
+    resultados = carregar_resultados_db(indicador, ano, db_path)
+    if resultados is None:
+        raise ValueError(f"Indicador '{indicador}' ({ano}) não encontrado em {db_path}")
+
+    with open(caminho, 'w', encoding='utf-8') as f:
+        json.dump(resultados, f, ensure_ascii=False, indent=2)
+    return caminho
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Consulta o banco de resultados das análises')
+    parser.add_argument('--db', default=DB_PADRAO, help=f'Banco SQLite (padrão: {DB_PADRAO})')
+    parser.add_argument('--indicador', help='Ex.: a3, a8, b4a, g6, h4d, prontidao')
+    parser.add_argument('--dimensao', help='Ex.: TOTAL, REGIÃO, ÁREA, ETAPA DE ENSINO')
+    parser.add_argument('--grupo', help='Ex.: Norte, Rural')
+    parser.add_argument('--ano', type=int)
+    parser.add_argument('--metrica')
+    adicionar_argumento_perfil(parser, './resultados/perfil_banco.json')
+    adicionar_argumentos_log(parser)
+    args = parser.parse_args()
+    configurar_perfil(args)
+    configurar_log_args(args)
+
+    df = consultar_fatos(args.indicador, args.dimensao, args.grupo, args.ano, args.metrica,
+                         db_path=args.db)
+    print(df.to_string(index=False) if len(df) else "⚠️  Nenhum fato encontrado")
@@ -4,11 +4,25 @@ TIC Educação 2024 - Análise Completa
 Reúne A8, A3, G6 e H4D em um relatório final
 """
 
+import argparse
+import sys
 import pandas as pd
 import json
 from pathlib import Path
 from datetime import datetime
 
+from banco_resultados import (carregar_resultados_db, salvar_resultados_db, achatar_resultados,
+                              DB_PADRAO)
+from consulta_indicadores import CacheIndicadores, resultados_indicador
+from cubo_indicadores import METRICA_ORIENTACAO, construir_cubo
+from cruzamento_indicadores import cruzar_indicadores, resumir_cruzamento, salvar_cruzamento
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from tic.instrumentacao import adicionar_argumento_perfil, configurar_perfil, instrumentar
+from tic.log import adicionar_argumentos_log, configurar_log_args, linha, obter_logger, titulo
+
+log = obter_logger('consolidador')
+
 
 def carregar_resultado(arquivo_json):
     """
@@ -18,10 +32,26 @@ def carregar_resultado(arquivo_json):
         with open(arquivo_json, 'r', encoding='utf-8') as f:
             return json.load(f)
     except FileNotFoundError:
-        print(f"⚠️  Arquivo não encontrado: {arquivo_json}")
+        log.warning(f"⚠️  Arquivo não encontrado: {arquivo_json}")
         return None
 
 
+@instrumentar(categoria='leitura')
+def carregar_analise(indicador, arquivo_json, db_path=DB_PADRAO):
+    """
+    Carrega o resultado de uma análise do banco de resultados
+    (com fallback para o cálculo memoizado a partir do workbook e, por fim,
+    para o JSON exportado)
+    """
+    resultado = carregar_resultados_db(indicador, db_path=db_path)
+    if resultado is not None:
+        return resultado
+    if CacheIndicadores.arquivo(indicador).exists():
+        log.info(f"ℹ️  {indicador.upper()} fora do banco: calculando a partir do workbook")
+        return resultados_indicador(indicador)
+    return carregar_resultado(arquivo_json)
+
+
 def calcular_indice_infraestrutura(a8_data, a3_data, b4a_data):
     """
     Calcula índice de infraestrutura combinando acesso, velocidade e proporção
@@ -29,9 +59,7 @@ def calcular_indice_infraestrutura(a8_data, a3_data, b4a_data):
     if not a8_data or not a3_data or not b4a_data:
         return None
     
-    print("\n" + "="*80)
-    print("PILAR 1: INFRAESTRUTURA TECNOLÓGICA")
-    print("="*80 + "\n")
+    titulo(log, "PILAR 1: INFRAESTRUTURA TECNOLÓGICA")
     
     pct_acesso = a8_data['brasil']['pct_com_acesso']
     pct_velocidade = a3_data['brasil']['pct_adequada']
@@ -40,12 +68,12 @@ def calcular_indice_infraestrutura(a8_data, a3_data, b4a_data):
     # Índice multiplicativo (todos três precisam estar presentes)
     indice_infra = (pct_acesso / 100) * (pct_velocidade / 100) * (pct_proporcao / 100) * 100
     
-    print(f"📊 Componentes da Infraestrutura:")
-    print(f"  • Acesso (PC+Internet): {pct_acesso:.1f}%")
-    print(f"  • Velocidade Adequada (≥51 Mbps): {pct_velocidade:.1f}%")
-    print(f"  • Proporção Adequada (≤20 alunos/PC): {pct_proporcao:.1f}%")
-    print(f"\n🎯 ÍNDICE DE INFRAESTRUTURA: {indice_infra:.1f}%")
-    print(f"   (Escolas com TODOS os 3 requisitos)")
+    log.info(f"📊 Componentes da Infraestrutura:")
+    log.info(f"  • Acesso (PC+Internet): {pct_acesso:.1f}%")
+    log.info(f"  • Velocidade Adequada (≥51 Mbps): {pct_velocidade:.1f}%")
+    log.info(f"  • Proporção Adequada (≤20 alunos/PC): {pct_proporcao:.1f}%")
+    log.info(f"\n🎯 ÍNDICE DE INFRAESTRUTURA: {indice_infra:.1f}%")
+    log.info(f"   (Escolas com TODOS os 3 requisitos)")
     
     return {
         'pct_acesso': pct_acesso,
@@ -58,23 +86,34 @@ def calcular_indice_infraestrutura(a8_data, a3_data, b4a_data):
 def calcular_indice_orientacao(h4d_data):
     """
     Analisa o pilar de orientação pedagógica sobre IA
+
+    O índice é o composto dos blocos da H4D (como usar, uso ético, riscos...);
+    resultados antigos, só com o primeiro bloco, usam o percentual dele
     """
     if not h4d_data:
         return None
     
-    print("\n" + "="*80)
-    print("PILAR 2: ORIENTAÇÃO PEDAGÓGICA SOBRE IA")
-    print("="*80 + "\n")
+    titulo(log, "PILAR 2: ORIENTAÇÃO PEDAGÓGICA SOBRE IA")
     
-    pct_orientacao = h4d_data['brasil']['percentual']
+    brasil = h4d_data['brasil']
+    pct_orientacao = brasil['percentual']
+    indice = brasil.get(METRICA_ORIENTACAO, pct_orientacao)
+    blocos = {metrica[len('percentual_'):]: valor for metrica, valor in brasil.items()
+              if metrica.startswith('percentual_') and metrica != METRICA_ORIENTACAO}
+    # Rótulos das questões, quando o banco guarda a lista de blocos da análise
+    rotulos = {b['metrica'][len('percentual_'):]: b['questao'] for b in h4d_data.get('blocos') or []}
     
-    print(f"👨‍🏫 Orientação dos professores:")
-    print(f"  • Alunos que receberam orientação sobre IA: {pct_orientacao:.1f}%")
-    print(f"\n🎯 ÍNDICE DE ORIENTAÇÃO: {pct_orientacao:.1f}%")
+    log.info(f"👨‍🏫 Orientação dos professores:")
+    log.info(f"  • Alunos que receberam orientação sobre IA: {pct_orientacao:.1f}%")
+    for bloco, valor in blocos.items():
+        log.info(f"  • {rotulos.get(bloco) or bloco}: {valor:.1f}%")
+    log.info(f"\n🎯 ÍNDICE DE ORIENTAÇÃO: {indice:.1f}%"
+             + (f" (média de {len(blocos)} blocos)" if blocos else ""))
     
     return {
         'pct_orientacao': pct_orientacao,
-        'indice': pct_orientacao
+        'blocos': blocos,
+        'indice': indice
     }
 
 
@@ -85,15 +124,13 @@ def calcular_indice_uso(g6_data):
     if not g6_data:
         return None
     
-    print("\n" + "="*80)
-    print("PILAR 3: USO REAL DE IA")
-    print("="*80 + "\n")
+    titulo(log, "PILAR 3: USO REAL DE IA")
     
     pct_uso = g6_data['brasil']['percentual']
     
-    print(f"🤖 Uso de IA Generativa:")
-    print(f"  • Alunos que usam IA: {pct_uso:.1f}%")
-    print(f"\n🎯 ÍNDICE DE USO: {pct_uso:.1f}%")
+    log.info(f"🤖 Uso de IA Generativa:")
+    log.info(f"  • Alunos que usam IA: {pct_uso:.1f}%")
+    log.info(f"\n🎯 ÍNDICE DE USO: {pct_uso:.1f}%")
     
     return {
         'pct_uso': pct_uso,
@@ -105,23 +142,21 @@ def calcular_triplo_deficit(infra, orientacao, uso):
     """
     Calcula o Triplo Déficit Tecnológico
     """
-    print("\n" + "="*80)
-    print("CÁLCULO DO TRIPLO DÉFICIT TECNOLÓGICO")
-    print("="*80 + "\n")
+    titulo(log, "CÁLCULO DO TRIPLO DÉFICIT TECNOLÓGICO")
     
     if not all([infra, orientacao, uso]):
-        print("⚠️  Dados incompletos para calcular o Triplo Déficit")
+        log.warning("⚠️  Dados incompletos para calcular o Triplo Déficit")
         return None
     
     # Índice de Prontidão = média dos 3 pilares
     indice_prontidao = (infra['indice'] + orientacao['indice'] + uso['indice']) / 3
     
-    print(f"📊 RESUMO DOS 3 PILARES:")
-    print(f"  1️⃣ Infraestrutura: {infra['indice']:.1f}%")
-    print(f"  2️⃣ Orientação Pedagógica: {orientacao['indice']:.1f}%")
-    print(f"  3️⃣ Uso Real: {uso['indice']:.1f}%")
-    print(f"\n🎯 ÍNDICE DE PRONTIDÃO PARA IA: {indice_prontidao:.1f}%")
-    print(f"   (Média dos 3 pilares)")
+    log.info(f"📊 RESUMO DOS 3 PILARES:")
+    log.info(f"  1️⃣ Infraestrutura: {infra['indice']:.1f}%")
+    log.info(f"  2️⃣ Orientação Pedagógica: {orientacao['indice']:.1f}%")
+    log.info(f"  3️⃣ Uso Real: {uso['indice']:.1f}%")
+    log.info(f"\n🎯 ÍNDICE DE PRONTIDÃO PARA IA: {indice_prontidao:.1f}%")
+    log.info(f"   (Média dos 3 pilares)")
     
     # Calcular déficits (quanto falta para 100%)
     deficit_infra = 100 - infra['indice']
@@ -129,11 +164,11 @@ def calcular_triplo_deficit(infra, orientacao, uso):
     deficit_uso = 100 - uso['indice']
     deficit_total = 100 - indice_prontidao
     
-    print(f"\n⚠️  DÉFICITS IDENTIFICADOS:")
-    print(f"  • Déficit de Infraestrutura: {deficit_infra:.1f} pontos")
-    print(f"  • Déficit de Orientação: {deficit_orientacao:.1f} pontos")
-    print(f"  • Déficit de Uso: {deficit_uso:.1f} pontos")
-    print(f"  • DÉFICIT TOTAL: {deficit_total:.1f} pontos")
+    log.info(f"\n⚠️  DÉFICITS IDENTIFICADOS:")
+    log.info(f"  • Déficit de Infraestrutura: {deficit_infra:.1f} pontos")
+    log.info(f"  • Déficit de Orientação: {deficit_orientacao:.1f} pontos")
+    log.info(f"  • Déficit de Uso: {deficit_uso:.1f} pontos")
+    log.info(f"  • DÉFICIT TOTAL: {deficit_total:.1f} pontos")
     
     return {
         'indice_prontidao': indice_prontidao,
@@ -148,9 +183,7 @@ def analisar_paradoxos(infra, orientacao, uso):
     """
     Identifica paradoxos entre os pilares
     """
-    print("\n" + "="*80)
-    print("ANÁLISE DE PARADOXOS")
-    print("="*80 + "\n")
+    titulo(log, "ANÁLISE DE PARADOXOS")
     
     if not all([infra, orientacao, uso]):
         return None
@@ -160,11 +193,11 @@ def analisar_paradoxos(infra, orientacao, uso):
     # Paradoxo 1: Uso maior que Infraestrutura
     gap_uso_infra = uso['indice'] - infra['indice']
     if gap_uso_infra > 0:
-        print(f"🚨 PARADOXO 1: USO > INFRAESTRUTURA")
-        print(f"   • {uso['indice']:.1f}% dos alunos USAM IA")
-        print(f"   • {infra['indice']:.1f}% das escolas têm infraestrutura adequada")
-        print(f"   • GAP: +{gap_uso_infra:.1f} pontos")
-        print(f"   → Alunos estão usando IA FORA da escola (celular, casa)")
+        log.info(f"🚨 PARADOXO 1: USO > INFRAESTRUTURA")
+        log.info(f"   • {uso['indice']:.1f}% dos alunos USAM IA")
+        log.info(f"   • {infra['indice']:.1f}% das escolas têm infraestrutura adequada")
+        log.info(f"   • GAP: +{gap_uso_infra:.1f} pontos")
+        log.info(f"   → Alunos estão usando IA FORA da escola (celular, casa)")
         paradoxos.append({
             'tipo': 'Uso > Infraestrutura',
             'gap': gap_uso_infra,
@@ -174,11 +207,11 @@ def analisar_paradoxos(infra, orientacao, uso):
     # Paradoxo 2: Uso maior que Orientação
     gap_uso_orientacao = uso['indice'] - orientacao['indice']
     if gap_uso_orientacao > 0:
-        print(f"\n🚨 PARADOXO 2: USO > ORIENTAÇÃO")
-        print(f"   • {uso['indice']:.1f}% dos alunos USAM IA")
-        print(f"   • {orientacao['indice']:.1f}% receberam orientação pedagógica")
-        print(f"   • GAP: +{gap_uso_orientacao:.1f} pontos")
-        print(f"   → Alunos estão aprendendo sozinhos, sem orientação pedagógica")
+        log.info(f"\n🚨 PARADOXO 2: USO > ORIENTAÇÃO")
+        log.info(f"   • {uso['indice']:.1f}% dos alunos USAM IA")
+        log.info(f"   • {orientacao['indice']:.1f}% receberam orientação pedagógica")
+        log.info(f"   • GAP: +{gap_uso_orientacao:.1f} pontos")
+        log.info(f"   → Alunos estão aprendendo sozinhos, sem orientação pedagógica")
         paradoxos.append({
             'tipo': 'Uso > Orientação',
             'gap': gap_uso_orientacao,
@@ -188,11 +221,11 @@ def analisar_paradoxos(infra, orientacao, uso):
     # Paradoxo 3: Orientação maior que Infraestrutura
     gap_orientacao_infra = orientacao['indice'] - infra['indice']
     if gap_orientacao_infra > 0:
-        print(f"\n🚨 PARADOXO 3: ORIENTAÇÃO > INFRAESTRUTURA")
-        print(f"   • {orientacao['indice']:.1f}% receberam orientação")
-        print(f"   • {infra['indice']:.1f}% das escolas têm infraestrutura")
-        print(f"   • GAP: +{gap_orientacao_infra:.1f} pontos")
-        print(f"   → Orientação sem condições de praticar na escola")
+        log.info(f"\n🚨 PARADOXO 3: ORIENTAÇÃO > INFRAESTRUTURA")
+        log.info(f"   • {orientacao['indice']:.1f}% receberam orientação")
+        log.info(f"   • {infra['indice']:.1f}% das escolas têm infraestrutura")
+        log.info(f"   • GAP: +{gap_orientacao_infra:.1f} pontos")
+        log.info(f"   → Orientação sem condições de praticar na escola")
         paradoxos.append({
             'tipo': 'Orientação > Infraestrutura',
             'gap': gap_orientacao_infra,
@@ -200,7 +233,7 @@ def analisar_paradoxos(infra, orientacao, uso):
         })
     
     if not paradoxos:
-        print("✅ Nenhum paradoxo significativo identificado")
+        log.info("✅ Nenhum paradoxo significativo identificado")
     
     return paradoxos
 
@@ -209,60 +242,71 @@ def criar_comparacao_regional(resultados_dict):
     """
     Cria tabela comparativa por região
     """
-    print("\n" + "="*80)
-    print("COMPARAÇÃO REGIONAL")
-    print("="*80 + "\n")
+    titulo(log, "COMPARAÇÃO REGIONAL")
     
-    if not all([resultados_dict.get('a8'), resultados_dict.get('a3'), 
+    if not all([resultados_dict.get('a8'), resultados_dict.get('a3'), resultados_dict.get('b4a'),
                 resultados_dict.get('g6'), resultados_dict.get('h4d')]):
-        print("⚠️  Dados regionais incompletos")
+        log.warning("⚠️  Dados regionais incompletos")
         return None
     
-    # Pegar dados regionais de cada análise
-    regioes_a8 = {r['regiao']: r['percentual'] for r in resultados_dict['a8']['regioes']}
-    regioes_a3 = {r['regiao']: r['percentual_adequada'] for r in resultados_dict['a3']['regioes']}
-    regioes_g6 = {r['regiao']: r['percentual'] for r in resultados_dict['g6']['regioes']}
-    regioes_h4d = {r['regiao']: r['percentual'] for r in resultados_dict['h4d']['regioes']}
+    # Métrica regional usada de cada análise
+    metricas = {'a8': 'percentual', 'a3': 'percentual_adequada', 'b4a': 'percentual_adequada',
+                'g6': 'percentual',
+                'h4d': METRICA_ORIENTACAO if METRICA_ORIENTACAO in resultados_dict['h4d']['brasil']
+                else 'percentual'}
+    
+    # Fatos longos de todas as análises → filtro (REGIÃO) → pivot região × indicador
+    colunas = ['indicador', 'dimensao', 'grupo', 'ano', 'metrica', 'valor', 'inteiro']
+    fatos = pd.DataFrame(
+        [linha for indicador in metricas
+         for linha in achatar_resultados(resultados_dict[indicador], indicador)],
+        columns=colunas
+    )
+    fatos = fatos[(fatos['dimensao'] == 'REGIÃO') &
+                  (fatos['metrica'] == fatos['indicador'].map(metricas))]
     
-    comparacao = []
+    regional = fatos.pivot_table(index='grupo', columns='indicador', values='valor',
+                                 aggfunc='first', sort=False)
+    regional = regional.reindex(columns=list(metricas))
+    regional = regional[regional['a8'].notna()].fillna(0)  # regiões da A8, como referência
     
-    for regiao in regioes_a8.keys():
-        acesso = regioes_a8.get(regiao, 0)
-        velocidade = regioes_a3.get(regiao, 0)
-        uso = regioes_g6.get(regiao, 0)
-        orientacao = regioes_h4d.get(regiao, 0)
-        
-        # Índice de infraestrutura regional
-        infra_reg = (acesso / 100) * (velocidade / 100) * 100
-        
-        # Índice de prontidão regional
-        prontidao_reg = (infra_reg + orientacao + uso) / 3
-        
-        comparacao.append({
-            'Região': regiao,
-            'Infraestrutura (%)': round(infra_reg, 1),
-            'Orientação (%)': round(orientacao, 1),
-            'Uso (%)': round(uso, 1),
-            'Prontidão (%)': round(prontidao_reg, 1),
-            'Déficit': round(100 - prontidao_reg, 1)
-        })
+    # Índice de infraestrutura regional (mesma fórmula do índice Brasil)
+    infra_reg = (regional['a8'] / 100) * (regional['a3'] / 100) * (regional['b4a'] / 100) * 100
+    
+    # Índice de prontidão regional
+    prontidao_reg = (infra_reg + regional['h4d'] + regional['g6']) / 3
+    
+    comparacao = pd.DataFrame({
+        'Região': regional.index,
+        'Infraestrutura (%)': infra_reg.round(1).to_numpy(),
+        'Orientação (%)': regional['h4d'].round(1).to_numpy(),
+        'Uso (%)': regional['g6'].round(1).to_numpy(),
+        'Prontidão (%)': prontidao_reg.round(1).to_numpy(),
+        'Déficit': (100 - prontidao_reg).round(1).to_numpy()
+    })
     
     df_comp = pd.DataFrame(comparacao).sort_values('Prontidão (%)', ascending=False)
     
-    print(df_comp.to_string(index=False))
+    for registro in df_comp.to_dict('records'):
+        log.debug(f"  {registro['Região']}: prontidão {registro['Prontidão (%)']:.1f}% "
+                  f"(déficit {registro['Déficit']:.1f})",
+                  extra=linha("Consolidação - comparação regional", **registro))
     
     return df_comp
 
 
-def gerar_relatorio_final(resultados_dict, output_dir='./resultados'):
+@instrumentar(categoria='agregacao')
+def gerar_relatorio_final(resultados_dict, output_dir='./resultados', db_path=DB_PADRAO,
+                          exportar_arquivos=False):
     """
     Gera relatório consolidado completo
+    
+    Os índices (Brasil e por região) são gravados no banco de resultados como
+    indicador 'prontidao'; JSON/CSV são exportados só se exportar_arquivos=True
     """
     Path(output_dir).mkdir(exist_ok=True)
     
-    print("\n" + "="*80)
-    print("GERANDO RELATÓRIO CONSOLIDADO")
-    print("="*80 + "\n")
+    titulo(log, "GERANDO RELATÓRIO CONSOLIDADO")
     
     # Calcular índices
     infra = calcular_indice_infraestrutura(
@@ -301,11 +345,45 @@ def gerar_relatorio_final(resultados_dict, output_dir='./resultados'):
         'dados_brutos': resultados_dict
     }
     
+    # Salvar índices no banco de resultados
+    brasil = {}
+    if infra:
+        brasil['infraestrutura'] = infra['indice']
+    if orientacao:
+        brasil['orientacao'] = orientacao['indice']
+    if uso:
+        brasil['uso'] = uso['indice']
+    if triplo_deficit:
+        brasil['prontidao'] = triplo_deficit['indice_prontidao']
+        brasil.update({k: v for k, v in triplo_deficit.items() if k.startswith('deficit_')})
+    
+    regioes = []
+    if comp_regional is not None:
+        regioes = comp_regional.rename(columns={
+            'Região': 'regiao',
+            'Infraestrutura (%)': 'infraestrutura',
+            'Orientação (%)': 'orientacao',
+            'Uso (%)': 'uso',
+            'Prontidão (%)': 'prontidao',
+            'Déficit': 'deficit'
+        }).to_dict('records')
+    
+    salvar_resultados_db({
+        'aba': None,
+        'indicador': 'Índice de Prontidão para IA (Triplo Déficit)',
+        'fonte': 'TIC Educação 2024 - Calculado',
+        'brasil': brasil,
+        'regioes': regioes
+    }, indicador='prontidao', db_path=db_path)
+    
+    if not exportar_arquivos:
+        return relatorio
+    
     # Salvar JSON completo
     json_path = f"{output_dir}/relatorio_triplo_deficit_completo.json"
     with open(json_path, 'w', encoding='utf-8') as f:
         json.dump(relatorio, f, ensure_ascii=False, indent=2)
-    print(f"\n✅ Relatório JSON salvo: {json_path}")
+    log.info(f"\n✅ Relatório JSON salvo: {json_path}")
     
     # Resumo executivo em CSV
     resumo_data = []
@@ -321,7 +399,7 @@ def gerar_relatorio_final(resultados_dict, output_dir='./resultados'):
     if orientacao:
         resumo_data.append({
             'Pilar': '2. Orientação',
-            'Indicador': 'Orientação pedagógica sobre IA',
+            'Indicador': 'Orientação pedagógica sobre IA (média dos blocos H4D)',
             'Percentual': f"{orientacao['indice']:.1f}%",
             'Fonte': 'H4D'
         })
@@ -352,13 +430,13 @@ def gerar_relatorio_final(resultados_dict, output_dir='./resultados'):
         df_resumo = pd.DataFrame(resumo_data)
         csv_path = f"{output_dir}/resumo_executivo.csv"
         df_resumo.to_csv(csv_path, index=False, encoding='utf-8-sig')
-        print(f"✅ Resumo executivo salvo: {csv_path}")
+        log.info(f"✅ Resumo executivo salvo: {csv_path}")
     
     # Salvar comparação regional
     if comp_regional is not None:
         csv_regional_path = f"{output_dir}/comparacao_regional.csv"
         comp_regional.to_csv(csv_regional_path, index=False, encoding='utf-8-sig')
-        print(f"✅ Comparação regional salva: {csv_regional_path}")
+        log.info(f"✅ Comparação regional salva: {csv_regional_path}")
     
     return relatorio
 
@@ -367,75 +445,92 @@ def main():
     """
     Função principal do consolidador
     """
-    print("\n" + "="*80)
-    print("CONSOLIDADOR - TRIPLO DÉFICIT TECNOLÓGICO")
-    print("TIC Educação 2024")
-    print("="*80)
+    parser = argparse.ArgumentParser(description='Consolidador - Triplo Déficit Tecnológico')
+    parser.add_argument('--db', default=DB_PADRAO, help=f'Banco de resultados (padrão: {DB_PADRAO})')
+    parser.add_argument('--exportar-arquivos', action='store_true',
+                        help='Também exporta o relatório em JSON/CSV (visão opcional)')
+    adicionar_argumento_perfil(parser, './resultados/perfil_consolidador.json')
+    adicionar_argumentos_log(parser)
+    args = parser.parse_args()
+    configurar_perfil(args)
+    configurar_log_args(args)
+    
+    titulo(log, "CONSOLIDADOR - TRIPLO DÉFICIT TECNOLÓGICO\nTIC Educação 2024")
     
     resultados_dir = './resultados'
     
-    # Carregar resultados
+    # Carregar resultados (banco de resultados, com fallback para os JSONs)
     resultados = {}
     
     # A8 - Acesso
-    a8_data = carregar_resultado(f'{resultados_dir}/a8_acesso_completo.json')
+    a8_data = carregar_analise('a8', f'{resultados_dir}/a8_acesso_completo.json', args.db)
     if a8_data:
         resultados['a8'] = a8_data
-        print(f"✅ A8 carregado (Acesso)")
+        log.info(f"✅ A8 carregado (Acesso)")
     
     # A3 - Velocidade
-    a3_data = carregar_resultado(f'{resultados_dir}/a3_velocidade_completo.json')
+    a3_data = carregar_analise('a3', f'{resultados_dir}/a3_velocidade_completo.json', args.db)
     if a3_data:
         resultados['a3'] = a3_data
-        print(f"✅ A3 carregado (Velocidade)")
+        log.info(f"✅ A3 carregado (Velocidade)")
 
     # B4A - Proporção (ADICIONE ESTAS LINHAS)
-    b4a_data = carregar_resultado(f'{resultados_dir}/b4a_proporcao_completo.json')
+    b4a_data = carregar_analise('b4a', f'{resultados_dir}/b4a_proporcao_completo.json', args.db)
     if b4a_data:
         resultados['b4a'] = b4a_data
-        print(f"✅ B4A carregado (Proporção)")
+        log.info(f"✅ B4A carregado (Proporção)")
     
     # G6 - Uso de IA
-    g6_data = carregar_resultado(f'{resultados_dir}/g6_uso_ia_completo.json')
+    g6_data = carregar_analise('g6', f'{resultados_dir}/g6_uso_ia_completo.json', args.db)
     if g6_data:
         resultados['g6'] = g6_data
-        print(f"✅ G6 carregado (Uso de IA)")
+        log.info(f"✅ G6 carregado (Uso de IA)")
     
     # H4D - Orientação
-    h4d_data = carregar_resultado(f'{resultados_dir}/h4d_orientacao_ia_completo.json')
+    h4d_data = carregar_analise('h4d', f'{resultados_dir}/h4d_orientacao_ia_completo.json', args.db)
     if h4d_data:
         resultados['h4d'] = h4d_data
-        print(f"✅ H4D carregado (Orientação)")
+        log.info(f"✅ H4D carregado (Orientação)")
     
     # Gerar relatório final
     if len(resultados) >= 5:
-        relatorio = gerar_relatorio_final(resultados)
+        relatorio = gerar_relatorio_final(resultados, db_path=args.db,
+                                          exportar_arquivos=args.exportar_arquivos)
+        
+        # Cruzamento alunos × escolas em todos os recortes comuns (gaps no banco)
+        cruzamento = cruzar_indicadores(db_path=args.db)
+        salvar_cruzamento(cruzamento, args.db)
+        resumir_cruzamento(cruzamento)
+        
+        # Cubo de agregados (todas as medidas × recortes, para consultas O(1))
+        construir_cubo(args.db)
         
-        print("\n" + "="*80)
-        print("✅ CONSOLIDAÇÃO CONCLUÍDA!")
-        print("="*80)
-        print(f"\n📊 Total de análises: {len(resultados)}")
-        print(f"📁 Arquivos gerados em: {resultados_dir}/")
+        titulo(log, "✅ CONSOLIDAÇÃO CONCLUÍDA!")
+        log.info(f"\n📊 Total de análises: {len(resultados)}")
+        log.info(f"🗄️  Banco de resultados: {args.db}")
+        if args.exportar_arquivos:
+            log.info(f"📁 Arquivos gerados em: {resultados_dir}/")
         
         # Mostrar principais achados se disponíveis
         if relatorio.get('triplo_deficit'):
-            print(f"\n🎯 ÍNDICE DE PRONTIDÃO: {relatorio['triplo_deficit']['indice_prontidao']:.1f}%")
-            print(f"⚠️  DÉFICIT TOTAL: {relatorio['triplo_deficit']['deficit_total']:.1f} pontos")
+            log.info(f"\n🎯 ÍNDICE DE PRONTIDÃO: {relatorio['triplo_deficit']['indice_prontidao']:.1f}%")
+            log.info(f"⚠️  DÉFICIT TOTAL: {relatorio['triplo_deficit']['deficit_total']:.1f} pontos")
         
         if relatorio.get('paradoxos'):
-            print(f"\n🚨 PARADOXOS IDENTIFICADOS: {len(relatorio['paradoxos'])}")
+            log.info(f"\n🚨 PARADOXOS IDENTIFICADOS: {len(relatorio['paradoxos'])}")
             for p in relatorio['paradoxos']:
-                print(f"   • {p['tipo']}: GAP de {p['gap']:.1f} pontos")
+                log.info(f"   • {p['tipo']}: GAP de {p['gap']:.1f} pontos")
         
     else:
-        print("\n⚠️  Análises incompletas.")
-        print(f"   Encontradas: {len(resultados)}/4")
-        print(f"   Necessárias: A8, A3, G6, H4D")
-        print("\nExecute os scripts de análise primeiro:")
-        print("  • python analise_a8_acesso_FINAL.py")
-        print("  • python analise_a3_velocidade_FINAL.py")
-        print("  • python analise_g6_uso_ia_FINAL.py")
-        print("  • python analise_h4d_orientacao_ia_FINAL.py")
+        log.warning("\n⚠️  Análises incompletas.")
+        log.warning(f"   Encontradas: {len(resultados)}/4")
+        log.warning(f"   Necessárias: A8, A3, G6, H4D")
+        log.warning("\nExecute os scripts de análise primeiro:")
+        log.warning("  • python analise_a8_acesso_FINAL.py")
+        log.warning("  • python analise_a3_velocidade_FINAL.py")
+        log.warning("  • python analise_g6_uso_ia_FINAL.py")
+        log.warning("  • python analise_h4d_orientacao_ia_FINAL.py")
+        sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,246 @@
+"""
+CONSULTA DE INDICADORES EM PROCESSO (MEMOIZADA)
+TIC Educação 2024
+
+consultar('a3', 'ÁREA', 'Rural') → linhas do indicador direto dos workbooks,
+sem rodar o script de análise nem passar pelo banco. Dois caches LRU limitados:
+- abas parseadas: tic/fatos.py (ativar_cache_abas)
+- indicadores calculados: aqui, por indicador, workbook e versão (mtime, tamanho)
+
+Chamadas repetidas (notebooks, laços, consolidador, servidor) custam um
+filtro sobre algumas dezenas de linhas; um workbook regravado é relido.
+
+Uso:
+    from consulta_indicadores import consultar
+    consultar('a3', dimensao='ÁREA', grupo='Rural', metrica='percentual_adequada')
+
+    python consulta_indicadores.py a3 --dimensao ÁREA --grupo Rural
+"""
+
+import importlib
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from pathlib import Path
+
+import pandas as pd
+
+from banco_resultados import ANO_PADRAO, achatar_resultados
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from tic.cli import ABAS_ANALISES, ARQUIVOS_PADRAO
+from tic.fatos import assinatura_arquivo, ativar_cache_abas, estatisticas_cache_abas
+from tic.instrumentacao import instrumentar
+from tic.log import obter_logger
+
+ARQUIVO_ESCOLAS = ARQUIVOS_PADRAO['escolas']
+ARQUIVO_ALUNOS = ARQUIVOS_PADRAO['alunos']
+
+# Indicador → (módulo, função de análise)
+FUNCOES_ANALISE = {
+    'a3': ('analise_a3_velocidade', 'analisar_a3_velocidade'),
+    'a8': ('analise_a8_acesso', 'analisar_a8'),
+    'b4a': ('analise_b4a_proporcao', 'analisar_b4a_proporcao'),
+    'g6': ('analise_g6_uso_ia', 'analisar_g6_uso_ia'),
+    'h4d': ('analise_h4d_orientacao_ia', 'analisar_h4d_orientacao_ia'),
+}
+
+# Indicador → (módulo, função de análise, workbook, aba); workbook e aba vêm de
+# tic.cli (ARQUIVOS_PADRAO, ABAS_ANALISES), os mesmos dos scripts e do vigia
+INDICADORES = {indicador: (*FUNCOES_ANALISE[indicador], ARQUIVOS_PADRAO[tipo], aba)
+               for indicador, (tipo, aba) in ABAS_ANALISES.items()}
+
+MAXIMO_ABAS = 64
+MAXIMO_INDICADORES = 32
+COLUNAS = ['indicador', 'dimensao', 'grupo', 'ano', 'metrica', 'valor']
+
+log = obter_logger('consulta_indicadores')
+
+
+# ============================================================================
+# CACHE DE INDICADORES
+# ============================================================================
+
+def linhas_indicador(resultados, indicador, ano=ANO_PADRAO):
+    """Dict de uma análise → linhas (dimensao, grupo, ano, metrica, valor)"""
+    return [{'dimensao': dimensao, 'grupo': grupo, 'ano': ano, 'metrica': metrica,
+             'valor': int(valor) if inteiro and valor is not None else valor}
+            for _, dimensao, grupo, ano, metrica, valor, inteiro
+            in achatar_resultados(resultados, indicador, ano)]
+
+
+class CacheIndicadores:
+    """
+    LRU (indicador, workbook, assinatura) → resultados da análise e linhas.
+    Liga o cache de abas de tic/fatos.py, se ainda estiver desligado.
+
+    A trava só protege o dicionário: o cálculo roda fora dela, então acertos
+    e outros indicadores não esperam. Quem pede uma chave em cálculo espera
+    o Future dela.
+    """
+
+    def __init__(self, maximo=MAXIMO_INDICADORES, maximo_abas=MAXIMO_ABAS):
+        self.maximo = maximo
+        self._itens = OrderedDict()
+        self._calculando = {}   # chave → Future do cálculo em andamento
+        self._trava = threading.RLock()
+        self.estatisticas = {'acertos': 0, 'faltas': 0}
+        if not estatisticas_cache_abas()['maximo']:
+            ativar_cache_abas(maximo_abas)
+
+    @staticmethod
+    def arquivo(indicador, pasta='.'):
+        return (Path(pasta) / INDICADORES[indicador][2]).resolve()
+
+    def obter(self, indicador, pasta='.'):
+        """
+        {'resultados', 'linhas'} do indicador e se veio do cache ('acerto')
+        ou foi calculado agora ('falta'). Os objetos são compartilhados:
+        não modifique.
+        """
+        if indicador not in INDICADORES:
+            raise KeyError(f"Indicador desconhecido: {indicador} (disponíveis: {', '.join(INDICADORES)})")
+        modulo, funcao, _, aba = INDICADORES[indicador]
+        arquivo = self.arquivo(indicador, pasta)
+        chave = (indicador, str(arquivo), assinatura_arquivo(arquivo))
+        with self._trava:
+            if chave in self._itens:
+                self.estatisticas['acertos'] += 1
+                self._itens.move_to_end(chave)
+                return self._itens[chave], 'acerto'
+
+            calculando = self._calculando.get(chave)
+            if calculando is None:
+                self.estatisticas['faltas'] += 1
+                self._calculando[chave] = Future()
+            else:
+                self.estatisticas['acertos'] += 1
+        if calculando is not None:
+            # Mesmo indicador e versão em cálculo por outra thread
+            return calculando.result(), 'acerto'
+
+        try:
+            inicio = time.perf_counter()
+            analisar = getattr(importlib.import_module(modulo), funcao)
+            resultados = analisar(str(arquivo), aba_nome=aba)
+            entrada = {'resultados': resultados, 'linhas': linhas_indicador(resultados, indicador)}
+        except BaseException as e:
+            with self._trava:
+                self._calculando.pop(chave).set_exception(e)
+            raise
+        log.info(f"↻ {indicador} calculado em {(time.perf_counter() - inicio) * 1000:.0f} ms "
+                 f"({len(entrada['linhas'])} linhas)")
+
+        with self._trava:
+            # Versões anteriores do mesmo workbook não servem mais
+            for antiga in [c for c in self._itens if c[:2] == chave[:2]]:
+                del self._itens[antiga]
+            self._itens[chave] = entrada
+            while len(self._itens) > self.maximo:
+                self._itens.popitem(last=False)
+            self._calculando.pop(chave).set_result(entrada)
+        return entrada, 'falta'
+
+    def calculados(self):
+        with self._trava:
+            return [indicador for indicador, _, _ in self._itens]
+
+    def desatualizados(self):
+        """(indicador, pasta) em cache cujo workbook mudou desde o cálculo"""
+        with self._trava:
+            itens = list(self._itens)
+        return [(indicador, str(Path(arquivo).parent)) for indicador, arquivo, assinatura in itens
+                if Path(arquivo).exists() and assinatura_arquivo(arquivo) != assinatura]
+
+    def resumo(self):
+        """Estatísticas dos dois caches (indicadores e abas)"""
+        with self._trava:
+            return {'indicadores': {**self.estatisticas, 'itens': len(self._itens),
+                                    'maximo': self.maximo},
+                    'abas': estatisticas_cache_abas()}
+
+
+_CACHE = None
+_TRAVA = threading.Lock()
+
+
+def cache_padrao():
+    """Cache compartilhado pelas funções deste módulo (criado no primeiro uso)"""
+    global _CACHE
+    with _TRAVA:
+        if _CACHE is None:
+            _CACHE = CacheIndicadores()
+        return _CACHE
+
+
+# ============================================================================
+# CONSULTA
+# ============================================================================
+
+def filtrar_linhas(linhas, dimensao=None, grupo=None, ano=None, metrica=None):
+    """Filtros da consulta (texto sem diferenciar maiúsculas/minúsculas)"""
+    filtros = {'dimensao': dimensao, 'grupo': grupo, 'metrica': metrica}
+    filtros = {campo: str(valor).casefold() for campo, valor in filtros.items() if valor is not None}
+    ano = None if ano is None else int(ano)
+    return [l for l in linhas
+            if (ano is None or l['ano'] == ano)
+            and all(str(l[campo]).casefold() == valor for campo, valor in filtros.items())]
+
+
+def resultados_indicador(indicador, pasta='.'):
+    """
+    Dict completo da análise (mesmo formato de analisar_*), memoizado.
+    Compartilhado entre chamadas: não modifique.
+    """
+    return cache_padrao().obter(indicador, pasta)[0]['resultados']
+
+
+@instrumentar('consultar_indicador', 'leitura')
+def consultar(indicador, dimensao=None, grupo=None, ano=None, metrica=None, pasta='.'):
+    """
+    Consulta um indicador calculado a partir dos workbooks em `pasta`
+
+    Args:
+        indicador: a3, a8, b4a, g6 ou h4d
+        dimensao: Ex.: TOTAL, REGIÃO, ÁREA, ETAPA DE ENSINO
+        grupo: Ex.: Norte, Rural
+        ano: Ano dos dados (padrão: todos)
+        metrica: Ex.: percentual_adequada
+
+    Returns:
+        DataFrame com as colunas indicador, dimensao, grupo, ano, metrica, valor
+        (as mesmas de banco_resultados.consultar_fatos)
+    """
+    linhas = filtrar_linhas(cache_padrao().obter(indicador, pasta)[0]['linhas'],
+                            dimensao, grupo, ano, metrica)
+    return pd.DataFrame([{'indicador': indicador, **l} for l in linhas], columns=COLUNAS)
+
+
+def estatisticas_consulta():
+    """Acertos, faltas e ocupação dos caches de indicadores e de abas"""
+    return cache_padrao().resumo()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from tic.instrumentacao import adicionar_argumento_perfil, configurar_perfil
+    from tic.log import adicionar_argumentos_log, configurar_log_args
+
+    parser = argparse.ArgumentParser(description='Consulta um indicador direto dos workbooks')
+    parser.add_argument('indicador', choices=list(INDICADORES))
+    parser.add_argument('--dimensao', help='Ex.: TOTAL, REGIÃO, ÁREA, ETAPA DE ENSINO')
+    parser.add_argument('--grupo', help='Ex.: Norte, Rural')
+    parser.add_argument('--ano', type=int)
+    parser.add_argument('--metrica')
+    parser.add_argument('--pasta', default='.', help='Pasta dos workbooks (padrão: .)')
+    adicionar_argumento_perfil(parser, './resultados/perfil_consulta.json')
+    adicionar_argumentos_log(parser)
+    args = parser.parse_args()
+    configurar_perfil(args)
+    configurar_log_args(args)
+
+    df = consultar(args.indicador, args.dimensao, args.grupo, args.ano, args.metrica, args.pasta)
+    print(df.to_string(index=False) if len(df) else "⚠️  Nenhuma linha encontrada")
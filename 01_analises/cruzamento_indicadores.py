@@ -0,0 +1,278 @@
+"""
+CRUZAMENTO ALUNOS × ESCOLAS - GAPS POR RECORTE
+TIC Educação 2024
+
+Os indicadores de alunos (G6 uso de IA, H4D orientação) vêm do workbook de
+alunos e os de escolas (A8 acesso, A3 velocidade, B4A proporção) do de
+escolas. Aqui os dois lados são alinhados em todas as dimensões comuns
+(REGIÃO, ÁREA, DEPENDÊNCIA ADMINISTRATIVA, ETAPA DE ENSINO, além do Brasil)
+e os gaps de todos os pares aluno × escola são calculados de uma vez.
+
+Alinhamento: os rótulos (dimensão, grupo) distintos do banco são mapeados
+uma única vez para uma chave normalizada (sem acento, sem palavras vazias,
+sem o trecho entre parênteses: 'Anos iniciais do Ensino Fundamental (4º e
+5º ano)' = 'Anos iniciais do Ensino Fundamental'); cada fato recebe a
+célula (ano, dimensão, chave) por esse mapa. Com as duas matrizes
+célula × indicador, os gaps saem de uma subtração com broadcasting
+(células × indicadores de alunos × indicadores de escolas).
+
+Métricas gravadas no banco como indicador 'cruzamento', por recorte:
+- gap_<aluno>_<escola>   pontos percentuais (aluno − escola)
+- razao_<aluno>_<escola> aluno / escola
+
+Uso:
+    python cruzamento_indicadores.py                        # calcula e grava
+    python cruzamento_indicadores.py --dimensao ÁREA --so-consultar
+"""
+
+import argparse
+import re
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from banco_resultados import (DIMENSAO_TOTAL, DIMENSOES, GRUPO_BRASIL, consultar_fatos,
+                              remover_indicador, salvar_resultados_db, DB_PADRAO)
+from cubo_indicadores import METRICA_ORIENTACAO
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from tic.texto import termos
+from tic.instrumentacao import adicionar_argumento_perfil, configurar_perfil, instrumentar
+from tic.log import adicionar_argumentos_log, configurar_log_args, linha, obter_logger, titulo
+
+log = obter_logger('cruzamento_indicadores')
+
+# Indicador → métricas candidatas (vale a primeira presente em cada recorte;
+# o bloco Brasil das análises de escolas usa os nomes pct_*)
+INDICADORES_ALUNOS = {
+    'g6': ('percentual',),
+    'h4d': (METRICA_ORIENTACAO, 'percentual'),
+}
+INDICADORES_ESCOLAS = {
+    'a8': ('percentual', 'pct_com_acesso'),
+    'a3': ('percentual_adequada', 'pct_adequada'),
+    'b4a': ('percentual_adequada', 'pct_adequada'),
+}
+
+DIMENSOES_CRUZAMENTO = (DIMENSAO_TOTAL, 'REGIÃO', 'ÁREA', 'DEPENDÊNCIA ADMINISTRATIVA', 'ETAPA DE ENSINO')
+
+COLUNAS = ['ano', 'dimensao', 'grupo', 'indicador_alunos', 'indicador_escolas',
+           'valor_alunos', 'valor_escolas', 'gap', 'razao']
+
+
+# ============================================================================
+# MAPA DE CHAVES
+# ============================================================================
+
+def chave_grupo(grupo):
+    """
+    Chave de alinhamento de um grupo entre os workbooks
+    ('Públicas (Municipal, Estadual e Federal)' → 'publicas')
+    """
+    return ' '.join(termos(re.sub(r'\(.*?\)', ' ', str(grupo))))
+
+
+def mapa_chaves(rotulos):
+    """
+    (dimensao, grupo) distintos → (dimensao, chave); o Brasil vira TOTAL/'brasil'
+    """
+    mapa = {}
+    for dimensao, grupo in rotulos:
+        if dimensao == DIMENSAO_TOTAL:
+            mapa[(dimensao, grupo)] = (DIMENSAO_TOTAL, chave_grupo(GRUPO_BRASIL))
+        else:
+            mapa[(dimensao, grupo)] = (dimensao, chave_grupo(grupo))
+    return mapa
+
+
+# ============================================================================
+# CRUZAMENTO
+# ============================================================================
+
+def _valores_indicadores(fatos, candidatos):
+    """
+    Fatos longos → um valor por (indicador, ano, dimensao, grupo), pela
+    primeira métrica candidata presente no recorte
+    """
+    prioridade = {(indicador, metrica): i
+                  for indicador, metricas in candidatos.items() for i, metrica in enumerate(metricas)}
+    chaves = pd.Series(list(zip(fatos['indicador'], fatos['metrica'])), index=fatos.index)
+    selecao = fatos.assign(prioridade=chaves.map(prioridade))
+    selecao = selecao[selecao['prioridade'].notna() & selecao['valor'].notna()]
+    return (selecao.sort_values('prioridade', kind='stable')
+                   .drop_duplicates(['indicador', 'ano', 'dimensao', 'grupo']))
+
+
+@instrumentar(categoria='agregacao')
+def cruzar_indicadores(fatos=None, db_path=DB_PADRAO, alunos=None, escolas=None):
+    """
+    Gaps aluno − escola para todas as células alinhadas
+
+    Args:
+        fatos: fatos longos (indicador, dimensao, grupo, ano, metrica, valor);
+               padrão: todo o banco de resultados
+        alunos / escolas: {indicador: métricas candidatas}
+                          (padrão: INDICADORES_ALUNOS / INDICADORES_ESCOLAS)
+
+    Returns:
+        DataFrame (ano, dimensao, grupo, indicador_alunos, indicador_escolas,
+        valor_alunos, valor_escolas, gap, razao), uma linha por célula × par
+        com os dois valores presentes
+    """
+    alunos = INDICADORES_ALUNOS if alunos is None else alunos
+    escolas = INDICADORES_ESCOLAS if escolas is None else escolas
+    if fatos is None:
+        fatos = consultar_fatos(db_path=db_path)
+
+    fatos = fatos[fatos['dimensao'].isin(DIMENSOES_CRUZAMENTO)]
+    valores = _valores_indicadores(fatos, {**alunos, **escolas})
+    if valores.empty:
+        return pd.DataFrame(columns=COLUNAS)
+
+    # Mapa de chaves pré-calculado sobre os rótulos distintos; os fatos só o consultam
+    rotulos = pd.Categorical(list(zip(valores['dimensao'], valores['grupo'])))
+    mapa = mapa_chaves(rotulos.categories)
+    chaves = [mapa[r] for r in rotulos.categories]
+    valores = valores.assign(
+        dimensao_chave=np.array([d for d, _ in chaves], dtype=object)[rotulos.codes],
+        chave=np.array([c for _, c in chaves], dtype=object)[rotulos.codes],
+    )
+
+    # Matriz célula × indicador e rótulo de cada célula (o dos alunos, se houver)
+    celula = ['ano', 'dimensao_chave', 'chave']
+    tabela = valores.pivot_table(index=celula, columns='indicador', values='valor',
+                                 aggfunc='first', sort=False)
+    tabela = tabela.reindex(columns=[*alunos, *escolas])
+    lado_alunos = valores['indicador'].isin(list(alunos))
+    rotulo = (valores.assign(lado=~lado_alunos).sort_values('lado', kind='stable')
+                     .drop_duplicates(celula).set_index(celula)['grupo'])
+
+    matriz_alunos = tabela[list(alunos)].to_numpy(dtype=np.float64)
+    matriz_escolas = tabela[list(escolas)].to_numpy(dtype=np.float64)
+
+    # Células alinhadas: ao menos um indicador de cada lado
+    alinhadas = (np.isfinite(matriz_alunos).any(axis=1) & np.isfinite(matriz_escolas).any(axis=1))
+    matriz_alunos, matriz_escolas = matriz_alunos[alinhadas], matriz_escolas[alinhadas]
+    celulas = tabela.index[alinhadas]
+
+    # Todos os pares de uma vez: células × alunos × escolas
+    valor_alunos = np.broadcast_to(matriz_alunos[:, :, None], (len(celulas), len(alunos), len(escolas)))
+    valor_escolas = np.broadcast_to(matriz_escolas[:, None, :], valor_alunos.shape)
+    gap = valor_alunos - valor_escolas
+    with np.errstate(divide='ignore', invalid='ignore'):
+        razao = np.where(valor_escolas != 0, valor_alunos / valor_escolas, np.nan)
+
+    n_celulas, n_alunos, n_escolas = gap.shape
+    posicao_celula = np.repeat(np.arange(n_celulas), n_alunos * n_escolas)
+    resultado = pd.DataFrame({
+        'ano': celulas.get_level_values('ano').to_numpy()[posicao_celula],
+        'dimensao': celulas.get_level_values('dimensao_chave').to_numpy()[posicao_celula],
+        'grupo': rotulo.reindex(celulas).to_numpy()[posicao_celula],
+        'indicador_alunos': np.tile(np.repeat(list(alunos), n_escolas), n_celulas),
+        'indicador_escolas': np.tile(list(escolas), n_celulas * n_alunos),
+        'valor_alunos': valor_alunos.ravel(),
+        'valor_escolas': valor_escolas.ravel(),
+        'gap': gap.ravel().round(1),
+        'razao': razao.ravel().round(3),
+    })
+    resultado = resultado[np.isfinite(gap.ravel())].reset_index(drop=True)
+
+    log.info(f"✅ Cruzamento: {n_celulas} células alinhadas × {n_alunos} indicadores de alunos × "
+             f"{n_escolas} de escolas → {len(resultado)} gaps")
+    return resultado
+
+
+# ============================================================================
+# BANCO DE RESULTADOS
+# ============================================================================
+
+def resultados_cruzamento(cruzamento):
+    """
+    Tabela do cruzamento (um ano) → dict no formato das análises
+    (brasil, regioes, areas, ...) com métricas gap_<aluno>_<escola> e
+    razao_<aluno>_<escola>
+    """
+    chaves_por_dimensao = {dim: (chave, nome) for chave, (dim, nome) in DIMENSOES.items()}
+    par = cruzamento['indicador_alunos'] + '_' + cruzamento['indicador_escolas']
+    largo = pd.concat([
+        cruzamento.assign(metrica='gap_' + par, v=cruzamento['gap']),
+        cruzamento.assign(metrica='razao_' + par, v=cruzamento['razao']),
+    ]).pivot_table(index=['dimensao', 'grupo'], columns='metrica', values='v',
+                   aggfunc='first', sort=False)
+
+    resultados = {
+        'aba': None,
+        'indicador': 'Cruzamento alunos × escolas (gaps por recorte)',
+        'fonte': 'TIC Educação 2024 - Alunos × Escolas - Calculado',
+    }
+    for (dimensao, grupo), metricas in largo.iterrows():
+        registro = {m: float(v) for m, v in metricas.items() if pd.notna(v)}
+        if dimensao == DIMENSAO_TOTAL:
+            resultados['brasil'] = registro
+        else:
+            chave, chave_nome = chaves_por_dimensao[dimensao]
+            resultados.setdefault(chave, []).append({chave_nome: grupo, **registro})
+    return resultados
+
+
+@instrumentar(categoria='escrita')
+def salvar_cruzamento(cruzamento, db_path=DB_PADRAO):
+    """
+    Grava o cruzamento no banco de resultados (indicador 'cruzamento', por ano).
+    O cruzamento anterior é removido antes, inclusive anos que não existem mais.
+    """
+    removidos = remover_indicador('cruzamento', db_path)
+    if cruzamento.empty and removidos:
+        log.info(f"🗑️  Cruzamento vazio: {removidos} fatos anteriores removidos de {db_path}")
+    total = 0
+    for ano, do_ano in cruzamento.groupby('ano', sort=True):
+        total += salvar_resultados_db(resultados_cruzamento(do_ano), indicador='cruzamento',
+                                      ano=int(ano), db_path=db_path)
+    return total
+
+
+def resumir_cruzamento(cruzamento):
+    """
+    Loga, por dimensão, o maior gap aluno − escola de cada par
+    """
+    if cruzamento.empty:
+        log.warning("⚠️  Nenhuma célula alinhada entre alunos e escolas")
+        return
+    ano = cruzamento['ano'].max()
+    do_ano = cruzamento[cruzamento['ano'] == ano]
+    titulo(log, f"CRUZAMENTO ALUNOS × ESCOLAS ({ano})")
+    for dimensao, grupos in do_ano.groupby('dimensao', sort=False):
+        log.info(f"\n📊 {dimensao}: {grupos['grupo'].nunique()} grupo(s)")
+        maiores = grupos.loc[grupos.groupby(['indicador_alunos', 'indicador_escolas'])['gap']
+                             .apply(lambda g: g.abs().idxmax())]
+        for registro in maiores.to_dict('records'):
+            log.info(f"  {registro['indicador_alunos'].upper()} × {registro['indicador_escolas'].upper()}: "
+                     f"{registro['grupo']} {registro['valor_alunos']:.1f}% vs {registro['valor_escolas']:.1f}% "
+                     f"(gap {registro['gap']:+.1f} pp)",
+                     extra=linha("Cruzamento - maior gap", **registro))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Cruzamento alunos × escolas por recorte')
+    parser.add_argument('--db', default=DB_PADRAO, help=f'Banco de resultados (padrão: {DB_PADRAO})')
+    parser.add_argument('--dimensao', help='Só mostra uma dimensão (ex.: TOTAL, REGIÃO, ÁREA)')
+    parser.add_argument('--ano', type=int)
+    parser.add_argument('--so-consultar', action='store_true', help='Não grava no banco')
+    adicionar_argumento_perfil(parser, './resultados/perfil_cruzamento.json')
+    adicionar_argumentos_log(parser)
+    args = parser.parse_args()
+    configurar_perfil(args)
+    configurar_log_args(args)
+
+    cruzamento = cruzar_indicadores(db_path=args.db)
+    if not args.so_consultar:
+        salvar_cruzamento(cruzamento, args.db)
+
+    tabela = cruzamento
+    if args.dimensao:
+        tabela = tabela[tabela['dimensao'] == args.dimensao]
+    if args.ano:
+        tabela = tabela[tabela['ano'] == args.ano]
+    print(tabela.to_string(index=False) if len(tabela) else "⚠️  Nenhum gap encontrado")
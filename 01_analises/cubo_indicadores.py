@@ -0,0 +1,249 @@
+"""
+CUBO DE INDICADORES - AGREGADOS PRÉ-CALCULADOS
+TIC Educação 2024
+
+Estágio executado depois das análises e do consolidador: lê o banco de
+resultados e materializa todas as medidas (indicador.métrica) para todos os
+recortes (dimensão, grupo) e anos em um array denso, mais os índices de
+prontidão derivados para cada recorte em que A8, A3, B4A, G6 e H4D existem.
+
+Layout em disco (pasta cubo/ ao lado do banco; ./resultados/cubo por padrão):
+- cubo.npy          float64 [medida, recorte, ano] (NaN = sem valor)
+- cubo_indice.json  posições de medidas, recortes e anos
+
+Consultas pontuais são lookups em dicionário + acesso ao array (O(1));
+fatias usam as posições pré-indexadas de cada indicador e dimensão.
+"""
+
+import argparse
+import json
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from banco_resultados import consultar_fatos, DB_PADRAO
+from tic.instrumentacao import adicionar_argumento_perfil, configurar_perfil, instrumentar
+from tic.log import adicionar_argumentos_log, configurar_log_args, obter_logger
+
+# Pasta do cubo: ao lado do banco de resultados (./resultados/cubo para o banco padrão)
+PASTA_CUBO = './resultados/cubo'
+FORMATO_VERSAO = 1
+
+log = obter_logger('cubo_indicadores')
+
+# Pilar de orientação: média de todos os blocos da H4D
+METRICA_ORIENTACAO = 'percentual_composto'
+
+# Entradas do índice de prontidão por recorte (mesma fórmula do índice Brasil e da
+# comparação regional do consolidador); com várias métricas, vale a primeira
+# gravada no banco
+ENTRADAS_PRONTIDAO = {
+    'acesso': ('a8', 'percentual'),
+    'velocidade': ('a3', 'percentual_adequada'),
+    'proporcao': ('b4a', 'percentual_adequada'),
+    'uso': ('g6', 'percentual'),
+    'orientacao': ('h4d', (METRICA_ORIENTACAO, 'percentual')),
+}
+
+
+# ============================================================================
+# CONSTRUÇÃO
+# ============================================================================
+
+def pasta_do_cubo(db_path=DB_PADRAO):
+    """Pasta do cubo de um banco de resultados (cubo/ na pasta do banco)"""
+    return str(Path(db_path).parent / 'cubo')
+
+
+def derivar_prontidao(fatos):
+    """
+    Calcula infraestrutura, orientação, uso, prontidão e déficit para todo
+    recorte (dimensão, grupo, ano) com as cinco entradas disponíveis.
+    Infraestrutura = acesso × velocidade × proporção, como no índice Brasil.
+
+    Recortes que o consolidador já gravou (indicador 'prontidao') são mantidos.
+    """
+    medida = fatos['indicador'] + '.' + fatos['metrica']
+    chave = ['dimensao', 'grupo', 'ano']
+
+    entradas = {}
+    for nome, (indicador, metricas) in ENTRADAS_PRONTIDAO.items():
+        metricas = (metricas,) if isinstance(metricas, str) else metricas
+        for metrica in metricas:
+            selecao = fatos[medida == f"{indicador}.{metrica}"]
+            if not selecao.empty:
+                break
+        entradas[nome] = selecao.set_index(chave)['valor']
+
+    tabela = pd.DataFrame(entradas).dropna()
+    if tabela.empty:
+        return fatos.iloc[0:0]
+
+    derivados = pd.DataFrame({
+        'infraestrutura': ((tabela['acesso'] / 100) * (tabela['velocidade'] / 100)
+                           * (tabela['proporcao'] / 100) * 100),
+        'orientacao': tabela['orientacao'],
+        'uso': tabela['uso'],
+    })
+    derivados['prontidao'] = derivados[['infraestrutura', 'orientacao', 'uso']].mean(axis=1)
+    derivados['deficit'] = 100 - derivados['prontidao']
+
+    longo = derivados.stack().rename('valor').reset_index()
+    longo.columns = chave + ['metrica', 'valor']
+    longo['indicador'] = 'prontidao'
+
+    # Não sobrescreve o que o consolidador já calculou
+    existentes = fatos.loc[fatos['indicador'] == 'prontidao', chave].drop_duplicates()
+    longo = longo.merge(existentes, on=chave, how='left', indicator=True)
+    longo = longo[longo['_merge'] == 'left_only'].drop(columns='_merge')
+
+    return longo[fatos.columns]
+
+
+@instrumentar(categoria='agregacao')
+def construir_cubo(db_path=DB_PADRAO, pasta=None):
+    """
+    Materializa o cubo a partir do banco de resultados e salva em disco
+    (padrão: pasta_do_cubo(db_path), ao lado do banco)
+
+    Returns:
+        Cubo carregado
+    """
+    pasta = pasta or pasta_do_cubo(db_path)
+    fatos = consultar_fatos(db_path=db_path)
+    if fatos.empty:
+        raise ValueError(f"Banco de resultados vazio: {db_path}")
+
+    fatos = pd.concat([fatos, derivar_prontidao(fatos)], ignore_index=True)
+
+    medidas = pd.Categorical(fatos['indicador'] + '.' + fatos['metrica'],
+                             categories=pd.unique(fatos['indicador'] + '.' + fatos['metrica']))
+    recortes = pd.Categorical(fatos['dimensao'] + '|' + fatos['grupo'],
+                              categories=pd.unique(fatos['dimensao'] + '|' + fatos['grupo']))
+    anos = pd.Categorical(fatos['ano'], categories=sorted(fatos['ano'].unique()))
+
+    dados = np.full((len(medidas.categories), len(recortes.categories), len(anos.categories)),
+                    np.nan, dtype=np.float64)
+    dados[medidas.codes, recortes.codes, anos.codes] = fatos['valor'].to_numpy(dtype=np.float64)
+
+    indice = {
+        'formato_versao': FORMATO_VERSAO,
+        'criado_em': datetime.now().isoformat(),
+        'origem': str(db_path),
+        'medidas': list(medidas.categories),
+        'recortes': [r.split('|', 1) for r in recortes.categories],
+        'anos': [int(a) for a in anos.categories],
+        'forma': list(dados.shape),
+    }
+
+    Path(pasta).mkdir(parents=True, exist_ok=True)
+    np.save(Path(pasta) / 'cubo.npy', dados)
+    with open(Path(pasta) / 'cubo_indice.json', 'w', encoding='utf-8') as f:
+        json.dump(indice, f, ensure_ascii=False, indent=2)
+
+    log.info(f"✅ Cubo salvo em {pasta}: {dados.shape[0]} medidas × {dados.shape[1]} recortes × "
+             f"{dados.shape[2]} anos ({np.isfinite(dados).sum()} células preenchidas)")
+
+    return Cubo(dados, indice)
+
+
+# ============================================================================
+# CONSULTA
+# ============================================================================
+
+class Cubo:
+    """
+    Cubo indicador × recorte × ano com índices de posição em memória
+    """
+
+    def __init__(self, dados, indice):
+        self.dados = dados
+        self.indice = indice
+        self.medidas = indice['medidas']
+        self.recortes = [tuple(r) for r in indice['recortes']]
+        self.anos = indice['anos']
+
+        self._pos_medida = {m: i for i, m in enumerate(self.medidas)}
+        self._pos_recorte = {r: i for i, r in enumerate(self.recortes)}
+        self._pos_ano = {a: i for i, a in enumerate(self.anos)}
+
+        # Posições pré-indexadas para fatias
+        self._medidas_por_indicador = {}
+        for i, medida in enumerate(self.medidas):
+            self._medidas_por_indicador.setdefault(medida.split('.', 1)[0], []).append(i)
+        self._recortes_por_dimensao = {}
+        for i, (dimensao, _) in enumerate(self.recortes):
+            self._recortes_por_dimensao.setdefault(dimensao, []).append(i)
+
+    def valor(self, indicador, metrica, dimensao='TOTAL', grupo='Brasil', ano=None):
+        """
+        Consulta pontual (None se a célula não existir ou estiver vazia)
+        """
+        ano = self.anos[-1] if ano is None else ano
+        try:
+            v = self.dados[self._pos_medida[f"{indicador}.{metrica}"],
+                           self._pos_recorte[(dimensao, grupo)],
+                           self._pos_ano[ano]]
+        except KeyError:
+            return None
+        return None if np.isnan(v) else float(v)
+
+    def fatia(self, indicador, metrica=None, dimensao=None, ano=None):
+        """
+        Fatia do cubo como tabela (dimensao, grupo) × métricas de um indicador
+
+        Ex.: cubo.fatia('a8', dimensao='REGIÃO')
+        """
+        ano = self.anos[-1] if ano is None else ano
+        if metrica is not None:
+            pos_medidas = [self._pos_medida[f"{indicador}.{metrica}"]]
+        else:
+            pos_medidas = self._medidas_por_indicador.get(indicador, [])
+        pos_recortes = (self._recortes_por_dimensao.get(dimensao, []) if dimensao
+                        else list(range(len(self.recortes))))
+
+        bloco = self.dados[np.ix_(pos_medidas, pos_recortes, [self._pos_ano[ano]])][:, :, 0]
+        tabela = pd.DataFrame(
+            bloco.T,
+            index=pd.MultiIndex.from_tuples([self.recortes[i] for i in pos_recortes],
+                                            names=['dimensao', 'grupo']),
+            columns=[self.medidas[i].split('.', 1)[1] for i in pos_medidas]
+        )
+        return tabela.dropna(how='all')
+
+
+def carregar_cubo(pasta=PASTA_CUBO):
+    """
+    Carrega o cubo salvo (array mapeado em memória)
+    """
+    with open(Path(pasta) / 'cubo_indice.json', encoding='utf-8') as f:
+        indice = json.load(f)
+    if indice.get('formato_versao') != FORMATO_VERSAO:
+        raise ValueError(f"Formato de cubo não suportado: {indice.get('formato_versao')}")
+    dados = np.load(Path(pasta) / 'cubo.npy', mmap_mode='r')
+    return Cubo(dados, indice)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Constrói/consulta o cubo de indicadores')
+    parser.add_argument('--db', default=DB_PADRAO, help=f'Banco de resultados (padrão: {DB_PADRAO})')
+    parser.add_argument('--pasta', help='Pasta do cubo (padrão: cubo/ na pasta do banco)')
+    parser.add_argument('--consultar', metavar='INDICADOR',
+                        help='Só consulta o cubo existente (ex.: a8, prontidao)')
+    parser.add_argument('--metrica')
+    parser.add_argument('--dimensao', help='Ex.: TOTAL, REGIÃO, ÁREA')
+    parser.add_argument('--ano', type=int)
+    adicionar_argumento_perfil(parser, './resultados/perfil_cubo.json')
+    adicionar_argumentos_log(parser)
+    args = parser.parse_args()
+    configurar_perfil(args)
+    configurar_log_args(args)
+
+    if args.consultar:
+        cubo = carregar_cubo(args.pasta or pasta_do_cubo(args.db))
+        tabela = cubo.fatia(args.consultar, args.metrica, args.dimensao, args.ano)
+        print(tabela.to_string() if len(tabela) else "⚠️  Nenhum valor encontrado")
+    else:
+        construir_cubo(args.db, args.pasta)
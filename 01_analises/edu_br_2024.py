@@ -5,17 +5,43 @@ Autor: Análise Educacional BR
 Data: Janeiro 2025
 """
 
+import argparse
+import sys
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 from pathlib import Path
 
-# Configurações
-plt.style.use('seaborn-v0_8-darkgrid')
-sns.set_palette("husl")
-plt.rcParams['figure.figsize'] = (16, 10)
-plt.rcParams['font.size'] = 10
+from analise_a3_velocidade import FAIXAS_A3
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from tic.fatos import carregar_fatos_aba, pivotar_respostas
+from tic.figuras import figura, renderizar
+from tic.instrumentacao import adicionar_argumento_perfil, configurar_perfil, instrumentar
+from tic.layout import ler_aba, para_numerico
+from tic.log import adicionar_argumentos_log, configurar_log_args, linha, obter_logger, titulo
+
+log = obter_logger('edu_br')
+
+# Colunas usadas no índice, pelos rótulos de resposta do cabeçalho (não pela posição)
+RESPOSTAS_SIM_NAO = {'Sim': 'sim', 'Não': 'nao'}
+FAIXAS_CONEXAO_RUIM = ['ate_10_mbps', 'de_11_a_50_mbps']
+FAIXAS_CONEXAO_BOA = ['de_51_a_100_mbps', 'de_101_a_250_mbps', 'de_251_a_500_mbps',
+                      'de_501_a_1_gbps', '1_gbps_ou_mais']
+
+
+def _pyplot():
+    """
+    Importa matplotlib/seaborn só quando um gráfico é gerado e aplica as
+    configurações de estilo
+    """
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    
+    plt.style.use('seaborn-v0_8-darkgrid')
+    sns.set_palette("husl")
+    plt.rcParams['figure.figsize'] = (16, 10)
+    plt.rcParams['font.size'] = 10
+    return plt
 
 # ============================================================================
 # PARTE 1: ANÁLISE DE INFRAESTRUTURA DAS ESCOLAS (2023 e 2024)
@@ -32,72 +58,56 @@ def listar_abas_disponiveis(arquivo_path):
     abas = wb.sheetnames
     wb.close()
     
-    print(f"\n📋 Abas disponíveis em {Path(arquivo_path).name}:")
+    log.info(f"\n📋 Abas disponíveis em {Path(arquivo_path).name}: {len(abas)} abas")
     for i, aba in enumerate(abas, 1):
-        print(f"  {i:2}. {aba}")
-    print(f"\n  Total: {len(abas)} abas")
+        log.info(f"  {i:2}. {aba}", extra=linha(f"Abas - {Path(arquivo_path).name}", posicao=i, aba=aba))
     
     return abas
 
-def encontrar_aba(arquivo_path, nome_base):
+
+def ler_tabela(arquivo_path, aba):
     """
-    Encontra o nome correto da aba, considerando variações como A3, A3_1, etc.
+    Região de dados de uma aba (a partir da linha TOTAL, sem título,
+    cabeçalhos e rodapé), com o layout detectado por tic/layout.py.
+    Colunas: Categoria, Subcategoria e os rótulos do cabeçalho, nas posições
+    da aba
     """
-    import openpyxl
-    
-    # Abrir workbook para listar abas
-    wb = openpyxl.load_workbook(arquivo_path, read_only=True, data_only=True)
-    abas_disponiveis = wb.sheetnames
-    wb.close()
-    
-    # Procurar pela aba exata primeiro
-    if nome_base in abas_disponiveis:
-        return nome_base
-    
-    # Procurar por variações com underscore
-    for aba in abas_disponiveis:
-        # Verificar se começa com o nome base seguido de underscore
-        if aba.startswith(f"{nome_base}_"):
-            print(f"  ℹ️  Usando aba '{aba}' para '{nome_base}'")
-            return aba
-    
-    # Se não encontrar, retornar None
-    return None
+    dados, layout = ler_aba(arquivo_path, aba)
+    rotulos = [f"{q} - {r}" if q else r for q, r in zip(layout['questoes'], layout['respostas'])]
+    rotulos_linha = ['Categoria', 'Subcategoria', *(f"col_{i}" for i in range(2, layout['primeira_coluna']))]
+    df = dados.reset_index(drop=True)
+    df.columns = [*rotulos_linha[:layout['primeira_coluna']], *rotulos]
+    return df
+
 
+@instrumentar(categoria='leitura')
 def carregar_dados_escolas_2023(arquivo_path, aba='B4A'):
     """
     Carrega dados de infraestrutura das escolas (TIC 2023)
     Aba B4A: Número de alunos por computador desktop
     """
-    print(f"\n📂 Carregando {aba} do TIC Educação 2023...")
-    
-    df = pd.read_excel(arquivo_path, sheet_name=aba, header=None)
-    
-    # Identificar linha de cabeçalho (geralmente linha 2)
-    header_row = 2
-    df.columns = df.iloc[header_row]
-    df = df.iloc[header_row+1:].reset_index(drop=True)
+    log.info(f"\n📂 Carregando {aba} do TIC Educação 2023...")
     
-    # Renomear colunas
-    df.columns = ['Categoria', 'Subcategoria', 'Sem_computador', 'Ate_5_alunos',
-                  'De_5_1_a_10', 'De_10_1_a_15', 'De_15_1_a_20', 'De_20_1_a_30',
-                  'De_30_1_a_40', 'De_40_1_a_50', 'De_50_1_a_100', 'Mais_de_100']
+    df = ler_tabela(arquivo_path, aba)
     
     # Converter para numérico
     cols_numericas = df.columns[2:]
     for col in cols_numericas:
-        df[col] = pd.to_numeric(df[col], errors='coerce')
+        df[col] = para_numerico(df[col])
     
     # Remover linhas de cabeçalhos intermediários
-    df = df[df['Sem_computador'].notna()]
+    df = df[df[cols_numericas].notna().any(axis=1)].reset_index(drop=True)
     
     return df
 
 def encontrar_aba(arquivo_path, nome_base):
     """
     Encontra o nome correto da aba, considerando variações como A3, A3_1, etc.
+    Com várias variantes, usa a primeira que passa na validação de
+    consistência (tic/validacao.py) e avisa quais foram descartadas.
     """
     import openpyxl
+    from tic.validacao import validar_fatos
     
     # Abrir workbook para listar abas
     wb = openpyxl.load_workbook(arquivo_path, read_only=True, data_only=True)
@@ -109,22 +119,33 @@ def encontrar_aba(arquivo_path, nome_base):
         return nome_base
     
     # Procurar por variações com underscore
-    for aba in abas_disponiveis:
-        # Verificar se começa com o nome base seguido de underscore
-        if aba.startswith(f"{nome_base}_"):
-            print(f"  ℹ️  Usando aba '{aba}' para '{nome_base}'")
+    variantes = [aba for aba in abas_disponiveis if aba.startswith(f"{nome_base}_")]
+    if len(variantes) == 1:
+        log.info(f"  ℹ️  Usando aba '{variantes[0]}' para '{nome_base}'")
+        return variantes[0]
+    
+    for aba in variantes:
+        problemas = validar_fatos(carregar_fatos_aba(arquivo_path, aba, validar=False))
+        if problemas.empty:
+            log.info(f"  ℹ️  Usando aba '{aba}' para '{nome_base}' (variantes: {', '.join(variantes)})")
             return aba
+        log.warning(f"  ⚠️  Variante '{aba}' descartada: {len(problemas)} inconsistência(s)")
+    
+    if variantes:
+        log.warning(f"  ⚠️  Nenhuma variante de '{nome_base}' consistente; usando '{variantes[0]}'")
+        return variantes[0]
     
     # Se não encontrar, retornar None
     return None
 
+@instrumentar(categoria='leitura')
 def carregar_dados_escolas_2024(arquivo_path):
     """
     Carrega dados atualizados de escolas TIC 2024
     Processa abas: A8 (acesso), A3 (velocidade), J1 (formação)
     Lida com variações nos nomes das abas (A3, A3_1, etc.)
     """
-    print(f"\n📂 Carregando dados TIC Educação 2024 - Escolas...")
+    log.info(f"\n📂 Carregando dados TIC Educação 2024 - Escolas...")
     
     dados = {}
     
@@ -133,55 +154,56 @@ def carregar_dados_escolas_2024(arquivo_path):
     if aba_a8 is None:
         raise ValueError("❌ Aba A8 não encontrada no arquivo!")
     
-    df_a8 = pd.read_excel(arquivo_path, sheet_name=aba_a8, header=None)
-    df_a8.columns = df_a8.iloc[2]
-    df_a8 = df_a8.iloc[3:].reset_index(drop=True)
+    df_a8 = pivotar_respostas(carregar_fatos_aba(arquivo_path, aba_a8), RESPOSTAS_SIM_NAO, aba_a8,
+                              estrito=False)
     dados['A8'] = df_a8
-    print(f"  ✅ A8: {len(df_a8)} linhas carregadas")
+    log.info(f"  ✅ A8: {len(df_a8)} linhas carregadas")
     
     # A3 - Velocidade da internet
     aba_a3 = encontrar_aba(arquivo_path, 'A3')
     if aba_a3 is None:
         raise ValueError("❌ Aba A3 (ou variação) não encontrada no arquivo!")
     
-    df_a3 = pd.read_excel(arquivo_path, sheet_name=aba_a3, header=None)
-    df_a3.columns = df_a3.iloc[2]
-    df_a3 = df_a3.iloc[3:].reset_index(drop=True)
+    df_a3 = pivotar_respostas(carregar_fatos_aba(arquivo_path, aba_a3), FAIXAS_A3, aba_a3)
     dados['A3'] = df_a3
-    print(f"  ✅ A3: {len(df_a3)} linhas carregadas")
+    log.info(f"  ✅ A3: {len(df_a3)} linhas carregadas")
     
     # J1 - Formação docente
     aba_j1 = encontrar_aba(arquivo_path, 'J1')
     if aba_j1 is None:
         raise ValueError("❌ Aba J1 (ou variação) não encontrada no arquivo!")
     
-    df_j1 = pd.read_excel(arquivo_path, sheet_name=aba_j1, header=None)
-    df_j1.columns = df_j1.iloc[2]
-    df_j1 = df_j1.iloc[3:].reset_index(drop=True)
+    df_j1 = pivotar_respostas(carregar_fatos_aba(arquivo_path, aba_j1), RESPOSTAS_SIM_NAO, aba_j1,
+                              estrito=False)
     dados['J1'] = df_j1
-    print(f"  ✅ J1: {len(df_j1)} linhas carregadas")
+    log.info(f"  ✅ J1: {len(df_j1)} linhas carregadas")
     
-    print("✅ Dados de escolas 2024 carregados com sucesso!")
+    log.info("✅ Dados de escolas 2024 carregados com sucesso!")
     
     return dados
 
+@instrumentar(categoria='leitura')
 def carregar_dados_alunos_2024(arquivo_path):
     """
     Carrega dados de uso de IA por alunos (TIC 2024)
     Aba G6: Recursos digitais em pesquisas escolares
     """
-    print(f"\n📂 Carregando dados TIC Educação 2024 - Alunos (IA)...")
+    log.info(f"\n📂 Carregando dados TIC Educação 2024 - Alunos (IA)...")
+    
+    fatos = carregar_fatos_aba(arquivo_path, 'G6')
     
-    df = pd.read_excel(arquivo_path, sheet_name='G6', header=None)
+    # Colunas de IA pela questão no cabeçalho (como em analise_g6_uso_ia.py)
+    eh_ia = fatos['questao'].astype(str).str.contains('Inteligência Artificial', regex=False)
+    colunas_ia = sorted(fatos.loc[eh_ia, 'coluna'].unique().tolist())
+    if len(colunas_ia) < 2:
+        raise ValueError("❌ Colunas de IA não encontradas na aba G6!")
     
-    # Dados começam na linha 4 (índice 3)
-    # Coluna 32 = "Sim" para uso de IA
-    # Coluna 33 = "Não" para uso de IA
+    total = fatos[fatos['dimensao'] == 'TOTAL'].set_index('coluna')['valor']
     
     dados_ia = {
         'brasil': {
-            'usa_ia': df.iloc[3, 32],  # Linha TOTAL
-            'nao_usa_ia': df.iloc[3, 33],
+            'usa_ia': total[colunas_ia[0]],  # Sim
+            'nao_usa_ia': total[colunas_ia[1]],  # Não
             'percentual': None  # Calcular depois
         },
         'regioes': {},
@@ -192,7 +214,7 @@ def carregar_dados_alunos_2024(arquivo_path):
     total = dados_ia['brasil']['usa_ia'] + dados_ia['brasil']['nao_usa_ia']
     dados_ia['brasil']['percentual'] = (dados_ia['brasil']['usa_ia'] / total) * 100
     
-    print(f"✅ Dados de uso de IA extraídos: {dados_ia['brasil']['percentual']:.1f}% usam IA")
+    log.info(f"✅ Dados de uso de IA extraídos: {dados_ia['brasil']['percentual']:.1f}% usam IA")
     
     return dados_ia
 
@@ -200,6 +222,7 @@ def carregar_dados_alunos_2024(arquivo_path):
 # PARTE 2: ANÁLISE DO TRIPLO DÉFICIT
 # ============================================================================
 
+@instrumentar(categoria='agregacao')
 def calcular_indice_prontidao(dados_escolas_2024):
     """
     Calcula o Índice de Prontidão para IA baseado em 3 pilares:
@@ -207,43 +230,40 @@ def calcular_indice_prontidao(dados_escolas_2024):
     2. Qualidade da conexão ≥3 Mbps (A3)
     3. Formação docente (J1)
     """
-    print("\n" + "="*80)
-    print("CALCULANDO ÍNDICE DE PRONTIDÃO PARA IA GENERATIVA")
-    print("="*80)
+    titulo(log, "CALCULANDO ÍNDICE DE PRONTIDÃO PARA IA GENERATIVA")
     
-    # Extrair dados do Brasil (primeira linha de dados)
-    a8_brasil = dados_escolas_2024['A8'].iloc[0]
-    a3_brasil = dados_escolas_2024['A3'].iloc[0]
-    j1_brasil = dados_escolas_2024['J1'].iloc[0]
+    # Extrair dados do Brasil (linha TOTAL)
+    a8_brasil, a3_brasil, j1_brasil = (
+        df[df['categoria'] == 'TOTAL'].iloc[0]
+        for df in (dados_escolas_2024['A8'], dados_escolas_2024['A3'], dados_escolas_2024['J1']))
     
     # Pilar 1: % com acesso (computador + internet)
-    com_acesso = pd.to_numeric(a8_brasil.iloc[2], errors='coerce')
-    sem_acesso = pd.to_numeric(a8_brasil.iloc[3], errors='coerce')
+    com_acesso = a8_brasil['sim']
+    sem_acesso = a8_brasil['nao']
     total = com_acesso + sem_acesso
     pct_com_acesso = (com_acesso / total) * 100
     
-    # Pilar 2: % com conexão adequada (≥3 Mbps)
-    # Colunas de velocidade: até 999Kbps, 1-2Mbps, 3-10Mbps, 11-20Mbps, >20Mbps
-    conexao_ruim = pd.to_numeric(a3_brasil.iloc[2], errors='coerce') + pd.to_numeric(a3_brasil.iloc[3], errors='coerce')
-    conexao_boa = sum([pd.to_numeric(a3_brasil.iloc[i], errors='coerce') for i in range(4, 9)])
+    # Pilar 2: % com conexão adequada (faixas da A3 de 51 Mbps para cima)
+    conexao_ruim = a3_brasil[FAIXAS_CONEXAO_RUIM].sum()
+    conexao_boa = a3_brasil[FAIXAS_CONEXAO_BOA].sum()
     total_internet = conexao_ruim + conexao_boa
     pct_conexao_boa = (conexao_boa / total_internet) * 100
     
     # Pilar 3: % com formação docente
-    com_formacao = pd.to_numeric(j1_brasil.iloc[2], errors='coerce')
-    sem_formacao = pd.to_numeric(j1_brasil.iloc[3], errors='coerce')
+    com_formacao = j1_brasil['sim']
+    sem_formacao = j1_brasil['nao']
     total_escolas = com_formacao + sem_formacao
     pct_com_formacao = (com_formacao / total_escolas) * 100
     
     # Índice de Prontidão = multiplicação dos 3 pilares
     indice_prontidao = (pct_com_acesso / 100) * (pct_conexao_boa / 100) * (pct_com_formacao / 100) * 100
     
-    print(f"\n📊 PILARES DO ÍNDICE:")
-    print(f"  1. Acesso (PC+Internet):  {pct_com_acesso:.1f}%")
-    print(f"  2. Conexão adequada:      {pct_conexao_boa:.1f}%")
-    print(f"  3. Formação docente:      {pct_com_formacao:.1f}%")
-    print(f"\n  🎯 ÍNDICE DE PRONTIDÃO:  {indice_prontidao:.1f}%")
-    print(f"     (~{(indice_prontidao/100 * total):.0f} escolas de {total:.0f})")
+    log.info(f"\n📊 PILARES DO ÍNDICE:")
+    log.info(f"  1. Acesso (PC+Internet):  {pct_com_acesso:.1f}%")
+    log.info(f"  2. Conexão adequada:      {pct_conexao_boa:.1f}%")
+    log.info(f"  3. Formação docente:      {pct_com_formacao:.1f}%")
+    log.info(f"\n  🎯 ÍNDICE DE PRONTIDÃO:  {indice_prontidao:.1f}%")
+    log.info(f"     (~{(indice_prontidao/100 * total):.0f} escolas de {total:.0f})")
     
     return {
         'pct_acesso': pct_com_acesso,
@@ -258,20 +278,18 @@ def analisar_paradoxo_ia(dados_alunos, indice_prontidao):
     """
     Analisa o paradoxo entre uso estudantil e capacidade escolar
     """
-    print("\n" + "="*80)
-    print("PARADOXO: USO ESTUDANTIL vs CAPACIDADE ESCOLAR")
-    print("="*80)
+    titulo(log, "PARADOXO: USO ESTUDANTIL vs CAPACIDADE ESCOLAR")
     
     pct_alunos_usam = dados_alunos['brasil']['percentual']
     pct_escolas_prontas = indice_prontidao['indice']
     
-    print(f"\n📊 USO DE IA GENERATIVA:")
-    print(f"  • Alunos que USAM IA:        {pct_alunos_usam:.1f}%")
-    print(f"  • Escolas PRONTAS para IA:   {pct_escolas_prontas:.1f}%")
-    print(f"\n  ⚠️  GAP: {pct_alunos_usam - pct_escolas_prontas:.1f} pontos percentuais")
-    print(f"\n💡 INTERPRETAÇÃO:")
-    print(f"  Estudantes usam IA APESAR da escola, não POR CAUSA da escola")
-    print(f"  Aprendizado acontece de forma autônoma, sem mediação pedagógica")
+    log.info(f"\n📊 USO DE IA GENERATIVA:")
+    log.info(f"  • Alunos que USAM IA:        {pct_alunos_usam:.1f}%")
+    log.info(f"  • Escolas PRONTAS para IA:   {pct_escolas_prontas:.1f}%")
+    log.info(f"\n  ⚠️  GAP: {pct_alunos_usam - pct_escolas_prontas:.1f} pontos percentuais")
+    log.info(f"\n💡 INTERPRETAÇÃO:")
+    log.info(f"  Estudantes usam IA APESAR da escola, não POR CAUSA da escola")
+    log.info(f"  Aprendizado acontece de forma autônoma, sem mediação pedagógica")
     
     return {
         'gap': pct_alunos_usam - pct_escolas_prontas,
@@ -283,10 +301,12 @@ def analisar_paradoxo_ia(dados_alunos, indice_prontidao):
 # PARTE 3: VISUALIZAÇÕES
 # ============================================================================
 
+@instrumentar(categoria='render')
 def criar_visualizacoes_completas(indice_prontidao, paradoxo, dados_alunos):
     """
     Cria visualizações consolidadas da análise
     """
+    plt = _pyplot()
     fig = plt.figure(figsize=(18, 12))
     gs = fig.add_gridspec(3, 3, hspace=0.3, wspace=0.3)
     
@@ -406,13 +426,23 @@ def criar_visualizacoes_completas(indice_prontidao, paradoxo, dados_alunos):
     
     plt.suptitle('Análise do Triplo Déficit Tecnológico - TIC Educação 2024',
                  fontsize=16, fontweight='bold', y=0.98)
-    
+
     return fig
 
+
+def salvar_visualizacoes(indice_prontidao, paradoxo, dados_alunos, caminho, dpi=300):
+    """
+    Desenha e salva a figura consolidada (contrato de tic/figuras.py)
+    """
+    fig = criar_visualizacoes_completas(indice_prontidao, paradoxo, dados_alunos)
+    fig.savefig(caminho, dpi=dpi, bbox_inches='tight')
+    _pyplot().close(fig)
+
 # ============================================================================
 # PARTE 4: EXPORTAÇÃO DE DADOS
 # ============================================================================
 
+@instrumentar(categoria='escrita')
 def exportar_dados_consolidados(indice_prontidao, paradoxo, dados_alunos, output_dir='./resultados'):
     """
     Exporta todos os dados processados em CSV
@@ -439,7 +469,7 @@ def exportar_dados_consolidados(indice_prontidao, paradoxo, dados_alunos, output
     }])
     
     df_indice.to_csv(f'{output_dir}/indice_prontidao.csv', index=False, encoding='utf-8-sig')
-    print(f"\n✅ Salvo: {output_dir}/indice_prontidao.csv")
+    log.info(f"\n✅ Salvo: {output_dir}/indice_prontidao.csv")
     
     # 2. Dados do Paradoxo
     df_paradoxo = pd.DataFrame([{
@@ -457,7 +487,7 @@ def exportar_dados_consolidados(indice_prontidao, paradoxo, dados_alunos, output
     }])
     
     df_paradoxo.to_csv(f'{output_dir}/paradoxo_ia.csv', index=False, encoding='utf-8-sig')
-    print(f"✅ Salvo: {output_dir}/paradoxo_ia.csv")
+    log.info(f"✅ Salvo: {output_dir}/paradoxo_ia.csv")
     
     # 3. Dados de uso de IA por alunos
     df_alunos = pd.DataFrame([{
@@ -468,9 +498,9 @@ def exportar_dados_consolidados(indice_prontidao, paradoxo, dados_alunos, output
     }])
     
     df_alunos.to_csv(f'{output_dir}/uso_ia_alunos.csv', index=False, encoding='utf-8-sig')
-    print(f"✅ Salvo: {output_dir}/uso_ia_alunos.csv")
+    log.info(f"✅ Salvo: {output_dir}/uso_ia_alunos.csv")
     
-    print(f"\n📂 Todos os dados salvos em: {output_dir}/")
+    log.info(f"\n📂 Todos os dados salvos em: {output_dir}/")
 
 # ============================================================================
 # EXECUÇÃO PRINCIPAL
@@ -481,7 +511,9 @@ def executar_analise_completa(
     arquivo_escolas_2024='tic_educacao_2024_escolas_tabela_total_v1.0.xlsx',
     arquivo_alunos_2024='tic_educacao_2024_alunos_tabela_total_v1.0.xlsx',
     output_dir='./resultados',
-    debug=False
+    debug=False,
+    graficos=True,
+    previa=False
 ):
     """
     Função principal que executa toda a análise
@@ -498,64 +530,60 @@ def executar_analise_completa(
         Diretório onde salvar os resultados
     debug : bool
         Se True, lista todas as abas disponíveis antes de carregar
+    graficos : bool
+        Se False, não gera o PNG (matplotlib não é importado)
+    previa : bool
+        PNG rápido em baixa resolução (analise_completa_2024.previa.png)
     """
-    print("\n" + "="*80)
-    print("ANÁLISE COMPLETA DO TRIPLO DÉFICIT TECNOLÓGICO")
-    print("TIC Educação 2023 + 2024")
-    print("="*80)
+    titulo(log, "ANÁLISE COMPLETA DO TRIPLO DÉFICIT TECNOLÓGICO\nTIC Educação 2023 + 2024")
     
     # Modo debug: listar abas disponíveis
     if debug:
-        print("\n🔍 MODO DEBUG ATIVADO - Listando abas disponíveis:")
-        print("\n" + "-"*80)
-        print("ARQUIVO: Escolas 2024")
+        log.info("\n🔍 MODO DEBUG ATIVADO - Listando abas disponíveis:")
+        titulo(log, "ARQUIVO: Escolas 2024", '-')
         listar_abas_disponiveis(arquivo_escolas_2024)
-        print("\n" + "-"*80)
-        print("ARQUIVO: Alunos 2024")
+        titulo(log, "ARQUIVO: Alunos 2024", '-')
         listar_abas_disponiveis(arquivo_alunos_2024)
-        print("\n" + "-"*80)
     
     # 1. Carregar dados
-    print("\n📥 ETAPA 1: CARREGANDO DADOS...")
+    log.info("\n📥 ETAPA 1: CARREGANDO DADOS...")
     dados_escolas_2024 = carregar_dados_escolas_2024(arquivo_escolas_2024)
     dados_alunos_2024 = carregar_dados_alunos_2024(arquivo_alunos_2024)
     
     # 2. Calcular Índice de Prontidão
-    print("\n📊 ETAPA 2: CALCULANDO ÍNDICE DE PRONTIDÃO...")
+    log.info("\n📊 ETAPA 2: CALCULANDO ÍNDICE DE PRONTIDÃO...")
     indice_prontidao = calcular_indice_prontidao(dados_escolas_2024)
     
     # 3. Analisar Paradoxo
-    print("\n⚠️  ETAPA 3: ANALISANDO PARADOXO...")
+    log.info("\n⚠️  ETAPA 3: ANALISANDO PARADOXO...")
     paradoxo = analisar_paradoxo_ia(dados_alunos_2024, indice_prontidao)
     
     # 4. Criar Visualizações
-    print("\n📈 ETAPA 4: GERANDO VISUALIZAÇÕES...")
-    fig = criar_visualizacoes_completas(indice_prontidao, paradoxo, dados_alunos_2024)
-    
-    # Salvar gráfico
     Path(output_dir).mkdir(exist_ok=True)
-    fig.savefig(f'{output_dir}/analise_completa_2024.png', dpi=300, bbox_inches='tight')
-    print(f"✅ Gráfico salvo: {output_dir}/analise_completa_2024.png")
+    if graficos:
+        log.info("\n📈 ETAPA 4: GERANDO VISUALIZAÇÕES...")
+        # Redesenha só se os dados ou o código da figura mudaram
+        status = renderizar([figura(salvar_visualizacoes, f'{output_dir}/analise_completa_2024.png',
+                                    indice_prontidao=indice_prontidao, paradoxo=paradoxo,
+                                    dados_alunos=dados_alunos_2024)], previa=previa)
+        for caminho, situacao in status.items():
+            log.info(f"✅ Gráfico salvo: {caminho}{' (cache)' if situacao == 'cache' else ''}")
     
     # 5. Exportar dados
-    print("\n💾 ETAPA 5: EXPORTANDO DADOS...")
+    log.info("\n💾 ETAPA 5: EXPORTANDO DADOS...")
     exportar_dados_consolidados(indice_prontidao, paradoxo, dados_alunos_2024, output_dir)
     
     # 6. Resumo final
-    print("\n" + "="*80)
-    print("✅ ANÁLISE CONCLUÍDA COM SUCESSO!")
-    print("="*80)
-    print(f"\n📊 PRINCIPAIS RESULTADOS:")
-    print(f"  • Índice de Prontidão: {indice_prontidao['indice']:.1f}%")
-    print(f"  • Alunos que usam IA: {dados_alunos_2024['brasil']['percentual']:.1f}%")
-    print(f"  • Gap (Paradoxo): {paradoxo['gap']:.1f} pontos percentuais")
-    print(f"\n📂 Arquivos gerados em: {output_dir}/")
-    print(f"  • analise_completa_2024.png")
-    print(f"  • indice_prontidao.csv")
-    print(f"  • paradoxo_ia.csv")
-    print(f"  • uso_ia_alunos.csv")
-    
-    plt.show()
+    titulo(log, "✅ ANÁLISE CONCLUÍDA COM SUCESSO!")
+    log.info(f"\n📊 PRINCIPAIS RESULTADOS:")
+    log.info(f"  • Índice de Prontidão: {indice_prontidao['indice']:.1f}%")
+    log.info(f"  • Alunos que usam IA: {dados_alunos_2024['brasil']['percentual']:.1f}%")
+    log.info(f"  • Gap (Paradoxo): {paradoxo['gap']:.1f} pontos percentuais")
+    log.info(f"\n📂 Arquivos gerados em: {output_dir}/")
+    log.info(f"  • analise_completa_2024.png")
+    log.info(f"  • indice_prontidao.csv")
+    log.info(f"  • paradoxo_ia.csv")
+    log.info(f"  • uso_ia_alunos.csv")
     
     return {
         'indice_prontidao': indice_prontidao,
@@ -588,16 +616,23 @@ if __name__ == "__main__":
     Isso listará todas as abas disponíveis nos arquivos antes de carregar.
     """
     
+    parser = argparse.ArgumentParser(description='Triplo déficit tecnológico - TIC Educação 2023/2024')
+    parser.add_argument('--previa', action='store_true',
+                        help='Figura em baixa resolução (*.previa.png), para iterar rápido')
+    adicionar_argumento_perfil(parser, './resultados/perfil_edu_br.json')
+    adicionar_argumentos_log(parser)
+    args = parser.parse_args()
+    configurar_perfil(args)
+    configurar_log_args(args)
+    
     # Executar análise (sem debug)
-    resultados = executar_analise_completa()
+    resultados = executar_analise_completa(previa=args.previa)
     
     # Para ativar modo debug, descomente a linha abaixo:
     # resultados = executar_analise_completa(debug=True)
     
     # Acessar resultados individuais se necessário
-    print("\n" + "="*80)
-    print("DADOS DISPONÍVEIS PARA ANÁLISES ADICIONAIS:")
-    print("="*80)
-    print("\nresultados['indice_prontidao'] - Dados do índice de prontidão")
-    print("resultados['paradoxo'] - Análise do paradoxo uso vs capacidade")
-    print("resultados['dados_alunos'] - Dados de uso de IA pelos alunos")
\ No newline at end of file
+    titulo(log, "DADOS DISPONÍVEIS PARA ANÁLISES ADICIONAIS:")
+    log.info("\nresultados['indice_prontidao'] - Dados do índice de prontidão")
+    log.info("resultados['paradoxo'] - Análise do paradoxo uso vs capacidade")
+    log.info("resultados['dados_alunos'] - Dados de uso de IA pelos alunos")
\ No newline at end of file
@@ -0,0 +1,306 @@
+"""
+PAINEL HTML ESTÁTICO - INDICADORES CONSOLIDADOS
+TIC Educação 2024
+
+Estágio executado depois do consolidador: empacota o cubo de indicadores em
+um pacote de dados colunar e compacto e gera uma página HTML autocontida
+(sem dependências externas) com filtros por região, área, etapa de ensino e
+demais recortes, feitos no navegador.
+
+Pacote (resultados/painel/painel_dados.json, também embutido no HTML):
+- dicionários: medidas, dimensões, grupos, anos
+- colunas paralelas só com as células preenchidas do cubo:
+  medida, dimensao, grupo, ano (códigos inteiros) e valor
+Inteiros repetidos e sem chaves por linha comprimem bem com gzip
+(painel_dados.json.gz é gravado junto, para servir por HTTP).
+
+Uso:
+    python painel_html.py                       # usa resultados/cubo (reconstrói se faltar)
+    python painel_html.py --saida /tmp/painel   # abra /tmp/painel/index.html
+"""
+
+import argparse
+import gzip
+import html
+import json
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+from banco_resultados import DB_PADRAO, descricoes_indicadores
+from cubo_indicadores import carregar_cubo, construir_cubo, pasta_do_cubo
+from tic.instrumentacao import adicionar_argumento_perfil, configurar_perfil, instrumentar
+from tic.log import adicionar_argumentos_log, configurar_log_args, obter_logger, titulo
+
+PASTA_PAINEL = './resultados/painel'
+FORMATO_VERSAO = 1
+
+# Casas decimais no pacote (percentuais e contagens; suficiente para exibição)
+CASAS_DECIMAIS = 2
+
+# Recortes com filtro próprio, nesta ordem; os demais vêm depois
+DIMENSOES_FILTRO = ['REGIÃO', 'ÁREA', 'ETAPA DE ENSINO']
+DIMENSAO_REFERENCIA = 'TOTAL'
+
+log = obter_logger('painel_html')
+
+
+# ============================================================================
+# PACOTE DE DADOS
+# ============================================================================
+
+@instrumentar(categoria='agregacao')
+def empacotar_cubo(cubo, descricoes=None):
+    """
+    Converte o cubo denso (medida × recorte × ano) no pacote colunar esparso
+
+    Returns:
+        dict pronto para json.dump
+    """
+    dados = np.asarray(cubo.dados)
+    pos_medida, pos_recorte, pos_ano = np.nonzero(np.isfinite(dados))
+    valores = np.round(dados[pos_medida, pos_recorte, pos_ano], CASAS_DECIMAIS)
+
+    dimensoes = list(dict.fromkeys(dimensao for dimensao, _ in cubo.recortes))
+    grupos = list(dict.fromkeys(grupo for _, grupo in cubo.recortes))
+    pos_dimensao = {d: i for i, d in enumerate(dimensoes)}
+    pos_grupo = {g: i for i, g in enumerate(grupos)}
+    codigo_dimensao = np.array([pos_dimensao[d] for d, _ in cubo.recortes], dtype=np.int64)
+    codigo_grupo = np.array([pos_grupo[g] for _, g in cubo.recortes], dtype=np.int64)
+
+    indicadores = list(dict.fromkeys(m.split('.', 1)[0] for m in cubo.medidas))
+    descricoes = descricoes or {}
+
+    return {
+        'formato_versao': FORMATO_VERSAO,
+        'gerado_em': datetime.now().isoformat(timespec='seconds'),
+        'indicadores': {i: (descricoes.get(i) or {}).get('descricao') or i.upper() for i in indicadores},
+        'medidas': list(cubo.medidas),
+        'dimensoes': dimensoes,
+        'grupos': grupos,
+        'anos': list(cubo.anos),
+        'colunas': {
+            'medida': pos_medida.tolist(),
+            'dimensao': codigo_dimensao[pos_recorte].tolist(),
+            'grupo': codigo_grupo[pos_recorte].tolist(),
+            'ano': pos_ano.tolist(),
+            # Valores inteiros sem ".0" (contagens)
+            'valor': [int(v) if v.is_integer() else v for v in valores.tolist()],
+        },
+    }
+
+
+def salvar_pacote(pacote, pasta):
+    """Grava o pacote em JSON compacto e a versão gzip"""
+    texto = json.dumps(pacote, ensure_ascii=False, separators=(',', ':'))
+    caminho = Path(pasta) / 'painel_dados.json'
+    caminho.write_text(texto, encoding='utf-8')
+    with gzip.open(caminho.with_suffix('.json.gz'), 'wt', encoding='utf-8', compresslevel=9) as f:
+        f.write(texto)
+    return caminho, texto
+
+
+# ============================================================================
+# PÁGINA HTML
+# ============================================================================
+
+MODELO_HTML = """<!DOCTYPE html>
+<html lang="pt-BR">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{titulo}</title>
+<style>
+body {{ font-family: system-ui, sans-serif; margin: 0; color: #222; background: #f6f7f9; }}
+header {{ background: #1f3b57; color: #fff; padding: 16px 24px; }}
+header h1 {{ margin: 0; font-size: 20px; }}
+header p {{ margin: 4px 0 0; opacity: .8; font-size: 13px; }}
+main {{ display: flex; gap: 24px; padding: 24px; align-items: flex-start; }}
+aside {{ flex: 0 0 260px; background: #fff; padding: 16px; border-radius: 8px; }}
+section {{ flex: 1; background: #fff; padding: 16px; border-radius: 8px; overflow-x: auto; }}
+label.campo {{ display: block; font-weight: 600; margin: 12px 0 4px; }}
+select {{ width: 100%; }}
+fieldset {{ border: 1px solid #ddd; border-radius: 6px; margin: 12px 0 0; }}
+fieldset label {{ display: block; font-size: 13px; }}
+legend {{ font-weight: 600; font-size: 13px; }}
+table {{ border-collapse: collapse; width: 100%; font-size: 13px; }}
+th, td {{ padding: 4px 8px; border-bottom: 1px solid #eee; text-align: left; }}
+td.num {{ text-align: right; font-variant-numeric: tabular-nums; }}
+tr.referencia {{ font-weight: 600; background: #eef3f8; }}
+.barra {{ background: #4a90c2; height: 12px; border-radius: 2px; }}
+.vazio {{ color: #888; }}
+</style>
+</head>
+<body>
+<header>
+<h1>{titulo}</h1>
+<p>Gerado em {gerado_em} · {n_valores} valores · {n_recortes} recortes</p>
+</header>
+<main>
+<aside>
+<label class="campo" for="indicador">Indicador</label><select id="indicador"></select>
+<label class="campo" for="metrica">Métrica</label><select id="metrica"></select>
+<label class="campo" for="ano">Ano</label><select id="ano"></select>
+<div id="filtros"></div>
+</aside>
+<section>
+<h2 id="descricao"></h2>
+<table><thead id="cabecalho"></thead><tbody id="linhas"></tbody></table>
+</section>
+</main>
+<script type="application/json" id="dados">{dados}</script>
+<script>
+const P = JSON.parse(document.getElementById('dados').textContent);
+const C = P.colunas, N = C.valor.length;
+const FILTRO = {filtro};
+const REFERENCIA = {referencia};
+const $ = id => document.getElementById(id);
+const esc = t => String(t).replace(/[&<>"]/g, c => ({{'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;'}})[c]);
+const fmt = v => v === undefined ? '–' : v.toLocaleString('pt-BR', {{maximumFractionDigits: 1}});
+
+function opcoes(sel, itens) {{
+  sel.innerHTML = itens.map(([v, t]) => `<option value="${{v}}">${{t}}</option>`).join('');
+}}
+
+// Grupos presentes por dimensão (na ordem do pacote)
+const gruposPorDim = P.dimensoes.map(() => []);
+for (let i = 0; i < N; i++) {{
+  const g = gruposPorDim[C.dimensao[i]];
+  if (!g.includes(C.grupo[i])) g.push(C.grupo[i]);
+}}
+const ordemDims = P.dimensoes.map((d, i) => i).filter(i => P.dimensoes[i] !== REFERENCIA)
+  .sort((a, b) => {{
+    const ia = FILTRO.indexOf(P.dimensoes[a]), ib = FILTRO.indexOf(P.dimensoes[b]);
+    return (ia < 0 ? 99 : ia) - (ib < 0 ? 99 : ib);
+  }});
+$('filtros').innerHTML = ordemDims.map(d => `<fieldset><legend>
+  <label><input type="checkbox" data-dim="${{d}}" ${{FILTRO.includes(P.dimensoes[d]) ? 'checked' : ''}}>
+  ${{esc(P.dimensoes[d])}}</label></legend>` + gruposPorDim[d].map(g =>
+  `<label><input type="checkbox" data-dim="${{d}}" data-grupo="${{g}}" checked> ${{esc(P.grupos[g])}}</label>`
+).join('') + '</fieldset>').join('');
+
+const indicadores = Object.keys(P.indicadores);
+opcoes($('indicador'), indicadores.map(i => [i, esc(`${{i.toUpperCase()}} – ${{P.indicadores[i]}}`)]));
+opcoes($('ano'), P.anos.map((a, i) => [i, a]).reverse());
+
+function atualizarMetricas() {{
+  const ind = $('indicador').value;
+  opcoes($('metrica'), P.medidas.map((m, i) => [i, m]).filter(([i, m]) => m.startsWith(ind + '.'))
+    .map(([i, m]) => [i, esc(m.slice(ind.length + 1))]));
+}}
+
+function selecionados() {{
+  const dims = new Set(), grupos = new Set();
+  document.querySelectorAll('#filtros input[data-dim]').forEach(c => {{
+    if (!c.checked) return;
+    if (c.dataset.grupo === undefined) dims.add(+c.dataset.dim);
+    else grupos.add(c.dataset.dim + '|' + c.dataset.grupo);
+  }});
+  return {{dims, grupos}};
+}}
+
+function desenhar() {{
+  const ind = $('indicador').value, ano = +$('ano').value, destaque = +$('metrica').value;
+  const medidas = P.medidas.map((m, i) => i).filter(i => P.medidas[i].startsWith(ind + '.'));
+  const {{dims, grupos}} = selecionados();
+  const tabela = new Map();  // "dim|grupo" → {{medida: valor}}
+  for (let i = 0; i < N; i++) {{
+    if (C.ano[i] !== ano || !medidas.includes(C.medida[i])) continue;
+    const d = C.dimensao[i], chave = d + '|' + C.grupo[i];
+    const ref = P.dimensoes[d] === REFERENCIA;
+    if (!ref && !(dims.has(d) && grupos.has(chave))) continue;
+    if (!tabela.has(chave)) tabela.set(chave, {{d, g: C.grupo[i], ref, v: {{}}}});
+    tabela.get(chave).v[C.medida[i]] = C.valor[i];
+  }}
+  const linhas = [...tabela.values()].sort((a, b) => (b.ref - a.ref) ||
+    (ordemDims.indexOf(a.d) - ordemDims.indexOf(b.d)));
+  const maximo = Math.max(1e-9, ...linhas.map(l => Math.abs(l.v[destaque] ?? 0)));
+
+  $('descricao').textContent = P.indicadores[ind] + ' – ' + P.anos[ano];
+  $('cabecalho').innerHTML = '<tr><th>Recorte</th><th>Grupo</th>' +
+    medidas.map(m => `<th>${{esc(P.medidas[m].slice(ind.length + 1))}}</th>`).join('') + '<th></th></tr>';
+  $('linhas').innerHTML = linhas.length ? linhas.map(l => `<tr class="${{l.ref ? 'referencia' : ''}}">
+    <td>${{esc(P.dimensoes[l.d])}}</td><td>${{esc(P.grupos[l.g])}}</td>` +
+    medidas.map(m => `<td class="num">${{fmt(l.v[m])}}</td>`).join('') +
+    `<td style="width:30%"><div class="barra" style="width:${{100 * Math.abs(l.v[destaque] ?? 0) / maximo}}%">
+    </div></td></tr>`).join('') :
+    `<tr><td class="vazio" colspan="${{medidas.length + 3}}">Nenhum recorte selecionado</td></tr>`;
+}}
+
+$('indicador').addEventListener('change', () => {{ atualizarMetricas(); desenhar(); }});
+['metrica', 'ano'].forEach(id => $(id).addEventListener('change', desenhar));
+$('filtros').addEventListener('change', desenhar);
+atualizarMetricas();
+desenhar();
+</script>
+</body>
+</html>
+"""
+
+
+def gerar_html(pacote, texto_pacote, titulo='Painel TIC Educação 2024'):
+    """
+    Página autocontida: o pacote vai em um <script type="application/json">
+    e os filtros rodam no navegador
+    """
+    # "</" não pode aparecer dentro do <script>
+    dados = texto_pacote.replace('</', '<\\/')
+    n_recortes = len({(d, g) for d, g in zip(pacote['colunas']['dimensao'],
+                                             pacote['colunas']['grupo'])})
+    return MODELO_HTML.format(
+        titulo=html.escape(titulo),
+        gerado_em=html.escape(pacote['gerado_em']),
+        n_valores=len(pacote['colunas']['valor']),
+        n_recortes=n_recortes,
+        dados=dados,
+        filtro=json.dumps(DIMENSOES_FILTRO, ensure_ascii=False),
+        referencia=json.dumps(DIMENSAO_REFERENCIA, ensure_ascii=False),
+    )
+
+
+@instrumentar(categoria='escrita')
+def gerar_painel(db_path=DB_PADRAO, pasta_cubo=None, pasta=PASTA_PAINEL):
+    """
+    Empacota o cubo (padrão: o do banco db_path) e grava painel_dados.json(.gz)
+    e index.html em `pasta`
+
+    Returns:
+        caminho do index.html
+    """
+    pasta_cubo = pasta_cubo or pasta_do_cubo(db_path)
+    if (Path(pasta_cubo) / 'cubo_indice.json').exists():
+        cubo = carregar_cubo(pasta_cubo)
+    else:
+        log.info("⚠️  Cubo não encontrado, construindo a partir do banco de resultados")
+        cubo = construir_cubo(db_path, pasta_cubo)
+
+    descricoes = descricoes_indicadores(db_path) if Path(db_path).exists() else {}
+    pacote = empacotar_cubo(cubo, descricoes)
+
+    Path(pasta).mkdir(parents=True, exist_ok=True)
+    caminho_pacote, texto = salvar_pacote(pacote, pasta)
+    caminho_html = Path(pasta) / 'index.html'
+    caminho_html.write_text(gerar_html(pacote, texto), encoding='utf-8')
+
+    tamanho = len(texto.encode('utf-8')) / 1024
+    tamanho_gz = caminho_pacote.with_suffix('.json.gz').stat().st_size / 1024
+    log.info(f"✅ Pacote: {caminho_pacote} ({len(pacote['colunas']['valor'])} valores, "
+             f"{tamanho:.1f} KB; {tamanho_gz:.1f} KB com gzip)")
+    log.info(f"✅ Painel: {caminho_html} (abra no navegador)")
+    return caminho_html
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Gera o painel HTML estático dos indicadores')
+    parser.add_argument('--db', default=DB_PADRAO, help=f'Banco de resultados (padrão: {DB_PADRAO})')
+    parser.add_argument('--cubo', help='Pasta do cubo (padrão: cubo/ na pasta do banco)')
+    parser.add_argument('--saida', default=PASTA_PAINEL, help=f'Pasta do painel (padrão: {PASTA_PAINEL})')
+    adicionar_argumento_perfil(parser, './resultados/perfil_painel.json')
+    adicionar_argumentos_log(parser)
+    args = parser.parse_args()
+    configurar_perfil(args)
+    configurar_log_args(args)
+
+    titulo(log, "PAINEL HTML - TIC EDUCAÇÃO 2024")
+    gerar_painel(args.db, args.cubo, args.saida)
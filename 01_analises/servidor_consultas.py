@@ -0,0 +1,202 @@
+"""
+SERVIDOR LOCAL DE CONSULTAS - INDICADORES TIC
+TIC Educação 2024
+
+Serviço HTTP/JSON de longa duração, só com a biblioteca padrão
+(http.server). Os workbooks são abertos uma vez e ficam em memória:
+- abas parseadas: cache LRU de tic/fatos.py (ativar_cache_abas)
+- indicadores calculados: cache LRU de consulta_indicadores.py, por indicador
+  e versão do workbook
+
+A versão de um workbook é a sua assinatura (mtime, tamanho). Quando o
+arquivo muda, a próxima consulta, ou o vigia em segundo plano, recalcula o
+indicador a partir do arquivo novo.
+
+Rotas:
+    GET /indicadores
+    GET /indicador/a3?dimensao=REGIÃO[&grupo=Norte][&ano=2024][&metrica=percentual_adequada]
+    GET /status
+
+Filtros desconhecidos ou inválidos (ex.: ano=abc) respondem 400 com {'erro': ...}.
+
+Uso:
+    python servidor_consultas.py --aquecer          # http://127.0.0.1:8765
+    curl 'http://127.0.0.1:8765/indicador/a3?dimensao=REGI%C3%83O'
+    python -m tic servir --porta 8765
+"""
+
+import argparse
+import json
+import logging
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from consulta_indicadores import (INDICADORES, MAXIMO_ABAS, MAXIMO_INDICADORES,
+                                  CacheIndicadores, filtrar_linhas)
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from tic.instrumentacao import adicionar_argumento_perfil, configurar_perfil
+from tic.log import (adicionar_argumentos_log, configurar_log_args, desativar_relatorio,
+                     obter_logger, titulo)
+
+HOST_PADRAO = '127.0.0.1'
+PORTA_PADRAO = 8765
+INTERVALO_VIGIA_S = 2.0
+
+# Filtros aceitos em /indicador/<id> (os de filtrar_linhas)
+PARAMETROS_CONSULTA = ['dimensao', 'grupo', 'ano', 'metrica']
+
+log = obter_logger('servidor')
+
+
+def vigiar(cache, intervalo):
+    """Recalcula em segundo plano os indicadores cujo workbook mudou"""
+    while True:
+        time.sleep(intervalo)
+        for indicador, pasta in cache.desatualizados():
+            try:
+                cache.obter(indicador, pasta)
+            except Exception:
+                log.exception(f"✗ Falha ao recarregar {indicador}")
+
+
+# ============================================================================
+# HTTP
+# ============================================================================
+
+def validar_parametros(parametros):
+    """
+    Filtros da query string prontos para filtrar_linhas (ano como int), ou a
+    mensagem de erro se algum for desconhecido ou inválido
+    """
+    desconhecidos = [chave for chave in parametros if chave not in PARAMETROS_CONSULTA]
+    if desconhecidos:
+        return None, (f"Parâmetro(s) desconhecido(s): {', '.join(desconhecidos)} "
+                      f"(aceitos: {', '.join(PARAMETROS_CONSULTA)})")
+    filtros = dict(parametros)
+    if 'ano' in filtros:
+        try:
+            filtros['ano'] = int(filtros['ano'])
+        except ValueError:
+            return None, f"ano deve ser um número inteiro (recebido: {filtros['ano']!r})"
+    return filtros, None
+
+
+class ManipuladorConsultas(BaseHTTPRequestHandler):
+    """Rotas GET em JSON; o cache fica em self.server.cache"""
+
+    def do_GET(self):
+        inicio = time.perf_counter()
+        partes = urlsplit(self.path)
+        rota = unquote(partes.path).rstrip('/') or '/'
+        parametros = {chave: valores[-1] for chave, valores in parse_qs(partes.query).items()}
+        cache = self.server.cache
+
+        try:
+            if rota == '/indicadores':
+                corpo = {indicador: {'arquivo': arquivo, 'aba': aba}
+                         for indicador, (_, _, arquivo, aba) in INDICADORES.items()}
+            elif rota.startswith('/indicador/'):
+                indicador = rota.split('/', 2)[2].lower()
+                if indicador not in INDICADORES:
+                    return self._responder(404, {'erro': f"Indicador desconhecido: {indicador}",
+                                                 'disponiveis': list(INDICADORES)})
+                filtros, erro = validar_parametros(parametros)
+                if erro:
+                    return self._responder(400, {'erro': erro})
+                entrada, situacao = cache.obter(indicador, self.server.pasta)
+                linhas = filtrar_linhas(entrada['linhas'], **filtros)
+                corpo = {'indicador': indicador, 'filtros': filtros, 'cache': situacao,
+                         'n_linhas': len(linhas), 'linhas': linhas}
+            elif rota == '/status':
+                corpo = {'indicadores_em_cache': cache.calculados(), **cache.resumo(),
+                         'no_ar_s': round(time.time() - self.server.inicio, 1)}
+            else:
+                return self._responder(404, {'erro': f"Rota desconhecida: {rota}",
+                                             'rotas': ['/indicadores', '/indicador/<id>', '/status']})
+        except FileNotFoundError as e:
+            return self._responder(404, {'erro': f"Workbook não encontrado: {e.filename}"})
+        except Exception as e:
+            log.exception(f"✗ Erro em {self.path}")
+            return self._responder(500, {'erro': str(e)})
+
+        corpo['tempo_ms'] = round((time.perf_counter() - inicio) * 1000, 2)
+        self._responder(200, corpo)
+
+    def _responder(self, status, corpo):
+        dados = json.dumps(corpo, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(dados)))
+        self.end_headers()
+        self.wfile.write(dados)
+
+    def log_message(self, formato, *args):
+        log.debug(f"{self.address_string()} {formato % args}")
+
+
+def criar_servidor(host=HOST_PADRAO, porta=PORTA_PADRAO, pasta='.',
+                   maximo_indicadores=MAXIMO_INDICADORES, maximo_abas=MAXIMO_ABAS):
+    """Servidor HTTP (uma thread por requisição) com o cache de indicadores"""
+    servidor = ThreadingHTTPServer((host, porta), ManipuladorConsultas)
+    servidor.daemon_threads = True
+    servidor.cache = CacheIndicadores(maximo_indicadores, maximo_abas)
+    servidor.pasta = pasta
+    servidor.inicio = time.time()
+    return servidor
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Servidor local de consultas aos indicadores TIC')
+    parser.add_argument('--host', default=HOST_PADRAO, help=f'Endereço (padrão: {HOST_PADRAO})')
+    parser.add_argument('--porta', type=int, default=PORTA_PADRAO, help=f'Porta (padrão: {PORTA_PADRAO})')
+    parser.add_argument('--aquecer', action='store_true',
+                        help='Calcula todos os indicadores ao iniciar')
+    parser.add_argument('--maximo-abas', type=int, default=MAXIMO_ABAS,
+                        help=f'Abas parseadas em cache (padrão: {MAXIMO_ABAS})')
+    parser.add_argument('--maximo-indicadores', type=int, default=MAXIMO_INDICADORES,
+                        help=f'Indicadores calculados em cache (padrão: {MAXIMO_INDICADORES})')
+    parser.add_argument('--intervalo', type=float, default=INTERVALO_VIGIA_S,
+                        help=f'Segundos entre verificações dos workbooks; 0 desliga o vigia '
+                             f'(padrão: {INTERVALO_VIGIA_S})')
+    adicionar_argumento_perfil(parser, './resultados/perfil_servidor.json')
+    adicionar_argumentos_log(parser)
+    args = parser.parse_args()
+    configurar_perfil(args)
+    configurar_log_args(args)
+    desativar_relatorio()
+
+    # Banners das análises só com -v (o servidor registra cada cálculo)
+    if not log.isEnabledFor(logging.DEBUG):
+        for indicador in INDICADORES:
+            obter_logger(f'analise_{indicador}').setLevel(logging.WARNING)
+
+    servidor = criar_servidor(args.host, args.porta, maximo_indicadores=args.maximo_indicadores,
+                              maximo_abas=args.maximo_abas)
+
+    titulo(log, "SERVIDOR DE CONSULTAS - TIC EDUCAÇÃO 2024")
+    if args.aquecer:
+        for indicador in INDICADORES:
+            try:
+                servidor.cache.obter(indicador, servidor.pasta)
+            except FileNotFoundError as e:
+                log.warning(f"⚠️  {indicador}: workbook não encontrado ({e.filename})")
+
+    if args.intervalo > 0:
+        threading.Thread(target=vigiar, args=(servidor.cache, args.intervalo), daemon=True).start()
+
+    log.info(f"🌐 http://{args.host}:{args.porta}/indicador/a3?dimensao=REGIÃO  (Ctrl+C encerra)")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        log.info("\n✓ Servidor encerrado")
+    finally:
+        servidor.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -5,36 +5,47 @@ FASE 1: Extração e Preparação de Dados - TIC Educação 2024 (Escolas)
 Este script:
 1. Lê o arquivo Excel com dados TIC Educação 2024 - Escolas
 2. Extrai as sheets mais relevantes para cluster analysis
-3. Transforma em formato estruturado (DataFrame)
-4. Salva em CSV e JSON para análise posterior
+3. Transforma em uma tabela de fatos longa (modelo canônico, tic/fatos.py)
+4. Pivota os fatos no dataset consolidado e salva nos formatos de --formatos
+   (Parquet por padrão, CSV sem pyarrow; tic/saida.py)
 
 Autor: [Seu nome]
 Data: 2025
 """
 
+import argparse
 import pandas as pd
 import numpy as np
-import openpyxl
+import sys
 from pathlib import Path
 import json
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from tic.cli import ARQUIVOS_PADRAO, SHEETS_PRIORITARIAS
+from tic.esquema import aplicar_esquema
+from tic.fatos import (ano_do_arquivo, carregar_fatos, construir_tabela_fatos, origem_fatos,
+                       pivotar_aba, pivotar_features, salvar_fatos)
+from tic.saida import salvar_tabela, pyarrow_disponivel, ESCRITORES
+from tic.instrumentacao import adicionar_argumento_perfil, configurar_perfil
+from tic.log import adicionar_argumentos_log, configurar_log_args, linha, obter_logger, titulo
+
+log = obter_logger('extracao')
+
 # ============================================================================
 # CONFIGURAÇÕES
 # ============================================================================
 
-# Caminho do arquivo (ajuste conforme necessário)
-ARQUIVO_EXCEL = 'tic_educacao_2024_escolas_tabela_total_v1.0.xlsx'
+# Caminho do arquivo (--arquivo escolhe outra versão do mesmo ano)
+ARQUIVO_EXCEL = ARQUIVOS_PADRAO['escolas']
+ANO_EXTRACAO = ano_do_arquivo(ARQUIVO_EXCEL)
 PASTA_OUTPUT = 'dados_processados'
+ARQUIVO_FATOS = f'{PASTA_OUTPUT}/fatos_escolas_2024.npz'
 
-# Sheets prioritárias para extração
-SHEETS_PRIORITARIAS = {
-    'infraestrutura': ['A1', 'B1', 'B1C', 'B2'],
-    'conectividade': ['A2', 'A3_1', 'A4', 'C1'],
-    'gestao_uso': ['E1', 'E1A', 'F1', 'F2', 'G4'],
-    'contexto': ['K3', 'K6']
-}
+# Formatos do dataset consolidado (Parquet se pyarrow estiver instalado)
+FORMATOS_SAIDA = ['parquet'] if pyarrow_disponivel() else ['csv']
 
-# Todas as sheets em lista plana
+# Sheets prioritárias para extração em lista plana (SHEETS_PRIORITARIAS, por grupo,
+# fica em tic/cli.py: o vigia planeja a extração incremental com a mesma lista)
 TODAS_SHEETS = [s for grupo in SHEETS_PRIORITARIAS.values() for s in grupo]
 
 # ============================================================================
@@ -44,114 +55,7 @@ TODAS_SHEETS = [s for grupo in SHEETS_PRIORITARIAS.values() for s in grupo]
 def criar_pasta_output():
     """Cria pasta para arquivos de saída se não existir"""
     Path(PASTA_OUTPUT).mkdir(exist_ok=True)
-    print(f"✓ Pasta '{PASTA_OUTPUT}' criada/verificada")
-
-
-def ler_sheet_estruturada(arquivo, sheet_name, verbose=True):
-    """
-    Lê uma sheet do Excel e retorna DataFrame estruturado.
-    
-    Estrutura esperada das sheets TIC:
-    - Linha 0: Título (ex: "A1 - ESCOLAS COM ACESSO À INTERNET")
-    - Linha 1: Descrição
-    - Linha 2-3: Headers
-    - Linha 4+: Dados
-    """
-    df_raw = pd.read_excel(arquivo, sheet_name=sheet_name, header=None)
-    
-    # Extrair metadados
-    titulo = df_raw.iloc[0, 0] if not pd.isna(df_raw.iloc[0, 0]) else sheet_name
-    
-    # Headers geralmente nas linhas 2-3
-    header_row1 = df_raw.iloc[2].fillna('')
-    header_row2 = df_raw.iloc[3].fillna('')
-    
-    # Combinar headers (quando há sub-colunas)
-    headers = []
-    for i, (h1, h2) in enumerate(zip(header_row1, header_row2)):
-        if h1 and h2 and h1 != h2:
-            headers.append(f"{h1}_{h2}")
-        elif h1:
-            headers.append(str(h1))
-        elif h2:
-            headers.append(str(h2))
-        else:
-            headers.append(f"col_{i}")
-    
-    # Criar DataFrame com dados (linha 4 em diante)
-    df = df_raw.iloc[4:].copy()
-    df.columns = headers[:len(df.columns)]
-    
-    # Limpar linhas vazias
-    df = df.dropna(how='all')
-    
-    # Resetar índice
-    df = df.reset_index(drop=True)
-    
-    if verbose:
-        print(f"  ✓ {sheet_name}: {len(df)} linhas, {len(df.columns)} colunas")
-    
-    return df, titulo
-
-
-def extrair_categorias_e_valores(df):
-    """
-    Extrai estrutura hierárquica das categorias (REGIÃO, ÁREA, etc.)
-    e seus valores correspondentes.
-    
-    Returns:
-        DataFrame pivotado onde cada linha é uma observação única
-    """
-    # Identificar colunas de categoria vs valores
-    primeira_col = df.columns[0]
-    segunda_col = df.columns[1] if len(df.columns) > 1 else None
-    
-    # Criar identificador único para cada observação
-    df['categoria_principal'] = df[primeira_col]
-    df['categoria_secundaria'] = df[segunda_col] if segunda_col else ''
-    
-    # Criar ID único
-    df['observacao_id'] = df['categoria_principal'] + '_' + df['categoria_secundaria'].fillna('Total')
-    df['observacao_id'] = df['observacao_id'].str.replace(' ', '_')
-    
-    return df
-
-
-def processar_sheet(arquivo, sheet_name):
-    """
-    Processa uma sheet completa e retorna DataFrame limpo
-    """
-    df, titulo = ler_sheet_estruturada(arquivo, sheet_name, verbose=False)
-    df = extrair_categorias_e_valores(df)
-    
-    # Adicionar metadados
-    df['sheet_origem'] = sheet_name
-    df['titulo_sheet'] = titulo
-    
-    return df
-
-
-def extrair_features_numericas(df):
-    """
-    Extrai apenas colunas numéricas relevantes (features)
-    Remove colunas de categoria e metadados
-    """
-    # Colunas a ignorar
-    colunas_ignorar = ['categoria_principal', 'categoria_secundaria', 
-                       'observacao_id', 'sheet_origem', 'titulo_sheet']
-    
-    # Selecionar colunas numéricas
-    colunas_numericas = []
-    for col in df.columns:
-        if col not in colunas_ignorar:
-            # Tentar converter para numérico
-            try:
-                pd.to_numeric(df[col], errors='coerce')
-                colunas_numericas.append(col)
-            except:
-                pass
-    
-    return df[colunas_ignorar + colunas_numericas]
+    log.info(f"✓ Pasta '{PASTA_OUTPUT}' criada/verificada")
 
 
 # ============================================================================
@@ -160,115 +64,117 @@ def extrair_features_numericas(df):
 
 def extrair_dados_todas_sheets(arquivo=ARQUIVO_EXCEL, sheets=TODAS_SHEETS):
     """
-    Extrai dados de todas as sheets prioritárias e consolida
+    Extrai todas as sheets prioritárias para a tabela de fatos longa
+    (ano, aba, dimensão, grupo, questão, resposta, valor)
     """
-    print("\n" + "="*70)
-    print("INICIANDO EXTRAÇÃO DE DADOS - TIC EDUCAÇÃO 2024 (ESCOLAS)")
-    print("="*70 + "\n")
+    titulo(log, "INICIANDO EXTRAÇÃO DE DADOS - TIC EDUCAÇÃO 2024 (ESCOLAS)", '=', 70)
     
     # Verificar se arquivo existe
     if not Path(arquivo).exists():
         raise FileNotFoundError(f"Arquivo não encontrado: {arquivo}")
     
-    print(f"✓ Arquivo encontrado: {arquivo}\n")
-    
-    # Dicionário para armazenar DataFrames
-    dfs_por_sheet = {}
+    log.info(f"✓ Arquivo encontrado: {arquivo}\n")
     
-    print("Extraindo sheets...")
-    for i, sheet in enumerate(sheets, 1):
-        try:
-            df = processar_sheet(arquivo, sheet)
-            dfs_por_sheet[sheet] = df
-            print(f"  [{i}/{len(sheets)}] ✓ {sheet}: {len(df)} observações")
-        except Exception as e:
-            print(f"  [{i}/{len(sheets)}] ✗ {sheet}: ERRO - {str(e)}")
+    log.info("Extraindo sheets...")
+    # Estrito: o clustering usa todas as sheets; uma sheet ilegível é erro
+    fatos = construir_tabela_fatos(arquivo, sheets, estrito=True)
     
-    print(f"\n✓ Total de sheets extraídas: {len(dfs_por_sheet)}/{len(sheets)}")
+    n_abas = fatos['aba'].nunique()
+    log.info(f"\n✓ Total de sheets extraídas: {n_abas}/{len(sheets)}")
+    log.info(f"✓ Tabela de fatos: {len(fatos)} linhas, "
+             f"{fatos.memory_usage(deep=True).sum() / 1024**2:.2f} MB em memória")
     
-    return dfs_por_sheet
+    return fatos
 
 
-def criar_dataset_consolidado(dfs_por_sheet):
+def extrair_abas_alteradas(abas, arquivo=ARQUIVO_EXCEL):
+    """
+    Extração incremental: re-extrai só `abas` e substitui as linhas delas na
+    tabela de fatos já salva (sem tabela salva, ou salva a partir de outro
+    workbook, extrai todas as sheets)
     """
-    Cria dataset consolidado com todas as features
+    desconhecidas = [a for a in abas if a not in TODAS_SHEETS]
+    if desconhecidas:
+        raise ValueError(f"Sheet(s) fora da extração: {', '.join(desconhecidas)} "
+                         f"(extraídas: {', '.join(TODAS_SHEETS)})")
+    abas = [s for s in TODAS_SHEETS if s in abas]
+    if not Path(ARQUIVO_FATOS).exists():
+        log.info(f"ℹ️  {ARQUIVO_FATOS} não existe: extraindo todas as sheets")
+        return extrair_dados_todas_sheets(arquivo)
+    origem = origem_fatos(ARQUIVO_FATOS)
+    if origem != Path(arquivo).name:
+        log.info(f"ℹ️  {ARQUIVO_FATOS} veio de {origem or 'origem desconhecida'}: extraindo todas as sheets")
+        return extrair_dados_todas_sheets(arquivo)
+
+    anteriores = carregar_fatos(ARQUIVO_FATOS)
+    mantidas = anteriores[~anteriores['aba'].isin(abas)]
+    log.info(f"♻️  Reaproveitadas da tabela salva: {mantidas['aba'].nunique()} sheets")
+    novos = extrair_dados_todas_sheets(arquivo, abas)
+
+    # Mesma ordem de linhas (e de categorias) de uma extração completa
+    fatos = pd.concat([mantidas, novos], ignore_index=True)
+    for coluna in fatos.select_dtypes('category'):
+        fatos[coluna] = fatos[coluna].astype(str)
+    ordem = fatos['aba'].map({s: i for i, s in enumerate(TODAS_SHEETS)})
+    fatos = fatos.iloc[ordem.argsort(kind='stable')].reset_index(drop=True)
+    return aplicar_esquema(fatos)
+
+
+def criar_dataset_consolidado(fatos):
+    """
+    Cria dataset consolidado com todas as features (pivot da tabela de fatos)
     Cada linha = uma observação (ex: "REGIÃO_Norte", "ÁREA_Urbana")
     Cada coluna = uma feature de uma sheet específica
     """
-    print("\n" + "-"*70)
-    print("CONSOLIDANDO DADOS...")
-    print("-"*70 + "\n")
-    
-    # Identificar todas as observações únicas
-    todas_obs = set()
-    for df in dfs_por_sheet.values():
-        todas_obs.update(df['observacao_id'].unique())
-    
-    print(f"Total de observações únicas encontradas: {len(todas_obs)}")
+    titulo(log, "CONSOLIDANDO DADOS...", '-', 70)
     
-    # Criar DataFrame base com todas as observações
-    df_consolidado = pd.DataFrame({'observacao_id': sorted(todas_obs)})
+    df_consolidado = pivotar_features(fatos)
     
-    # Para cada sheet, adicionar suas features
-    for sheet_name, df in dfs_por_sheet.items():
-        # Selecionar apenas colunas numéricas
-        df_num = extrair_features_numericas(df)
-        
-        # Renomear colunas para incluir origem
-        feature_cols = [c for c in df_num.columns if c not in 
-                       ['categoria_principal', 'categoria_secundaria', 
-                        'observacao_id', 'sheet_origem', 'titulo_sheet']]
-        
-        rename_dict = {col: f"{sheet_name}_{col}" for col in feature_cols}
-        df_num = df_num.rename(columns=rename_dict)
-        
-        # Merge com dataset consolidado
-        df_consolidado = df_consolidado.merge(
-            df_num[['observacao_id'] + list(rename_dict.values())],
-            on='observacao_id',
-            how='left'
-        )
-    
-    print(f"✓ Dataset consolidado: {len(df_consolidado)} observações × {len(df_consolidado.columns)-1} features")
+    log.info(f"Total de observações únicas encontradas: {len(df_consolidado)}")
+    log.info(f"✓ Dataset consolidado: {len(df_consolidado)} observações × {len(df_consolidado.columns)-1} features")
     
     return df_consolidado
 
 
-def salvar_resultados(df_consolidado, dfs_por_sheet):
+def salvar_resultados(df_consolidado, fatos, formatos=FORMATOS_SAIDA, abas_individuais=False,
+                      arquivo=ARQUIVO_EXCEL):
     """
-    Salva resultados em múltiplos formatos
+    Salva resultados nos formatos escolhidos (csv, json, parquet, feather)
     """
-    print("\n" + "-"*70)
-    print("SALVANDO RESULTADOS...")
-    print("-"*70 + "\n")
+    titulo(log, "SALVANDO RESULTADOS...", '-', 70)
     
     criar_pasta_output()
-    
-    # 1. Dataset consolidado em CSV
-    arquivo_csv = f"{PASTA_OUTPUT}/escolas_2024_consolidado.csv"
-    df_consolidado.to_csv(arquivo_csv, index=False, encoding='utf-8-sig')
-    print(f"✓ CSV salvo: {arquivo_csv}")
-    
-    # 2. Dataset consolidado em JSON
-    arquivo_json = f"{PASTA_OUTPUT}/escolas_2024_consolidado.json"
-    df_consolidado.to_json(arquivo_json, orient='records', force_ascii=False, indent=2)
-    print(f"✓ JSON salvo: {arquivo_json}")
-    
-    # 3. Sheets individuais em CSV (para referência)
-    pasta_sheets = f"{PASTA_OUTPUT}/sheets_individuais"
-    Path(pasta_sheets).mkdir(exist_ok=True)
-    
-    for sheet_name, df in dfs_por_sheet.items():
-        arquivo = f"{pasta_sheets}/{sheet_name}.csv"
-        df.to_csv(arquivo, index=False, encoding='utf-8-sig')
-    
-    print(f"✓ Sheets individuais salvas em: {pasta_sheets}/")
+    abas = fatos['aba'].unique().tolist()
+    
+    # 0. Tabela de fatos (modelo canônico, colunas codificadas por dicionário)
+    salvar_fatos(fatos, ARQUIVO_FATOS, origem=Path(arquivo).name)
+    log.info(f"✓ Tabela de fatos salva: {ARQUIVO_FATOS}")
+    
+    # 1-2. Dataset consolidado, uma vez por formato escolhido
+    arquivos = salvar_tabela(
+        df_consolidado, f"{PASTA_OUTPUT}/escolas_2024_consolidado", formatos,
+        metadados={'origem': Path(arquivo).name, 'sheets': abas}
+    )
+    for arquivo in arquivos:
+        log.info(f"✓ Consolidado salvo: {arquivo}")
+    
+    # 3. Sheets individuais (opcional, para referência: são pivots da tabela de fatos)
+    if abas_individuais:
+        pasta_sheets = f"{PASTA_OUTPUT}/sheets_individuais"
+        Path(pasta_sheets).mkdir(exist_ok=True)
+        
+        for sheet_name in abas:
+            salvar_tabela(pivotar_aba(fatos, sheet_name, rotulos=True),
+                          f"{pasta_sheets}/{sheet_name}", formatos)
+        
+        log.info(f"✓ Sheets individuais salvas em: {pasta_sheets}/")
     
     # 4. Metadados
     metadados = {
         'total_observacoes': len(df_consolidado),
         'total_features': len(df_consolidado.columns) - 1,
-        'sheets_extraidas': list(dfs_por_sheet.keys()),
+        'sheets_extraidas': abas,
+        'total_fatos': len(fatos),
         'observacoes_unicas': df_consolidado['observacao_id'].tolist(),
         'colunas': df_consolidado.columns.tolist()
     }
@@ -277,7 +183,7 @@ def salvar_resultados(df_consolidado, dfs_por_sheet):
     with open(arquivo_meta, 'w', encoding='utf-8') as f:
         json.dump(metadados, f, ensure_ascii=False, indent=2)
     
-    print(f"✓ Metadados salvos: {arquivo_meta}")
+    log.info(f"✓ Metadados salvos: {arquivo_meta}")
     
     # 5. Relatório de extração
     relatorio = f"""
@@ -287,7 +193,7 @@ RELATÓRIO DE EXTRAÇÃO - TIC EDUCAÇÃO 2024 (ESCOLAS)
 RESUMO:
 - Total de observações: {len(df_consolidado)}
 - Total de features: {len(df_consolidado.columns) - 1}
-- Sheets processadas: {len(dfs_por_sheet)}
+- Sheets processadas: {len(abas)}
 
 OBSERVAÇÕES EXTRAÍDAS:
 {chr(10).join(['  - ' + obs for obs in sorted(df_consolidado['observacao_id'].unique())[:20]])}
@@ -299,7 +205,7 @@ FEATURES POR CATEGORIA:
     for categoria, sheets in SHEETS_PRIORITARIAS.items():
         relatorio += f"\n{categoria.upper()}:\n"
         for sheet in sheets:
-            if sheet in dfs_por_sheet:
+            if sheet in abas:
                 cols = [c for c in df_consolidado.columns if c.startswith(sheet + '_')]
                 relatorio += f"  - {sheet}: {len(cols)} features\n"
     
@@ -307,24 +213,22 @@ FEATURES POR CATEGORIA:
     with open(arquivo_relatorio, 'w', encoding='utf-8') as f:
         f.write(relatorio)
     
-    print(f"✓ Relatório salvo: {arquivo_relatorio}")
+    log.info(f"✓ Relatório salvo: {arquivo_relatorio}")
 
 
 def gerar_estatisticas_descritivas(df):
     """
     Gera estatísticas descritivas do dataset
     """
-    print("\n" + "="*70)
-    print("ESTATÍSTICAS DESCRITIVAS")
-    print("="*70 + "\n")
+    titulo(log, "ESTATÍSTICAS DESCRITIVAS", '=', 70)
     
     # Info básica
-    print(f"Shape: {df.shape}")
-    print(f"Observações: {len(df)}")
-    print(f"Features: {len(df.columns) - 1}")  # -1 para observacao_id
+    log.info(f"Shape: {df.shape}")
+    log.info(f"Observações: {len(df)}")
+    log.info(f"Features: {len(df.columns) - 1}")  # -1 para observacao_id
     
     # Valores faltantes
-    print("\n--- Valores Faltantes ---")
+    log.info("\n--- Valores Faltantes ---")
     missing = df.isnull().sum()
     missing_pct = (missing / len(df) * 100).round(2)
     missing_df = pd.DataFrame({
@@ -334,56 +238,63 @@ def gerar_estatisticas_descritivas(df):
     missing_df = missing_df[missing_df['Total'] > 0].sort_values('Total', ascending=False)
     
     if len(missing_df) > 0:
-        print(f"\nColunas com valores faltantes: {len(missing_df)}")
-        print(missing_df.head(10))
+        log.info(f"\nColunas com valores faltantes: {len(missing_df)}")
+        for coluna, faltantes in missing_df.head(10).iterrows():
+            log.debug(f"  {coluna}: {faltantes['Total']:.0f} ({faltantes['Percentual (%)']:.2f}%)",
+                      extra=linha("Extração - valores faltantes", feature=coluna,
+                                  total=int(faltantes['Total']),
+                                  percentual=float(faltantes['Percentual (%)'])))
     else:
-        print("✓ Nenhum valor faltante!")
+        log.info("✓ Nenhum valor faltante!")
     
     # Estatísticas das features numéricas
-    print("\n--- Estatísticas das Features Numéricas (amostra) ---")
+    log.info("\n--- Estatísticas das Features Numéricas (amostra) ---")
     numeric_cols = df.select_dtypes(include=[np.number]).columns
     if len(numeric_cols) > 0:
-        print(df[numeric_cols].describe().iloc[:, :5])  # Primeiras 5 colunas
+        # Primeiras 5 colunas, uma linha por feature no relatório final
+        estatisticas = df[numeric_cols].describe().iloc[:, :5].T
+        for feature, valores in estatisticas.iterrows():
+            log.debug(f"  {feature}: média {valores['mean']:.2f}, mín {valores['min']:.2f}, "
+                      f"máx {valores['max']:.2f}",
+                      extra=linha("Extração - estatísticas das features", feature=feature,
+                                  **{k: float(v) for k, v in valores.items()}))
 
 
 # ============================================================================
 # EXECUÇÃO PRINCIPAL
 # ============================================================================
 
-def main():
+def main(formatos=FORMATOS_SAIDA, abas_individuais=False, abas=None, arquivo=ARQUIVO_EXCEL):
     """
     Função principal - executa todo o pipeline
+    (com `abas`, só essas sheets são re-extraídas)
     """
     try:
-        # 1. Extrair dados de todas as sheets
-        dfs_por_sheet = extrair_dados_todas_sheets()
+        # 1. Extrair dados de todas as sheets (tabela de fatos)
+        fatos = extrair_abas_alteradas(abas, arquivo) if abas else extrair_dados_todas_sheets(arquivo)
         
-        # 2. Consolidar em um único dataset
-        df_consolidado = criar_dataset_consolidado(dfs_por_sheet)
+        # 2. Consolidar em um único dataset (pivot dos fatos)
+        df_consolidado = criar_dataset_consolidado(fatos)
         
         # 3. Salvar resultados
-        salvar_resultados(df_consolidado, dfs_por_sheet)
+        salvar_resultados(df_consolidado, fatos, formatos, abas_individuais, arquivo)
         
         # 4. Estatísticas descritivas
         gerar_estatisticas_descritivas(df_consolidado)
         
-        print("\n" + "="*70)
-        print("✓ EXTRAÇÃO CONCLUÍDA COM SUCESSO!")
-        print("="*70 + "\n")
+        titulo(log, "✓ EXTRAÇÃO CONCLUÍDA COM SUCESSO!", '=', 70)
         
-        print("Próximos passos:")
-        print("  1. Revisar o arquivo: dados_processados/escolas_2024_consolidado.csv")
-        print("  2. Analisar estatísticas descritivas")
-        print("  3. Limpar/tratar valores faltantes")
-        print("  4. Normalizar features")
-        print("  5. Executar cluster analysis!")
+        log.info("Próximos passos:")
+        log.info(f"  1. Revisar o arquivo: dados_processados/escolas_2024_consolidado.{formatos[0]}")
+        log.info("  2. Analisar estatísticas descritivas")
+        log.info("  3. Limpar/tratar valores faltantes")
+        log.info("  4. Normalizar features")
+        log.info("  5. Executar cluster analysis!")
         
         return df_consolidado
         
     except Exception as e:
-        print(f"\n✗ ERRO durante execução: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        log.exception(f"\n✗ ERRO durante execução: {str(e)}")
         return None
 
 
@@ -391,5 +302,38 @@ def main():
 # EXECUTAR
 # ============================================================================
 
+def lista_abas(valor):
+    """--abas A1,B1,...: só sheets da extração (nome desconhecido é erro de uso)"""
+    abas = [a.strip() for a in valor.split(',') if a.strip()]
+    desconhecidas = [a for a in abas if a not in TODAS_SHEETS]
+    if not abas or desconhecidas:
+        pedidas = ', '.join(desconhecidas) if desconhecidas else repr(valor)
+        raise argparse.ArgumentTypeError(
+            f"sheet(s) fora da extração: {pedidas} (extraídas: {', '.join(TODAS_SHEETS)})")
+    return abas
+
+
 if __name__ == "__main__":
-    df_resultado = main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description='Extração TIC Educação 2024 (Escolas)')
+    parser.add_argument('--formatos', default=','.join(FORMATOS_SAIDA),
+                        help=f"Formatos do consolidado, separados por vírgula ({', '.join(ESCRITORES)}; "
+                             f"padrão: {','.join(FORMATOS_SAIDA)})")
+    parser.add_argument('--abas-individuais', action='store_true',
+                        help='Também salva cada sheet em sheets_individuais/')
+    parser.add_argument('--arquivo', default=ARQUIVO_EXCEL,
+                        help=f'Workbook de escolas de {ANO_EXTRACAO} (padrão: {ARQUIVO_EXCEL})')
+    parser.add_argument('--abas', type=lista_abas, metavar='A1,B1,...',
+                        help='Extração incremental: re-extrai só essas sheets e reaproveita as demais '
+                             f'da tabela de fatos salva ({ARQUIVO_FATOS})')
+    adicionar_argumento_perfil(parser, 'dados_processados/perfil_extracao.json')
+    adicionar_argumentos_log(parser)
+    args = parser.parse_args()
+    configurar_perfil(args)
+    configurar_log_args(args)
+    if ano_do_arquivo(args.arquivo) != ANO_EXTRACAO:
+        # As saídas (fatos_escolas_2024, escolas_2024_consolidado, ...) e o clustering são de um ano só
+        parser.error(f"--arquivo {args.arquivo}: a extração do clustering é de {ANO_EXTRACAO}")
+    
+    df_resultado = main(args.formatos.split(','), args.abas_individuais, args.abas, args.arquivo)
+    if df_resultado is None:
+        sys.exit(1)
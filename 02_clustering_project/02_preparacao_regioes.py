@@ -1,30 +1,60 @@
+import argparse
 import pandas as pd
 import numpy as np
 from sklearn.preprocessing import StandardScaler
-import matplotlib.pyplot as plt
-import seaborn as sns
-
-print("="*70)
-print("FASE 1: PREPARAÇÃO DE DADOS - CLUSTERING POR REGIÃO")
-print("="*70)
-
-# 1. CARREGAR DADOS
-df = pd.read_csv('dados_processados/escolas_2024_consolidado.csv')
-print(f"\n✓ Dataset carregado: {df.shape}")
-
-# 2. FILTRAR APENAS REGIÕES
-df_regioes = df[df['observacao_id'].str.contains('REGIÃO_', na=False)].copy()
-df_regioes = df_regioes[~df_regioes['observacao_id'].str.contains('TOTAL')]
-
-print(f"✓ Regiões filtradas: {len(df_regioes)}")
-print("\nRegiões encontradas:")
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from tic.fatos import carregar_fatos, filtrar_fatos, pivotar_features
+from tic.saida import ler_arquivo, localizar_tabela, salvar_tabela, pyarrow_disponivel
+from tic.instrumentacao import adicionar_argumento_perfil, configurar_perfil, span
+from tic.log import adicionar_argumentos_log, configurar_log_args, linha, obter_logger, titulo
+from feature_store import salvar_feature_store
+from poda_correlacao import LIMIAR_CORRELACAO, podar_features_correlacionadas
+
+log = obter_logger('preparacao')
+
+ARQUIVO_FATOS = 'dados_processados/fatos_escolas_2024.npz'
+BASE_CONSOLIDADO = 'dados_processados/escolas_2024_consolidado'
+
+# Formatos do dataset preparado (Parquet se pyarrow estiver instalado)
+FORMATOS_SAIDA = ['parquet'] if pyarrow_disponivel() else ['csv']
+
+parser = argparse.ArgumentParser(description='Preparação dos dados regionais para o clustering')
+adicionar_argumento_perfil(parser, 'dados_processados/perfil_preparacao.json')
+adicionar_argumentos_log(parser)
+args = parser.parse_args()
+configurar_perfil(args)
+configurar_log_args(args)
+
+titulo(log, "FASE 1: PREPARAÇÃO DE DADOS - CLUSTERING POR REGIÃO", '=', 70)
+
+# 1-2. CARREGAR DADOS E FILTRAR APENAS REGIÕES
+# (filtro + pivot sobre a tabela de fatos; consolidado salvo como alternativa)
+# (origem: arquivo efetivamente lido, registrado no feature store)
+if Path(ARQUIVO_FATOS).exists():
+    origem = ARQUIVO_FATOS
+    fatos = carregar_fatos(origem)
+    log.info(f"\n✓ Tabela de fatos carregada: {len(fatos)} fatos")
+    df_regioes = pivotar_features(filtrar_fatos(fatos, dimensao='REGIÃO'))
+else:
+    origem = localizar_tabela(BASE_CONSOLIDADO)
+    if origem is None:
+        raise FileNotFoundError(f"Nem {ARQUIVO_FATOS} nem {BASE_CONSOLIDADO}.* encontrados "
+                                f"(rode 01_extrair_dados_escolas.py)")
+    df = ler_arquivo(origem)
+    log.info(f"\n✓ Dataset carregado: {df.shape}")
+    df_regioes = df[df['observacao_id'].str.contains('REGIÃO_', na=False)].copy()
+    df_regioes = df_regioes[~df_regioes['observacao_id'].str.contains('TOTAL')]
+
+log.info(f"✓ Regiões filtradas: {len(df_regioes)}")
+log.debug("\nRegiões encontradas:")
 for idx, regiao in enumerate(df_regioes['observacao_id'].values, 1):
-    print(f"  {idx}. {regiao}")
+    log.debug(f"  {idx}. {regiao}")
 
 # 3. ANÁLISE DE VALORES FALTANTES
-print("\n" + "-"*70)
-print("ANÁLISE DE VALORES FALTANTES")
-print("-"*70)
+titulo(log, "ANÁLISE DE VALORES FALTANTES", '-', 70)
 
 missing_by_col = df_regioes.isnull().sum()
 missing_pct = (missing_by_col / len(df_regioes) * 100)
@@ -33,15 +63,21 @@ missing_pct = (missing_by_col / len(df_regioes) * 100)
 complete_features = missing_pct[missing_pct == 0].index.tolist()
 complete_features = [f for f in complete_features if f != 'observacao_id']
 
-print(f"\nFeatures com dados completos: {len(complete_features)}")
-print(f"Features com algum NaN: {len(missing_pct[missing_pct > 0])}")
+log.info(f"\nFeatures com dados completos: {len(complete_features)}")
+log.info(f"Features com algum NaN: {len(missing_pct[missing_pct > 0])}")
+
+# Features descartadas e o motivo (persistidas no feature store)
+features_removidas = [
+    {'feature': f, 'motivo': 'valores_faltantes'}
+    for f in missing_pct[missing_pct > 0].index.tolist()
+]
 
 # 4. SELECIONAR APENAS FEATURES COMPLETAS
 df_clean = df_regioes[['observacao_id'] + complete_features].copy()
 
-print(f"\n✓ Dataset limpo: {df_clean.shape}")
-print(f"  - Observações: {len(df_clean)}")
-print(f"  - Features: {len(complete_features)}")
+log.info(f"\n✓ Dataset limpo: {df_clean.shape}")
+log.info(f"  - Observações: {len(df_clean)}")
+log.info(f"  - Features: {len(complete_features)}")
 
 # 5. SEPARAR FEATURES NUMÉRICAS
 X = df_clean.drop('observacao_id', axis=1)
@@ -52,64 +88,101 @@ for col in X.columns:
     X[col] = pd.to_numeric(X[col], errors='coerce')
 
 # Remover colunas que ficaram todas NaN
+colunas_nao_numericas = X.columns[X.isna().all()].tolist()
+features_removidas += [{'feature': f, 'motivo': 'nao_numerica'} for f in colunas_nao_numericas]
 X = X.dropna(axis=1, how='all')
 
-print(f"\n✓ Features numéricas: {X.shape[1]}")
+log.info(f"\n✓ Features numéricas: {X.shape[1]}")
 
 # 6. VERIFICAR VARIÂNCIA
-print("\n" + "-"*70)
-print("ANÁLISE DE VARIÂNCIA")
-print("-"*70)
+titulo(log, "ANÁLISE DE VARIÂNCIA", '-', 70)
 
 variances = X.var()
 zero_var = variances[variances == 0].index.tolist()
 
 if len(zero_var) > 0:
-    print(f"\n⚠️  Features com variância zero (constantes): {len(zero_var)}")
-    print("Removendo features constantes...")
+    log.info(f"\n⚠️  Features com variância zero (constantes): {len(zero_var)}")
+    log.info("Removendo features constantes...")
     X = X.drop(columns=zero_var)
+    features_removidas += [{'feature': f, 'motivo': 'variancia_zero'} for f in zero_var]
+else:
+    log.info("\n✓ Nenhuma feature constante encontrada")
+
+# 6B. PODA DE FEATURES CORRELACIONADAS
+titulo(log, "PODA DE FEATURES CORRELACIONADAS", '-', 70)
+
+if LIMIAR_CORRELACAO is not None:
+    n_antes = X.shape[1]
+    with span('poda_correlacao', 'agregacao', limiar=LIMIAR_CORRELACAO):
+        X, relatorio_poda = podar_features_correlacionadas(X, limiar=LIMIAR_CORRELACAO)
+
+    features_removidas += [
+        {'feature': par.feature_removida, 'motivo': 'correlacionada',
+         'representante': par.representante, 'correlacao': par.correlacao}
+        for par in relatorio_poda.itertuples()
+    ]
+
+    relatorio_poda.to_csv('dados_processados/relatorio_poda_correlacao.csv', index=False)
+
+    n_grupos = relatorio_poda['representante'].nunique()
+    log.info(f"\n✓ |r| ≥ {LIMIAR_CORRELACAO}: {n_antes - X.shape[1]} features colapsadas "
+             f"em {n_grupos} representantes ({n_antes} → {X.shape[1]})")
+    for representante, grupo in relatorio_poda.groupby('representante', sort=False):
+        log.debug(f"  • {representante[:60]} ← {len(grupo)} colapsada(s)",
+                  extra=linha("Preparação - poda de correlação", representante=representante,
+                              colapsadas=len(grupo), correlacao_min=grupo['correlacao'].min()))
+    log.info("✓ Relatório salvo: dados_processados/relatorio_poda_correlacao.csv")
 else:
-    print("\n✓ Nenhuma feature constante encontrada")
+    log.info("\n⚠️  Poda desativada (poda_correlacao.LIMIAR_CORRELACAO = None)")
 
-print(f"\n✓ Features finais: {X.shape[1]}")
+log.info(f"\n✓ Features finais: {X.shape[1]}")
 
 # 7. NORMALIZAÇÃO
-print("\n" + "-"*70)
-print("NORMALIZAÇÃO")
-print("-"*70)
+titulo(log, "NORMALIZAÇÃO", '-', 70)
 
 scaler = StandardScaler()
 X_normalized = scaler.fit_transform(X)
 X_normalized = pd.DataFrame(X_normalized, columns=X.columns, index=X.index)
 
-print("✓ Dados normalizados (média=0, std=1)")
+log.info("✓ Dados normalizados (média=0, std=1)")
 
 # 8. SALVAR DADOS PREPARADOS
 df_preparado = X_normalized.copy()
 df_preparado.insert(0, 'observacao_id', regioes_nomes)
 
-output_file = 'dados_processados/regioes_preparado_para_clustering.csv'
-df_preparado.to_csv(output_file, index=False)
+arquivos_saida = salvar_tabela(df_preparado, 'dados_processados/regioes_preparado_para_clustering',
+                               FORMATOS_SAIDA)
+
+log.info(f"\n✓ Dados salvos: {', '.join(arquivos_saida)}")
+
+# 8B. FEATURE STORE (matriz binária + scaler + features removidas)
+with span('escrever_feature_store', 'escrita'):
+    pasta_versao = salvar_feature_store(
+        X_normalized.values,
+        colunas=X.columns.tolist(),
+        observacoes=regioes_nomes,
+        scaler=scaler,
+        features_removidas=features_removidas,
+        nome='regioes',
+        origem=str(origem)
+    )
 
-print(f"\n✓ Dados salvos: {output_file}")
+log.info(f"✓ Feature store salvo: {pasta_versao}")
+log.info(f"  - Features removidas registradas: {len(features_removidas)}")
 
 # 9. ESTATÍSTICAS FINAIS
-print("\n" + "="*70)
-print("RESUMO DOS DADOS PREPARADOS")
-print("="*70)
+titulo(log, "RESUMO DOS DADOS PREPARADOS", '=', 70)
 
-print(f"\nObservações: {len(df_preparado)}")
-print(f"Features: {len(X.columns)}")
-print(f"\nRegiões:")
+log.info(f"\nObservações: {len(df_preparado)}")
+log.info(f"Features: {len(X.columns)}")
+log.debug(f"\nRegiões:")
 for regiao in regioes_nomes:
-    print(f"  - {regiao}")
+    log.debug(f"  - {regiao}")
 
-print(f"\nPrimeiras 10 features:")
+log.debug(f"\nPrimeiras 10 features:")
 for i, col in enumerate(X.columns[:10], 1):
-    print(f"  {i}. {col}")
+    log.debug(f"  {i}. {col}")
 
-print("\n" + "="*70)
-print("✓ DADOS PRONTOS PARA CLUSTERING!")
-print("="*70)
-print("\nPróximo passo: Executar cluster analysis")
-print("  Script: 03_clustering_regioes.py")
\ No newline at end of file
+titulo(log, "✓ DADOS PRONTOS PARA CLUSTERING!", '=', 70)
+log.info("\nPróximo passo: Executar cluster analysis")
+log.info("  Script: 03_clustering_regioes.py")
\ No newline at end of file
@@ -9,65 +9,109 @@ Este script:
 4. Visualiza resultados
 5. Interpreta clusters encontrados
 
+Uso:
+    python 03_clustering_regioes.py
+    python 03_clustering_regioes.py --consenso --reamostragens 500 --workers 4
+    python 03_clustering_regioes.py --sem-graficos   # só números (não carrega matplotlib)
+    python 03_clustering_regioes.py --previa         # figuras rápidas em baixa resolução
+
 Autor: [Seu nome]
 Data: 2025
 """
 
+import argparse
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 from sklearn.decomposition import PCA
 from sklearn.cluster import KMeans, AgglomerativeClustering, DBSCAN
 from sklearn.metrics import silhouette_score, davies_bouldin_score
-from scipy.cluster.hierarchy import dendrogram, linkage
+from scipy.cluster.hierarchy import linkage
 from scipy.spatial.distance import pdist, squareform
 import warnings
+import sys
+from pathlib import Path
 warnings.filterwarnings('ignore')
 
-# Configurações de visualização
-plt.style.use('seaborn-v0_8-darkgrid')
-sns.set_palette("husl")
-plt.rcParams['figure.figsize'] = (12, 8)
-plt.rcParams['font.size'] = 10
-
-print("="*80)
-print("CLUSTER ANALYSIS - REGIÕES BRASILEIRAS")
-print("Perfis Digitais da Educação")
-print("="*80)
+from consenso_clustering import executar_consenso, MODOS_REAMOSTRAGEM
+from feature_store import carregar_feature_store
+from prever_cluster import salvar_modelo
+from interpretacao_clusters import interpretar_clusters, tabela_interpretacao
+import graficos_clustering
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from tic.saida import ler_tabela
+from tic.figuras import figura, renderizar
+from tic.instrumentacao import adicionar_argumento_perfil, configurar_perfil, span
+from tic.log import adicionar_argumentos_log, configurar_log_args, linha, obter_logger, titulo
+
+log = obter_logger('clustering')
+
+# Argumentos de linha de comando
+parser = argparse.ArgumentParser(description='Cluster analysis das regiões brasileiras')
+parser.add_argument('--consenso', action='store_true',
+                    help='Avalia a estabilidade dos clusters por reamostragem (consenso)')
+parser.add_argument('--reamostragens', type=int, default=500,
+                    help='Número de reamostragens do consenso (padrão: 500)')
+parser.add_argument('--modo-reamostragem', choices=MODOS_REAMOSTRAGEM, default='observacoes',
+                    help='Reamostrar observações ou features (padrão: observacoes)')
+parser.add_argument('--workers', type=int, default=None,
+                    help='Processos para o consenso (padrão: todos os núcleos)')
+parser.add_argument('--sem-graficos', action='store_true',
+                    help='Não gera os gráficos PNG (não importa matplotlib/seaborn)')
+parser.add_argument('--previa', action='store_true',
+                    help='Figuras em baixa resolução (*.previa.png), para iterar rápido')
+parser.add_argument('--workers-figuras', type=int, default=None,
+                    help='Processos para renderizar as figuras (padrão: uma por figura)')
+parser.add_argument('--redesenhar', action='store_true',
+                    help='Ignora o cache de figuras e redesenha todas')
+adicionar_argumento_perfil(parser, 'dados_processados/perfil_clustering.json')
+adicionar_argumentos_log(parser)
+args = parser.parse_args()
+configurar_perfil(args)
+configurar_log_args(args)
+
+titulo(log, "CLUSTER ANALYSIS - REGIÕES BRASILEIRAS\nPerfis Digitais da Educação")
 
 # ============================================================================
 # 1. CARREGAR DADOS
 # ============================================================================
 
-print("\n" + "-"*80)
-print("1. CARREGANDO DADOS")
-print("-"*80)
-
-df = pd.read_csv('dados_processados/regioes_preparado_para_clustering.csv')
-
-# Separar features e labels
+titulo(log, "1. CARREGANDO DADOS", '-')
+
+# Feature store (matriz memory-mapped) com fallback para o CSV preparado
+try:
+    with span('carregar_feature_store', 'leitura'):
+        feature_store = carregar_feature_store('regioes')
+    X = feature_store['X']
+    df = pd.DataFrame(X, columns=feature_store['colunas'])
+    df.insert(0, 'observacao_id', feature_store['observacoes'])
+    log.info(f"\n✓ Feature store carregado: regioes/{feature_store['manifesto']['versao']} (memory-map)")
+except FileNotFoundError:
+    feature_store = None
+    df = ler_tabela('dados_processados/regioes_preparado_para_clustering')
+    X = df.drop('observacao_id', axis=1).values
+    log.info("\n⚠️  Feature store não encontrado, usando dataset preparado")
+
+# Separar labels
 regioes = df['observacao_id'].str.replace('REGIÃO_', '').values
-X = df.drop('observacao_id', axis=1).values
 
-print(f"\n✓ Dados carregados:")
-print(f"  - Regiões: {len(regioes)}")
-print(f"  - Features: {X.shape[1]}")
-print(f"\nRegiões:")
+log.info(f"\n✓ Dados carregados:")
+log.info(f"  - Regiões: {len(regioes)}")
+log.info(f"  - Features: {X.shape[1]}")
+log.debug(f"\nRegiões:")
 for i, regiao in enumerate(regioes, 1):
-    print(f"  {i}. {regiao}")
+    log.debug(f"  {i}. {regiao}")
 
 # ============================================================================
 # 2. ANÁLISE DE COMPONENTES PRINCIPAIS (PCA)
 # ============================================================================
 
-print("\n" + "-"*80)
-print("2. REDUÇÃO DE DIMENSIONALIDADE - PCA")
-print("-"*80)
+titulo(log, "2. REDUÇÃO DE DIMENSIONALIDADE - PCA", '-')
 
 # PCA completo para ver variância explicada
 pca_full = PCA()
-pca_full.fit(X)
+with span('pca_completo', 'modelo'):
+    pca_full.fit(X)
 
 # Variância explicada cumulativa
 variance_cumsum = np.cumsum(pca_full.explained_variance_ratio_)
@@ -76,116 +120,75 @@ variance_cumsum = np.cumsum(pca_full.explained_variance_ratio_)
 n_comp_90 = np.argmax(variance_cumsum >= 0.90) + 1
 n_comp_95 = np.argmax(variance_cumsum >= 0.95) + 1
 
-print(f"\nVariância explicada:")
-print(f"  - {n_comp_90} componentes explicam 90% da variância")
-print(f"  - {n_comp_95} componentes explicam 95% da variância")
-print(f"  - Primeiros 5 componentes: {variance_cumsum[4]*100:.1f}%")
+log.info(f"\nVariância explicada:")
+log.info(f"  - {n_comp_90} componentes explicam 90% da variância")
+log.info(f"  - {n_comp_95} componentes explicam 95% da variância")
+log.info(f"  - Primeiros 5 componentes: {variance_cumsum[4]*100:.1f}%")
 
 # Aplicar PCA com número reduzido de componentes
 n_components = min(n_comp_90, 4)  # Máximo 4 para 5 observações
 pca = PCA(n_components=n_components)
-X_pca = pca.fit_transform(X)
+with span('pca', 'modelo', componentes=n_components):
+    X_pca = pca.fit_transform(X)
 
-print(f"\n✓ PCA aplicado:")
-print(f"  - Componentes selecionados: {n_components}")
-print(f"  - Variância explicada total: {sum(pca.explained_variance_ratio_)*100:.2f}%")
+log.info(f"\n✓ PCA aplicado:")
+log.info(f"  - Componentes selecionados: {n_components}")
+log.info(f"  - Variância explicada total: {sum(pca.explained_variance_ratio_)*100:.2f}%")
+
+# Figuras: coletadas ao longo do script e renderizadas juntas na seção 6
+figuras = []
 
 # Visualizar variância explicada
-fig, axes = plt.subplots(1, 2, figsize=(15, 5))
-
-# Scree plot
-axes[0].bar(range(1, min(21, len(pca_full.explained_variance_ratio_)+1)), 
-            pca_full.explained_variance_ratio_[:20])
-axes[0].set_xlabel('Componente Principal')
-axes[0].set_ylabel('Variância Explicada')
-axes[0].set_title('Scree Plot - Variância por Componente')
-axes[0].axhline(y=0.1, color='r', linestyle='--', label='10% threshold')
-axes[0].legend()
-
-# Variância cumulativa
-axes[1].plot(range(1, min(21, len(variance_cumsum)+1)), variance_cumsum[:20], 'bo-')
-axes[1].axhline(y=0.90, color='r', linestyle='--', label='90%')
-axes[1].axhline(y=0.95, color='g', linestyle='--', label='95%')
-axes[1].set_xlabel('Número de Componentes')
-axes[1].set_ylabel('Variância Explicada Cumulativa')
-axes[1].set_title('Variância Cumulativa')
-axes[1].legend()
-axes[1].grid(True, alpha=0.3)
-
-plt.tight_layout()
-plt.savefig('dados_processados/01_pca_variance.png', dpi=300, bbox_inches='tight')
-print("\n✓ Gráfico salvo: dados_processados/01_pca_variance.png")
-plt.close()
+figuras.append(figura(graficos_clustering.grafico_variancia_pca, 'dados_processados/01_pca_variance.png',
+                      variancia_explicada=pca_full.explained_variance_ratio_,
+                      variance_cumsum=variance_cumsum))
 
 # ============================================================================
 # 3. MATRIZ DE DISTÂNCIAS
 # ============================================================================
 
-print("\n" + "-"*80)
-print("3. ANÁLISE DE DISTÂNCIAS ENTRE REGIÕES")
-print("-"*80)
+titulo(log, "3. ANÁLISE DE DISTÂNCIAS ENTRE REGIÕES", '-')
 
 # Calcular matriz de distâncias Euclidianas
 distances = squareform(pdist(X_pca, metric='euclidean'))
 dist_df = pd.DataFrame(distances, index=regioes, columns=regioes)
 
-print("\nMatriz de Distâncias (resumo):")
-print(dist_df.round(2))
+log.info(f"\nMatriz de distâncias: {len(regioes)} × {len(regioes)} (tabela no relatório final)")
+for regiao, distancias in dist_df.round(2).iterrows():
+    log.debug(f"  {regiao}: " + ", ".join(f"{outra} {d:.2f}" for outra, d in distancias.items() if outra != regiao),
+              extra=linha("Clustering - matriz de distâncias", regiao=regiao, **distancias.to_dict()))
 
 # Heatmap de distâncias
-plt.figure(figsize=(10, 8))
-sns.heatmap(dist_df, annot=True, fmt='.2f', cmap='YlOrRd', 
-            square=True, cbar_kws={'label': 'Distância Euclidiana'})
-plt.title('Matriz de Distâncias Entre Regiões\n(Baseada em PCA)', fontsize=14, fontweight='bold')
-plt.tight_layout()
-plt.savefig('dados_processados/02_distance_matrix.png', dpi=300, bbox_inches='tight')
-print("\n✓ Heatmap salvo: dados_processados/02_distance_matrix.png")
-plt.close()
+figuras.append(figura(graficos_clustering.grafico_distancias, 'dados_processados/02_distance_matrix.png',
+                      dist_df=dist_df))
 
 # Identificar pares mais similares e mais diferentes
 dist_flat = dist_df.values[np.triu_indices_from(dist_df.values, k=1)]
 min_idx = np.unravel_index(np.argmin(distances + np.eye(5)*1000), distances.shape)
 max_idx = np.unravel_index(np.argmax(distances), distances.shape)
 
-print(f"\nRegiões MAIS SIMILARES: {regioes[min_idx[0]]} ↔ {regioes[min_idx[1]]}")
-print(f"  Distância: {distances[min_idx]:.2f}")
+log.info(f"\nRegiões MAIS SIMILARES: {regioes[min_idx[0]]} ↔ {regioes[min_idx[1]]}")
+log.info(f"  Distância: {distances[min_idx]:.2f}")
 
-print(f"\nRegiões MAIS DIFERENTES: {regioes[max_idx[0]]} ↔ {regioes[max_idx[1]]}")
-print(f"  Distância: {distances[max_idx]:.2f}")
+log.info(f"\nRegiões MAIS DIFERENTES: {regioes[max_idx[0]]} ↔ {regioes[max_idx[1]]}")
+log.info(f"  Distância: {distances[max_idx]:.2f}")
 
 # ============================================================================
 # 4. CLUSTERING HIERÁRQUICO
 # ============================================================================
 
-print("\n" + "-"*80)
-print("4. CLUSTERING HIERÁRQUICO")
-print("-"*80)
+titulo(log, "4. CLUSTERING HIERÁRQUICO", '-')
 
 # Calcular linkage
-linkage_matrix = linkage(X_pca, method='ward')
+with span('linkage_ward', 'modelo'):
+    linkage_matrix = linkage(X_pca, method='ward')
 
 # Plotar dendrograma
-plt.figure(figsize=(12, 6))
-dendrogram(linkage_matrix, 
-           labels=regioes,
-           leaf_font_size=12,
-           color_threshold=0)
-plt.title('Dendrograma - Clustering Hierárquico das Regiões', 
-          fontsize=14, fontweight='bold')
-plt.xlabel('Região', fontsize=12)
-plt.ylabel('Distância (Ward)', fontsize=12)
-plt.axhline(y=linkage_matrix[-2, 2], color='r', linestyle='--', 
-            label=f'Corte para 2 clusters')
-plt.axhline(y=linkage_matrix[-3, 2], color='g', linestyle='--', 
-            label=f'Corte para 3 clusters')
-plt.legend()
-plt.tight_layout()
-plt.savefig('dados_processados/03_dendrogram.png', dpi=300, bbox_inches='tight')
-print("\n✓ Dendrograma salvo: dados_processados/03_dendrogram.png")
-plt.close()
+figuras.append(figura(graficos_clustering.grafico_dendrograma, 'dados_processados/03_dendrogram.png',
+                      linkage_matrix=linkage_matrix, regioes=regioes))
 
 # Aplicar clustering hierárquico com diferentes números de clusters
-print("\nTestando diferentes números de clusters:")
+log.info("\nTestando diferentes números de clusters:")
 for n_clusters in [2, 3]:
     hier = AgglomerativeClustering(n_clusters=n_clusters)
     labels = hier.fit_predict(X_pca)
@@ -194,29 +197,30 @@ for n_clusters in [2, 3]:
     if n_clusters > 1:
         sil_score = silhouette_score(X_pca, labels)
         db_score = davies_bouldin_score(X_pca, labels)
-        print(f"\n  {n_clusters} clusters:")
-        print(f"    - Silhouette Score: {sil_score:.3f} (quanto maior, melhor)")
-        print(f"    - Davies-Bouldin Score: {db_score:.3f} (quanto menor, melhor)")
+        log.info(f"\n  {n_clusters} clusters:")
+        log.info(f"    - Silhouette Score: {sil_score:.3f} (quanto maior, melhor)")
+        log.info(f"    - Davies-Bouldin Score: {db_score:.3f} (quanto menor, melhor)")
         
         # Mostrar composição
         for cluster_id in range(n_clusters):
             members = regioes[labels == cluster_id]
-            print(f"    - Cluster {cluster_id+1}: {', '.join(members)}")
+            log.debug(f"    - Cluster {cluster_id+1}: {', '.join(members)}",
+                      extra=linha("Clustering - hierárquico", n_clusters=n_clusters,
+                                  cluster=cluster_id + 1, regioes=', '.join(members)))
 
 # ============================================================================
 # 5. K-MEANS CLUSTERING
 # ============================================================================
 
-print("\n" + "-"*80)
-print("5. K-MEANS CLUSTERING")
-print("-"*80)
+titulo(log, "5. K-MEANS CLUSTERING", '-')
 
 # Testar K=2 e K=3
 resultados_kmeans = {}
 
 for k in [2, 3]:
     kmeans = KMeans(n_clusters=k, random_state=42, n_init=50)
-    labels = kmeans.fit_predict(X_pca)
+    with span('kmeans', 'modelo', k=k):
+        labels = kmeans.fit_predict(X_pca)
     
     sil_score = silhouette_score(X_pca, labels)
     db_score = davies_bouldin_score(X_pca, labels)
@@ -230,148 +234,159 @@ for k in [2, 3]:
         'centers': kmeans.cluster_centers_
     }
     
-    print(f"\nK-Means com K={k}:")
-    print(f"  - Silhouette Score: {sil_score:.3f}")
-    print(f"  - Davies-Bouldin Score: {db_score:.3f}")
-    print(f"  - Inertia: {inertia:.2f}")
+    log.info(f"\nK-Means com K={k}:")
+    log.info(f"  - Silhouette Score: {sil_score:.3f}")
+    log.info(f"  - Davies-Bouldin Score: {db_score:.3f}")
+    log.info(f"  - Inertia: {inertia:.2f}")
     
     for cluster_id in range(k):
         members = regioes[labels == cluster_id]
-        print(f"  - Cluster {cluster_id+1}: {', '.join(members)}")
+        log.debug(f"  - Cluster {cluster_id+1}: {', '.join(members)}",
+                  extra=linha("Clustering - k-means", k=k, cluster=cluster_id + 1,
+                              regioes=', '.join(members)))
 
 # Escolher melhor K (maior silhouette)
 best_k = max(resultados_kmeans.keys(), 
              key=lambda k: resultados_kmeans[k]['silhouette'])
-print(f"\n✓ Melhor configuração: K={best_k}")
-print(f"  Silhouette Score: {resultados_kmeans[best_k]['silhouette']:.3f}")
+log.info(f"\n✓ Melhor configuração: K={best_k}")
+log.info(f"  Silhouette Score: {resultados_kmeans[best_k]['silhouette']:.3f}")
 
 best_labels = resultados_kmeans[best_k]['labels']
 
+# ============================================================================
+# 5B. ESTABILIDADE DOS CLUSTERS (CONSENSO)
+# ============================================================================
+
+resultado_consenso = None
+
+if args.consenso:
+    titulo(log, "5B. ESTABILIDADE DOS CLUSTERS (CONSENSO POR REAMOSTRAGEM)", '-')
+
+    # Observações: reagrupa subconjuntos no espaço do PCA
+    # Features: reaplica PCA sobre subconjuntos das features normalizadas
+    if args.modo_reamostragem == 'observacoes':
+        X_consenso = X_pca
+    else:
+        X_consenso = X
+
+    with span('consenso', 'modelo', reamostragens=args.reamostragens, modo=args.modo_reamostragem):
+        resultado_consenso = executar_consenso(
+            X_consenso, best_labels, best_k,
+            nomes=list(regioes),
+            n_reamostragens=args.reamostragens,
+            modo=args.modo_reamostragem,
+            n_componentes=n_components,
+            n_workers=args.workers
+        )
+
+    consenso_df = pd.DataFrame(resultado_consenso['consenso'], index=regioes, columns=regioes)
+    consenso_df.to_csv('dados_processados/matriz_consenso.csv')
+    log.info("\n✓ Matriz de consenso salva: dados_processados/matriz_consenso.csv")
+
+    estabilidade_df = pd.DataFrame({
+        'regiao': regioes,
+        'cluster': best_labels + 1,
+        'estabilidade_observacao': resultado_consenso['estabilidade_observacoes'],
+        'estabilidade_cluster': [resultado_consenso['estabilidade_clusters'][c] for c in best_labels]
+    })
+    estabilidade_df.to_csv('dados_processados/estabilidade_consenso.csv', index=False)
+    log.info("✓ Estabilidade salva: dados_processados/estabilidade_consenso.csv")
+
 # ============================================================================
 # 6. VISUALIZAÇÃO DOS CLUSTERS
 # ============================================================================
 
-print("\n" + "-"*80)
-print("6. VISUALIZAÇÃO DOS CLUSTERS")
-print("-"*80)
+titulo(log, "6. VISUALIZAÇÃO DOS CLUSTERS", '-')
 
-# Criar figura com múltiplos subplots
-fig, axes = plt.subplots(1, 2, figsize=(16, 6))
+if not args.sem_graficos:
+    # Top 15 features com maior variância, por região
+    feature_vars = df.drop('observacao_id', axis=1).var().sort_values(ascending=False)
+    top_features = feature_vars.head(15).index.tolist()
 
-# Plot 1: PCA 2D com clusters do K-means
-if X_pca.shape[1] >= 2:
-    scatter = axes[0].scatter(X_pca[:, 0], X_pca[:, 1], 
-                             c=best_labels, s=500, alpha=0.6, 
-                             cmap='viridis', edgecolors='black', linewidth=2)
-    
-    # Adicionar labels
-    for i, regiao in enumerate(regioes):
-        axes[0].annotate(regiao, (X_pca[i, 0], X_pca[i, 1]),
-                        fontsize=11, fontweight='bold',
-                        ha='center', va='center')
-    
-    # Adicionar centróides
-    centers = resultados_kmeans[best_k]['centers']
-    axes[0].scatter(centers[:, 0], centers[:, 1],
-                   c='red', s=300, alpha=0.8, marker='X',
-                   edgecolors='black', linewidth=2,
-                   label='Centróides')
-    
-    axes[0].set_xlabel(f'PC1 ({pca.explained_variance_ratio_[0]*100:.1f}% var.)', 
-                      fontsize=12)
-    axes[0].set_ylabel(f'PC2 ({pca.explained_variance_ratio_[1]*100:.1f}% var.)', 
-                      fontsize=12)
-    axes[0].set_title(f'Clusters das Regiões (K-Means, K={best_k})', 
-                     fontsize=14, fontweight='bold')
-    axes[0].legend()
-    axes[0].grid(True, alpha=0.3)
-
-# Plot 2: Heatmap de features mais importantes por região
-# Selecionar top 15 features com maior variância
-feature_vars = df.drop('observacao_id', axis=1).var().sort_values(ascending=False)
-top_features = feature_vars.head(15).index.tolist()
-
-data_top = df[['observacao_id'] + top_features].set_index('observacao_id')
-data_top.index = data_top.index.str.replace('REGIÃO_', '')
-
-sns.heatmap(data_top.T, annot=True, fmt='.2f', cmap='RdYlGn', 
-            ax=axes[1], cbar_kws={'label': 'Valor Normalizado'})
-axes[1].set_title('Top 15 Features Mais Variáveis por Região', 
-                 fontsize=14, fontweight='bold')
-axes[1].set_xlabel('Região', fontsize=12)
-axes[1].set_ylabel('Feature', fontsize=12)
-
-plt.tight_layout()
-plt.savefig('dados_processados/04_clustering_results.png', dpi=300, bbox_inches='tight')
-print("\n✓ Visualização salva: dados_processados/04_clustering_results.png")
-plt.close()
+    data_top = df[['observacao_id'] + top_features].set_index('observacao_id')
+    data_top.index = data_top.index.str.replace('REGIÃO_', '')
+
+    figuras.append(figura(graficos_clustering.grafico_clusters, 'dados_processados/04_clustering_results.png',
+                          X_pca=X_pca, labels=best_labels, regioes=regioes,
+                          centers=resultados_kmeans[best_k]['centers'],
+                          variancia_explicada=pca.explained_variance_ratio_, k=best_k, data_top=data_top))
+
+    # Só as figuras cujos dados/código mudaram são redesenhadas (em paralelo)
+    status_figuras = renderizar(figuras, previa=args.previa, workers=args.workers_figuras,
+                                forcar=args.redesenhar)
+    for caminho, status in status_figuras.items():
+        log.info(f"  ✓ {caminho}{' (cache)' if status == 'cache' else ''}")
 
 # ============================================================================
 # 7. INTERPRETAÇÃO DOS CLUSTERS
 # ============================================================================
 
-print("\n" + "="*80)
-print("7. INTERPRETAÇÃO DOS CLUSTERS")
-print("="*80)
-
-# Carregar dados originais (não normalizados) para interpretação
-df_original = pd.read_csv('dados_processados/escolas_2024_consolidado.csv')
-df_regioes_orig = df_original[df_original['observacao_id'].str.contains('REGIÃO_', na=False)]
-df_regioes_orig = df_regioes_orig[~df_regioes_orig['observacao_id'].str.contains('TOTAL')]
-
-# Adicionar labels de cluster
-df_regioes_orig['cluster'] = best_labels
-df_regioes_orig['regiao'] = df_regioes_orig['observacao_id'].str.replace('REGIÃO_', '')
-
-print(f"\nClustering final (K={best_k}):")
-print("-"*80)
+titulo(log, "7. INTERPRETAÇÃO DOS CLUSTERS")
+
+# Valores originais (não normalizados) para interpretação
+if feature_store is not None:
+    # Desfaz a normalização sobre a matriz já em memória (sem reler o CSV)
+    escala = np.asarray(feature_store['scaler']['scale'])
+    media = np.asarray(feature_store['scaler']['mean'])
+    valores_originais = pd.DataFrame(np.asarray(X) * escala + media,
+                                     columns=feature_store['colunas'])
+else:
+    # Só as colunas usadas no clustering, nas linhas das regiões, na ordem de X
+    colunas_features = df.columns.drop('observacao_id').tolist()
+    df_original = ler_tabela('dados_processados/escolas_2024_consolidado',
+                             colunas=['observacao_id'] + colunas_features)
+    valores_originais = (df_original.set_index('observacao_id')
+                         .loc[df['observacao_id'], colunas_features].reset_index(drop=True))
+
+# Médias, diferenças relativas, efeitos e top-10 de todos os clusters de uma vez
+with span('interpretacao', 'agregacao'):
+    interpretacao = interpretar_clusters(valores_originais, best_labels, top_k=10)
+medias_clusters = interpretacao['medias']
+global_means = interpretacao['media_global']
+rel_diffs = interpretacao['diferenca_relativa']
+efeitos = interpretacao['efeito']
+
+log.info(f"\nClustering final (K={best_k}):")
+log.info("-"*80)
 
 for cluster_id in range(best_k):
-    cluster_regioes = df_regioes_orig[df_regioes_orig['cluster'] == cluster_id]['regiao'].values
-    print(f"\n{'='*80}")
-    print(f"CLUSTER {cluster_id + 1}: {', '.join(cluster_regioes)}")
-    print(f"{'='*80}")
-    
-    # Selecionar dados deste cluster
-    cluster_data = df_regioes_orig[df_regioes_orig['cluster'] == cluster_id]
-    
-    # Identificar features distintivas (comparar com média global)
-    numeric_cols = cluster_data.select_dtypes(include=[np.number]).columns
-    numeric_cols = [c for c in numeric_cols if c not in ['cluster']]
-    
-    # Calcular médias do cluster vs global
-    cluster_means = cluster_data[numeric_cols].mean()
-    global_means = df_regioes_orig[numeric_cols].mean()
+    cluster_regioes = regioes[best_labels == cluster_id]
+    titulo(log, f"CLUSTER {cluster_id + 1}: {', '.join(cluster_regioes)}")
     
-    # Diferenças relativas
-    rel_diff = ((cluster_means - global_means) / (global_means + 1)) * 100
-    rel_diff = rel_diff.sort_values(ascending=False)
-    
-    print(f"\nCaracterísticas distintivas (TOP 10 acima da média):")
-    for feat in rel_diff.head(10).index:
-        val = cluster_means[feat]
-        global_val = global_means[feat]
-        diff = rel_diff[feat]
+    log.debug(f"\nCaracterísticas distintivas (TOP 10 acima da média):")
+    for feat in interpretacao['top_acima'].loc[cluster_id]:
+        diff = rel_diffs.at[cluster_id, feat]
         if diff > 5:  # Apenas diferenças > 5%
-            print(f"  ↑ {feat[:60]}")
-            print(f"     Cluster: {val:.0f} | Média: {global_val:.0f} | +{diff:.1f}%")
+            log.debug(f"  ↑ {feat[:60]}\n"
+                      f"     Cluster: {medias_clusters.at[cluster_id, feat]:.0f} | "
+                      f"Média: {global_means[feat]:.0f} | +{diff:.1f}% | d={efeitos.at[cluster_id, feat]:.2f}",
+                      extra=linha("Clustering - características distintivas", cluster=cluster_id + 1,
+                                  feature=feat[:60], media_cluster=float(medias_clusters.at[cluster_id, feat]),
+                                  media_geral=float(global_means[feat]), diferenca_pct=float(diff),
+                                  efeito_d=float(efeitos.at[cluster_id, feat])))
     
-    print(f"\nCaracterísticas distintivas (TOP 10 abaixo da média):")
-    for feat in rel_diff.tail(10).index:
-        val = cluster_means[feat]
-        global_val = global_means[feat]
-        diff = rel_diff[feat]
+    log.debug(f"\nCaracterísticas distintivas (TOP 10 abaixo da média):")
+    for feat in interpretacao['top_abaixo'].loc[cluster_id]:
+        diff = rel_diffs.at[cluster_id, feat]
         if diff < -5:  # Apenas diferenças < -5%
-            print(f"  ↓ {feat[:60]}")
-            print(f"     Cluster: {val:.0f} | Média: {global_val:.0f} | {diff:.1f}%")
+            log.debug(f"  ↓ {feat[:60]}\n"
+                      f"     Cluster: {medias_clusters.at[cluster_id, feat]:.0f} | "
+                      f"Média: {global_means[feat]:.0f} | {diff:.1f}% | d={efeitos.at[cluster_id, feat]:.2f}",
+                      extra=linha("Clustering - características distintivas", cluster=cluster_id + 1,
+                                  feature=feat[:60], media_cluster=float(medias_clusters.at[cluster_id, feat]),
+                                  media_geral=float(global_means[feat]), diferenca_pct=float(diff),
+                                  efeito_d=float(efeitos.at[cluster_id, feat])))
+
+tabela_interp = tabela_interpretacao(interpretacao)
+tabela_interp['cluster'] += 1  # 1-indexed, como nos demais resultados
+tabela_interp.to_csv('dados_processados/interpretacao_clusters.csv', index=False)
+log.info("\n✓ Interpretação salva: dados_processados/interpretacao_clusters.csv")
 
 # ============================================================================
 # 8. SALVAR RESULTADOS
 # ============================================================================
 
-print("\n" + "="*80)
-print("8. SALVANDO RESULTADOS")
-print("="*80)
+titulo(log, "8. SALVANDO RESULTADOS")
 
 # Criar DataFrame com resultados
 resultados_df = pd.DataFrame({
@@ -383,7 +398,23 @@ resultados_df = pd.DataFrame({
 
 output_file = 'dados_processados/resultados_clustering.csv'
 resultados_df.to_csv(output_file, index=False)
-print(f"\n✓ Resultados salvos: {output_file}")
+log.info(f"\n✓ Resultados salvos: {output_file}")
+
+# Bundle do modelo para atribuir novas observações (prever_cluster.py)
+if feature_store is not None:
+    arquivo_modelo = salvar_modelo(
+        pca=pca,
+        centroides=resultados_kmeans[best_k]['centers'],
+        colunas=feature_store['colunas'],
+        scaler=feature_store['scaler'],
+        labels=best_labels,
+        observacoes=regioes,
+        metadados={'feature_store_versao': feature_store['manifesto']['versao'],
+                   'silhouette': float(resultados_kmeans[best_k]['silhouette'])}
+    )
+    log.info(f"✓ Modelo salvo: {arquivo_modelo}")
+else:
+    log.info("⚠️  Modelo não salvo: parâmetros do scaler exigem o feature store (rode 02_preparacao_regioes.py)")
 
 # Salvar relatório textual
 with open('dados_processados/relatorio_clustering.txt', 'w', encoding='utf-8') as f:
@@ -404,31 +435,44 @@ with open('dados_processados/relatorio_clustering.txt', 'w', encoding='utf-8') a
         members = regioes[best_labels == cluster_id]
         f.write(f"Cluster {cluster_id+1}: {', '.join(members)}\n\n")
 
-print("✓ Relatório salvo: dados_processados/relatorio_clustering.txt")
+    if resultado_consenso is not None:
+        f.write("ESTABILIDADE (CONSENSO):\n")
+        f.write("-"*80 + "\n\n")
+        f.write(f"Reamostragens: {resultado_consenso['n_reamostragens']} "
+                f"(modo: {resultado_consenso['modo']})\n\n")
+        for cluster_id, score in resultado_consenso['estabilidade_clusters'].items():
+            f.write(f"Cluster {cluster_id+1}: {score:.3f}\n")
+        f.write("\n")
+        for regiao, score in zip(regioes, resultado_consenso['estabilidade_observacoes']):
+            f.write(f"  {regiao}: {score:.3f}\n")
+
+log.info("✓ Relatório salvo: dados_processados/relatorio_clustering.txt")
 
 # ============================================================================
 # RESUMO FINAL
 # ============================================================================
 
-print("\n" + "="*80)
-print("✓ CLUSTER ANALYSIS CONCLUÍDA!")
-print("="*80)
-
-print("\nArquivos gerados:")
-print("  1. dados_processados/01_pca_variance.png")
-print("  2. dados_processados/02_distance_matrix.png")
-print("  3. dados_processados/03_dendrogram.png")
-print("  4. dados_processados/04_clustering_results.png")
-print("  5. dados_processados/resultados_clustering.csv")
-print("  6. dados_processados/relatorio_clustering.txt")
-
-print(f"\nMelhor configuração: K={best_k} clusters")
-print(f"Silhouette Score: {resultados_kmeans[best_k]['silhouette']:.3f}")
-
-print("\nPróximos passos:")
-print("  1. Revisar visualizações geradas")
-print("  2. Interpretar significado dos clusters")
-print("  3. Criar dashboard interativo (opcional)")
-print("  4. Expandir análise com mais dados (Alunos, anos anteriores)")
-
-print("\n" + "="*80)
\ No newline at end of file
+titulo(log, "✓ CLUSTER ANALYSIS CONCLUÍDA!")
+
+log.info("\nArquivos gerados:")
+log.info("  1. dados_processados/01_pca_variance.png")
+log.info("  2. dados_processados/02_distance_matrix.png")
+log.info("  3. dados_processados/03_dendrogram.png")
+log.info("  4. dados_processados/04_clustering_results.png")
+log.info("  5. dados_processados/resultados_clustering.csv")
+log.info("  6. dados_processados/relatorio_clustering.txt")
+log.info("  -  dados_processados/interpretacao_clusters.csv")
+if resultado_consenso is not None:
+    log.info("  7. dados_processados/matriz_consenso.csv")
+    log.info("  8. dados_processados/estabilidade_consenso.csv")
+if feature_store is not None:
+    log.info("  -  dados_processados/modelo_clusters.npz (use prever_cluster.py)")
+
+log.info(f"\nMelhor configuração: K={best_k} clusters")
+log.info(f"Silhouette Score: {resultados_kmeans[best_k]['silhouette']:.3f}")
+
+log.info("\nPróximos passos:")
+log.info("  1. Revisar visualizações geradas")
+log.info("  2. Interpretar significado dos clusters")
+log.info("  3. Criar dashboard interativo (opcional)")
+log.info("  4. Expandir análise com mais dados (Alunos, anos anteriores)")
@@ -0,0 +1,275 @@
+"""
+PROJETO: Cluster Analysis - Perfis Digitais das Escolas Brasileiras
+MÓDULO: Consenso de Clustering (estabilidade por reamostragem)
+
+Este módulo:
+1. Reamostra observações ou features centenas de vezes
+2. Reexecuta o K-Means em cada reamostragem, em um pool de processos
+3. Acumula a matriz de co-atribuição incrementalmente, lote a lote
+4. Calcula um score de estabilidade por cluster e por observação
+
+Usado por 03_clustering_regioes.py com a flag --consenso.
+
+Autor: [Seu nome]
+Data: 2025
+"""
+
+import os
+import time
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+from sklearn.cluster import KMeans
+from sklearn.decomposition import PCA
+
+from tic.log import linha, obter_logger
+
+# ============================================================================
+# CONFIGURAÇÕES
+# ============================================================================
+
+MODOS_REAMOSTRAGEM = ('observacoes', 'features')
+
+# Fração das observações (ou features) sorteada em cada reamostragem
+FRACAO_PADRAO = 0.8
+
+# Lotes por worker: lotes menores equilibram melhor a carga entre processos
+LOTES_POR_WORKER = 4
+
+# Matriz usada pelos workers (definida uma única vez pelo initializer do pool,
+# para não serializar X novamente a cada lote)
+_X_WORKER = None
+
+log = obter_logger('consenso')
+
+
+# ============================================================================
+# FUNÇÕES DOS WORKERS
+# ============================================================================
+
+def _inicializar_worker(X):
+    """Guarda X no processo e limita BLAS/OpenMP a 1 thread por worker"""
+    global _X_WORKER
+    _X_WORKER = X
+
+    # O paralelismo vem do pool; threads extras por processo disputariam os
+    # mesmos núcleos e quebrariam a escala linear com o número de workers
+    try:
+        from threadpoolctl import threadpool_limits
+        threadpool_limits(limits=1)
+    except ImportError:
+        pass
+
+
+def _executar_lote(sementes, k, modo, fracao, n_componentes):
+    """
+    Executa um lote de reamostragens e devolve as contagens parciais.
+
+    Returns:
+        (coatribuicao, coamostragem): matrizes n×n com o número de vezes em
+        que cada par caiu no mesmo cluster e em que foi sorteado junto
+    """
+    X = _X_WORKER
+    n_obs, n_feat = X.shape
+
+    coatribuicao = np.zeros((n_obs, n_obs), dtype=np.int32)
+    coamostragem = np.zeros((n_obs, n_obs), dtype=np.int32)
+
+    for semente in sementes:
+        rng = np.random.default_rng(semente)
+
+        if modo == 'observacoes':
+            # Subamostragem sem reposição (consenso de Monti et al.)
+            tamanho = min(n_obs, max(k + 1, int(round(fracao * n_obs))))
+            idx = np.sort(rng.choice(n_obs, size=tamanho, replace=False))
+            X_amostra = X[idx]
+        else:
+            # Todas as observações, subconjunto das features + PCA
+            tamanho = max(1, int(round(fracao * n_feat)))
+            colunas = rng.choice(n_feat, size=tamanho, replace=False)
+            idx = np.arange(n_obs)
+            X_amostra = X[:, colunas]
+            if n_componentes:
+                n_comp = min(n_componentes, n_obs - 1, tamanho)
+                X_amostra = PCA(n_components=n_comp).fit_transform(X_amostra)
+
+        labels = KMeans(n_clusters=k, random_state=int(semente % 2**31),
+                        n_init=10).fit_predict(X_amostra)
+
+        bloco = np.ix_(idx, idx)
+        coatribuicao[bloco] += labels[:, None] == labels[None, :]
+        coamostragem[bloco] += 1
+
+    return coatribuicao, coamostragem
+
+
+# ============================================================================
+# CONSENSO E ESTABILIDADE
+# ============================================================================
+
+def calcular_matriz_consenso(X, k, n_reamostragens=500, modo='observacoes',
+                             fracao=FRACAO_PADRAO, n_componentes=None,
+                             n_workers=None, semente=42):
+    """
+    Reamostra X e acumula a matriz de co-atribuição em paralelo.
+
+    Parâmetros:
+    -----------
+    X : np.ndarray
+        Matriz observações × features. No modo 'observacoes' é o espaço em
+        que o clustering é feito (ex.: X_pca); no modo 'features' são as
+        features normalizadas, reduzidas por PCA a cada reamostragem.
+    k : int
+        Número de clusters do K-Means
+    n_reamostragens : int
+        Total de reamostragens
+    modo : str
+        'observacoes' ou 'features'
+    n_componentes : int
+        Componentes do PCA no modo 'features' (None = sem PCA)
+    n_workers : int
+        Processos do pool (None = todos os núcleos; 1 = sem pool)
+
+    Returns:
+        dict com a matriz de consenso (fração de vezes em que cada par foi
+        agrupado junto, entre as vezes em que foi sorteado junto)
+    """
+    if modo not in MODOS_REAMOSTRAGEM:
+        raise ValueError(f"Modo de reamostragem inválido: {modo} "
+                         f"(use {', '.join(MODOS_REAMOSTRAGEM)})")
+
+    X = np.ascontiguousarray(X, dtype=np.float64)
+    n_obs = X.shape[0]
+    n_workers = n_workers or os.cpu_count() or 1
+
+    # Sementes derivadas de uma única SeedSequence: o resultado não depende
+    # do número de workers nem da ordem em que os lotes terminam
+    sementes = np.random.SeedSequence(semente).generate_state(n_reamostragens)
+    n_lotes = min(n_reamostragens, n_workers * LOTES_POR_WORKER)
+    lotes = [l for l in np.array_split(sementes, n_lotes) if len(l) > 0]
+
+    coatribuicao = np.zeros((n_obs, n_obs), dtype=np.int64)
+    coamostragem = np.zeros((n_obs, n_obs), dtype=np.int64)
+
+    # fork evita reexecutar o script principal em cada worker
+    if n_workers > 1 and 'fork' not in mp.get_all_start_methods():
+        log.warning("⚠️  Plataforma sem 'fork': executando reamostragens sem pool")
+        n_workers = 1
+
+    inicio = time.perf_counter()
+
+    if n_workers == 1:
+        _inicializar_worker(X)
+        for lote in lotes:
+            parcial_co, parcial_am = _executar_lote(lote, k, modo, fracao, n_componentes)
+            coatribuicao += parcial_co
+            coamostragem += parcial_am
+    else:
+        with ProcessPoolExecutor(max_workers=n_workers,
+                                 mp_context=mp.get_context('fork'),
+                                 initializer=_inicializar_worker,
+                                 initargs=(X,)) as pool:
+            futuros = [pool.submit(_executar_lote, lote, k, modo, fracao, n_componentes)
+                       for lote in lotes]
+            # Acumula cada lote assim que termina (sem guardar os rótulos)
+            for futuro in as_completed(futuros):
+                parcial_co, parcial_am = futuro.result()
+                coatribuicao += parcial_co
+                coamostragem += parcial_am
+
+    tempo = time.perf_counter() - inicio
+
+    consenso = np.divide(coatribuicao, coamostragem,
+                         out=np.zeros((n_obs, n_obs)), where=coamostragem > 0)
+    np.fill_diagonal(consenso, 1.0)
+
+    return {
+        'consenso': consenso,
+        'coamostragem': coamostragem,
+        'n_reamostragens': n_reamostragens,
+        'modo': modo,
+        'fracao': fracao,
+        'n_workers': n_workers,
+        'tempo_s': tempo
+    }
+
+
+def calcular_estabilidade(consenso, labels):
+    """
+    Calcula a estabilidade de cada observação e de cada cluster.
+
+    - Observação: consenso médio com os demais membros do seu cluster
+    - Cluster: consenso médio entre todos os pares do cluster
+
+    Para clusters unitários não há pares; a estabilidade é 1 menos o maior
+    consenso da observação com qualquer outra (quão sempre ela fica sozinha).
+
+    Returns:
+        (estabilidade_observacoes, estabilidade_clusters): array com um score
+        por observação e dict {cluster_id: score}
+    """
+    labels = np.asarray(labels)
+    n_obs = len(labels)
+
+    mesmo_cluster = labels[:, None] == labels[None, :]
+    np.fill_diagonal(mesmo_cluster, False)
+    n_pares = mesmo_cluster.sum(axis=1)
+
+    outros = consenso.copy()
+    np.fill_diagonal(outros, -np.inf)
+    sozinha = 1.0 - outros.max(axis=1) if n_obs > 1 else np.ones(n_obs)
+
+    soma_intra = (consenso * mesmo_cluster).sum(axis=1)
+    estabilidade_obs = np.where(n_pares > 0,
+                                soma_intra / np.maximum(n_pares, 1),
+                                sozinha)
+
+    estabilidade_clusters = {}
+    for cluster_id in np.unique(labels):
+        membros = np.flatnonzero(labels == cluster_id)
+        if len(membros) == 1:
+            estabilidade_clusters[int(cluster_id)] = float(estabilidade_obs[membros[0]])
+        else:
+            bloco = consenso[np.ix_(membros, membros)]
+            pares = bloco[np.triu_indices(len(membros), k=1)]
+            estabilidade_clusters[int(cluster_id)] = float(pares.mean())
+
+    return estabilidade_obs, estabilidade_clusters
+
+
+def executar_consenso(X, labels, k, nomes=None, **kwargs):
+    """
+    Executa o consenso completo e imprime o resumo de estabilidade.
+
+    Os kwargs são repassados para calcular_matriz_consenso.
+    """
+    resultado = calcular_matriz_consenso(X, k, **kwargs)
+    est_obs, est_clusters = calcular_estabilidade(resultado['consenso'], labels)
+
+    resultado['labels'] = np.asarray(labels)
+    resultado['estabilidade_observacoes'] = est_obs
+    resultado['estabilidade_clusters'] = est_clusters
+
+    nomes = nomes if nomes is not None else [str(i) for i in range(len(labels))]
+
+    log.info(f"\n✓ Consenso calculado:")
+    log.info(f"  - Reamostragens: {resultado['n_reamostragens']} "
+             f"(modo: {resultado['modo']}, fração: {resultado['fracao']:.0%})")
+    log.info(f"  - Workers: {resultado['n_workers']}")
+    log.info(f"  - Tempo: {resultado['tempo_s']:.2f}s")
+
+    log.debug(f"\nEstabilidade por cluster (1 = sempre juntos):")
+    for cluster_id, score in est_clusters.items():
+        membros = [nomes[i] for i in np.flatnonzero(resultado['labels'] == cluster_id)]
+        log.debug(f"  - Cluster {cluster_id+1}: {score:.3f} ({', '.join(membros)})",
+                  extra=linha("Consenso - estabilidade por cluster", cluster=cluster_id + 1,
+                              estabilidade=float(score), membros=', '.join(membros)))
+
+    log.debug(f"\nEstabilidade por observação:")
+    for nome, score in zip(nomes, est_obs):
+        log.debug(f"  - {nome}: {score:.3f}",
+                  extra=linha("Consenso - estabilidade por observação", observacao=nome,
+                              estabilidade=float(score)))
+
+    return resultado
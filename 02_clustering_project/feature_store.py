@@ -0,0 +1,202 @@
+"""
+PROJETO: Cluster Analysis - Perfis Digitais das Escolas Brasileiras
+MÓDULO: Feature Store (features normalizadas + parâmetros do scaler)
+
+Cada versão do feature store é uma pasta com:
+- matriz.npy       → matriz binária (observações × features), lida via memory-map
+- manifesto.json   → colunas, observações, parâmetros do StandardScaler,
+                     features removidas (com motivo) e hash da matriz
+
+Estrutura:
+    dados_processados/feature_store/<nome>/v001/matriz.npy
+    dados_processados/feature_store/<nome>/v001/manifesto.json
+
+Autor: [Seu nome]
+Data: 2025
+"""
+
+import hashlib
+import json
+import shutil
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+# ============================================================================
+# CONFIGURAÇÕES
+# ============================================================================
+
+PASTA_FEATURE_STORE = 'dados_processados/feature_store'
+
+# Versão do formato do artefato (muda apenas se a estrutura mudar)
+FORMATO_VERSAO = 1
+
+ARQUIVO_MATRIZ = 'matriz.npy'
+ARQUIVO_MANIFESTO = 'manifesto.json'
+
+
+# ============================================================================
+# FUNÇÕES AUXILIARES
+# ============================================================================
+
+def _hash_matriz(X):
+    """SHA-256 dos bytes da matriz (identifica o conteúdo de uma versão)"""
+    return hashlib.sha256(np.ascontiguousarray(X).tobytes()).hexdigest()
+
+
+def listar_versoes(nome='regioes', pasta=PASTA_FEATURE_STORE):
+    """Lista as versões existentes de um feature store, da mais antiga à mais recente"""
+    base = Path(pasta) / nome
+    if not base.exists():
+        return []
+    return sorted(p.name for p in base.iterdir()
+                  if p.is_dir() and p.name.startswith('v') and p.name[1:].isdigit())
+
+
+# ============================================================================
+# ESCRITA E LEITURA
+# ============================================================================
+
+def salvar_feature_store(X, colunas, observacoes, scaler, features_removidas=None,
+                         nome='regioes', pasta=PASTA_FEATURE_STORE, origem=None):
+    """
+    Salva uma nova versão do feature store.
+
+    Parâmetros:
+    -----------
+    X : array-like
+        Features já normalizadas (observações × features)
+    colunas, observacoes : list
+        Nomes das features e identificadores das observações
+    scaler : StandardScaler
+        Scaler já ajustado (mean_, var_, scale_)
+    features_removidas : list of dict
+        [{'feature': ..., 'motivo': ...}] para cada coluna descartada
+    origem : str
+        Arquivo de onde os dados brutos vieram
+
+    Returns:
+        Path da pasta da versão (a versão mais recente é reaproveitada se a
+        matriz, as colunas, as observações e o scaler forem idênticos)
+    """
+    X = np.ascontiguousarray(X, dtype=np.float64)
+    colunas = [str(c) for c in colunas]
+    observacoes = [str(o) for o in observacoes]
+
+    if X.shape != (len(observacoes), len(colunas)):
+        raise ValueError(f"Shape da matriz {X.shape} não bate com "
+                         f"{len(observacoes)} observações × {len(colunas)} colunas")
+
+    hash_matriz = _hash_matriz(X)
+    parametros_scaler = {
+        'tipo': type(scaler).__name__,
+        'mean': scaler.mean_.tolist(),
+        'var': scaler.var_.tolist(),
+        'scale': scaler.scale_.tolist(),
+        'n_samples_seen': int(np.max(scaler.n_samples_seen_))
+    }
+    base = Path(pasta) / nome
+    versoes = listar_versoes(nome, pasta)
+
+    # Reexecução sem mudanças: não cria versão nova. O scaler também precisa
+    # ser igual: dados brutos em outra escala podem normalizar para a mesma
+    # matriz, e prever_cluster usa a média/desvio do manifesto
+    if versoes:
+        ultima = base / versoes[-1]
+        with open(ultima / ARQUIVO_MANIFESTO, 'r', encoding='utf-8') as f:
+            manifesto_anterior = json.load(f)
+        if (manifesto_anterior['sha256'] == hash_matriz
+                and manifesto_anterior['colunas'] == colunas
+                and manifesto_anterior['observacoes'] == observacoes
+                and manifesto_anterior.get('scaler') == parametros_scaler):
+            return ultima
+
+    numero = int(versoes[-1][1:]) + 1 if versoes else 1
+    versao = f"v{numero:03d}"
+
+    manifesto = {
+        'formato_versao': FORMATO_VERSAO,
+        'nome': nome,
+        'versao': versao,
+        'criado_em': datetime.now().isoformat(),
+        'origem': origem,
+        'shape': list(X.shape),
+        'dtype': str(X.dtype),
+        'sha256': hash_matriz,
+        'colunas': colunas,
+        'observacoes': observacoes,
+        'scaler': parametros_scaler,
+        'features_removidas': features_removidas or []
+    }
+
+    # Escreve em pasta temporária e renomeia: uma versão nunca fica pela metade
+    destino = base / versao
+    temporaria = base / f".{versao}.tmp"
+    if temporaria.exists():
+        shutil.rmtree(temporaria)
+    temporaria.mkdir(parents=True)
+
+    np.save(temporaria / ARQUIVO_MATRIZ, X)
+    with open(temporaria / ARQUIVO_MANIFESTO, 'w', encoding='utf-8') as f:
+        json.dump(manifesto, f, ensure_ascii=False, indent=2)
+
+    temporaria.rename(destino)
+    return destino
+
+
+def carregar_feature_store(nome='regioes', versao=None, pasta=PASTA_FEATURE_STORE, mmap=True):
+    """
+    Carrega uma versão do feature store (a mais recente se versao=None).
+
+    Com mmap=True a matriz é mapeada em memória (somente leitura), sem
+    reprocessar texto nem reajustar o scaler.
+
+    Returns:
+        dict com 'X', 'colunas', 'observacoes', 'scaler' e 'manifesto'
+    """
+    versoes = listar_versoes(nome, pasta)
+    if not versoes:
+        raise FileNotFoundError(f"Feature store '{nome}' não encontrado em {pasta}")
+
+    versao = versao or versoes[-1]
+    if versao not in versoes:
+        raise FileNotFoundError(f"Versão '{versao}' do feature store '{nome}' não encontrada "
+                                f"(disponíveis: {', '.join(versoes)})")
+
+    pasta_versao = Path(pasta) / nome / versao
+    with open(pasta_versao / ARQUIVO_MANIFESTO, 'r', encoding='utf-8') as f:
+        manifesto = json.load(f)
+
+    if manifesto['formato_versao'] > FORMATO_VERSAO:
+        raise ValueError(f"Formato {manifesto['formato_versao']} mais novo que o suportado "
+                         f"({FORMATO_VERSAO})")
+
+    X = np.load(pasta_versao / ARQUIVO_MATRIZ, mmap_mode='r' if mmap else None)
+
+    if list(X.shape) != manifesto['shape']:
+        raise ValueError(f"Matriz {X.shape} inconsistente com o manifesto {manifesto['shape']}")
+
+    return {
+        'X': X,
+        'colunas': manifesto['colunas'],
+        'observacoes': manifesto['observacoes'],
+        'scaler': manifesto['scaler'],
+        'manifesto': manifesto
+    }
+
+
+def reconstruir_scaler(parametros):
+    """
+    Reconstrói um StandardScaler ajustado a partir dos parâmetros salvos,
+    para transformar novas observações sem reajustar.
+    """
+    from sklearn.preprocessing import StandardScaler
+
+    scaler = StandardScaler()
+    scaler.mean_ = np.asarray(parametros['mean'], dtype=np.float64)
+    scaler.var_ = np.asarray(parametros['var'], dtype=np.float64)
+    scaler.scale_ = np.asarray(parametros['scale'], dtype=np.float64)
+    scaler.n_features_in_ = len(scaler.mean_)
+    scaler.n_samples_seen_ = parametros['n_samples_seen']
+    return scaler
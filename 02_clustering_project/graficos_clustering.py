@@ -0,0 +1,154 @@
+"""
+PROJETO: Cluster Analysis - Perfis Digitais das Escolas Brasileiras
+MÓDULO: Gráficos do clustering (03_clustering_regioes.py)
+
+matplotlib, seaborn e o dendrograma do scipy só são importados quando um
+gráfico é de fato gerado; execuções com --sem-graficos não os carregam.
+
+As funções seguem o contrato de tic/figuras.py (caminho, dpi) e recebem só
+arrays/DataFrames, para o hash de conteúdo e o envio aos workers.
+
+Autor: [Seu nome]
+Data: 2025
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from tic.instrumentacao import instrumentar
+
+_ESTILO_CONFIGURADO = False
+
+
+def _pyplot():
+    """Importa pyplot/seaborn e aplica o estilo do projeto (uma vez)"""
+    global _ESTILO_CONFIGURADO
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    if not _ESTILO_CONFIGURADO:
+        plt.style.use('seaborn-v0_8-darkgrid')
+        sns.set_palette("husl")
+        plt.rcParams['figure.figsize'] = (12, 8)
+        plt.rcParams['font.size'] = 10
+        _ESTILO_CONFIGURADO = True
+
+    return plt, sns
+
+
+@instrumentar(categoria='render')
+def grafico_variancia_pca(variancia_explicada, variance_cumsum, caminho, dpi=300):
+    """Scree plot + variância cumulativa"""
+    plt, _ = _pyplot()
+    fig, axes = plt.subplots(1, 2, figsize=(15, 5))
+
+    # Scree plot
+    axes[0].bar(range(1, min(21, len(variancia_explicada)+1)),
+                variancia_explicada[:20])
+    axes[0].set_xlabel('Componente Principal')
+    axes[0].set_ylabel('Variância Explicada')
+    axes[0].set_title('Scree Plot - Variância por Componente')
+    axes[0].axhline(y=0.1, color='r', linestyle='--', label='10% threshold')
+    axes[0].legend()
+
+    # Variância cumulativa
+    axes[1].plot(range(1, min(21, len(variance_cumsum)+1)), variance_cumsum[:20], 'bo-')
+    axes[1].axhline(y=0.90, color='r', linestyle='--', label='90%')
+    axes[1].axhline(y=0.95, color='g', linestyle='--', label='95%')
+    axes[1].set_xlabel('Número de Componentes')
+    axes[1].set_ylabel('Variância Explicada Cumulativa')
+    axes[1].set_title('Variância Cumulativa')
+    axes[1].legend()
+    axes[1].grid(True, alpha=0.3)
+
+    plt.tight_layout()
+    plt.savefig(caminho, dpi=dpi, bbox_inches='tight')
+    plt.close()
+
+
+@instrumentar(categoria='render')
+def grafico_distancias(dist_df, caminho, dpi=300):
+    """Heatmap da matriz de distâncias entre regiões"""
+    plt, sns = _pyplot()
+    plt.figure(figsize=(10, 8))
+    sns.heatmap(dist_df, annot=True, fmt='.2f', cmap='YlOrRd',
+                square=True, cbar_kws={'label': 'Distância Euclidiana'})
+    plt.title('Matriz de Distâncias Entre Regiões\n(Baseada em PCA)', fontsize=14, fontweight='bold')
+    plt.tight_layout()
+    plt.savefig(caminho, dpi=dpi, bbox_inches='tight')
+    plt.close()
+
+
+@instrumentar(categoria='render')
+def grafico_dendrograma(linkage_matrix, regioes, caminho, dpi=300):
+    """Dendrograma com os cortes para 2 e 3 clusters"""
+    from scipy.cluster.hierarchy import dendrogram
+
+    plt, _ = _pyplot()
+    plt.figure(figsize=(12, 6))
+    dendrogram(linkage_matrix,
+               labels=regioes,
+               leaf_font_size=12,
+               color_threshold=0)
+    plt.title('Dendrograma - Clustering Hierárquico das Regiões',
+              fontsize=14, fontweight='bold')
+    plt.xlabel('Região', fontsize=12)
+    plt.ylabel('Distância (Ward)', fontsize=12)
+    plt.axhline(y=linkage_matrix[-2, 2], color='r', linestyle='--',
+                label=f'Corte para 2 clusters')
+    plt.axhline(y=linkage_matrix[-3, 2], color='g', linestyle='--',
+                label=f'Corte para 3 clusters')
+    plt.legend()
+    plt.tight_layout()
+    plt.savefig(caminho, dpi=dpi, bbox_inches='tight')
+    plt.close()
+
+
+@instrumentar(categoria='render')
+def grafico_clusters(X_pca, labels, regioes, centers, variancia_explicada, k, data_top, caminho,
+                     dpi=300):
+    """PCA 2D com os clusters + heatmap das features mais variáveis"""
+    plt, sns = _pyplot()
+
+    # Criar figura com múltiplos subplots
+    fig, axes = plt.subplots(1, 2, figsize=(16, 6))
+
+    # Plot 1: PCA 2D com clusters do K-means
+    if X_pca.shape[1] >= 2:
+        axes[0].scatter(X_pca[:, 0], X_pca[:, 1],
+                        c=labels, s=500, alpha=0.6,
+                        cmap='viridis', edgecolors='black', linewidth=2)
+
+        # Adicionar labels
+        for i, regiao in enumerate(regioes):
+            axes[0].annotate(regiao, (X_pca[i, 0], X_pca[i, 1]),
+                            fontsize=11, fontweight='bold',
+                            ha='center', va='center')
+
+        # Adicionar centróides
+        axes[0].scatter(centers[:, 0], centers[:, 1],
+                       c='red', s=300, alpha=0.8, marker='X',
+                       edgecolors='black', linewidth=2,
+                       label='Centróides')
+
+        axes[0].set_xlabel(f'PC1 ({variancia_explicada[0]*100:.1f}% var.)',
+                          fontsize=12)
+        axes[0].set_ylabel(f'PC2 ({variancia_explicada[1]*100:.1f}% var.)',
+                          fontsize=12)
+        axes[0].set_title(f'Clusters das Regiões (K-Means, K={k})',
+                         fontsize=14, fontweight='bold')
+        axes[0].legend()
+        axes[0].grid(True, alpha=0.3)
+
+    # Plot 2: Heatmap de features mais importantes por região
+    sns.heatmap(data_top.T, annot=True, fmt='.2f', cmap='RdYlGn',
+                ax=axes[1], cbar_kws={'label': 'Valor Normalizado'})
+    axes[1].set_title('Top 15 Features Mais Variáveis por Região',
+                     fontsize=14, fontweight='bold')
+    axes[1].set_xlabel('Região', fontsize=12)
+    axes[1].set_ylabel('Feature', fontsize=12)
+
+    plt.tight_layout()
+    plt.savefig(caminho, dpi=dpi, bbox_inches='tight')
+    plt.close()
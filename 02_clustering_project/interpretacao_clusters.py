@@ -0,0 +1,121 @@
+"""
+PROJETO: Cluster Analysis - Perfis Digitais das Escolas Brasileiras
+MÓDULO: Interpretação dos clusters (todos os clusters de uma vez)
+
+Este módulo:
+1. Calcula a matriz cluster × feature de médias em um único groupby
+2. Deriva diferenças relativas e tamanhos de efeito para todos os clusters
+3. Seleciona as top-k features distintivas (acima e abaixo da média) por cluster
+
+Autor: [Seu nome]
+Data: 2025
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def interpretar_clusters(valores, labels, top_k=10):
+    """
+    Interpreta todos os clusters em uma passada vetorizada.
+
+    Parâmetros:
+    -----------
+    valores : pd.DataFrame
+        Observações × features em escala original (não normalizada)
+    labels : array-like
+        Cluster de cada observação (mesma ordem das linhas)
+    top_k : int
+        Número de features distintivas por cluster e direção
+
+    Returns:
+        dict com:
+        - 'medias': DataFrame cluster × feature
+        - 'media_global': Series por feature
+        - 'diferenca_relativa': DataFrame cluster × feature, em %
+          ((média do cluster - média global) / (média global + 1))
+        - 'efeito': DataFrame cluster × feature, d de Cohen do cluster
+          contra as demais observações (desvio combinado)
+        - 'top_acima' / 'top_abaixo': DataFrame cluster × top_k com os nomes
+          das features de maior / menor diferença relativa
+    """
+    valores = valores.astype(np.float64).reset_index(drop=True)
+    labels = np.asarray(labels)
+
+    grupos = valores.groupby(labels)
+    medias = grupos.mean()
+    somas = grupos.sum()
+    somas_quad = (valores ** 2).groupby(labels).sum()
+    n_cluster = grupos.size().to_numpy()[:, None]
+
+    n_total = len(valores)
+    soma_total = valores.sum().to_numpy()[None, :]
+    soma_quad_total = (valores ** 2).sum().to_numpy()[None, :]
+    media_global = valores.mean()
+
+    # Diferença relativa (mesma definição usada na interpretação original)
+    diferenca_relativa = (medias - media_global) / (media_global + 1) * 100
+
+    # Tamanho de efeito: cluster vs. demais observações, a partir das somas
+    n_resto = n_total - n_cluster
+    media_resto = (soma_total - somas.to_numpy()) / np.maximum(n_resto, 1)
+    var_cluster = somas_quad.to_numpy() / n_cluster - medias.to_numpy() ** 2
+    var_resto = ((soma_quad_total - somas_quad.to_numpy()) / np.maximum(n_resto, 1)
+                 - media_resto ** 2)
+    desvio_combinado = np.sqrt(np.maximum(
+        (n_cluster * var_cluster + n_resto * var_resto) / n_total, 0.0))
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        efeito = (medias.to_numpy() - media_resto) / desvio_combinado
+    efeito[~np.isfinite(efeito)] = np.nan
+    efeito = pd.DataFrame(efeito, index=medias.index, columns=medias.columns)
+
+    # Top-k por cluster: uma ordenação por linha para todos os clusters
+    colunas = medias.columns.to_numpy()
+    dif = diferenca_relativa.to_numpy()
+    ordem = np.argsort(-np.nan_to_num(dif, nan=0.0), axis=1, kind='stable')
+    k = min(top_k, len(colunas))
+
+    top_acima = pd.DataFrame(colunas[ordem[:, :k]], index=medias.index)
+    top_abaixo = pd.DataFrame(colunas[ordem[:, ::-1][:, :k]], index=medias.index)
+
+    return {
+        'medias': medias,
+        'media_global': media_global,
+        'diferenca_relativa': diferenca_relativa,
+        'efeito': efeito,
+        'top_acima': top_acima,
+        'top_abaixo': top_abaixo
+    }
+
+
+def tabela_interpretacao(interpretacao):
+    """
+    Converte as top-k features de cada cluster em uma tabela longa
+    (cluster, direcao, posicao, feature, médias, diferença e efeito).
+    """
+    medias = interpretacao['medias']
+    media_global = interpretacao['media_global']
+    dif = interpretacao['diferenca_relativa']
+    efeito = interpretacao['efeito']
+
+    linhas = []
+    for direcao, tops in [('acima', interpretacao['top_acima']),
+                          ('abaixo', interpretacao['top_abaixo'])]:
+        longo = tops.stack().rename('feature').reset_index()
+        longo.columns = ['cluster', 'posicao', 'feature']
+        longo['direcao'] = direcao
+        linhas.append(longo)
+
+    tabela = pd.concat(linhas, ignore_index=True)
+    idx_cluster = medias.index.get_indexer(tabela['cluster'])
+    idx_feature = medias.columns.get_indexer(tabela['feature'])
+
+    tabela['media_cluster'] = medias.to_numpy()[idx_cluster, idx_feature]
+    tabela['media_global'] = media_global.to_numpy()[idx_feature]
+    tabela['diferenca_relativa'] = dif.to_numpy()[idx_cluster, idx_feature]
+    tabela['efeito'] = efeito.to_numpy()[idx_cluster, idx_feature]
+    tabela['posicao'] += 1
+
+    return tabela[['cluster', 'direcao', 'posicao', 'feature', 'media_cluster',
+                   'media_global', 'diferenca_relativa', 'efeito']]
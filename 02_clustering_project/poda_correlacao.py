@@ -0,0 +1,133 @@
+"""
+PROJETO: Cluster Analysis - Perfis Digitais das Escolas Brasileiras
+MÓDULO: Poda de features correlacionadas (antes do PCA)
+
+Muitas features extraídas são quase duplicadas: colunas Sim/Não/Total da
+mesma pergunta, o mesmo indicador em valor absoluto e percentual etc.
+
+Este módulo:
+1. Calcula a matriz de correlação em blocos (produtos de matrizes padronizadas)
+2. Agrupa colunas altamente correlacionadas ou complementares (|r| ≥ limiar)
+3. Mantém um representante por grupo e relata o que foi colapsado
+
+Autor: [Seu nome]
+Data: 2025
+"""
+
+import numpy as np
+import pandas as pd
+
+# ============================================================================
+# CONFIGURAÇÕES
+# ============================================================================
+
+# |r| a partir do qual duas features são consideradas redundantes.
+# Complementares (ex.: Sim vs. Não com total fixo) têm r ≈ -1 e também caem aqui.
+LIMIAR_CORRELACAO = 0.98
+
+# Colunas por bloco: a matriz p × p nunca é materializada inteira
+TAMANHO_BLOCO = 256
+
+
+# ============================================================================
+# CORRELAÇÃO EM BLOCOS
+# ============================================================================
+
+def _padronizar(X):
+    """
+    Centraliza e escala as colunas de forma que Zᵀ Z seja a matriz de correlação
+    """
+    X = np.asarray(X, dtype=np.float64)
+    Z = X - X.mean(axis=0)
+    norma = np.sqrt((Z ** 2).sum(axis=0))
+    norma[norma == 0] = np.inf  # colunas constantes: correlação 0 com todas
+    return Z / norma
+
+
+def encontrar_pares_correlacionados(X, limiar=LIMIAR_CORRELACAO, tamanho_bloco=TAMANHO_BLOCO):
+    """
+    Encontra todos os pares (i, j), i < j, com |correlação| ≥ limiar.
+
+    A correlação é calculada bloco a bloco (Z[:, a]ᵀ Z[:, b]) percorrendo
+    apenas o triângulo superior.
+
+    Returns:
+        (i, j, r): arrays com os índices das colunas e a correlação de cada par
+    """
+    Z = _padronizar(X)
+    n_colunas = Z.shape[1]
+
+    lista_i, lista_j, lista_r = [], [], []
+    for inicio_a in range(0, n_colunas, tamanho_bloco):
+        bloco_a = Z[:, inicio_a:inicio_a + tamanho_bloco]
+        for inicio_b in range(inicio_a, n_colunas, tamanho_bloco):
+            bloco_b = Z[:, inicio_b:inicio_b + tamanho_bloco]
+            corr = bloco_a.T @ bloco_b
+
+            ii, jj = np.nonzero(np.abs(corr) >= limiar)
+            gi, gj = ii + inicio_a, jj + inicio_b
+            superior = gi < gj
+
+            lista_i.append(gi[superior])
+            lista_j.append(gj[superior])
+            lista_r.append(corr[ii[superior], jj[superior]])
+
+    if not lista_i:
+        vazio = np.array([], dtype=np.int64)
+        return vazio, vazio, np.array([], dtype=np.float64)
+
+    return np.concatenate(lista_i), np.concatenate(lista_j), np.concatenate(lista_r)
+
+
+# ============================================================================
+# PODA
+# ============================================================================
+
+def podar_features_correlacionadas(X, limiar=LIMIAR_CORRELACAO, tamanho_bloco=TAMANHO_BLOCO):
+    """
+    Mantém um representante por grupo de features correlacionadas.
+
+    Percorre as colunas na ordem original: a primeira coluna ainda não
+    colapsada vira representante e absorve todas as colunas posteriores
+    com |r| ≥ limiar em relação a ela.
+
+    Parâmetros:
+    -----------
+    X : pd.DataFrame
+        Observações × features numéricas
+    limiar : float
+        |correlação| mínima para colapsar duas features
+
+    Returns:
+        (X_podado, relatorio): DataFrame só com os representantes e
+        DataFrame (representante, feature_removida, correlacao)
+    """
+    colunas = X.columns.tolist()
+    pares_i, pares_j, pares_r = encontrar_pares_correlacionados(
+        X.to_numpy(dtype=np.float64), limiar, tamanho_bloco)
+
+    # Vizinhos de cada coluna (apenas colunas posteriores), ordenados
+    ordem = np.lexsort((pares_j, pares_i))
+    pares_i, pares_j, pares_r = pares_i[ordem], pares_j[ordem], pares_r[ordem]
+    limites = np.searchsorted(pares_i, np.arange(len(colunas) + 1))
+
+    removida = np.zeros(len(colunas), dtype=bool)
+    relatorio = []
+
+    for i in range(len(colunas)):
+        if removida[i]:
+            continue
+        for pos in range(limites[i], limites[i + 1]):
+            j = pares_j[pos]
+            if not removida[j]:
+                removida[j] = True
+                relatorio.append({
+                    'representante': colunas[i],
+                    'feature_removida': colunas[j],
+                    'correlacao': round(float(pares_r[pos]), 4)
+                })
+
+    relatorio = pd.DataFrame(relatorio, columns=['representante', 'feature_removida', 'correlacao'])
+    X_podado = X.loc[:, ~removida]
+
+    return X_podado, relatorio
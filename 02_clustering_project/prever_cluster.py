@@ -0,0 +1,250 @@
+"""
+PROJETO: Cluster Analysis - Perfis Digitais das Escolas Brasileiras
+MÓDULO: Atribuição de novas observações aos clusters existentes
+
+Este módulo:
+1. Salva o modelo de clustering (ordem das colunas, scaler, PCA, centróides)
+2. Carrega o modelo e pré-combina scaler + PCA em uma única projeção afim
+3. Atribui lotes de novas linhas (novo ano, estado, rede) em uma chamada
+   vetorizada, sem reexecutar o clustering
+
+Uso (CLI):
+    python prever_cluster.py novas_observacoes.csv
+    python prever_cluster.py novas.csv --modelo dados_processados/modelo_clusters.npz --saida previsoes.csv
+
+A entrada usa o mesmo formato do escolas_2024_consolidado (CSV, Parquet ou
+Feather; valores brutos, não normalizados, uma linha por observação). Só as
+colunas do modelo e a identificadora são lidas.
+
+Autor: [Seu nome]
+Data: 2025
+"""
+
+import argparse
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from tic.saida import ler_arquivo
+from tic.instrumentacao import adicionar_argumento_perfil, configurar_perfil, span
+from tic.log import adicionar_argumentos_log, configurar_log_args, obter_logger
+
+log = obter_logger('prever_cluster')
+
+# ============================================================================
+# CONFIGURAÇÕES
+# ============================================================================
+
+ARQUIVO_MODELO = 'dados_processados/modelo_clusters.npz'
+MODELO_VERSAO = 1
+
+
+# ============================================================================
+# SALVAR / CARREGAR MODELO
+# ============================================================================
+
+def salvar_modelo(pca, centroides, colunas, scaler, labels, observacoes,
+                  caminho=ARQUIVO_MODELO, metadados=None):
+    """
+    Salva o bundle do modelo em um único .npz (sem pickle).
+
+    Parâmetros:
+    -----------
+    pca : PCA
+        PCA ajustado sobre as features normalizadas
+    centroides : np.ndarray
+        Centróides do K-Means no espaço do PCA (k × componentes)
+    colunas : list
+        Ordem das features esperada na entrada
+    scaler : dict
+        Parâmetros do StandardScaler ('mean', 'scale'), como no feature store
+    labels, observacoes : array-like
+        Clusters (0-indexed) e nomes das observações de treino
+    """
+    Path(caminho).parent.mkdir(parents=True, exist_ok=True)
+
+    meta = {
+        'modelo_versao': MODELO_VERSAO,
+        'criado_em': datetime.now().isoformat(),
+        'n_clusters': int(len(centroides)),
+        'n_componentes': int(pca.n_components_),
+        'variancia_explicada': [float(v) for v in pca.explained_variance_ratio_],
+        **(metadados or {})
+    }
+
+    np.savez(
+        caminho,
+        colunas=np.array(colunas, dtype=str),
+        scaler_media=np.asarray(scaler['mean'], dtype=np.float64),
+        scaler_escala=np.asarray(scaler['scale'], dtype=np.float64),
+        pca_media=pca.mean_.astype(np.float64),
+        pca_componentes=pca.components_.astype(np.float64),
+        centroides=np.asarray(centroides, dtype=np.float64),
+        labels_treino=np.asarray(labels, dtype=np.int32),
+        observacoes_treino=np.array(observacoes, dtype=str),
+        metadados=np.array(json.dumps(meta, ensure_ascii=False))
+    )
+    return caminho
+
+
+def carregar_modelo(caminho=ARQUIVO_MODELO):
+    """
+    Carrega o bundle e pré-calcula a projeção afim combinada:
+
+        z = ((x - média) / escala - média_pca) @ Wᵀ  =  x @ A + b
+
+    Returns:
+        dict com colunas, A, b, centróides e metadados
+    """
+    if not Path(caminho).exists():
+        raise FileNotFoundError(f"Modelo não encontrado: {caminho} "
+                                "(execute 03_clustering_regioes.py primeiro)")
+
+    with np.load(caminho, allow_pickle=False) as npz:
+        dados = {k: npz[k] for k in npz.files}
+
+    meta = json.loads(str(dados['metadados']))
+    if meta['modelo_versao'] > MODELO_VERSAO:
+        raise ValueError(f"Modelo versão {meta['modelo_versao']} mais novo que o suportado")
+
+    media = dados['scaler_media']
+    escala = dados['scaler_escala']
+    W = dados['pca_componentes']
+
+    A = (W / escala).T
+    b = -(media / escala) @ W.T - dados['pca_media'] @ W.T
+
+    centroides = dados['centroides']
+
+    return {
+        'colunas': dados['colunas'].tolist(),
+        'media': media,
+        'A': np.ascontiguousarray(A),
+        'b': b,
+        'centroides': centroides,
+        'centroides_norma2': (centroides ** 2).sum(axis=1),
+        'labels_treino': dados['labels_treino'],
+        'observacoes_treino': dados['observacoes_treino'].tolist(),
+        'metadados': meta
+    }
+
+
+# ============================================================================
+# PREVISÃO
+# ============================================================================
+
+def preparar_matriz(dados, modelo):
+    """
+    Alinha a entrada à ordem de colunas do modelo.
+
+    Colunas ausentes ou valores faltantes recebem a média de treino (ou seja,
+    zero após a normalização).
+
+    Returns:
+        (X, n_imputados)
+    """
+    if isinstance(dados, pd.DataFrame):
+        X = dados.reindex(columns=modelo['colunas'])
+        X = X.apply(pd.to_numeric, errors='coerce').to_numpy(dtype=np.float64)
+    else:
+        X = np.array(dados, dtype=np.float64, ndmin=2)
+        if X.shape[1] != len(modelo['colunas']):
+            raise ValueError(f"Esperadas {len(modelo['colunas'])} colunas, recebidas {X.shape[1]}")
+
+    faltantes = np.isnan(X)
+    n_imputados = int(faltantes.sum())
+    if n_imputados:
+        X = np.where(faltantes, modelo['media'], X)
+
+    return X, n_imputados
+
+
+def prever_cluster(dados, modelo=None):
+    """
+    Projeta e atribui um lote de observações aos clusters existentes.
+
+    Parâmetros:
+    -----------
+    dados : pd.DataFrame ou np.ndarray
+        Linhas com as features brutas (mesmas colunas do consolidado)
+    modelo : dict
+        Modelo de carregar_modelo() (carregado do caminho padrão se None)
+
+    Returns:
+        dict com 'cluster' (1-indexed, como em resultados_clustering.csv),
+        'distancia' ao centróide, 'componentes' (coordenadas no PCA) e
+        'n_imputados'
+    """
+    if modelo is None:
+        modelo = carregar_modelo()
+
+    X, n_imputados = preparar_matriz(dados, modelo)
+
+    # Uma multiplicação de matrizes para scaler + PCA
+    Z = X @ modelo['A'] + modelo['b']
+
+    # ||z - c||² = ||z||² - 2 z·c + ||c||², para todos os pares de uma vez
+    dist2 = ((Z ** 2).sum(axis=1)[:, None]
+             - 2.0 * Z @ modelo['centroides'].T
+             + modelo['centroides_norma2'][None, :])
+    labels = dist2.argmin(axis=1)
+    distancia = np.sqrt(np.maximum(dist2[np.arange(len(labels)), labels], 0.0))
+
+    return {
+        'cluster': labels + 1,
+        'distancia': distancia,
+        'componentes': Z,
+        'n_imputados': n_imputados
+    }
+
+
+# ============================================================================
+# EXECUÇÃO VIA LINHA DE COMANDO
+# ============================================================================
+
+def main():
+    """
+    Lê um arquivo de novas observações e salva o cluster atribuído a cada linha
+    """
+    parser = argparse.ArgumentParser(description='Atribui novas observações aos clusters existentes')
+    parser.add_argument('entrada', help='CSV/Parquet/Feather com as novas observações (formato do consolidado)')
+    parser.add_argument('--modelo', default=ARQUIVO_MODELO, help=f'Bundle do modelo (padrão: {ARQUIVO_MODELO})')
+    parser.add_argument('--saida', default=None, help='CSV de saída (padrão: <entrada>_clusters.csv)')
+    parser.add_argument('--id', default='observacao_id', help='Coluna identificadora (padrão: observacao_id)')
+    adicionar_argumento_perfil(parser, 'dados_processados/perfil_prever_cluster.json')
+    adicionar_argumentos_log(parser)
+    args = parser.parse_args()
+    configurar_perfil(args)
+    configurar_log_args(args)
+
+    modelo = carregar_modelo(args.modelo)
+    necessarias = set(modelo['colunas']) | {args.id}
+    df = ler_arquivo(args.entrada, colunas=lambda c: c in necessarias)
+
+    with span('prever_cluster', 'modelo', linhas=len(df)):
+        resultado = prever_cluster(df, modelo)
+
+    saida = pd.DataFrame({
+        args.id: df[args.id] if args.id in df.columns else np.arange(len(df)),
+        'cluster': resultado['cluster'],
+        'distancia_centroide': resultado['distancia']
+    })
+    for i in range(resultado['componentes'].shape[1]):
+        saida[f'PC{i+1}'] = resultado['componentes'][:, i]
+
+    arquivo_saida = args.saida or f"{Path(args.entrada).with_suffix('')}_clusters.csv"
+    saida.to_csv(arquivo_saida, index=False)
+
+    log.info(f"✓ {len(saida)} observações atribuídas a {modelo['metadados']['n_clusters']} clusters")
+    if resultado['n_imputados']:
+        log.warning(f"⚠️  {resultado['n_imputados']} valores ausentes imputados com a média de treino")
+    log.info(f"✓ Resultados salvos: {arquivo_saida}")
+
+
+if __name__ == "__main__":
+    main()
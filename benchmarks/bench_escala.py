@@ -0,0 +1,185 @@
+"""
+BENCHMARK - ESCALABILIDADE DO PIPELINE
+TIC Educação 2024
+
+Gera workbooks TIC sintéticos (tic/sintetico.py) em várias escalas e mede cada
+etapa do pipeline rodando a CLI em processos novos, na pasta dos dados:
+- extração (tabela de fatos + consolidado)
+- análise de cada aba (A3, A8, B4A, G6, H4D)
+- consolidação (relatório + cubo)
+- clustering (preparação + PCA/k-means, sem gráficos)
+
+Cada etapa roda com --profile: além do tempo total, o resultado guarda o pico
+de RSS e o tempo dos spans (ler_aba, fatos_aba, escrever_*, ...) do rastro.
+
+Os resultados são salvos em JSON para comparação com uma execução anterior.
+Com --comparar, sai com código 1 se alguma etapa ficar mais lenta que a
+tolerância.
+
+Uso (na raiz do repositório):
+    python benchmarks/bench_escala.py
+    python benchmarks/bench_escala.py --escalas real media grande --repeticoes 3
+    python benchmarks/bench_escala.py --comparar benchmarks/resultados/base.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(RAIZ))
+from tic.instrumentacao import resumo
+from tic.sintetico import ESCALAS, gerar_conjunto
+
+PASTA_RESULTADOS = RAIZ / 'benchmarks' / 'resultados'
+
+ESCALAS_PADRAO = ['real', 'media']
+REPETICOES = 1
+
+# Etapa → argumentos da CLI tic (na ordem do pipeline; cada uma usa as saídas das anteriores)
+ETAPAS = {
+    'extracao': ['extrair'],
+    'analise_a3': ['analisar', 'a3'],
+    'analise_a8': ['analisar', 'a8'],
+    'analise_b4a': ['analisar', 'b4a'],
+    'analise_g6': ['analisar', 'g6'],
+    'analise_h4d': ['analisar', 'h4d'],
+    'consolidacao': ['consolidar'],
+    'clustering': ['clusterizar', '--sem-graficos'],
+}
+
+# Regressão: mais lento que base × TOLERANCIA e com diferença acima do ruído
+TOLERANCIA = 1.25
+RUIDO_S = 0.05
+
+
+def executar_etapa(pasta, argumentos, rastro):
+    """
+    Roda `python -m tic --diretorio pasta --profile ...` e devolve
+    (tempo em s, pico de RSS em MB, parede por span em ms)
+    """
+    comando = [sys.executable, '-m', 'tic', '--diretorio', str(pasta),
+               '--profile', '--rastro', str(rastro), *argumentos]
+    inicio = time.perf_counter()
+    processo = subprocess.run(comando, cwd=RAIZ, env={**os.environ, 'MPLBACKEND': 'Agg'},
+                              stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    tempo = time.perf_counter() - inicio
+    if processo.returncode != 0:
+        raise SystemExit(f"✗ Falhou: {' '.join(comando)}\n{processo.stderr[-2000:]}")
+
+    with open(rastro, encoding='utf-8') as f:
+        eventos = json.load(f)['traceEvents']
+    spans = resumo(eventos)
+    pico = max((linha['pico_rss_mb'] for linha in spans.values()), default=None)
+    return tempo, pico, {nome: round(linha['parede_ms'], 1) for nome, linha in spans.items()}
+
+
+def medir_escala(nome, pasta, repeticoes):
+    """Gera os dados de uma escala e mede todas as etapas"""
+    parametros = ESCALAS[nome]
+    pasta = Path(pasta) / nome
+
+    inicio = time.perf_counter()
+    arquivos = gerar_conjunto(pasta, **parametros)
+    geracao = time.perf_counter() - inicio
+    tamanho = sum(Path(a).stat().st_size for a in arquivos) / 1024 ** 2
+    print(f"\n📦 Escala '{nome}' {parametros}: {tamanho:.1f} MB gerados em {geracao:.1f} s")
+
+    etapas = {}
+    for etapa, argumentos in ETAPAS.items():
+        tempos, picos = [], []
+        for i in range(repeticoes):
+            tempo, pico, spans = executar_etapa(pasta, argumentos, pasta / f'perfil_{etapa}_{i}.json')
+            tempos.append(tempo)
+            picos.append(pico or 0.0)
+        etapas[etapa] = {'tempo_s': round(statistics.median(tempos), 3),
+                         'pico_rss_mb': round(max(picos), 1),
+                         'spans_ms': spans}
+        print(f"  {etapa:<16} {etapas[etapa]['tempo_s']:8.2f} s  {etapas[etapa]['pico_rss_mb']:8.1f} MB")
+
+    return {'parametros': parametros, 'tamanho_mb': round(tamanho, 2),
+            'geracao_s': round(geracao, 2), 'etapas': etapas}
+
+
+def comparar(atual, base, tolerancia):
+    """
+    Compara os tempos com uma execução anterior; devolve as regressões
+    """
+    regressoes = []
+    print("\n" + "="*70)
+    print(f"COMPARAÇÃO COM A BASE ({base.get('gerado_em', '?')})")
+    print("="*70)
+    for escala, dados in atual['escalas'].items():
+        etapas_base = base.get('escalas', {}).get(escala, {}).get('etapas', {})
+        for etapa, medida in dados['etapas'].items():
+            if etapa not in etapas_base:
+                continue
+            antes, agora = etapas_base[etapa]['tempo_s'], medida['tempo_s']
+            razao = agora / antes if antes else float('inf')
+            regrediu = razao > tolerancia and agora - antes > RUIDO_S
+            status = '✗' if regrediu else '✓'
+            print(f"  {status} {escala:<8} {etapa:<16} {antes:8.2f} s → {agora:8.2f} s ({razao:5.2f}×)")
+            if regrediu:
+                regressoes.append(f"{escala}/{etapa}: {antes:.2f} s → {agora:.2f} s ({razao:.2f}×)")
+    return regressoes
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de escalabilidade do pipeline tic')
+    parser.add_argument('--escalas', nargs='+', choices=ESCALAS, default=ESCALAS_PADRAO,
+                        help=f"Escalas de tic/sintetico.py (padrão: {' '.join(ESCALAS_PADRAO)})")
+    parser.add_argument('--repeticoes', type=int, default=REPETICOES,
+                        help='Execuções por etapa; o tempo é a mediana (padrão: 1)')
+    parser.add_argument('--pasta', help='Pasta para os dados gerados (padrão: temporária)')
+    parser.add_argument('--saida', help='JSON de resultados (padrão: benchmarks/resultados/escala_<data>.json)')
+    parser.add_argument('--comparar', metavar='BASE_JSON', help='Resultados anteriores para comparação')
+    parser.add_argument('--tolerancia', type=float, default=TOLERANCIA,
+                        help=f'Razão máxima atual/base por etapa (padrão: {TOLERANCIA})')
+    args = parser.parse_args()
+
+    print("="*70)
+    print("BENCHMARK - ESCALABILIDADE DO PIPELINE")
+    print("="*70)
+
+    resultado = {
+        'gerado_em': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'repeticoes': args.repeticoes,
+        'escalas': {},
+    }
+
+    with tempfile.TemporaryDirectory(prefix='tic_bench_') as temporaria:
+        pasta = args.pasta or temporaria
+        for escala in args.escalas:
+            resultado['escalas'][escala] = medir_escala(escala, pasta, args.repeticoes)
+
+    saida = Path(args.saida) if args.saida else \
+        PASTA_RESULTADOS / f"escala_{datetime.now():%Y%m%d_%H%M%S}.json"
+    saida.parent.mkdir(parents=True, exist_ok=True)
+    with open(saida, 'w', encoding='utf-8') as f:
+        json.dump(resultado, f, ensure_ascii=False, indent=2)
+    print(f"\n✓ Resultados salvos: {saida}")
+
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as f:
+            base = json.load(f)
+        regressoes = comparar(resultado, base, args.tolerancia)
+        if regressoes:
+            print("\n✗ Regressões de desempenho:")
+            for regressao in regressoes:
+                print(f"  - {regressao}")
+            sys.exit(1)
+        print(f"\n✓ Nenhuma etapa acima de {args.tolerancia:.2f}× a base")
+
+
+if __name__ == "__main__":
+    main()
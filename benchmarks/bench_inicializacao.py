@@ -0,0 +1,111 @@
+"""
+BENCHMARK - TEMPO DE INICIALIZAÇÃO DA CLI
+TIC Educação 2024
+
+Mede o tempo de `python -m tic --help` (e de `python -m tic <comando> --help`)
+em processos novos e verifica:
+- o orçamento de inicialização (mediana abaixo de ORCAMENTO_S)
+- que nenhum módulo pesado é importado só para montar a CLI
+
+Uso (na raiz do repositório):
+    python benchmarks/bench_inicializacao.py
+    python benchmarks/bench_inicializacao.py --repeticoes 20 --orcamento 0.25
+
+Sai com código 1 se algum limite for violado.
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parents[1]
+
+ORCAMENTO_S = 0.20
+REPETICOES = 10
+
+# Não podem aparecer em sys.modules depois de montar a CLI
+MODULOS_PESADOS = ['pandas', 'numpy', 'matplotlib', 'seaborn', 'sklearn', 'scipy', 'openpyxl']
+
+COMANDOS = [
+    ['--help'],
+    ['extrair', '--help'],
+    ['analisar', '--help'],
+    ['consolidar', '--help'],
+    ['clusterizar', '--help'],
+]
+
+
+def medir(argumentos, repeticoes):
+    """Mediana (s) de `python -m tic <argumentos>` em processos novos"""
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        subprocess.run([sys.executable, '-m', 'tic', *argumentos], cwd=RAIZ,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        tempos.append(time.perf_counter() - inicio)
+    return statistics.median(tempos)
+
+
+def medir_interpretador(repeticoes):
+    """Mediana (s) de um `python -c pass` (piso do tempo de inicialização)"""
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        subprocess.run([sys.executable, '-c', 'pass'], check=True)
+        tempos.append(time.perf_counter() - inicio)
+    return statistics.median(tempos)
+
+
+def modulos_pesados_importados():
+    """Módulos pesados carregados ao montar o parser da CLI"""
+    codigo = (
+        "import sys; from tic.cli import criar_parser; criar_parser(); "
+        f"print(','.join(m for m in {MODULOS_PESADOS!r} if m in sys.modules))"
+    )
+    saida = subprocess.run([sys.executable, '-c', codigo], cwd=RAIZ,
+                           capture_output=True, text=True, check=True)
+    return [m for m in saida.stdout.strip().split(',') if m]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de inicialização da CLI tic')
+    parser.add_argument('--repeticoes', type=int, default=REPETICOES)
+    parser.add_argument('--orcamento', type=float, default=ORCAMENTO_S,
+                        help=f'Tempo máximo (s) da mediana por comando (padrão: {ORCAMENTO_S})')
+    args = parser.parse_args()
+
+    print("="*70)
+    print("BENCHMARK - INICIALIZAÇÃO DA CLI tic")
+    print("="*70)
+
+    piso = medir_interpretador(args.repeticoes)
+    print(f"\nPython sem imports: {piso*1000:7.1f} ms")
+
+    falhas = []
+    for argumentos in COMANDOS:
+        mediana = medir(argumentos, args.repeticoes)
+        status = '✓' if mediana <= args.orcamento else '✗'
+        print(f"  {status} tic {' '.join(argumentos):<22} {mediana*1000:7.1f} ms")
+        if mediana > args.orcamento:
+            falhas.append(f"tic {' '.join(argumentos)}: {mediana*1000:.0f} ms > {args.orcamento*1000:.0f} ms")
+
+    pesados = modulos_pesados_importados()
+    if pesados:
+        falhas.append(f"módulos pesados importados na inicialização: {', '.join(pesados)}")
+    else:
+        print("\n✓ Nenhum módulo pesado importado ao montar a CLI")
+
+    if falhas:
+        print("\n✗ Orçamento violado:")
+        for falha in falhas:
+            print(f"  - {falha}")
+        sys.exit(1)
+
+    print(f"\n✓ Todos os comandos dentro do orçamento de {args.orcamento*1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
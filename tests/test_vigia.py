@@ -0,0 +1,84 @@
+"""
+TESTES DO VIGIA - WORKBOOK CORROMPIDO
+TIC Educação 2024
+
+Uma aba removida do workbook de escolas (A3_1) faz a extração e a análise A3
+falharem: as etapas seguintes são puladas e a aba fica pendente no estado,
+para ser refeita na próxima execução do vigia.
+
+Uso (na raiz do repositório):
+    python -m pytest -q tests
+"""
+
+import json
+import logging
+import sys
+from pathlib import Path
+
+import openpyxl
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from tic.log import RAIZ_LOGGER, desativar_relatorio
+from tic.sintetico import gerar_conjunto
+from tic.vigia import ARQUIVO_ESTADO, Vigia, abas_alteradas, abas_com_falha, assinaturas_abas
+
+ESCOLAS = 'tic_educacao_2024_escolas_tabela_total_v1.0.xlsx'
+
+
+@pytest.fixture
+def pasta(tmp_path):
+    gerar_conjunto(tmp_path)
+    yield tmp_path
+    # Os scripts configuram o log no stdout capturado pelo pytest: sem relatório ao sair
+    desativar_relatorio()
+    logging.getLogger(RAIZ_LOGGER).handlers.clear()
+
+
+def remover_aba(caminho, aba):
+    livro = openpyxl.load_workbook(caminho)
+    del livro[aba]
+    livro.save(caminho)
+
+
+def test_abas_com_falha_segue_dependencias(tmp_path):
+    alteracoes = {(tmp_path, ESCOLAS): {'A3_1', 'A8'}}
+    falhas = {'analisar a3', 'consolidar'}
+    assert abas_com_falha(alteracoes, falhas, tmp_path) == {(tmp_path, ESCOLAS): {'A3_1', 'A8'}}
+    assert abas_com_falha(alteracoes, {'analisar a3'}, tmp_path) == {(tmp_path, ESCOLAS): {'A3_1'}}
+    assert abas_com_falha(alteracoes, set(), tmp_path) == {}
+
+
+def test_workbook_corrompido_nao_avanca_estado(pasta):
+    vigia = Vigia(pasta, espera=0)
+    abas_base = json.loads((pasta / ARQUIVO_ESTADO).read_text(encoding='utf-8'))[ESCOLAS]['abas']
+
+    remover_aba(pasta / ESCOLAS, 'A3_1')
+    vigia.varrer()
+    falhas = []
+    executar = vigia._executar
+
+    def executar_registrando(etapas):
+        falhas.extend(sorted(executar(etapas)))
+        return set(falhas)
+
+    vigia._executar = executar_registrando
+    assert vigia.reconstruir()
+
+    # Extração e A3 falham; consolidação e clustering são pulados
+    assert falhas == ['analisar a3', 'clusterizar', 'consolidar', 'extrair', 'preparar']
+    assert not (pasta / 'dados_processados' / 'fatos_escolas_2024.npz').exists()
+    assert not list((pasta / 'dados_processados').glob('escolas_2024_consolidado.*'))
+
+    # A aba que falhou mantém a assinatura anterior; as demais avançam
+    estado = json.loads((pasta / ARQUIVO_ESTADO).read_text(encoding='utf-8'))[ESCOLAS]
+    assert estado['abas']['A3_1'] == abas_base['A3_1']
+    atuais = assinaturas_abas(pasta / ESCOLAS)
+    assert abas_alteradas(estado['abas'], atuais) == {'A3_1'}
+
+    # O mesmo processo não repete a reconstrução; um novo vigia a refaz
+    vigia.varrer()
+    assert not vigia.pendentes
+    novo = Vigia(pasta, espera=0)
+    novo.varrer()
+    assert list(novo.pendentes) == [pasta / ESCOLAS]
@@ -0,0 +1,7 @@
+"""
+TIC - Módulos compartilhados entre as análises (01_analises) e o projeto de
+clustering (02_clustering_project)
+
+Os scripts das duas pastas adicionam a raiz do repositório ao sys.path para
+importar este pacote.
+"""
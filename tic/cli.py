@@ -0,0 +1,191 @@
+"""
+CLI ÚNICA DO PIPELINE TIC
+
+    python -m tic extrair [--formatos parquet,csv] [--abas-individuais]
+    python -m tic analisar [a3 a8 b4a g6 h4d] [--db ...] [--exportar-arquivos]
+    python -m tic consolidar [--db ...] [--exportar-arquivos]
+    python -m tic painel [--saida resultados/painel]
+    python -m tic servir [--porta 8765] [--aquecer]
+    python -m tic vigiar [--espera 3] [--uma-vez]      # reconstrói só o afetado por xlsx novos/alterados
+    python -m tic buscar inteligência artificial        # abas/colunas por título e cabeçalho
+    python -m tic clusterizar [--pular-preparacao] [--consenso ...] [--sem-graficos]
+    python -m tic --profile [--rastro perfil.json] analisar ...
+    python -m tic --diretorio /tmp/tic_sintetico extrair   # dados fora das pastas do projeto
+    python -m tic --log-json analisar                      # log em JSON (-v: linhas por item, -q: só avisos)
+
+Cada subcomando executa os scripts do projeto na pasta deles; opções não
+reconhecidas aqui são repassadas ao script. Este módulo só importa a
+biblioteca padrão: pandas, sklearn, matplotlib etc. são carregados apenas
+quando o subcomando escolhido roda o script que precisa deles.
+"""
+
+import argparse
+import os
+import runpy
+import sys
+from pathlib import Path
+
+from tic.instrumentacao import adicionar_argumento_perfil, configurar_perfil, span
+from tic.log import adicionar_argumentos_log, configurar_log_args
+
+RAIZ = Path(__file__).resolve().parents[1]
+PASTA_ANALISES = RAIZ / '01_analises'
+PASTA_CLUSTERING = RAIZ / '02_clustering_project'
+
+SCRIPTS_ANALISES = {
+    'a3': 'analise_a3_velocidade.py',
+    'a8': 'analise_a8_acesso.py',
+    'b4a': 'analise_b4a_proporcao.py',
+    'g6': 'analise_g6_uso_ia.py',
+    'h4d': 'analise_h4d_orientacao_ia.py',
+}
+
+# Fonte única dos workbooks e abas lidos pelo pipeline (scripts, consulta_indicadores e vigia)
+# Tipo → workbook lido por padrão (--arquivo nos scripts escolhe outro, ex.: pelo vigia)
+ARQUIVOS_PADRAO = {
+    'escolas': 'tic_educacao_2024_escolas_tabela_total_v1.0.xlsx',
+    'alunos': 'tic_educacao_2024_alunos_tabela_total_v1.0.xlsx',
+}
+
+# Sheets de escolas extraídas para o clustering (01_extrair_dados_escolas.py), por grupo
+SHEETS_PRIORITARIAS = {
+    'infraestrutura': ['A1', 'B1', 'B1C', 'B2'],
+    'conectividade': ['A2', 'A3_1', 'A4', 'C1'],
+    'gestao_uso': ['E1', 'E1A', 'F1', 'F2', 'G4'],
+    'contexto': ['K3', 'K6']
+}
+
+# Indicador → (workbook, aba) lida pela análise
+ABAS_ANALISES = {
+    'a3': ('escolas', 'A3_1'),
+    'a8': ('escolas', 'A8'),
+    'b4a': ('escolas', 'B4A'),
+    'g6': ('alunos', 'G6'),
+    'h4d': ('alunos', 'H4D'),
+}
+
+
+def executar_script(pasta, script, argumentos=(), diretorio=None):
+    """
+    Executa um script do projeto como __main__, com a pasta dele no sys.path e
+    como diretório de trabalho (como em `cd pasta && python script`), ou com
+    `diretorio` como diretório de trabalho, se informado
+    """
+    cwd_anterior, argv_anterior, path_anterior = os.getcwd(), sys.argv, list(sys.path)
+    os.chdir(diretorio or pasta)
+    sys.argv = [script, *argumentos]
+    sys.path.insert(0, str(pasta))
+    try:
+        with span(Path(script).stem, 'script'):
+            runpy.run_path(str(Path(pasta) / script), run_name='__main__')
+    except SystemExit as e:
+        if e.code not in (None, 0):
+            raise
+    finally:
+        os.chdir(cwd_anterior)
+        sys.argv = argv_anterior
+        sys.path[:] = path_anterior
+
+
+def _extrair(args, extras):
+    executar_script(PASTA_CLUSTERING, '01_extrair_dados_escolas.py', extras, args.diretorio)
+
+
+def _analisar(args, extras):
+    invalidos = [i for i in args.indicadores if i not in SCRIPTS_ANALISES]
+    if invalidos:
+        raise SystemExit(f"Indicador(es) desconhecido(s): {', '.join(invalidos)} "
+                         f"(disponíveis: {', '.join(SCRIPTS_ANALISES)})")
+    for indicador in args.indicadores or list(SCRIPTS_ANALISES):
+        executar_script(PASTA_ANALISES, SCRIPTS_ANALISES[indicador], extras, args.diretorio)
+
+
+def _consolidar(args, extras):
+    executar_script(PASTA_ANALISES, 'consolidador_analises.py', extras, args.diretorio)
+
+
+def _painel(args, extras):
+    executar_script(PASTA_ANALISES, 'painel_html.py', extras, args.diretorio)
+
+
+def _servir(args, extras):
+    executar_script(PASTA_ANALISES, 'servidor_consultas.py', extras, args.diretorio)
+
+
+def _vigiar(args, extras):
+    from tic.vigia import vigiar
+    vigiar(args.diretorio, args.intervalo, args.espera, args.uma_vez)
+
+
+def _buscar(args, extras):
+    from tic.indice import pastas_padrao, pesquisar
+    pesquisar(' '.join(args.consulta), pastas_padrao(args.diretorio), args.publico, args.ano,
+              args.reconstruir, args.detalhes)
+
+
+def _clusterizar(args, extras):
+    if not args.pular_preparacao:
+        executar_script(PASTA_CLUSTERING, '02_preparacao_regioes.py', diretorio=args.diretorio)
+    executar_script(PASTA_CLUSTERING, '03_clustering_regioes.py', extras, args.diretorio)
+
+
+def criar_parser():
+    parser = argparse.ArgumentParser(
+        prog='tic', description='Pipeline TIC Educação (extração, análises, consolidação, clustering)',
+        epilog='Opções não listadas são repassadas ao script do subcomando.')
+    parser.add_argument('--diretorio', type=lambda d: str(Path(d).resolve()), metavar='PASTA',
+                        help='Pasta de trabalho de todos os scripts (xlsx de entrada, dados_processados/, '
+                             'resultados/); padrão: a pasta de cada script')
+    adicionar_argumento_perfil(parser, 'perfil_tic.json')
+    adicionar_argumentos_log(parser)
+    sub = parser.add_subparsers(dest='comando', metavar='comando', required=True)
+
+    p = sub.add_parser('extrair', help='Extrai as sheets de escolas para a tabela de fatos')
+    p.set_defaults(executar=_extrair)
+
+    p = sub.add_parser('analisar', help='Roda as análises de indicadores (A3, A8, B4A, G6, H4D)')
+    p.add_argument('indicadores', nargs='*', metavar='indicador',
+                   help=f"Indicadores a analisar: {', '.join(SCRIPTS_ANALISES)} (padrão: todos)")
+    p.set_defaults(executar=_analisar)
+
+    p = sub.add_parser('consolidar', help='Calcula o índice de prontidão e o cubo de indicadores')
+    p.set_defaults(executar=_consolidar)
+
+    p = sub.add_parser('painel', help='Gera o painel HTML estático (filtros no navegador)')
+    p.set_defaults(executar=_painel)
+
+    p = sub.add_parser('servir', help='Servidor local de consultas JSON (workbooks e indicadores em memória)')
+    p.set_defaults(executar=_servir)
+
+    p = sub.add_parser('vigiar', help='Vigia os workbooks de entrada e reconstrói só as etapas afetadas')
+    p.add_argument('--intervalo', type=float, default=1.0, help='Segundos entre varreduras (padrão: 1)')
+    p.add_argument('--espera', type=float, default=3.0,
+                   help='Segundos sem novas mudanças antes de reconstruir (padrão: 3)')
+    p.add_argument('--uma-vez', action='store_true', help='Uma varredura/reconstrução e sai')
+    p.set_defaults(executar=_vigiar)
+
+    p = sub.add_parser('buscar', help='Busca abas e colunas pelos títulos e cabeçalhos (sem acentos)')
+    p.add_argument('consulta', nargs='+', help='Termos (todos precisam aparecer; termo* = prefixo)')
+    p.add_argument('--publico', help='Ex.: escolas, alunos')
+    p.add_argument('--ano', type=int)
+    p.add_argument('--reconstruir', action='store_true', help='Relê todas as abas')
+    p.add_argument('--detalhes', action='store_true', help='Lista o rótulo de cada coluna encontrada')
+    p.set_defaults(executar=_buscar)
+
+    p = sub.add_parser('clusterizar', help='Prepara as regiões e executa o clustering')
+    p.add_argument('--pular-preparacao', action='store_true',
+                   help='Usa o feature store/dataset preparado existente')
+    p.set_defaults(executar=_clusterizar)
+
+    return parser
+
+
+def main(argv=None):
+    args, extras = criar_parser().parse_known_args(argv)
+    configurar_perfil(args)
+    configurar_log_args(args)
+    args.executar(args, extras)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+ESQUEMA TIPADO DA TABELA DE FATOS
+TIC Educação 2023/2024
+
+Aplicado no carregamento: dimensões categóricas, posições em inteiros
+pequenos e valores no menor tipo sem perda (int32 para contagens inteiras,
+float32 quando representa os valores exatamente, float64 caso contrário).
+
+Uso do relatório de memória (workbooks inteiros, antes/depois):
+    python -m tic.esquema tic_educacao_2024_escolas_tabela_total_v1.0.xlsx \
+                          tic_educacao_2024_alunos_tabela_total_v1.0.xlsx
+"""
+
+import argparse
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Tipo de cada coluna da tabela de fatos ('category' = dicionário na ordem de aparição)
+ESQUEMA_FATOS = {
+    'ano': np.int16,
+    'aba': 'category',
+    'linha': np.int32,
+    'dimensao': 'category',
+    'grupo': 'category',
+    'coluna': np.int16,
+    'questao': 'category',
+    'resposta': 'category',
+    'valor': None,  # escolhido por reduzir_valores
+}
+
+_LIMITE_INT32 = np.iinfo(np.int32).max
+
+
+def reduzir_valores(valores):
+    """
+    Converte os valores para o menor tipo que os representa sem perda:
+    int32 (contagens inteiras), float32 ou float64
+    """
+    valores = np.asarray(valores, dtype=np.float64)
+    if len(valores) == 0:
+        return valores.astype(np.float32)
+
+    if (np.all(np.isfinite(valores)) and np.all(np.abs(valores) <= _LIMITE_INT32)
+            and np.array_equal(valores, np.round(valores))):
+        return valores.astype(np.int32)
+
+    reduzido = valores.astype(np.float32)
+    if np.array_equal(reduzido.astype(np.float64), valores, equal_nan=True):
+        return reduzido
+
+    return valores
+
+
+def categorizar(serie):
+    """Converte em categórica (dicionário na ordem de aparição, strings internadas)"""
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        return serie
+    categorias = [sys.intern(str(c)) for c in pd.unique(serie)]
+    return pd.Series(pd.Categorical(serie.astype(str), categories=categorias), index=serie.index)
+
+
+def aplicar_esquema(fatos):
+    """
+    Aplica ESQUEMA_FATOS à tabela de fatos (in place) e a devolve
+    """
+    for coluna, tipo in ESQUEMA_FATOS.items():
+        if coluna not in fatos:
+            continue
+        if tipo == 'category':
+            fatos[coluna] = categorizar(fatos[coluna])
+        elif tipo is None:
+            fatos[coluna] = reduzir_valores(fatos[coluna].to_numpy())
+        else:
+            fatos[coluna] = fatos[coluna].astype(tipo)
+    return fatos
+
+
+# ============================================================================
+# RELATÓRIO DE MEMÓRIA
+# ============================================================================
+
+def _mb(n_bytes):
+    return n_bytes / 1024 ** 2
+
+
+def relatorio_memoria(arquivo):
+    """
+    Carrega o workbook inteiro de duas formas e compara o uso de memória:
+    - antes: abas cruas (header=None, strings em object, números em float64)
+    - depois: tabela de fatos com o esquema tipado
+
+    Returns:
+        DataFrame por aba com bytes antes/depois e a redução
+    """
+    from tic.fatos import fatos_da_aba, ano_do_arquivo
+
+    ano = ano_do_arquivo(arquivo)
+    linhas = []
+    with pd.ExcelFile(arquivo) as livro:
+        for aba in livro.sheet_names:
+            df_raw = livro.parse(aba, header=None)
+            fatos = aplicar_esquema(fatos_da_aba(df_raw, aba, ano))
+            linhas.append({
+                'aba': aba,
+                'fatos': len(fatos),
+                'tipo_valor': str(fatos['valor'].dtype),
+                'bytes_antes': int(df_raw.memory_usage(deep=True).sum()),
+                'bytes_depois': int(fatos.memory_usage(deep=True).sum()),
+            })
+
+    tabela = pd.DataFrame(linhas)
+    tabela['reducao_%'] = (1 - tabela['bytes_depois'] / tabela['bytes_antes']) * 100
+    return tabela
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Relatório de memória: abas cruas vs. fatos tipados')
+    parser.add_argument('arquivos', nargs='+', help='Workbooks TIC (.xlsx)')
+    parser.add_argument('--por-aba', action='store_true', help='Mostra o detalhe por aba')
+    args = parser.parse_args(argv)
+
+    for arquivo in args.arquivos:
+        tabela = relatorio_memoria(arquivo)
+        antes, depois = tabela['bytes_antes'].sum(), tabela['bytes_depois'].sum()
+
+        print(f"\n📊 {arquivo}")
+        print(f"  Abas: {len(tabela)} | Fatos: {tabela['fatos'].sum():,}")
+        print(f"  Antes (abas cruas):   {_mb(antes):8.2f} MB")
+        print(f"  Depois (fatos):       {_mb(depois):8.2f} MB")
+        print(f"  Redução:              {(1 - depois / antes) * 100:8.1f}%")
+        print(f"  Tipos de valor: {tabela['tipo_valor'].value_counts().to_dict()}")
+        if args.por_aba:
+            print(tabela.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,572 @@
+"""
+TABELA DE FATOS - MODELO CANÔNICO DOS DADOS TIC
+TIC Educação 2023/2024
+
+Toda aba TIC é convertida para o mesmo formato longo, uma linha por célula:
+
+    ano | aba | linha | dimensao | grupo | coluna | questao | resposta | valor
+
+- dimensao/grupo: bloco da linha (REGIÃO → Norte, ÁREA → Rural, TOTAL → Total)
+- questao/resposta: cabeçalho da coluna (ex.: Computador de mesa → Sim), com
+  título, cabeçalho, dados e rodapé detectados em cada aba (tic/layout.py)
+- linha/coluna: posição na aba original (preserva a ordem e permite
+  reconstruir a tabela larga)
+
+As colunas de texto são categóricas (códigos inteiros + dicionário) e os
+valores usam o menor tipo sem perda (tic/esquema.py), então a tabela de várias
+abas continua pequena em memória e em disco.
+Análises, consolidador e preparação do clustering são filtros e pivots sobre ela.
+"""
+
+import os
+import re
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from tic.esquema import ESQUEMA_FATOS, aplicar_esquema
+from tic.instrumentacao import instrumentar, span
+from tic.layout import PREFIXOS_RODAPE, detectar_layout, ler_aba, para_numerico
+from tic.log import linha, obter_logger
+from tic.texto import slug
+
+COLUNAS_FATOS = list(ESQUEMA_FATOS)
+COLUNAS_CATEGORICAS = [c for c, tipo in ESQUEMA_FATOS.items() if tipo == 'category']
+
+ANO_PADRAO = 2024
+
+log = obter_logger('fatos')
+
+# Cache de abas para processos de longa duração (desligado por padrão)
+_CACHE_ABAS = OrderedDict()   # (arquivo, assinatura, aba, ano) → fatos
+_LIVROS = {}                  # arquivo → (assinatura, pd.ExcelFile)
+_LENDO_ABAS = {}              # chave do cache → Future da leitura em andamento
+_MAXIMO_ABAS = 0
+_ESTATISTICAS_ABAS = {'acertos': 0, 'faltas': 0, 'recarregamentos': 0}
+_TRAVA_CACHE = threading.RLock()
+
+
+def ano_do_arquivo(arquivo, padrao=ANO_PADRAO):
+    """
+    Extrai o ano do nome do arquivo (ex.: tic_educacao_2024_escolas_... → 2024)
+    """
+    encontrado = re.search(r'(20\d{2})', Path(arquivo).name)
+    return int(encontrado.group(1)) if encontrado else padrao
+
+
+def rotulos_colunas(df_raw):
+    """
+    (questao, resposta) de cada coluna de valores, a partir do cabeçalho
+    detectado (tic/layout.py)
+    """
+    layout = detectar_layout(df_raw)
+    return layout['questoes'], layout['respostas']
+
+
+def fatos_da_aba(df_raw, aba, ano=ANO_PADRAO, layout=None):
+    """
+    Converte uma aba lida com header=None na tabela de fatos longa.
+
+    O layout (cabeçalho, região de dados, rodapé) é detectado, se não for
+    informado; ficam só as células numéricas da região de dados.
+    """
+    layout = layout or detectar_layout(df_raw)
+    return fatos_da_regiao(df_raw.iloc[layout['inicio']:layout['fim']], layout, aba, ano)
+
+
+def fatos_da_regiao(dados, layout, aba, ano=ANO_PADRAO):
+    """
+    Converte a região de dados de uma aba (índice = linha na aba, colunas nas
+    posições da aba) na tabela de fatos longa
+    """
+    primeira_coluna = layout['primeira_coluna']
+    primeira = dados.iloc[:, 0].astype(object)
+
+    # Linhas da região iguais a um rodapé (ex.: nota entre blocos) ficam de fora
+    rodape = primeira.astype(str).str.strip().str.startswith(PREFIXOS_RODAPE)
+    if rodape.any():
+        dados, primeira = dados[~rodape.to_numpy()], primeira[~rodape.to_numpy()]
+
+    dimensao = primeira.ffill()
+    if layout['coluna_grupo'] is not None:
+        grupo = dados.iloc[:, layout['coluna_grupo']].astype(object)
+    else:
+        grupo = pd.Series(np.nan, index=dados.index, dtype=object)
+    grupo = grupo.where(grupo.notna(), 'Total')
+
+    valores = dados.iloc[:, primeira_coluna:].apply(para_numerico)
+    matriz = valores.to_numpy(dtype=np.float64)
+    n_linhas, n_colunas = matriz.shape
+
+    # Derrete a matriz de uma vez: linha i, coluna j → uma observação
+    linhas = np.repeat(dados.index.to_numpy(), n_colunas)
+    colunas = np.tile(np.arange(primeira_coluna, primeira_coluna + n_colunas), n_linhas)
+    planos = matriz.ravel()
+    presentes = ~np.isnan(planos) & np.repeat(dimensao.notna().to_numpy(), n_colunas)
+
+    idx_linha = np.repeat(np.arange(n_linhas), n_colunas)[presentes]
+    idx_coluna = np.tile(np.arange(n_colunas), n_linhas)[presentes]
+
+    fatos = pd.DataFrame({
+        'ano': np.full(presentes.sum(), ano, dtype=np.int16),
+        'aba': aba,
+        'linha': linhas[presentes].astype(np.int32),
+        'dimensao': dimensao.astype(str).str.strip().to_numpy()[idx_linha],
+        'grupo': grupo.astype(str).str.strip().to_numpy()[idx_linha],
+        'coluna': colunas[presentes].astype(np.int16),
+        'questao': np.array(layout['questoes'], dtype=object)[idx_coluna],
+        'resposta': np.array(layout['respostas'], dtype=object)[idx_coluna],
+        'valor': planos[presentes]
+    })
+    return fatos
+
+
+class AbasComErro(ValueError):
+    """
+    Abas que não puderam ser lidas por construir_tabela_fatos
+
+    falhas: aba → mensagem de erro; fatos: tabela das demais abas (None se
+    nenhuma foi lida)
+    """
+
+    def __init__(self, arquivo, falhas, fatos=None):
+        self.arquivo = str(arquivo)
+        self.falhas = dict(falhas)
+        self.fatos = fatos
+        detalhe = '; '.join(f"{aba}: {erro}" for aba, erro in self.falhas.items())
+        super().__init__(f"{len(self.falhas)} aba(s) com erro em {Path(arquivo).name} ({detalhe})")
+
+
+def construir_tabela_fatos(arquivo, abas, ano=None, verbose=True, validar=True, estrito=False):
+    """
+    Lê várias abas de um workbook (abrindo o arquivo uma única vez) e devolve
+    a tabela de fatos concatenada. Com validar, inconsistências
+    (tic/validacao.py) são registradas como avisos.
+
+    Abas com erro são reportadas; com estrito=True levantam AbasComErro (com
+    as falhas e a tabela das demais abas), senão são ignoradas. Se nenhuma aba
+    for lida, AbasComErro é levantada sempre.
+    """
+    ano = ano or ano_do_arquivo(arquivo)
+
+    partes = []
+    falhas = {}
+    with span('abrir_workbook', 'leitura', arquivo=Path(arquivo).name):
+        livro = pd.ExcelFile(arquivo)
+    with livro:
+        for i, aba in enumerate(abas, 1):
+            try:
+                with span('ler_aba', 'leitura', aba=aba):
+                    dados, layout = ler_aba(arquivo, aba, livro)
+                with span('fatos_aba', 'agregacao', aba=aba):
+                    fatos_aba = fatos_da_regiao(dados, layout, aba, ano)
+                partes.append(fatos_aba)
+                if verbose:
+                    observacoes = fatos_aba['linha'].nunique()
+                    log.debug(f"  [{i}/{len(abas)}] ✓ {aba}: {observacoes} observações, {len(fatos_aba)} fatos",
+                              extra=linha(f"Extração - {Path(arquivo).name}", aba=aba,
+                                          observacoes=observacoes, fatos=len(fatos_aba)))
+            except Exception as e:
+                falhas[aba] = str(e)
+                if verbose:
+                    log.warning(f"  [{i}/{len(abas)}] ✗ {aba}: ERRO - {str(e)}")
+
+    if not partes:
+        raise AbasComErro(arquivo, falhas)
+
+    fatos = aplicar_esquema(pd.concat(partes, ignore_index=True))
+    if validar:
+        _validar(fatos, Path(arquivo).name)
+    if falhas:
+        log.warning(f"⚠️  {Path(arquivo).name}: {len(falhas)} aba(s) com erro: {', '.join(falhas)}")
+        if estrito:
+            raise AbasComErro(arquivo, falhas, fatos)
+    return fatos
+
+
+def _validar(fatos, origem):
+    from tic.validacao import relatar_problemas, validar_fatos
+    relatar_problemas(validar_fatos(fatos), origem)
+
+
+def carregar_fatos_aba(arquivo, aba, ano=None, validar=True):
+    """
+    Carrega uma única aba como tabela de fatos (validada, como em
+    construir_tabela_fatos)
+
+    Com o cache ativo (ativar_cache_abas), o workbook fica aberto e a aba
+    parseada é reaproveitada enquanto o arquivo não mudar (mtime/tamanho).
+    A trava só protege o cache: a leitura roda fora dela, e threads que pedem
+    a mesma aba ao mesmo tempo esperam a leitura em andamento (Future).
+    O DataFrame devolvido é compartilhado: não modifique.
+    """
+    ano = ano or ano_do_arquivo(arquivo)
+    if not _MAXIMO_ABAS:
+        with span('ler_aba', 'leitura', arquivo=Path(arquivo).name, aba=aba):
+            dados, layout = ler_aba(arquivo, aba)
+        with span('fatos_aba', 'agregacao', aba=aba):
+            fatos = aplicar_esquema(fatos_da_regiao(dados, layout, aba, ano))
+        if validar:
+            _validar(fatos, f"{Path(arquivo).name}/{aba}")
+        return fatos
+
+    caminho = str(Path(arquivo).resolve())
+    with _TRAVA_CACHE:
+        assinatura = assinatura_arquivo(caminho)
+        chave = (caminho, assinatura, aba, ano)
+        if chave in _CACHE_ABAS:
+            _ESTATISTICAS_ABAS['acertos'] += 1
+            _CACHE_ABAS.move_to_end(chave)
+            return _CACHE_ABAS[chave]
+
+        lendo = _LENDO_ABAS.get(chave)
+        if lendo is None:
+            _ESTATISTICAS_ABAS['faltas'] += 1
+            livro = _livro_aberto(caminho, assinatura)
+            _LENDO_ABAS[chave] = Future()
+        else:
+            _ESTATISTICAS_ABAS['acertos'] += 1
+    if lendo is not None:
+        return lendo.result()
+
+    try:
+        with span('ler_aba', 'leitura', arquivo=Path(arquivo).name, aba=aba):
+            dados, layout = ler_aba(caminho, aba, livro)
+        with span('fatos_aba', 'agregacao', aba=aba):
+            fatos = aplicar_esquema(fatos_da_regiao(dados, layout, aba, ano))
+        if validar:
+            _validar(fatos, f"{Path(arquivo).name}/{aba}")
+    except BaseException as e:
+        with _TRAVA_CACHE:
+            _LENDO_ABAS.pop(chave).set_exception(e)
+        raise
+
+    with _TRAVA_CACHE:
+        if _MAXIMO_ABAS:
+            _CACHE_ABAS[chave] = fatos
+            while len(_CACHE_ABAS) > _MAXIMO_ABAS:
+                _CACHE_ABAS.popitem(last=False)
+        _LENDO_ABAS.pop(chave).set_result(fatos)
+    return fatos
+
+
+# ============================================================================
+# CACHE DE ABAS (PROCESSOS DE LONGA DURAÇÃO)
+# ============================================================================
+
+def assinatura_arquivo(arquivo):
+    """(mtime em ns, tamanho): muda quando o arquivo é regravado"""
+    estado = os.stat(arquivo)
+    return estado.st_mtime_ns, estado.st_size
+
+
+def _livro_aberto(caminho, assinatura):
+    """
+    Workbook aberto uma vez por versão do arquivo; uma versão nova fecha a
+    anterior e descarta as abas dela do cache
+    """
+    aberto = _LIVROS.get(caminho)
+    if aberto is not None and aberto[0] == assinatura:
+        return aberto[1]
+
+    if aberto is not None:
+        aberto[1].close()
+        for chave in [c for c in _CACHE_ABAS if c[0] == caminho]:
+            del _CACHE_ABAS[chave]
+        _ESTATISTICAS_ABAS['recarregamentos'] += 1
+        log.info(f"🔄 Workbook alterado, recarregando: {Path(caminho).name}")
+
+    with span('abrir_workbook', 'leitura', arquivo=Path(caminho).name):
+        livro = pd.ExcelFile(caminho)
+    _LIVROS[caminho] = (assinatura, livro)
+    return livro
+
+
+def ativar_cache_abas(maximo=64):
+    """
+    Liga o cache LRU de abas parseadas (maximo abas; 0 desliga e fecha os
+    workbooks abertos)
+    """
+    global _MAXIMO_ABAS
+    with _TRAVA_CACHE:
+        _MAXIMO_ABAS = maximo
+        if not maximo:
+            _CACHE_ABAS.clear()
+            for _, livro in _LIVROS.values():
+                livro.close()
+            _LIVROS.clear()
+        while len(_CACHE_ABAS) > maximo:
+            _CACHE_ABAS.popitem(last=False)
+
+
+def estatisticas_cache_abas():
+    """Acertos, faltas, recarregamentos e ocupação do cache de abas"""
+    with _TRAVA_CACHE:
+        return {**_ESTATISTICAS_ABAS, 'abas': len(_CACHE_ABAS), 'maximo': _MAXIMO_ABAS,
+                'workbooks': len(_LIVROS)}
+
+
+# ============================================================================
+# FILTROS E PIVOTS
+# ============================================================================
+
+def filtrar_fatos(fatos, **criterios):
+    """
+    Filtra a tabela de fatos (ex.: aba='A8', dimensao=['TOTAL', 'REGIÃO']).
+    Listas/tuplas são tratadas como "qualquer um destes valores".
+    """
+    mascara = np.ones(len(fatos), dtype=bool)
+    for coluna, valor in criterios.items():
+        if valor is None:
+            continue
+        if isinstance(valor, (list, tuple, set)):
+            mascara &= fatos[coluna].isin(list(valor)).to_numpy()
+        else:
+            mascara &= (fatos[coluna] == valor).to_numpy()
+    return fatos[mascara]
+
+
+@instrumentar(categoria='agregacao')
+def pivotar_aba(fatos, aba=None, rotulos=False):
+    """
+    Reconstrói a tabela larga de uma aba: uma linha por (dimensão, grupo).
+
+    Colunas: 'categoria', 'subcategoria' e os valores. Com rotulos=False os
+    valores ficam nas posições originais da aba (2, 3, ...), como nas
+    análises que acessam colunas por índice; com rotulos=True recebem o nome
+    'questao_resposta'.
+    """
+    if aba is not None:
+        fatos = filtrar_fatos(fatos, aba=aba)
+
+    linhas = fatos.drop_duplicates('linha').set_index('linha')[['dimensao', 'grupo']]
+    largo = fatos.pivot(index='linha', columns='coluna', values='valor')
+
+    if rotulos:
+        nomes = fatos.drop_duplicates('coluna').set_index('coluna')
+        largo.columns = [_nome_feature(None, q, r) for q, r in
+                         zip(nomes.loc[largo.columns, 'questao'], nomes.loc[largo.columns, 'resposta'])]
+    elif len(largo.columns):
+        largo = largo.reindex(columns=range(2, int(largo.columns.max()) + 1))
+
+    largo.insert(0, 'categoria', linhas.loc[largo.index, 'dimensao'].to_numpy())
+    largo.insert(1, 'subcategoria', linhas.loc[largo.index, 'grupo'].to_numpy())
+    largo.columns.name = None
+    return largo.sort_index().reset_index(drop=True)
+
+
+def pivotar_respostas(fatos, nomes, aba=None, estrito=True):
+    """
+    Tabela larga com as colunas de valores nomeadas pelos rótulos de resposta
+    do cabeçalho (tic/layout.py), não pela posição na aba.
+
+    Args:
+        nomes: rótulo de resposta → nome da coluna (ex.: {'Até 10 Mbps':
+               'ate_10_mbps'}), comparados sem acento, caixa e pontuação
+        estrito: rótulos do cabeçalho fora de `nomes` também são erro (faixas
+                 que precisam somar o total); senão são ignorados
+
+    Levanta ValueError se um rótulo esperado não está no cabeçalho (ou, com
+    estrito, se sobra um rótulo desconhecido).
+    """
+    if aba is not None:
+        fatos = filtrar_fatos(fatos, aba=aba)
+    aba = aba or ', '.join(fatos['aba'].astype(str).unique())
+
+    cabecalho = fatos.drop_duplicates('coluna').set_index('coluna')['resposta'].astype(str)
+    por_chave = {slug(rotulo): nome for rotulo, nome in nomes.items()}
+    colunas = {coluna: por_chave.get(slug(rotulo)) for coluna, rotulo in cabecalho.items()}
+
+    encontrados = [nome for nome in colunas.values() if nome]
+    faltando = [rotulo for rotulo, nome in nomes.items() if nome not in encontrados]
+    repetidos = sorted({nome for nome in encontrados if encontrados.count(nome) > 1})
+    desconhecidos = [cabecalho[c] for c, nome in colunas.items() if nome is None] if estrito else []
+    if faltando or repetidos or desconhecidos:
+        raise ValueError(
+            f"Cabeçalho de {aba} não bate com as respostas esperadas"
+            + (f"; faltando: {', '.join(faltando)}" if faltando else "")
+            + (f"; repetidas: {', '.join(repetidos)}" if repetidos else "")
+            + (f"; desconhecidas: {', '.join(desconhecidos)}" if desconhecidos else ""))
+
+    largo = pivotar_aba(fatos)
+    largo = largo[['categoria', 'subcategoria', *(c for c, nome in colunas.items() if nome)]]
+    largo = largo.rename(columns={c: nome for c, nome in colunas.items() if nome})
+    return largo[['categoria', 'subcategoria', *nomes.values()]]
+
+
+@instrumentar(categoria='agregacao')
+def proporcoes_respostas(fatos, positiva='Sim', negativa='Não'):
+    """
+    Proporção de `positiva` em positiva + negativa para todas as questões ×
+    todas as linhas de uma aba, em uma passada: um pivot linha × (resposta,
+    questão) e operações sobre matrizes. Outras respostas (Não sabe, ...)
+    ficam de fora.
+
+    Returns:
+        (questoes, linhas, positivos, negativos, pct): questões na ordem das
+        colunas, DataFrame dimensao/grupo de cada linha e matrizes
+        [linha, questão] (NaN onde a célula falta)
+    """
+    texto = fatos.assign(questao=fatos['questao'].astype(str),
+                         resposta=fatos['resposta'].astype(str).str.strip())
+    texto = texto[texto['resposta'].isin([positiva, negativa])]
+    questoes = texto.sort_values('coluna')['questao'].drop_duplicates().tolist()
+    if not questoes:
+        raise ValueError(f"Nenhuma coluna {positiva}/{negativa} encontrada no cabeçalho")
+
+    largo = texto.pivot_table(index='linha', columns=['resposta', 'questao'], values='valor', aggfunc='first')
+    positivos = largo[positiva].reindex(columns=questoes).to_numpy(dtype=np.float64)
+    negativos = largo[negativa].reindex(columns=questoes).to_numpy(dtype=np.float64)
+    total = positivos + negativos
+    with np.errstate(divide='ignore', invalid='ignore'):
+        pct = np.where(total > 0, positivos / total * 100, 0.0)
+    pct[np.isnan(total)] = np.nan
+
+    linhas = fatos.drop_duplicates('linha').set_index('linha').loc[largo.index, ['dimensao', 'grupo']]
+    linhas = linhas.astype(str).apply(lambda c: c.str.strip()).reset_index(drop=True)
+    return questoes, linhas, positivos, negativos, pct
+
+
+def inteiro(valor):
+    """Contagem de uma matriz de proporcoes_respostas como int (None onde a célula falta)"""
+    return None if np.isnan(valor) else int(valor)
+
+
+def registros_por_dimensao(linhas, registro, dimensoes, aba, descrever, log=log):
+    """
+    Registros por grupo de cada dimensão, a partir das linhas de
+    proporcoes_respostas (uma linha de log por grupo)
+
+    Args:
+        registro: i → métricas da linha i (dict)
+        dimensoes: chave do resultado → (dimensão, chave do nome do grupo),
+                   como banco_resultados.DIMENSOES
+        descrever: métricas de um grupo → texto da linha de log
+
+    Returns:
+        {chave do resultado: [{chave do nome: grupo, **registro(i)}, ...]}
+        ([] para dimensões ausentes da aba)
+    """
+    valores = linhas['dimensao'].to_numpy()
+    resultados = {}
+    for chave_resultado, (dimensao, chave_nome) in dimensoes.items():
+        indices = np.flatnonzero(valores == dimensao)
+        registros = []
+        if len(indices):
+            log.debug(f"\n📊 POR {dimensao}:")
+        for i in indices:
+            registros.append({chave_nome: linhas.at[i, 'grupo'], **registro(i)})
+            log.debug(f"  {registros[-1][chave_nome]}: {descrever(registros[-1])}",
+                      extra=linha(f"{aba} - por {dimensao.lower()}", **registros[-1]))
+        resultados[chave_resultado] = registros
+    return resultados
+
+
+def chave_questao(questao, padrao='questao'):
+    """Nome estável de métrica para uma questão ('Uso ético de IA' → 'uso_etico_ia')"""
+    return slug(questao, padrao=padrao)
+
+
+def _nome_feature(aba, questao, resposta):
+    """Nome de feature no padrão do consolidado: ABA_questao_resposta"""
+    partes = [p for p in (aba, questao, resposta) if p]
+    return '_'.join(str(p) for p in partes)
+
+
+def id_observacao(dimensao, grupo):
+    """Identificador da observação no padrão do consolidado (ex.: REGIÃO_Norte)"""
+    return f"{dimensao}_{grupo}".replace(' ', '_')
+
+
+def _codificar(fatos, colunas, nomear):
+    """
+    Códigos e nomes (internados) de cada combinação única de colunas, na
+    ordem de aparição; nomear é chamado uma vez por combinação
+    """
+    combinacoes = fatos[colunas].drop_duplicates()
+    posicoes = pd.MultiIndex.from_frame(combinacoes).get_indexer(pd.MultiIndex.from_frame(fatos[colunas]))
+    nomes = [sys.intern(nomear(*c)) for c in combinacoes.itertuples(index=False)]
+    return posicoes, nomes
+
+
+@instrumentar(categoria='agregacao')
+def pivotar_features(fatos):
+    """
+    Pivota a tabela de fatos no dataset consolidado: uma linha por observação
+    (DIMENSÃO_Grupo) e uma coluna por feature (ABA_questao_resposta)
+    """
+    pos_obs, ids = _codificar(fatos, ['dimensao', 'grupo'], id_observacao)
+    pos_feat, nomes = _codificar(fatos, ['aba', 'questao', 'resposta', 'coluna'],
+                                 lambda a, q, r, c: _nome_feature(a, q, r))
+
+    # Matriz observação × feature preenchida por posição (sem pivot de strings);
+    # features com o mesmo nome (cabeçalho repetido) ficam com o primeiro valor
+    nomes_unicos = list(dict.fromkeys(nomes))
+    coluna_de = pd.Index(nomes_unicos).get_indexer(nomes)[pos_feat]
+
+    matriz = np.full((len(ids), len(nomes_unicos)), np.nan)
+    linear = pos_obs * len(nomes_unicos) + coluna_de
+    _, primeiro = np.unique(linear, return_index=True)
+    matriz.flat[linear[primeiro]] = fatos['valor'].to_numpy(dtype=np.float64)[primeiro]
+
+    largo = pd.DataFrame(matriz, columns=nomes_unicos)
+    largo.insert(0, 'observacao_id', ids)
+    return largo.sort_values('observacao_id').reset_index(drop=True)
+
+
+# ============================================================================
+# PERSISTÊNCIA (colunas codificadas por dicionário)
+# ============================================================================
+
+@instrumentar('escrever_fatos', 'escrita')
+def salvar_fatos(fatos, caminho, origem=None):
+    """
+    Salva a tabela de fatos em .npz: cada coluna categórica vira códigos
+    inteiros + dicionário de valores; numéricas são salvas como estão
+    (`origem`: nome do workbook extraído, lido de volta por origem_fatos)
+    """
+    Path(caminho).parent.mkdir(parents=True, exist_ok=True)
+    fatos = aplicar_esquema(fatos.copy())
+
+    arrays = {}
+    for coluna in COLUNAS_FATOS:
+        if coluna in COLUNAS_CATEGORICAS:
+            arrays[f"{coluna}__codigos"] = fatos[coluna].cat.codes.to_numpy()
+            arrays[f"{coluna}__categorias"] = np.array(fatos[coluna].cat.categories.astype(str), dtype=str)
+        else:
+            arrays[coluna] = fatos[coluna].to_numpy()
+
+    if origem is not None:
+        arrays['origem'] = np.array(origem, dtype=str)
+
+    np.savez_compressed(caminho, **arrays)
+    return caminho
+
+
+def origem_fatos(caminho):
+    """
+    Workbook do qual a tabela de fatos salva foi extraída (None se não registrado)
+    """
+    with np.load(caminho, allow_pickle=False) as npz:
+        return str(npz['origem']) if 'origem' in npz.files else None
+
+
+@instrumentar('ler_fatos', 'leitura')
+def carregar_fatos(caminho):
+    """
+    Carrega a tabela de fatos salva por salvar_fatos
+    """
+    with np.load(caminho, allow_pickle=False) as npz:
+        dados = {}
+        for coluna in COLUNAS_FATOS:
+            if coluna in COLUNAS_CATEGORICAS:
+                categorias = [sys.intern(c) for c in npz[f"{coluna}__categorias"].tolist()]
+                dados[coluna] = pd.Categorical.from_codes(npz[f"{coluna}__codigos"], categories=categorias)
+            else:
+                dados[coluna] = npz[coluna]
+    return pd.DataFrame(dados)[COLUNAS_FATOS]
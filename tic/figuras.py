@@ -0,0 +1,213 @@
+"""
+RENDERIZAÇÃO DE FIGURAS - CACHE POR CONTEÚDO E POOL DE PROCESSOS
+TIC Educação 2024
+
+Cada figura é uma tarefa: uma função de desenho de nível de módulo, o
+caminho do PNG e os dados de entrada. A chave da figura é um SHA-256 de:
+- os dados (arrays, DataFrames, escalares)
+- a função e o código-fonte do módulo que a define (estilo incluso)
+- o dpi e a versão do matplotlib
+
+Se o PNG já existe e a chave é a registrada no manifesto da pasta
+(.cache_figuras.json), a figura não é redesenhada. As demais são
+renderizadas em processos (fork, backend Agg); com uma única pendente, ou
+sem fork, no próprio processo.
+
+Modo prévia: dpi baixo e arquivos *.previa.png, sem tocar nas figuras finais
+nem no cache delas.
+
+    tarefas = [figura(graficos.grafico_distancias, 'dados_processados/02.png', dist_df=dist_df)]
+    renderizar(tarefas, previa=args.previa)
+
+Contrato das funções de desenho: funcao(**dados, caminho=..., dpi=...).
+"""
+
+import hashlib
+import inspect
+import json
+import multiprocessing as mp
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from importlib import metadata
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from tic.instrumentacao import span
+from tic.log import linha, obter_logger
+
+DPI_FINAL = 300
+DPI_PREVIA = 72
+SUFIXO_PREVIA = '.previa'
+
+MANIFESTO = '.cache_figuras.json'
+VERSAO_CACHE = 1
+
+log = obter_logger('figuras')
+
+
+def figura(funcao, caminho, **dados):
+    """Tarefa de renderização: funcao(**dados, caminho=caminho, dpi=...)"""
+    return {'funcao': funcao, 'caminho': str(caminho), 'dados': dados}
+
+
+# ============================================================================
+# CHAVE DE CONTEÚDO
+# ============================================================================
+
+def _atualizar_hash(h, valor):
+    """Alimenta o hash com o conteúdo de valor (não com endereços de memória)"""
+    if isinstance(valor, np.ndarray):
+        h.update(f"ndarray{valor.dtype}{valor.shape}".encode())
+        if valor.dtype == object:
+            h.update(repr(valor.tolist()).encode())
+        else:
+            h.update(np.ascontiguousarray(valor).tobytes())
+    elif isinstance(valor, (pd.DataFrame, pd.Series)):
+        h.update(type(valor).__name__.encode())
+        if isinstance(valor, pd.DataFrame):
+            h.update(repr(list(valor.columns)).encode())
+        else:
+            h.update(repr(valor.name).encode())
+        h.update(pd.util.hash_pandas_object(valor, index=True).to_numpy().tobytes())
+    elif isinstance(valor, dict):
+        h.update(b'dict')
+        for chave in sorted(valor, key=str):
+            h.update(repr(chave).encode())
+            _atualizar_hash(h, valor[chave])
+    elif isinstance(valor, (list, tuple)):
+        h.update(f"{type(valor).__name__}{len(valor)}".encode())
+        for item in valor:
+            _atualizar_hash(h, item)
+    else:
+        h.update(repr(valor).encode())
+
+
+def _versao_matplotlib():
+    """Versão instalada, sem importar o matplotlib"""
+    try:
+        return metadata.version('matplotlib')
+    except metadata.PackageNotFoundError:
+        return None
+
+
+def chave_figura(tarefa, dpi):
+    """SHA-256 dos dados, do código da função de desenho, do dpi e do matplotlib"""
+    funcao = inspect.unwrap(tarefa['funcao'])
+    h = hashlib.sha256()
+    h.update(f"v{VERSAO_CACHE}|{funcao.__module__}.{funcao.__qualname__}|{dpi}|"
+             f"{_versao_matplotlib()}".encode())
+    h.update(Path(funcao.__code__.co_filename).read_bytes())
+    _atualizar_hash(h, tarefa['dados'])
+    return h.hexdigest()
+
+
+def _ler_manifesto(pasta):
+    try:
+        with open(Path(pasta) / MANIFESTO, encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _salvar_manifesto(pasta, manifesto):
+    Path(pasta).mkdir(parents=True, exist_ok=True)
+    with open(Path(pasta) / MANIFESTO, 'w', encoding='utf-8') as f:
+        json.dump(manifesto, f, ensure_ascii=False, indent=2, sort_keys=True)
+
+
+# ============================================================================
+# RENDERIZAÇÃO
+# ============================================================================
+
+def _inicializar_worker():
+    """Backend sem janela: os workers só gravam PNG"""
+    import matplotlib
+    matplotlib.use('Agg')
+
+
+def _renderizar_tarefa(funcao, caminho, dados, dpi):
+    inicio = time.perf_counter()
+    Path(caminho).parent.mkdir(parents=True, exist_ok=True)
+    funcao(**dados, caminho=caminho, dpi=dpi)
+    return time.perf_counter() - inicio
+
+
+def caminho_previa(caminho):
+    """dados_processados/01_pca.png → dados_processados/01_pca.previa.png"""
+    caminho = Path(caminho)
+    return caminho.with_name(caminho.stem + SUFIXO_PREVIA + caminho.suffix)
+
+
+def renderizar(tarefas, previa=False, workers=None, forcar=False):
+    """
+    Renderiza as figuras que não estão em cache.
+
+    Parâmetros:
+    -----------
+    tarefas : list
+        Tarefas criadas com figura()
+    previa : bool
+        dpi baixo (DPI_PREVIA), gravando em *.previa.png
+    workers : int
+        Processos do pool (None = um por figura pendente, até o nº de núcleos)
+    forcar : bool
+        Ignora o cache e redesenha tudo
+
+    Returns:
+        dict caminho → 'cache' ou 'renderizada'
+    """
+    dpi = DPI_PREVIA if previa else DPI_FINAL
+    status, pendentes, manifestos = {}, [], {}
+
+    for tarefa in tarefas:
+        caminho = caminho_previa(tarefa['caminho']) if previa else Path(tarefa['caminho'])
+        chave = chave_figura(tarefa, dpi)
+        manifesto = manifestos.setdefault(caminho.parent, _ler_manifesto(caminho.parent))
+        if not forcar and caminho.exists() and manifesto.get(caminho.name) == chave:
+            status[str(caminho)] = 'cache'
+            log.debug(f"  = {caminho} (cache)",
+                      extra=linha("Figuras", figura=str(caminho), status='cache', tempo_s=0.0))
+            continue
+        pendentes.append((tarefa, caminho, chave))
+
+    workers = min(len(pendentes), workers or os.cpu_count() or 1)
+    # fork evita reexecutar o script principal em cada worker
+    if workers > 1 and 'fork' not in mp.get_all_start_methods():
+        workers = 1
+
+    def concluir(caminho, chave, tempo):
+        manifestos[caminho.parent][caminho.name] = chave
+        status[str(caminho)] = 'renderizada'
+        log.debug(f"  ✓ {caminho} ({tempo:.2f}s)",
+                  extra=linha("Figuras", figura=str(caminho), status='renderizada',
+                              tempo_s=round(tempo, 3)))
+
+    try:
+        with span('renderizar_figuras', 'render', pendentes=len(pendentes), workers=workers,
+                  dpi=dpi):
+            if workers <= 1:
+                if pendentes:
+                    _inicializar_worker()
+                for tarefa, caminho, chave in pendentes:
+                    concluir(caminho, chave,
+                             _renderizar_tarefa(tarefa['funcao'], str(caminho), tarefa['dados'], dpi))
+            else:
+                with ProcessPoolExecutor(max_workers=workers, mp_context=mp.get_context('fork'),
+                                         initializer=_inicializar_worker) as pool:
+                    futuros = {pool.submit(_renderizar_tarefa, tarefa['funcao'], str(caminho),
+                                           tarefa['dados'], dpi): (caminho, chave)
+                               for tarefa, caminho, chave in pendentes}
+                    for futuro in as_completed(futuros):
+                        concluir(*futuros[futuro], futuro.result())
+    finally:
+        # Figuras já gravadas entram no cache mesmo se outra falhar
+        for pasta, manifesto in manifestos.items():
+            _salvar_manifesto(pasta, manifesto)
+
+    n_cache = sum(s == 'cache' for s in status.values())
+    log.info(f"✓ Figuras: {len(status) - n_cache} renderizadas, {n_cache} em cache"
+             f"{' (prévia, ' + str(dpi) + ' dpi)' if previa else ''}")
+    return status
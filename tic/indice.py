@@ -0,0 +1,341 @@
+"""
+ÍNDICE INVERTIDO DE ABAS E CABEÇALHOS
+TIC Educação 2023/2024
+
+Em qual das ~200 abas está um assunto, sem abrir o Excel:
+
+    buscar('inteligência artificial')
+    → alunos 2024 G6 (colunas 32-33), alunos 2024 H4D, ...
+
+Cada aba de cada workbook (tic_educacao_*_tabela_total_*.xlsx, todos os anos)
+vira documentos: o título com a descrição, e um por coluna de valores
+(questão + resposta), com os rótulos do layout detectado (tic/layout.py).
+Os termos são normalizados sem acento e sem diferenciar maiúsculas
+(tic/texto.py: 'Inteligência' = 'inteligencia'); palavras vazias (de, da, e, ...) ficam de
+fora. Uma aba casa quando todos os termos aparecem nela: os que não estão no
+título precisam estar juntos em uma mesma coluna, e essas colunas são
+devolvidas. Um termo terminado em * casa prefixos ('intelig*').
+
+O índice fica em .indice_abas.json em cada pasta, com a versão de cada aba
+(CRC no zip): só abas novas ou alteradas são relidas, e as consultas são
+consultas a dicionários.
+
+Uso (na raiz do repositório):
+    python -m tic buscar inteligência artificial
+    python -m tic --diretorio /tmp/tic_sintetico buscar velocidade --publico escolas
+    python -m tic.indice "intelig* artificial" --pasta 01_analises --reconstruir
+"""
+
+import argparse
+import bisect
+import json
+import os
+import re
+import threading
+import zipfile
+from collections import defaultdict
+from pathlib import Path
+
+from tic.cli import PASTA_ANALISES, PASTA_CLUSTERING
+from tic.log import obter_logger
+from tic.texto import termos
+
+ARQUIVO_INDICE = '.indice_abas.json'
+PADRAO_WORKBOOK = 'tic_educacao_*_tabela_total_*.xlsx'
+FORMATO = 1
+
+# Coluna dos documentos de título/descrição nas listas de ocorrências
+COLUNA_TITULO = -1
+
+_NOME_WORKBOOK = re.compile(r'tic_educacao_(\d{4})_(\w+?)_tabela')
+
+log = obter_logger('indice')
+
+
+def pastas_padrao(diretorio=None):
+    """Pastas de entrada do pipeline (as mesmas vigiadas por tic/vigia.py)"""
+    return [Path(diretorio)] if diretorio else [PASTA_CLUSTERING, PASTA_ANALISES]
+
+
+# ============================================================================
+# ÍNDICE
+# ============================================================================
+
+class IndiceAbas:
+    """
+    Índice invertido termo → (pasta, workbook, aba, coluna) das pastas
+    informadas, atualizado incrementalmente a partir das versões das abas
+    """
+
+    def __init__(self, pastas=None):
+        self.pastas = [Path(p).resolve() for p in (pastas or pastas_padrao())]
+        self._conteudos = {}   # pasta → conteúdo de .indice_abas.json
+        self._termos = {}      # termo → {(pasta, workbook, aba, coluna)}
+        self._vocabulario = []
+        self._trava = threading.RLock()
+
+    def atualizar(self, reconstruir=False):
+        """
+        Relê só as abas novas ou alteradas (todas, com reconstruir) e grava o
+        índice de cada pasta que mudou. Devolve o número de abas relidas.
+        """
+        relidas = 0
+        with self._trava:
+            for pasta in self.pastas:
+                conteudo = {} if reconstruir else self._carregar(pasta)
+                mudancas = self._atualizar_pasta(pasta, conteudo)
+                self._conteudos[pasta] = conteudo
+                if mudancas or reconstruir:
+                    self._salvar(pasta, conteudo)
+                relidas += mudancas
+            self._montar()
+        return relidas
+
+    def _atualizar_pasta(self, pasta, conteudo):
+        """Abas relidas ou removidas (workbooks removidos contam uma vez)"""
+        from tic.vigia import assinaturas_abas
+
+        workbooks = conteudo.setdefault('workbooks', {})
+        presentes = {c.name: c for c in sorted(pasta.glob(PADRAO_WORKBOOK))}
+        removidos = [nome for nome in workbooks if nome not in presentes]
+        for nome in removidos:
+            del workbooks[nome]
+        mudancas = len(removidos)
+
+        for nome, caminho in presentes.items():
+            try:
+                versoes = assinaturas_abas(caminho)
+            except (zipfile.BadZipFile, KeyError) as e:
+                log.warning(f"⚠️  {nome} ignorado (xlsx incompleto ou inválido): {e}")
+                continue
+            entrada = workbooks.setdefault(nome, {**_identificar(nome), 'abas': {}})
+            abas = entrada['abas']
+            alteradas = [aba for aba, versao in versoes.items()
+                         if aba not in abas or abas[aba]['versao'] != versao]
+            removidas = [aba for aba in abas if aba not in versoes]
+            for aba in removidas:
+                del abas[aba]
+            mudancas += len(alteradas) + len(removidas)
+            if not alteradas:
+                continue
+
+            # pandas só é carregado quando há abas para reler
+            import pandas as pd
+            from tic.layout import layout_aba
+            log.info(f"🔎 Indexando {len(alteradas)} aba(s) de {nome}")
+            with pd.ExcelFile(caminho) as livro:
+                for aba in alteradas:
+                    try:
+                        layout = layout_aba(caminho, aba, livro)
+                    except ValueError as e:
+                        # Abas sem dados (ex.: sumário) entram só pelo nome
+                        log.debug(f"  {aba}: sem layout de dados ({e})")
+                        layout = {'titulo': aba, 'primeira_coluna': 0, 'questoes': [], 'respostas': []}
+                    abas[aba] = {'versao': versoes[aba],
+                                 'titulo': layout.get('titulo', ''),
+                                 'descricao': layout.get('descricao', ''),
+                                 'colunas': [[coluna, *rotulo] for coluna, rotulo in zip(
+                                     range(layout['primeira_coluna'], layout['primeira_coluna']
+                                           + len(layout['respostas'])),
+                                     zip(layout['questoes'], layout['respostas']))]}
+
+        if mudancas or 'termos' not in conteudo:
+            conteudo['termos'] = _ocorrencias(workbooks)
+        conteudo['formato'] = FORMATO
+        return mudancas
+
+    def _carregar(self, pasta):
+        if pasta in self._conteudos:
+            return self._conteudos[pasta]
+        arquivo = pasta / ARQUIVO_INDICE
+        try:
+            conteudo = json.loads(arquivo.read_text(encoding='utf-8'))
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            log.warning(f"⚠️  {arquivo} ilegível, reconstruindo: {e}")
+            return {}
+        return conteudo if conteudo.get('formato') == FORMATO else {}
+
+    def _salvar(self, pasta, conteudo):
+        destino = pasta / ARQUIVO_INDICE
+        temporario = destino.with_name(f"{destino.name}.{os.getpid()}.tmp")
+        try:
+            temporario.write_text(json.dumps(conteudo, ensure_ascii=False), encoding='utf-8')
+            os.replace(temporario, destino)
+        except OSError as e:
+            log.warning(f"⚠️  Índice não gravado em {destino}: {e}")
+
+    def _montar(self):
+        """Junta as ocorrências de todas as pastas em memória"""
+        indice = defaultdict(set)
+        for pasta, conteudo in self._conteudos.items():
+            for termo, ocorrencias in conteudo.get('termos', {}).items():
+                indice[termo].update((pasta, nome, aba, coluna) for nome, aba, coluna in ocorrencias)
+        self._termos = dict(indice)
+        self._vocabulario = sorted(indice)
+
+    def _ocorrencias_termo(self, termo):
+        if not termo.endswith('*'):
+            return self._termos.get(termo, set())
+        prefixo = termo[:-1]
+        encontradas = set()
+        for i in range(bisect.bisect_left(self._vocabulario, prefixo), len(self._vocabulario)):
+            if not self._vocabulario[i].startswith(prefixo):
+                break
+            encontradas |= self._termos[self._vocabulario[i]]
+        return encontradas
+
+    def buscar(self, consulta, publico=None, ano=None):
+        """
+        Abas que contêm todos os termos da consulta
+
+        Returns:
+            lista de dicts (pasta, arquivo, publico, ano, aba, titulo,
+            no_titulo, colunas, rotulos): primeiro as abas em que a consulta
+            está no título, depois as com mais colunas
+        """
+        procurados = termos(consulta, consulta=True)
+        if not procurados:
+            return []
+
+        with self._trava:
+            por_aba = defaultdict(lambda: defaultdict(set))   # aba → termo → colunas
+            for termo in procurados:
+                for pasta, nome, aba, coluna in self._ocorrencias_termo(termo):
+                    por_aba[(pasta, nome, aba)][termo].add(coluna)
+
+            resultados = []
+            for (pasta, nome, aba), colunas_termo in por_aba.items():
+                if len(colunas_termo) < len(procurados):
+                    continue
+                entrada = self._conteudos[pasta]['workbooks'][nome]
+                if (publico and entrada['publico'] != publico) or (ano and entrada['ano'] != int(ano)):
+                    continue
+
+                no_titulo = {t for t in procurados if COLUNA_TITULO in colunas_termo[t]}
+                restantes = [t for t in procurados if t not in no_titulo] or procurados
+                colunas = set.intersection(*(colunas_termo[t] - {COLUNA_TITULO} for t in restantes))
+                if not colunas and len(no_titulo) < len(procurados):
+                    continue   # termos espalhados por colunas diferentes
+
+                rotulos = {c: f"{q} - {r}" if q else r for c, q, r in entrada['abas'][aba]['colunas']}
+                resultados.append({
+                    'pasta': str(pasta), 'arquivo': nome, 'publico': entrada['publico'],
+                    'ano': entrada['ano'], 'aba': aba, 'titulo': entrada['abas'][aba]['titulo'],
+                    'no_titulo': len(no_titulo) == len(procurados),
+                    'colunas': sorted(colunas), 'rotulos': [rotulos[c] for c in sorted(colunas)],
+                })
+
+        resultados.sort(key=lambda r: (not r['no_titulo'], -len(r['colunas']), -r['ano'],
+                                       r['publico'], _ordem_aba(r['aba'])))
+        return resultados
+
+    def resumo(self):
+        with self._trava:
+            abas = sum(len(w['abas']) for c in self._conteudos.values() for w in c.get('workbooks', {}).values())
+            workbooks = sum(len(c.get('workbooks', {})) for c in self._conteudos.values())
+            return {'workbooks': workbooks, 'abas': abas, 'termos': len(self._termos)}
+
+
+def _identificar(nome):
+    """Ano e público (escolas, alunos, ...) pelo nome do workbook"""
+    encontrado = _NOME_WORKBOOK.search(nome)
+    return {'ano': int(encontrado.group(1)), 'publico': encontrado.group(2)} if encontrado \
+        else {'ano': 0, 'publico': Path(nome).stem}
+
+
+def _ocorrencias(workbooks):
+    """termo → [[workbook, aba, coluna], ...] (formato gravado em .indice_abas.json)"""
+    indice = defaultdict(set)
+    for nome, entrada in workbooks.items():
+        for aba, dados in entrada['abas'].items():
+            documentos = [(COLUNA_TITULO, f"{aba} {dados['titulo']} {dados['descricao']}")]
+            documentos += [(coluna, f"{questao} {resposta}") for coluna, questao, resposta in dados['colunas']]
+            for coluna, texto in documentos:
+                for termo in termos(texto):
+                    indice[termo].add((nome, aba, coluna))
+    return {termo: sorted(map(list, ocorrencias)) for termo, ocorrencias in sorted(indice.items())}
+
+
+def _ordem_aba(aba):
+    """Ordem natural (A2 antes de A10)"""
+    return [int(p) if p.isdigit() else p for p in re.split(r'(\d+)', aba)]
+
+
+def _faixas(colunas):
+    """[32, 33, 35] → '32-33, 35'"""
+    partes, inicio = [], None
+    for i, coluna in enumerate(colunas):
+        if inicio is None:
+            inicio = coluna
+        if i + 1 == len(colunas) or colunas[i + 1] != coluna + 1:
+            partes.append(f"{inicio}-{coluna}" if coluna != inicio else f"{coluna}")
+            inicio = None
+    return ', '.join(partes)
+
+
+_INDICES = {}
+_TRAVA = threading.Lock()
+
+
+def indice_padrao(pastas=None):
+    """Índice compartilhado das pastas (criado e atualizado no primeiro uso)"""
+    chave = tuple(str(Path(p).resolve()) for p in (pastas or pastas_padrao()))
+    with _TRAVA:
+        if chave not in _INDICES:
+            _INDICES[chave] = IndiceAbas(chave)
+            _INDICES[chave].atualizar()
+        return _INDICES[chave]
+
+
+def buscar(consulta, pastas=None, publico=None, ano=None):
+    """Abas e colunas que contêm a consulta (ver IndiceAbas.buscar)"""
+    return indice_padrao(pastas).buscar(consulta, publico, ano)
+
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+def pesquisar(consulta, pastas=None, publico=None, ano=None, reconstruir=False, detalhes=False):
+    """Atualiza o índice das pastas e imprime o resultado da consulta"""
+    indice = IndiceAbas(pastas)
+    relidas = indice.atualizar(reconstruir)
+    resumo = indice.resumo()
+    log.debug(f"Índice: {resumo['workbooks']} workbook(s), {resumo['abas']} abas, "
+              f"{resumo['termos']} termos ({relidas} aba(s) relida(s))")
+    if not resumo['workbooks']:
+        log.warning(f"⚠️  Nenhum workbook {PADRAO_WORKBOOK} em {', '.join(map(str, indice.pastas))}")
+
+    resultados = indice.buscar(consulta, publico, ano)
+    print(f"🔎 \"{consulta}\": {len(resultados)} aba(s)")
+    for r in resultados:
+        onde = f"colunas {_faixas(r['colunas'])}" if r['colunas'] else 'título'
+        pasta = f"  [{r['pasta']}]" if len(indice.pastas) > 1 else ''
+        print(f"  {r['publico']} {r['ano']}  {r['aba']:<8} {onde:<18} {r['titulo']}{pasta}")
+        if detalhes:
+            for coluna, rotulo in zip(r['colunas'], r['rotulos']):
+                print(f"      {coluna:>4}  {rotulo}")
+    return resultados
+
+
+def main(argv=None):
+    from tic.log import adicionar_argumentos_log, configurar_log_args
+
+    parser = argparse.ArgumentParser(description='Busca abas e colunas pelos títulos e cabeçalhos')
+    parser.add_argument('consulta', nargs='+', help='Termos (sem diferenciar acentos; termo* = prefixo)')
+    parser.add_argument('--pasta', action='append', dest='pastas',
+                        help='Pasta dos workbooks (repetível; padrão: pastas de entrada do projeto)')
+    parser.add_argument('--publico', help='Ex.: escolas, alunos')
+    parser.add_argument('--ano', type=int)
+    parser.add_argument('--reconstruir', action='store_true', help='Relê todas as abas')
+    parser.add_argument('--detalhes', action='store_true', help='Lista o rótulo de cada coluna encontrada')
+    adicionar_argumentos_log(parser)
+    args = parser.parse_args(argv)
+    configurar_log_args(args)
+    pesquisar(' '.join(args.consulta), args.pastas, args.publico, args.ano, args.reconstruir, args.detalhes)
+
+
+if __name__ == "__main__":
+    main()
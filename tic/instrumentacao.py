@@ -0,0 +1,173 @@
+"""
+INSTRUMENTAÇÃO - TEMPO E MEMÓRIA POR ETAPA
+TIC Educação 2023/2024
+
+Spans leves em volta das etapas do pipeline (abrir workbook, ler aba,
+agregação, escrita, renderização). Cada span registra tempo de parede, tempo
+de CPU e o pico de memória (RSS) do processo ao final.
+
+Desligado por padrão (custo de um if por span). Com --profile, os spans são
+gravados no formato Chrome Trace Event: abra o JSON em chrome://tracing ou
+https://ui.perfetto.dev para ver o flame chart.
+
+    with span('ler_aba', categoria='leitura', aba='A8'):
+        ...
+
+    @instrumentar('render', categoria='render')
+    def grafico(...): ...
+"""
+
+import atexit
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+_ATIVO = False
+_EVENTOS = []
+_ARQUIVO_RASTRO = None
+_INICIO_NS = time.perf_counter_ns()
+
+# ru_maxrss é em KB no Linux e em bytes no macOS
+_ESCALA_RSS = 1 if sys.platform == 'darwin' else 1024
+
+
+def pico_rss_mb():
+    """Pico de memória residente do processo até agora (MB)"""
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * _ESCALA_RSS / 1024 ** 2
+
+
+def ativo():
+    return _ATIVO
+
+
+@contextmanager
+def span(nome, categoria='etapa', **args):
+    """
+    Mede o bloco (parede, CPU, pico de RSS) e registra um evento no rastro
+    """
+    if not _ATIVO:
+        yield
+        return
+
+    inicio = time.perf_counter_ns()
+    cpu_inicio = time.process_time()
+    rss_inicio = pico_rss_mb()
+    try:
+        yield
+    finally:
+        fim = time.perf_counter_ns()
+        rss_fim = pico_rss_mb()
+        detalhes = {k: (v if isinstance(v, (int, float, bool)) else str(v)) for k, v in args.items()}
+        detalhes['cpu_ms'] = round((time.process_time() - cpu_inicio) * 1000, 3)
+        if rss_fim is not None:
+            detalhes['pico_rss_mb'] = round(rss_fim, 1)
+            detalhes['aumento_pico_rss_mb'] = round(rss_fim - rss_inicio, 1)
+
+        _EVENTOS.append({
+            'name': nome,
+            'cat': categoria,
+            'ph': 'X',
+            'ts': (inicio - _INICIO_NS) / 1000,
+            'dur': (fim - inicio) / 1000,
+            'pid': os.getpid(),
+            'tid': threading.get_ident(),
+            'args': detalhes,
+        })
+
+
+def instrumentar(nome=None, categoria='etapa'):
+    """
+    Decorator: envolve a função em um span (nome padrão: nome da função)
+    """
+    def decorar(funcao):
+        @functools.wraps(funcao)
+        def envolvida(*a, **kw):
+            with span(nome or funcao.__name__, categoria):
+                return funcao(*a, **kw)
+        return envolvida
+    return decorar
+
+
+# ============================================================================
+# RASTRO E RESUMO
+# ============================================================================
+
+def ativar(arquivo_rastro):
+    """
+    Liga a instrumentação; o rastro é salvo e resumido ao final do processo
+    """
+    global _ATIVO, _ARQUIVO_RASTRO
+    if _ATIVO:
+        return
+    _ATIVO = True
+    _ARQUIVO_RASTRO = Path(arquivo_rastro).resolve()  # scripts podem mudar de diretório
+    atexit.register(finalizar)
+
+
+def salvar_rastro(caminho):
+    """
+    Salva os eventos no formato Chrome Trace Event (JSON)
+    """
+    Path(caminho).parent.mkdir(parents=True, exist_ok=True)
+    with open(caminho, 'w', encoding='utf-8') as f:
+        json.dump({'traceEvents': _EVENTOS, 'displayTimeUnit': 'ms'}, f, ensure_ascii=False)
+    return caminho
+
+
+def resumo(eventos=None):
+    """
+    Agrega os spans por nome: chamadas, parede total, CPU total e pico de RSS
+    (dos eventos deste processo ou de uma lista lida de um rastro salvo)
+    """
+    tabela = {}
+    for evento in _EVENTOS if eventos is None else eventos:
+        linha = tabela.setdefault(evento['name'], {'chamadas': 0, 'parede_ms': 0.0,
+                                                   'cpu_ms': 0.0, 'pico_rss_mb': 0.0})
+        linha['chamadas'] += 1
+        linha['parede_ms'] += evento['dur'] / 1000
+        linha['cpu_ms'] += evento['args']['cpu_ms']
+        linha['pico_rss_mb'] = max(linha['pico_rss_mb'], evento['args'].get('pico_rss_mb') or 0.0)
+    return dict(sorted(tabela.items(), key=lambda item: -item[1]['parede_ms']))
+
+
+def finalizar():
+    """Salva o rastro e imprime o resumo (chamado automaticamente ao sair)"""
+    if not _EVENTOS:
+        return
+    caminho = salvar_rastro(_ARQUIVO_RASTRO)
+
+    print("\n" + "="*78)
+    print(f"⏱️  PERFIL ({len(_EVENTOS)} spans) - rastro: {caminho}")
+    print("="*78)
+    print(f"{'span':<32}{'chamadas':>9}{'parede (ms)':>13}{'CPU (ms)':>11}{'pico RSS (MB)':>14}")
+    for nome, linha in resumo().items():
+        print(f"{nome[:31]:<32}{linha['chamadas']:>9}{linha['parede_ms']:>13.1f}"
+              f"{linha['cpu_ms']:>11.1f}{linha['pico_rss_mb']:>14.1f}")
+
+
+def adicionar_argumento_perfil(parser, padrao):
+    """
+    Adiciona --profile e --rastro ARQUIVO ao parser de um entry point
+    """
+    parser.add_argument('--profile', action='store_true',
+                        help='Mede tempo/CPU/memória por etapa e salva um rastro (flame chart)')
+    parser.add_argument('--rastro', default=padrao, metavar='ARQUIVO',
+                        help=f'Arquivo do rastro com --profile (padrão: {padrao})')
+
+
+def configurar_perfil(args):
+    """Ativa a instrumentação se --profile foi passado"""
+    if getattr(args, 'profile', False):
+        ativar(args.rastro)
@@ -0,0 +1,319 @@
+"""
+DETECÇÃO DO LAYOUT DAS ABAS TIC
+TIC Educação 2023/2024
+
+Em vez de posições fixas (título na linha 0, cabeçalhos nas linhas 2-3, dados
+a partir da 4), o layout de cada aba é detectado a partir do conteúdo:
+
+- dados:     da linha TOTAL (ou da primeira linha com números) até a última
+             linha numérica antes do rodapé
+- rodapé:    primeira linha 'Fonte:'/'Nota:' depois do início dos dados
+- colunas:   a primeira coluna com números nos dados inicia os valores; as
+             anteriores são dimensão (0) e grupo (1)
+- cabeçalho: linhas acima dos dados com texto nas colunas de valores, em
+             quantos níveis houver; células mescladas de um nível superior
+             (só a primeira tem texto) valem para as colunas seguintes do grupo
+- título:    linhas com texto antes do cabeçalho
+
+O layout detectado fica em .layout_abas.json, na pasta do workbook, por
+(workbook, aba, versão da aba). A versão é o CRC da parte da aba no zip
+(tic/vigia.py), então sobrevive a cópias e regravações sem mudança. Leituras
+seguintes da mesma versão pulam a detecção e leem só a região de dados.
+
+Uso (na raiz do repositório):
+    python -m tic.layout tic_educacao_2024_alunos_tabela_total_v1.0.xlsx G6 H4D
+"""
+
+import argparse
+import json
+import os
+import threading
+import zipfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from tic.log import obter_logger
+from tic.texto import texto_celula
+
+ARQUIVO_LAYOUTS = '.layout_abas.json'
+
+# Linhas de rodapé que não são observações
+PREFIXOS_RODAPE = ('Fonte:', 'Nota:', 'Notas:')
+
+DIMENSAO_TOTAL = 'TOTAL'
+
+log = obter_logger('layout')
+
+_VERSOES = {}     # arquivo → ((mtime, tamanho), {aba: versão})
+_REGISTROS = {}   # pasta → (mtime do .layout_abas.json, conteúdo)
+_ESTATISTICAS = {'detectados': 0, 'reaproveitados': 0}
+_TRAVA = threading.RLock()
+
+
+def para_numerico(coluna):
+    """Converte uma coluna de valores, tratando '-' e separadores de milhar em texto"""
+    if coluna.dtype == object:
+        coluna = coluna.astype(str).str.replace(',', '', regex=False).str.replace('-', '', regex=False)
+    return pd.to_numeric(coluna, errors='coerce')
+
+
+# ============================================================================
+# DETECÇÃO
+# ============================================================================
+
+def rotulos_cabecalho(niveis, primeira_coluna):
+    """
+    (questões, respostas) das colunas de valores a partir das linhas de
+    cabeçalho (lista de listas de texto, de cima para baixo).
+
+    O último nível é a resposta e os de cima formam a questão; com dois
+    níveis, vale a regra do extrator original: textos diferentes → questão e
+    resposta, senão a coluna tem só resposta.
+    """
+    niveis = [list(nivel) for nivel in niveis]
+    n_colunas = len(niveis[0]) if niveis else 0
+
+    # Célula mesclada: o texto está só na primeira coluna do grupo
+    for nivel in niveis[:-1]:
+        for j in range(1, n_colunas):
+            if not nivel[j] and nivel[j - 1] and niveis[-1][j] and niveis[-1][j - 1]:
+                nivel[j] = nivel[j - 1]
+
+    questoes, respostas = [], []
+    for j in range(n_colunas):
+        partes = []
+        for nivel in niveis:
+            if nivel[j] and (not partes or partes[-1] != nivel[j]):
+                partes.append(nivel[j])
+        questoes.append(' - '.join(partes[:-1]))
+        respostas.append(partes[-1] if partes else f"col_{primeira_coluna + j}")
+    return questoes, respostas
+
+
+def detectar_layout(df_raw):
+    """
+    Detecta título, cabeçalho, dados e rodapé de uma aba lida com header=None
+
+    Returns:
+        dict com linhas_titulo, linhas_cabecalho, inicio e fim (região de
+        dados, fim exclusivo), rodape (linha ou None), coluna_grupo (1 ou
+        None), primeira_coluna, colunas, questoes, respostas (uma por coluna
+        de valores), titulo, descricao (demais linhas de título) e
+        primeira_dimensao
+    """
+    n_linhas, n_colunas = df_raw.shape
+    primeira = [texto_celula(v) for v in df_raw.iloc[:, 0]] if n_colunas else []
+    # Só para localizar os dados: números já lidos como números bastam
+    numeros = (df_raw.iloc[:, 1:].apply(pd.to_numeric, errors='coerce').notna().to_numpy()
+               if n_colunas > 1 else np.zeros((n_linhas, 0), dtype=bool))
+    com_numeros = numeros.any(axis=1)
+
+    # Início: a linha TOTAL; sem ela, a primeira linha rotulada com números
+    candidatas = [i for i in range(n_linhas) if com_numeros[i] and primeira[i]]
+    if not candidatas:
+        raise ValueError("Nenhuma linha de dados encontrada")
+    inicio = next((i for i in candidatas if primeira[i] == DIMENSAO_TOTAL), candidatas[0])
+
+    rodape = next((i for i in range(inicio, n_linhas) if primeira[i].startswith(PREFIXOS_RODAPE)), None)
+    limite = n_linhas if rodape is None else rodape
+    fim = inicio + int(np.flatnonzero(com_numeros[inicio:limite]).max()) + 1
+
+    primeira_coluna = int(np.argmax(numeros[inicio:fim].any(axis=0))) + 1
+
+    linhas_cabecalho = [i for i in range(inicio)
+                        if any(texto_celula(v) for v in df_raw.iloc[i, primeira_coluna:])]
+    antes = linhas_cabecalho[0] if linhas_cabecalho else inicio
+    linhas_titulo = [i for i in range(antes) if primeira[i]]
+
+    niveis = [[texto_celula(v) for v in df_raw.iloc[i, primeira_coluna:]] for i in linhas_cabecalho]
+    questoes, respostas = rotulos_cabecalho(niveis or [[''] * (n_colunas - primeira_coluna)],
+                                            primeira_coluna)
+
+    return {
+        'titulo': primeira[linhas_titulo[0]] if linhas_titulo else '',
+        'descricao': ' '.join(primeira[i] for i in linhas_titulo[1:]),
+        'linhas_titulo': linhas_titulo,
+        'linhas_cabecalho': linhas_cabecalho,
+        'inicio': inicio,
+        'fim': fim,
+        'rodape': rodape,
+        'coluna_grupo': 1 if primeira_coluna > 1 else None,
+        'primeira_coluna': primeira_coluna,
+        'colunas': n_colunas,
+        'questoes': questoes,
+        'respostas': respostas,
+        'primeira_dimensao': primeira[inicio],
+    }
+
+
+# ============================================================================
+# REGISTRO (.layout_abas.json)
+# ============================================================================
+
+def versoes_abas(arquivo):
+    """
+    Aba → versão (CRC/tamanho da parte no zip); {} se o arquivo não é um
+    xlsx legível. Memoizado por (mtime, tamanho) do arquivo.
+    """
+    from tic.vigia import assinaturas_abas
+
+    caminho = str(Path(arquivo).resolve())
+    estado = os.stat(caminho)
+    assinatura = (estado.st_mtime_ns, estado.st_size)
+    with _TRAVA:
+        memo = _VERSOES.get(caminho)
+        if memo is not None and memo[0] == assinatura:
+            return memo[1]
+    try:
+        versoes = assinaturas_abas(caminho)
+    except (zipfile.BadZipFile, KeyError, OSError) as e:
+        log.debug(f"Sem versões por aba para {Path(caminho).name}: {e}")
+        versoes = {}
+    with _TRAVA:
+        _VERSOES[caminho] = (assinatura, versoes)
+    return versoes
+
+
+def _registro(pasta):
+    """Conteúdo de .layout_abas.json da pasta (relido se o arquivo mudou)"""
+    arquivo = Path(pasta) / ARQUIVO_LAYOUTS
+    try:
+        mtime = arquivo.stat().st_mtime_ns
+    except FileNotFoundError:
+        return _REGISTROS.setdefault(str(pasta), (None, {}))[1]
+    memo = _REGISTROS.get(str(pasta))
+    if memo is None or memo[0] != mtime:
+        try:
+            conteudo = json.loads(arquivo.read_text(encoding='utf-8'))
+        except (OSError, ValueError) as e:
+            log.warning(f"⚠️  {arquivo} ilegível, layouts serão detectados de novo: {e}")
+            conteudo = {}
+        memo = (mtime, conteudo)
+        _REGISTROS[str(pasta)] = memo
+    return memo[1]
+
+
+def layout_registrado(arquivo, aba, versao):
+    """Layout salvo para esta versão da aba, ou None"""
+    if not versao:
+        return None
+    caminho = Path(arquivo).resolve()
+    with _TRAVA:
+        salvo = _registro(caminho.parent).get(caminho.name, {}).get(aba)
+    return salvo if salvo is not None and salvo.get('versao') == versao else None
+
+
+def registrar_layout(arquivo, aba, versao, layout):
+    """Grava o layout da aba em .layout_abas.json (gravação atômica)"""
+    if not versao:
+        return
+    caminho = Path(arquivo).resolve()
+    destino = caminho.parent / ARQUIVO_LAYOUTS
+    with _TRAVA:
+        conteudo = _registro(caminho.parent)
+        conteudo.setdefault(caminho.name, {})[aba] = {'versao': versao, **layout}
+        # Abas removidas do workbook saem do registro
+        atuais = versoes_abas(caminho)
+        for antiga in [a for a in conteudo[caminho.name] if atuais and a not in atuais]:
+            del conteudo[caminho.name][antiga]
+        temporario = destino.with_name(f"{destino.name}.{os.getpid()}.tmp")
+        try:
+            temporario.write_text(json.dumps(conteudo, ensure_ascii=False, indent=1), encoding='utf-8')
+            os.replace(temporario, destino)
+            _REGISTROS[str(caminho.parent)] = (destino.stat().st_mtime_ns, conteudo)
+        except OSError as e:
+            log.debug(f"Layout de {aba} não registrado ({destino}): {e}")
+
+
+def estatisticas_layouts():
+    """Layouts detectados e reaproveitados do registro neste processo"""
+    with _TRAVA:
+        return dict(_ESTATISTICAS)
+
+
+# ============================================================================
+# LEITURA
+# ============================================================================
+
+def ler_aba(arquivo, aba, livro=None):
+    """
+    Lê a região de dados de uma aba e o layout dela
+
+    Com layout registrado para a versão atual da aba, lê só as linhas de
+    dados (skiprows/nrows); senão lê a aba inteira, detecta e registra.
+
+    Args:
+        livro: pd.ExcelFile já aberto do mesmo arquivo (opcional)
+
+    Returns:
+        (dados, layout): dados com o índice = linha na aba e as colunas nas
+        posições da aba
+    """
+    ler = livro.parse if livro is not None else (lambda *a, **k: pd.read_excel(arquivo, *a, **k))
+    versao = versoes_abas(arquivo).get(aba)
+
+    layout = layout_registrado(arquivo, aba, versao)
+    if layout is not None:
+        dados = ler(aba, header=None, skiprows=layout['inicio'], nrows=layout['fim'] - layout['inicio'])
+        dados.index = range(layout['inicio'], layout['inicio'] + len(dados))
+        dados = dados.reindex(columns=range(layout['colunas']))
+        if len(dados) == layout['fim'] - layout['inicio'] and texto_celula(dados.iat[0, 0]) == layout['primeira_dimensao']:
+            with _TRAVA:
+                _ESTATISTICAS['reaproveitados'] += 1
+            return dados, layout
+        log.debug(f"Layout registrado de {aba} não confere com a aba; detectando de novo")
+
+    df_raw, layout = _detectar(ler, arquivo, aba, versao)
+    return df_raw.iloc[layout['inicio']:layout['fim']], layout
+
+
+def layout_aba(arquivo, aba, livro=None):
+    """Só o layout da aba: do registro, sem ler a aba, ou detectado e registrado"""
+    versao = versoes_abas(arquivo).get(aba)
+    layout = layout_registrado(arquivo, aba, versao)
+    if layout is not None:
+        with _TRAVA:
+            _ESTATISTICAS['reaproveitados'] += 1
+        return layout
+    ler = livro.parse if livro is not None else (lambda *a, **k: pd.read_excel(arquivo, *a, **k))
+    return _detectar(ler, arquivo, aba, versao)[1]
+
+
+def _detectar(ler, arquivo, aba, versao):
+    df_raw = ler(aba, header=None)
+    layout = detectar_layout(df_raw)
+    with _TRAVA:
+        _ESTATISTICAS['detectados'] += 1
+    registrar_layout(arquivo, aba, versao, layout)
+    return df_raw, layout
+
+
+def main(argv=None):
+    from tic.log import adicionar_argumentos_log, configurar_log_args
+
+    parser = argparse.ArgumentParser(description='Mostra o layout detectado das abas de um workbook TIC')
+    parser.add_argument('arquivo')
+    parser.add_argument('abas', nargs='*', help='Abas (padrão: todas)')
+    adicionar_argumentos_log(parser)
+    args = parser.parse_args(argv)
+    configurar_log_args(args)
+
+    with pd.ExcelFile(args.arquivo) as livro:
+        for aba in args.abas or livro.sheet_names:
+            try:
+                dados, layout = ler_aba(args.arquivo, aba, livro)
+            except ValueError as e:
+                print(f"✗ {aba}: {e}")
+                continue
+            niveis = len(layout['linhas_cabecalho'])
+            rodape = layout['rodape'] if layout['rodape'] is not None else '-'
+            print(f"✓ {aba}: título {layout['linhas_titulo']}, cabeçalho {layout['linhas_cabecalho']} "
+                  f"({niveis} nível(is)), dados {layout['inicio']}-{layout['fim'] - 1}, rodapé {rodape}, "
+                  f"valores a partir da coluna {layout['primeira_coluna']} "
+                  f"({layout['colunas'] - layout['primeira_coluna']} colunas)")
+
+
+if __name__ == "__main__":
+    main()
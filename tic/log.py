@@ -0,0 +1,216 @@
+"""
+LOG ESTRUTURADO DO PIPELINE
+TIC Educação 2024
+
+Substitui os prints incondicionais por um logger (logging da biblioteca
+padrão) com níveis e dois formatos de saída:
+
+- texto (padrão): as mesmas mensagens de antes, para leitura humana
+- json: um objeto JSON por linha (ts, nivel, logger, msg + campos), para
+  execuções em lote
+
+Linhas por item (por região, por grupo, ...) são registros DEBUG com campos
+estruturados: não vão para o console por padrão, mas são coletados e o
+relatório legível é impresso uma vez, ao final do processo, a partir deles.
+
+    log = obter_logger('analise_a8')
+    titulo(log, 'ANÁLISE ABA A8')
+    log.info('✅ Aba carregada')
+    log.debug(f'  {nome}: {pct:.1f}%', extra=linha('A8 por região', regiao=nome, percentual=pct))
+
+Nos entry points:
+    adicionar_argumentos_log(parser)   # --verbose, --quiet, --log-json
+    configurar_log_args(args)
+"""
+
+import atexit
+import json
+import logging
+import sys
+from datetime import datetime
+
+RAIZ_LOGGER = 'tic'
+
+_CONFIGURADO = False
+_TABELAS = {}  # título da tabela → lista de linhas (dicts), na ordem de chegada
+
+
+def obter_logger(nome):
+    """Logger do pipeline (filho de 'tic')"""
+    return logging.getLogger(f"{RAIZ_LOGGER}.{nome}")
+
+
+def linha(tabela, **campos):
+    """
+    `extra` de um registro por item: entra na tabela `tabela` do relatório
+    final e, no modo JSON, os campos vão no próprio registro
+    """
+    return {'tabela': tabela, 'dados': campos}
+
+
+def titulo(log, texto, caractere='=', largura=80):
+    """Cabeçalho de seção (banner no modo texto, um registro no modo JSON)"""
+    log.info(texto, extra={'titulo': (caractere, largura)})
+
+
+# ============================================================================
+# FORMATOS
+# ============================================================================
+
+class FormatoTexto(logging.Formatter):
+    """Só a mensagem, como os prints antigos (títulos viram banners)"""
+
+    def format(self, registro):
+        mensagem = registro.getMessage()
+        if getattr(registro, 'titulo', None):
+            caractere, largura = registro.titulo
+            mensagem = f"\n{caractere * largura}\n{mensagem}\n{caractere * largura}"
+        if registro.exc_info:
+            mensagem += '\n' + self.formatException(registro.exc_info)
+        return mensagem
+
+
+class FormatoJSON(logging.Formatter):
+    """Um objeto JSON por registro"""
+
+    def format(self, registro):
+        objeto = {
+            'ts': datetime.fromtimestamp(registro.created).isoformat(timespec='milliseconds'),
+            'nivel': registro.levelname,
+            'logger': registro.name,
+            'msg': registro.getMessage().strip(),
+        }
+        if getattr(registro, 'tabela', None):
+            objeto['tabela'] = registro.tabela
+            objeto.update(registro.dados)
+        if getattr(registro, 'tabelas', None):
+            objeto['tabelas'] = registro.tabelas
+        if registro.exc_info:
+            objeto['excecao'] = self.formatException(registro.exc_info)
+        return json.dumps(objeto, ensure_ascii=False, default=str)
+
+
+class ColetorTabelas(logging.Handler):
+    """Guarda os registros por item (com `tabela`) para o relatório final"""
+
+    def emit(self, registro):
+        if getattr(registro, 'tabela', None):
+            _TABELAS.setdefault(registro.tabela, []).append(registro.dados)
+
+
+# ============================================================================
+# RELATÓRIO FINAL
+# ============================================================================
+
+# Campos inteiros que identificam (ano, posição, rótulo de cluster) em vez de
+# contar: sem separador de milhar (2024, não 2,024)
+CAMPOS_IDENTIFICADORES = {'ano', 'linha', 'coluna', 'cluster', 'k', 'n_clusters'}
+
+
+def _formatar_valor(valor, campo=None):
+    if isinstance(valor, float):
+        return f"{valor:,.1f}"
+    if isinstance(valor, int) and not isinstance(valor, bool):
+        return str(valor) if campo in CAMPOS_IDENTIFICADORES else f"{valor:,}"
+    return str(valor)
+
+
+def relatorio_tabelas():
+    """Texto do relatório: uma tabela alinhada por título coletado"""
+    blocos = []
+    for nome, linhas in _TABELAS.items():
+        colunas = list(dict.fromkeys(chave for dados in linhas for chave in dados))
+        celulas = [[_formatar_valor(dados.get(c, ''), c) for c in colunas] for dados in linhas]
+        larguras = [max(len(c), *(len(l[i]) for l in celulas)) for i, c in enumerate(colunas)]
+
+        texto = [f"\n📋 {nome} ({len(linhas)} linhas)",
+                 "  " + "  ".join(c.ljust(larguras[i]) for i, c in enumerate(colunas))]
+        for l in celulas:
+            texto.append("  " + "  ".join(
+                v.rjust(larguras[i]) if v[:1].isdigit() or v[:1] == '-' else v.ljust(larguras[i])
+                for i, v in enumerate(l)))
+        blocos.append("\n".join(texto))
+    return "\n".join(blocos)
+
+
+def emitir_relatorio():
+    """
+    Emite o relatório das tabelas coletadas (uma vez, ao final): texto legível
+    ou um registro JSON com todas as tabelas
+    """
+    if not _TABELAS:
+        return
+    log = obter_logger('relatorio')
+    if any(isinstance(h.formatter, FormatoJSON) for h in logging.getLogger(RAIZ_LOGGER).handlers):
+        log.info('relatorio', extra={'tabelas': dict(_TABELAS)})
+    else:
+        titulo(log, 'RELATÓRIO')
+        log.info(relatorio_tabelas())
+    _TABELAS.clear()
+
+
+# ============================================================================
+# CONFIGURAÇÃO
+# ============================================================================
+
+def configurar_log(nivel='INFO', formato='texto', arquivo=None):
+    """
+    Configura o logger 'tic': console (stdout) no nível pedido, no formato
+    texto ou json, e o coletor das tabelas do relatório final
+    """
+    global _CONFIGURADO
+    raiz = logging.getLogger(RAIZ_LOGGER)
+    for handler in list(raiz.handlers):
+        raiz.removeHandler(handler)
+
+    console = logging.FileHandler(arquivo, encoding='utf-8') if arquivo else logging.StreamHandler(sys.stdout)
+    console.setLevel(nivel)
+    console.setFormatter(FormatoJSON() if formato == 'json' else FormatoTexto())
+
+    raiz.addHandler(console)
+    raiz.addHandler(ColetorTabelas(logging.DEBUG))
+    raiz.setLevel(logging.DEBUG)
+    raiz.propagate = False
+
+    if not _CONFIGURADO:
+        atexit.register(emitir_relatorio)
+    _CONFIGURADO = True
+
+
+def desativar_relatorio():
+    """
+    Processos de longa duração (ex.: servidor): não acumula as linhas por
+    item para o relatório final
+    """
+    raiz = logging.getLogger(RAIZ_LOGGER)
+    for handler in [h for h in raiz.handlers if isinstance(h, ColetorTabelas)]:
+        raiz.removeHandler(handler)
+    _TABELAS.clear()
+    # Sem o coletor, registros abaixo do nível do console nem são criados
+    if raiz.handlers:
+        raiz.setLevel(min(h.level for h in raiz.handlers))
+
+
+def adicionar_argumentos_log(parser):
+    """Adiciona --verbose, --quiet, --log-json e --log-arquivo a um entry point"""
+    grupo = parser.add_argument_group('log')
+    grupo.add_argument('-v', '--verbose', action='store_true', default=None,
+                       help='Mostra as linhas por item (nível DEBUG)')
+    grupo.add_argument('-q', '--quiet', action='store_true', default=None,
+                       help='Só avisos e erros (nível WARNING)')
+    grupo.add_argument('--log-json', action='store_true', default=None,
+                       help='Registros em JSON, um por linha')
+    grupo.add_argument('--log-arquivo', metavar='ARQUIVO', help='Grava o log em arquivo em vez do console')
+
+
+def configurar_log_args(args):
+    """
+    Configura o log a partir dos argumentos. Sem nenhuma opção de log, mantém
+    uma configuração já feita (ex.: pela CLI tic que chamou o script).
+    """
+    opcoes = [getattr(args, nome, None) for nome in ('verbose', 'quiet', 'log_json', 'log_arquivo')]
+    if _CONFIGURADO and not any(opcoes):
+        return
+    verbose, quiet, log_json, arquivo = opcoes
+    nivel = 'DEBUG' if verbose else 'WARNING' if quiet else 'INFO'
+    configurar_log(nivel, 'json' if log_json else 'texto', arquivo)
@@ -0,0 +1,195 @@
+"""
+FORMATOS DE SAÍDA - ESCRITORES PLUGÁVEIS E LEITURA POR COLUNAS
+TIC Educação 2023/2024
+
+Cada formato é um escritor registrado (csv, json, parquet, feather).
+Parquet e Feather guardam esquema tipado e compressão e permitem ler só as
+colunas necessárias; exigem pyarrow (opcional: pip install pyarrow).
+
+    salvar_tabela(df, 'dados_processados/escolas_2024_consolidado', formatos=['parquet', 'csv'])
+    ler_tabela('dados_processados/escolas_2024_consolidado', colunas=['observacao_id', 'A1_Sim'])
+"""
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from tic.instrumentacao import span
+
+FORMATOS_PADRAO = ('parquet',)
+COMPRESSAO_PADRAO = 'zstd'
+
+# Formatos lidos por ler_tabela; a ordem só desempata arquivos igualmente
+# recentes (colunares primeiro)
+FORMATOS_LEITURA = ('parquet', 'feather', 'csv')
+
+# nome → (extensão, função(df, caminho, compressao, metadados))
+ESCRITORES = {}
+
+
+def registrar_escritor(nome, extensao):
+    """
+    Registra um escritor de formato (decorator)
+    """
+    def decorar(funcao):
+        ESCRITORES[nome] = (extensao, funcao)
+        return funcao
+    return decorar
+
+
+def _pyarrow():
+    """Importa pyarrow sob demanda (dependência opcional)"""
+    try:
+        import pyarrow
+        return pyarrow
+    except ImportError:
+        raise ImportError("Formatos parquet/feather requerem pyarrow (pip install pyarrow)")
+
+
+def pyarrow_disponivel():
+    """True se os formatos colunares podem ser usados"""
+    try:
+        _pyarrow()
+        return True
+    except ImportError:
+        return False
+
+
+def tabela_arrow(df, metadados=None):
+    """
+    Converte o DataFrame em tabela Arrow com esquema explícito
+    (texto/categóricas como string, inteiros e floats com a largura original)
+    """
+    pa = _pyarrow()
+
+    campos = []
+    for coluna, tipo in df.dtypes.items():
+        if isinstance(tipo, pd.CategoricalDtype) or tipo == object or pd.api.types.is_string_dtype(tipo):
+            campos.append(pa.field(str(coluna), pa.string()))
+        elif pd.api.types.is_bool_dtype(tipo):
+            campos.append(pa.field(str(coluna), pa.bool_()))
+        else:
+            campos.append(pa.field(str(coluna), pa.from_numpy_dtype(np.dtype(tipo))))
+
+    esquema = pa.schema(campos)
+    df = df.astype({c: str for c, t in df.dtypes.items() if isinstance(t, pd.CategoricalDtype)})
+    tabela = pa.Table.from_pandas(df, schema=esquema, preserve_index=False)
+
+    # Só os metadados do projeto (o bloco 'pandas' repetiria o esquema coluna a coluna)
+    return tabela.replace_schema_metadata({'tic': json.dumps(metadados or {}, ensure_ascii=False)})
+
+
+@registrar_escritor('csv', '.csv')
+def _escrever_csv(df, caminho, compressao=None, metadados=None):
+    df.to_csv(caminho, index=False, encoding='utf-8-sig')
+
+
+@registrar_escritor('json', '.json')
+def _escrever_json(df, caminho, compressao=None, metadados=None):
+    df.to_json(caminho, orient='records', force_ascii=False, indent=2)
+
+
+@registrar_escritor('parquet', '.parquet')
+def _escrever_parquet(df, caminho, compressao=COMPRESSAO_PADRAO, metadados=None):
+    _pyarrow()
+    import pyarrow.parquet as pq
+    pq.write_table(tabela_arrow(df, metadados), caminho, compression=compressao)
+
+
+@registrar_escritor('feather', '.feather')
+def _escrever_feather(df, caminho, compressao=COMPRESSAO_PADRAO, metadados=None):
+    _pyarrow()
+    import pyarrow.feather as feather
+    feather.write_feather(tabela_arrow(df, metadados), caminho, compression=compressao)
+
+
+def salvar_tabela(df, caminho_base, formatos=FORMATOS_PADRAO, compressao=COMPRESSAO_PADRAO,
+                  metadados=None):
+    """
+    Salva a tabela em cada formato pedido (caminho_base sem extensão)
+
+    Returns:
+        lista de arquivos gravados
+    """
+    desconhecidos = [f for f in formatos if f not in ESCRITORES]
+    if desconhecidos:
+        raise ValueError(f"Formato(s) desconhecido(s): {desconhecidos}. Disponíveis: {list(ESCRITORES)}")
+
+    Path(caminho_base).parent.mkdir(parents=True, exist_ok=True)
+    arquivos = []
+    for formato in formatos:
+        extensao, escrever = ESCRITORES[formato]
+        caminho = f"{caminho_base}{extensao}"
+        with span(f'escrever_{formato}', 'escrita', arquivo=Path(caminho).name):
+            escrever(df, caminho, compressao=compressao, metadados=metadados)
+        arquivos.append(caminho)
+    return arquivos
+
+
+# ============================================================================
+# LEITURA
+# ============================================================================
+
+def colunas_disponiveis(caminho):
+    """
+    Nomes das colunas de um arquivo salvo, sem ler os dados
+    """
+    sufixo = Path(caminho).suffix
+    if sufixo == '.parquet':
+        _pyarrow()
+        import pyarrow.parquet as pq
+        return pq.read_schema(caminho).names
+    if sufixo == '.feather':
+        pa = _pyarrow()
+        with pa.memory_map(str(caminho)) as origem:
+            return pa.ipc.open_file(origem).schema.names
+    return pd.read_csv(caminho, nrows=0, encoding='utf-8-sig').columns.tolist()
+
+
+def localizar_tabela(caminho_base, formatos=FORMATOS_LEITURA):
+    """
+    Arquivo mais recente para caminho_base entre os formatos pedidos (um
+    .parquet de uma execução anterior não esconde um .csv gravado depois);
+    empates seguem a ordem de formatos. Formatos colunares são pulados se
+    pyarrow não estiver instalado.
+    """
+    candidatos = []
+    for ordem, formato in enumerate(formatos):
+        if formato in ('parquet', 'feather') and not pyarrow_disponivel():
+            continue
+        caminho = Path(f"{caminho_base}{ESCRITORES[formato][0]}")
+        if caminho.exists():
+            candidatos.append((-caminho.stat().st_mtime_ns, ordem, caminho))
+    return min(candidatos)[2] if candidatos else None
+
+
+def ler_arquivo(caminho, colunas=None):
+    """
+    Lê um arquivo (formato pela extensão), carregando só as colunas pedidas.
+
+    colunas: lista de nomes, função nome → bool, ou None (todas)
+    """
+    caminho = Path(caminho)
+    if callable(colunas):
+        colunas = [c for c in colunas_disponiveis(caminho) if colunas(c)]
+
+    with span(f'ler_{caminho.suffix.lstrip(".")}', 'leitura', arquivo=caminho.name):
+        if caminho.suffix == '.parquet':
+            _pyarrow()
+            return pd.read_parquet(caminho, columns=colunas)
+        if caminho.suffix == '.feather':
+            _pyarrow()
+            return pd.read_feather(caminho, columns=colunas)
+        return pd.read_csv(caminho, usecols=colunas, encoding='utf-8-sig')
+
+
+def ler_tabela(caminho_base, colunas=None, formatos=FORMATOS_LEITURA):
+    """
+    Lê a tabela salva por salvar_tabela (o arquivo mais recente entre os formatos)
+    """
+    caminho = localizar_tabela(caminho_base, formatos)
+    if caminho is None:
+        raise FileNotFoundError(f"Nenhum arquivo encontrado para {caminho_base} ({', '.join(formatos)})")
+    return ler_arquivo(caminho, colunas)
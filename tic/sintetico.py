@@ -0,0 +1,305 @@
+"""
+GERADOR DE WORKBOOKS SINTÉTICOS NO FORMATO TIC
+TIC Educação 2024
+
+Os xlsx do CETIC não ficam no repositório; este módulo escreve workbooks com a
+mesma estrutura das tabelas reais, para testar o pipeline e medir desempenho
+em escalas maiores:
+
+- linha 0 com o título, linha 1 com a base ("Total de escolas"/"Total de alunos")
+- linhas 2 e 3 com os cabeçalhos (questão, resposta) e "Total" na coluna 0
+- bloco TOTAL seguido dos blocos por dimensão (REGIÃO, ÁREA, ...), coluna 0 =
+  dimensão e coluna 1 = grupo
+- rodapé "Fonte: ..." depois dos dados
+- as abas usadas pelas análises (A8, A3_1, B4A, G6, H4D) com as respostas nas
+  posições que os scripts esperam, e abas variantes no estilo "A3_1"
+
+Os valores são contagens inteiras e consistentes nos dois sentidos: cada bloco
+soma o TOTAL, coluna a coluna, e em cada linha as respostas de cada questão
+somam a base da linha (tic/validacao.py verifica as duas coisas).
+
+Escala configurável: número de abas, linhas de dados por aba (blocos extras de
+MUNICÍPIO), colunas de valores por aba (questões extras) e anos (um par de
+workbooks escolas/alunos por ano).
+
+Uso (na raiz do repositório):
+    python -m tic.sintetico pasta_saida
+    python -m tic.sintetico pasta_saida --escala media
+    python -m tic.sintetico pasta_saida --abas 40 --linhas 500 --colunas 50 --anos 2023 2024
+"""
+
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+FONTE = ("Fonte: Núcleo de Informação e Coordenação do Ponto BR. ({ano}). Pesquisa sobre o uso "
+         "das tecnologias de informação e comunicação nas escolas brasileiras: "
+         "TIC Educação {ano} [Tabelas].")
+
+# Bases (total da linha TOTAL, por questão)
+BASE_ESCOLAS = 130_000
+BASE_ALUNOS = 25_000_000
+
+# Blocos de dimensão → grupos (na ordem das tabelas)
+BLOCOS_ESCOLAS = [
+    ('REGIÃO', ['Norte', 'Nordeste', 'Sudeste', 'Sul', 'Centro-Oeste']),
+    ('ÁREA', ['Urbana', 'Rural']),
+    ('DEPENDÊNCIA ADMINISTRATIVA', ['Municipal', 'Estadual',
+                                    'Públicas (Municipal, Estadual e Federal)', 'Particular']),
+    ('LOCALIZAÇÃO', ['Capital', 'Interior']),
+    ('PORTE', ['Até 50 matrículas', 'De 51 a 150 matrículas', 'Mais de 150 matrículas']),
+]
+
+BLOCOS_ALUNOS = [
+    ('REGIÃO', ['Norte', 'Nordeste', 'Sudeste', 'Sul', 'Centro-Oeste']),
+    ('ÁREA', ['Urbana', 'Rural']),
+    ('DEPENDÊNCIA ADMINISTRATIVA', ['Municipal', 'Estadual',
+                                    'Públicas (Municipal, Estadual e Federal)', 'Particular']),
+    ('ETAPA DE ENSINO', ['Anos iniciais do Ensino Fundamental (4º e 5º ano)',
+                         'Anos finais do Ensino Fundamental', 'Ensino Médio']),
+    ('FAIXA ETÁRIA', ['De 9 a 10 anos', 'De 11 a 12 anos', 'De 13 a 17 anos']),
+    ('SEXO', ['Feminino', 'Masculino']),
+]
+
+# Dimensão usada para as linhas extras (--linhas acima do tamanho real)
+DIMENSAO_EXTRA = 'MUNICÍPIO'
+
+SIM_NAO = ['Sim', 'Não']
+SIM_NAO_COMPLETO = ['Sim', 'Não', 'Não sabe', 'Não respondeu']
+
+# nome → (título, questões, respostas); questão None = colunas só com a resposta
+ABAS_ESCOLAS = {
+    'A1': ('ESCOLAS COM ACESSO À INTERNET', [None], SIM_NAO_COMPLETO),
+    'B1': ('ESCOLAS COM COMPUTADOR', [None], SIM_NAO),
+    'B1C': ('ESCOLAS POR QUANTIDADE DE COMPUTADORES', [None],
+            ['Nenhum', 'Até 5', 'De 6 a 15', 'De 16 a 20', 'De 21 a 30', 'De 31 a 40', '41 ou mais']),
+    'B2': ('ESCOLAS POR TIPO DE COMPUTADOR', ['Computador de mesa', 'Computador portátil', 'Tablet'],
+           SIM_NAO_COMPLETO),
+    'A2': ('ESCOLAS POR TIPO DE CONEXÃO', [None],
+           ['Conexão via cabo', 'Conexão via rádio', 'Conexão via fibra ótica', 'Não sabe']),
+    'A3_1': ('ESCOLAS POR VELOCIDADE DA PRINCIPAL CONEXÃO', [None],
+             ['Até 10 Mbps', 'De 11 Mbps a 50 Mbps', 'De 51 Mbps a 100 Mbps', 'De 101 Mbps a 250 Mbps',
+              'De 251 Mbps a 500 Mbps', 'De 501 Mbps a 1 Gbps', '1 Gbps ou mais', 'Não sabe',
+              'Não respondeu', 'Não se aplica']),
+    'A4': ('ESCOLAS COM REDE WI-FI', [None], SIM_NAO_COMPLETO),
+    'C1': ('ESCOLAS POR LOCAL DE USO DA INTERNET', ['Sala de aula', 'Biblioteca'],
+           SIM_NAO_COMPLETO + ['Não se aplica']),
+    'E1': ('ESCOLAS COM PRESENÇA ONLINE', ['Plataforma', 'Site'], SIM_NAO_COMPLETO),
+    'E1A': ('ESCOLAS COM AMBIENTE VIRTUAL DE APRENDIZAGEM', [None], SIM_NAO_COMPLETO),
+    'F1': ('ESCOLAS POR PROJETOS SOBRE USO DA INTERNET',
+           ['Uso seguro da internet', 'Desinformação'], SIM_NAO_COMPLETO),
+    'F2': ('ESCOLAS COM PROGRAMAS DE FORMAÇÃO', [None], SIM_NAO_COMPLETO),
+    'G4': ('ESCOLAS COM POLÍTICA DE USO DE DISPOSITIVOS', [None], SIM_NAO_COMPLETO),
+    'K3': ('ESCOLAS COM PLANO DE SEGURANÇA DA INFORMAÇÃO', [None], SIM_NAO_COMPLETO),
+    'K6': ('ESCOLAS COM PROTEÇÃO DE DADOS', [None], SIM_NAO_COMPLETO),
+    'A8': ('ESCOLAS COM COMPUTADOR E INTERNET PARA ALUNOS', [None], SIM_NAO),
+    'B4A': ('ESCOLAS POR PROPORÇÃO DE ALUNOS POR COMPUTADOR', [None],
+            ['Até 5 alunos', 'De 5,1 a 10', 'De 10,1 a 15', 'De 15,1 a 20', 'De 20,1 a 30',
+             'De 30,1 a 40', 'De 40,1 a 50', 'De 50,1 a 100', '100 alunos ou mais',
+             'Não possuem computador de mesa', 'Sem informação']),
+    'J1': ('ESCOLAS COM COORDENADOR DE TECNOLOGIA', [None], SIM_NAO),
+}
+
+ABAS_ALUNOS = {
+    'G6': ('ALUNOS POR RECURSOS DIGITAIS UTILIZADOS EM PESQUISAS ESCOLARES',
+           ['Sites de busca', 'Enciclopédias online', 'Vídeos', 'Redes sociais', 'Livros digitais',
+            'Sites de notícias', 'Aplicativos de mensagens', 'Podcasts',
+            'Inteligência Artificial (ChatGPT, Copilot, Gemini)'],
+           SIM_NAO),
+    'H4D': ('ALUNOS QUE RECEBERAM ORIENTAÇÃO DE PROFESSORES SOBRE INTELIGÊNCIA ARTIFICIAL',
+            ['Como usar aplicações de IA', 'Uso ético de IA', 'Riscos da IA'], SIM_NAO_COMPLETO),
+}
+
+# Presets de escala (None = tamanho real das tabelas)
+ESCALAS = {
+    'real': {'abas': None, 'linhas': None, 'colunas': None},
+    'media': {'abas': 30, 'linhas': 200, 'colunas': 30},
+    'grande': {'abas': 40, 'linhas': 1000, 'colunas': 60},
+}
+
+
+# ============================================================================
+# ESTRUTURA DAS ABAS
+# ============================================================================
+
+def _variantes(abas, total):
+    """
+    Completa o dicionário de abas até `total` com variantes no estilo A3_1
+    (A1_2, B1_2, ..., A3_2, ...), ciclando pelas abas originais
+    """
+    abas = dict(abas)
+    originais = list(abas.items())
+    ordem = 2
+    while len(abas) < total:
+        for nome, definicao in originais:
+            if len(abas) >= total:
+                break
+            raiz = nome.split('_')[0]
+            variante = f"{raiz}_{ordem}"
+            if variante not in abas:
+                abas[variante] = definicao
+        ordem += 1
+    return abas
+
+
+def _completar_questoes(questoes, respostas, colunas):
+    """
+    Acrescenta questões extras (depois das originais, preservando as posições
+    que as análises leem) até a aba ter pelo menos `colunas` colunas de valores
+    """
+    if colunas is None or len(questoes) * len(respostas) >= colunas:
+        return questoes
+    faltam = -(-(colunas - len(questoes) * len(respostas)) // len(respostas))
+    return questoes + [f"Questão complementar {i}" for i in range(1, faltam + 1)]
+
+
+def _completar_blocos(blocos, linhas):
+    """
+    Acrescenta um bloco de MUNICÍPIO até a aba ter `linhas` linhas de dados
+    (TOTAL + grupos)
+    """
+    atuais = 1 + sum(len(grupos) for _, grupos in blocos)
+    if linhas is None or linhas <= atuais:
+        return blocos
+    extras = [f"Município {i:05d}" for i in range(1, linhas - atuais + 1)]
+    return blocos + [(DIMENSAO_EXTRA, extras)]
+
+
+# ============================================================================
+# VALORES
+# ============================================================================
+
+def valores_aba(n_questoes, n_respostas, blocos, base, rng):
+    """
+    Gera a linha TOTAL e as linhas de cada bloco (contagens inteiras).
+
+    A linha TOTAL divide a base entre as respostas de cada questão. Em cada
+    bloco, a base é dividida entre os grupos, e cada coluna do TOTAL é
+    distribuída entre eles sem exceder o que resta da base de cada grupo
+    (hipergeométrica multivariada). Assim os grupos de uma dimensão somam o
+    TOTAL e, em cada linha, as respostas de cada questão somam a base do grupo.
+    """
+    proporcoes = rng.dirichlet(np.ones(n_respostas), size=n_questoes)
+    total = rng.multinomial(base, proporcoes)
+
+    linhas = []
+    for _, grupos in blocos:
+        bases = rng.multinomial(base, rng.dirichlet(np.full(len(grupos), 5.0)))
+        bloco = np.empty((len(grupos), n_questoes, n_respostas), dtype=np.int64)
+        for q in range(n_questoes):
+            restante = bases.copy()
+            for r in range(n_respostas - 1):
+                bloco[:, q, r] = rng.multivariate_hypergeometric(restante, total[q, r])
+                restante -= bloco[:, q, r]
+            bloco[:, q, -1] = restante
+        linhas.append(bloco.reshape(len(grupos), -1))
+    return total.ravel(), linhas
+
+
+# ============================================================================
+# ESCRITA
+# ============================================================================
+
+def escrever_aba(livro, nome, titulo, base_rotulo, questoes, respostas, blocos, valores, ano):
+    """
+    Escreve uma aba no layout TIC (título, cabeçalhos, TOTAL, blocos, rodapé)
+    """
+    total, linhas_blocos = valores
+    ws = livro.create_sheet(nome)
+
+    # Colunas sem questão (None) trazem a resposta na primeira linha de cabeçalho
+    cabecalho = [(q, r) if q is not None else (r, None) for q in questoes for r in respostas]
+
+    ws.append([f"{nome} - {titulo}"])
+    ws.append([base_rotulo])
+    ws.append([None, None, *(h1 for h1, _ in cabecalho)])
+    ws.append(['Total', None, *(h2 for _, h2 in cabecalho)])
+
+    ws.append(['TOTAL', None, *total.tolist()])
+    for (dimensao, grupos), valores_bloco in zip(blocos, linhas_blocos):
+        for grupo, linha in zip(grupos, valores_bloco.tolist()):
+            ws.append([dimensao, grupo, *linha])
+
+    ws.append([FONTE.format(ano=ano)])
+
+
+def gerar_workbook(caminho, abas, blocos, base, base_rotulo, ano=2024, linhas=None,
+                   colunas=None, semente=0):
+    """
+    Escreve um workbook TIC sintético
+
+    Args:
+        abas: dict nome → (título, questões, respostas)
+        blocos: lista (dimensão, grupos) das tabelas reais
+        linhas: linhas de dados por aba (None = tamanho real)
+        colunas: colunas de valores mínimas por aba (None = tamanho real)
+    """
+    import openpyxl
+
+    rng = np.random.default_rng([semente, ano])
+    blocos = _completar_blocos(blocos, linhas)
+
+    # Workbook normal (não write_only): grava <dimension> em cada aba, como o
+    # Excel; sem ele o openpyxl em modo leitura varre todas as abas ao abrir
+    livro = openpyxl.Workbook()
+    livro.remove(livro.active)
+    for nome, (titulo, questoes, respostas) in abas.items():
+        questoes = _completar_questoes(questoes, respostas, colunas)
+        valores = valores_aba(len(questoes), len(respostas), blocos, base, rng)
+        escrever_aba(livro, nome, titulo, base_rotulo, questoes, respostas, blocos, valores, ano)
+
+    Path(caminho).parent.mkdir(parents=True, exist_ok=True)
+    livro.save(caminho)
+    return str(caminho)
+
+
+def gerar_conjunto(pasta, abas=None, linhas=None, colunas=None, anos=(2024,), semente=0):
+    """
+    Gera os workbooks de escolas e alunos de cada ano na pasta, com os nomes
+    que os scripts do projeto esperam (tic_educacao_<ano>_<público>_tabela_total_v1.0.xlsx)
+
+    Args:
+        abas: total de abas do workbook de escolas (None = as abas reais);
+              as extras são variantes no estilo A3_1
+    """
+    abas_escolas = _variantes(ABAS_ESCOLAS, abas) if abas else ABAS_ESCOLAS
+
+    arquivos = []
+    for ano in anos:
+        arquivos.append(gerar_workbook(
+            Path(pasta) / f"tic_educacao_{ano}_escolas_tabela_total_v1.0.xlsx",
+            abas_escolas, BLOCOS_ESCOLAS, BASE_ESCOLAS, 'Total de escolas',
+            ano=ano, linhas=linhas, colunas=colunas, semente=semente))
+        arquivos.append(gerar_workbook(
+            Path(pasta) / f"tic_educacao_{ano}_alunos_tabela_total_v1.0.xlsx",
+            ABAS_ALUNOS, BLOCOS_ALUNOS, BASE_ALUNOS, 'Total de alunos',
+            ano=ano, linhas=linhas, colunas=colunas, semente=semente))
+    return arquivos
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Gera workbooks TIC sintéticos (escolas e alunos)')
+    parser.add_argument('pasta', help='Pasta de saída')
+    parser.add_argument('--escala', choices=ESCALAS, default='real',
+                        help='Preset de tamanho (padrão: real); --abas/--linhas/--colunas sobrescrevem')
+    parser.add_argument('--abas', type=int, help='Total de abas do workbook de escolas')
+    parser.add_argument('--linhas', type=int, help='Linhas de dados por aba (TOTAL + grupos)')
+    parser.add_argument('--colunas', type=int, help='Colunas de valores mínimas por aba')
+    parser.add_argument('--anos', type=int, nargs='+', default=[2024])
+    parser.add_argument('--semente', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    escala = dict(ESCALAS[args.escala])
+    for chave in escala:
+        if getattr(args, chave) is not None:
+            escala[chave] = getattr(args, chave)
+
+    arquivos = gerar_conjunto(args.pasta, anos=args.anos, semente=args.semente, **escala)
+    for arquivo in arquivos:
+        tamanho = Path(arquivo).stat().st_size / 1024 ** 2
+        print(f"✓ {arquivo} ({tamanho:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+NORMALIZAÇÃO DE TEXTO DAS ABAS TIC
+TIC Educação 2023/2024
+
+Funções de texto compartilhadas pela detecção de layout (tic/layout.py), pela
+tabela de fatos (tic/fatos.py), pelo índice de abas (tic/indice.py) e pelo
+cruzamento de indicadores:
+
+    texto_celula(nan)                          → ''
+    termos('Uso de Inteligência Artificial')   → ['uso', 'inteligencia', 'artificial']
+    slug('Uso ético de IA')                    → 'uso_etico_ia'
+
+Só biblioteca padrão: o índice importa este módulo sem carregar pandas.
+"""
+
+import re
+import unicodedata
+
+PALAVRAS_VAZIAS = {'a', 'o', 'as', 'os', 'ao', 'aos', 'de', 'da', 'do', 'das', 'dos', 'e', 'em',
+                   'no', 'na', 'nos', 'nas', 'para', 'por', 'pelo', 'pela', 'com', 'ou', 'que',
+                   'um', 'uma', 'se'}
+
+
+def texto_celula(valor):
+    """Converte célula (cabeçalho, rótulo) em texto ('' para vazias/NaN)"""
+    if valor is None or (isinstance(valor, float) and valor != valor):
+        return ''
+    return str(valor).strip()
+
+
+def termos(texto, consulta=False):
+    """
+    Termos sem acento, em minúsculas e sem palavras vazias
+    ('Uso de Inteligência Artificial' → ['uso', 'inteligencia', 'artificial']).
+    Em consultas, um * no fim do termo é mantido (prefixo).
+    """
+    decomposto = unicodedata.normalize('NFKD', str(texto))
+    sem_acento = ''.join(c for c in decomposto if not unicodedata.combining(c)).casefold()
+    palavras = re.findall(r'\w+\*?' if consulta else r'\w+', sem_acento)
+    return [p for p in palavras if p.rstrip('*') not in PALAVRAS_VAZIAS]
+
+
+def slug(texto, separador='_', padrao=''):
+    """Nome estável a partir de um rótulo ('Uso ético de IA' → 'uso_etico_ia')"""
+    return separador.join(termos(texto)) or padrao
@@ -0,0 +1,320 @@
+"""
+VALIDAÇÃO DE CONSISTÊNCIA DA TABELA DE FATOS
+TIC Educação 2023/2024
+
+Verifica, em uma única passada vetorizada (groupby sobre a tabela longa),
+todas as abas e anos presentes em uma tabela de fatos:
+
+- tipos:         colunas com o tipo de ESQUEMA_FATOS
+- valores:       sem negativos nem infinitos
+- rodape:        nenhuma linha 'Fonte:'/'Nota:' tratada como observação
+- cabecalho:     nenhuma linha de título/cabeçalho tratada como dados
+                 (dimensão fora do padrão em maiúsculas, resposta numérica)
+- total_unico:   exatamente uma linha TOTAL por aba
+- soma_dimensao: os grupos de REGIÃO (e ÁREA) somam o TOTAL, coluna a coluna
+- soma_respostas: em cada linha, as respostas de cada questão somam o mesmo
+                 total da linha (a mediana entre as questões completas)
+
+As somas usam a tolerância do arredondamento das tabelas publicadas: meia
+unidade por parcela, ou TOLERANCIA_RELATIVA do valor esperado. Células
+suprimidas ('-') tornam a soma incompleta e ela não é verificada.
+Pensado para as tabelas de totais (tabela_total); tabelas de proporção
+não somam por dimensão.
+
+Uso (na raiz do repositório):
+    python -m tic.validacao tic_educacao_2023_escolas_tabela_total_v1.0.xlsx \\
+                            tic_educacao_2024_escolas_tabela_total_v1.0.xlsx
+"""
+
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from tic.esquema import ESQUEMA_FATOS, aplicar_esquema
+from tic.layout import PREFIXOS_RODAPE
+from tic.instrumentacao import instrumentar
+from tic.log import linha, obter_logger
+
+DIMENSAO_TOTAL = 'TOTAL'
+DIMENSOES_SOMA = ('REGIÃO', 'ÁREA')
+TOLERANCIA_RELATIVA = 0.001
+MAXIMO_DETALHES = 50
+
+COLUNAS_PROBLEMAS = ['ano', 'aba', 'regra', 'linha', 'coluna', 'detalhe', 'esperado', 'obtido']
+TIPOS_VALOR = (np.int32, np.float32, np.float64)
+
+_NUMERICO = re.compile(r'^-?\d+([.,]\d+)?$')
+
+log = obter_logger('validacao')
+
+
+def _fatorar(serie):
+    """Códigos inteiros e dicionário (de graça para colunas categóricas)"""
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        return serie.cat.codes.to_numpy().astype(np.int64), [str(c) for c in serie.cat.categories]
+    codigos, categorias = pd.factorize(serie.astype(str))
+    return codigos.astype(np.int64), [str(c) for c in categorias]
+
+
+def _por_categoria(coluna, regra):
+    """Máscara por fato de um predicado avaliado uma vez por valor do dicionário"""
+    codigos, categorias = coluna
+    resultado = np.fromiter((regra(c) for c in categorias), dtype=bool, count=len(categorias))
+    return resultado[codigos] & (codigos >= 0)
+
+
+def _compactar(chave):
+    """Chave inteira → índice denso 0..n-1 (e a primeira posição de cada valor)"""
+    valores, primeira, inverso = np.unique(chave, return_index=True, return_inverse=True)
+    return inverso.ravel(), primeira, len(valores)
+
+
+def _codigo(categorias, texto):
+    return categorias.index(texto) if texto in categorias else -2
+
+
+class _Tabela:
+    """Colunas da tabela de fatos como arrays, com a aba (ano, aba) codificada"""
+
+    def __init__(self, fatos):
+        aba, self.nomes_abas = _fatorar(fatos['aba'])
+        self.dimensao, self.dimensoes = _fatorar(fatos['dimensao'])
+        self.questao, self.questoes = _fatorar(fatos['questao'])
+        self.grupo = _fatorar(fatos['grupo'])
+        self.resposta = _fatorar(fatos['resposta'])
+        self.ano_fato = fatos['ano'].to_numpy().astype(np.int64)
+        self.linha = fatos['linha'].to_numpy().astype(np.int64)
+        self.coluna = fatos['coluna'].to_numpy().astype(np.int64)
+        self.valor = fatos['valor'].to_numpy(dtype=np.float64)
+
+        self.folha, primeira, self.n_folhas = _compactar(self.ano_fato * (len(self.nomes_abas) + 1) + aba)
+        self.ano = self.ano_fato[primeira]
+        self.aba = np.asarray(self.nomes_abas)[aba[primeira]] if len(primeira) else np.array([], dtype=object)
+
+    def problemas(self, folhas, regra, linhas=-1, colunas=-1, detalhe='', esperado=np.nan, obtido=np.nan):
+        """Linhas de problemas (uma por elemento de `folhas`) no formato COLUNAS_PROBLEMAS"""
+        if not len(folhas):
+            return None
+        saida = pd.DataFrame({'ano': self.ano[folhas], 'aba': self.aba[folhas], 'regra': regra,
+                              'linha': linhas, 'coluna': colunas, 'detalhe': detalhe,
+                              'esperado': esperado, 'obtido': obtido}, index=range(len(folhas)))
+        return saida[COLUNAS_PROBLEMAS]
+
+
+def _limite(esperado, parcelas, tolerancia):
+    """Meia unidade por parcela arredondada, ou a tolerância relativa"""
+    return np.maximum(tolerancia * np.abs(esperado), 0.5 * parcelas) + 1e-9
+
+
+# ============================================================================
+# REGRAS
+# ============================================================================
+
+def _tipos(fatos):
+    erros = []
+    for coluna, tipo in ESQUEMA_FATOS.items():
+        if coluna not in fatos:
+            erros.append((coluna, 'ausente'))
+            continue
+        dtype = fatos[coluna].dtype
+        if tipo == 'category':
+            ok = isinstance(dtype, pd.CategoricalDtype)
+        elif tipo is None:
+            ok = dtype in TIPOS_VALOR
+        else:
+            ok = dtype == tipo
+        if not ok:
+            erros.append((coluna, str(dtype)))
+    return pd.DataFrame([{'ano': 0, 'aba': '*', 'regra': 'tipos', 'linha': -1, 'coluna': -1,
+                          'detalhe': f"{coluna}: {obtido}", 'esperado': np.nan, 'obtido': np.nan}
+                         for coluna, obtido in erros], columns=COLUNAS_PROBLEMAS)
+
+
+def _valores(t):
+    ruins = np.flatnonzero((t.valor < 0) | ~np.isfinite(t.valor))
+    return t.problemas(t.folha[ruins], 'valores', t.linha[ruins], t.coluna[ruins],
+                       'negativo ou não finito', obtido=t.valor[ruins])
+
+
+def _linhas_invalidas(t):
+    """Rodapé e cabeçalho lidos como dados (uma ocorrência por linha da aba)"""
+    def rodape(texto):
+        return texto.strip().startswith(PREFIXOS_RODAPE) or 'Fonte:' in texto
+
+    dimensao = (t.dimensao, t.dimensoes)
+    e_rodape = _por_categoria(dimensao, rodape) | _por_categoria(t.grupo, rodape)
+    e_cabecalho = ~e_rodape & (
+        _por_categoria(dimensao, lambda texto: texto != texto.upper())
+        | _por_categoria(t.resposta, lambda texto: bool(_NUMERICO.match(texto.strip()))))
+
+    partes = []
+    for regra, mascara in (('rodape', e_rodape), ('cabecalho', e_cabecalho)):
+        if mascara.any():
+            indices = np.flatnonzero(mascara)
+            _, primeira, _ = _compactar(t.folha[indices] * (t.linha.max() + 1) + t.linha[indices])
+            indices = indices[primeira]
+            partes.append(t.problemas(t.folha[indices], regra, t.linha[indices],
+                                      detalhe=np.asarray(t.dimensoes)[t.dimensao[indices]]))
+    return partes
+
+
+def _total_unico(t, e_total):
+    pares, primeira, _ = _compactar(t.folha[e_total] * (t.linha.max() + 1) + t.linha[e_total])
+    totais = np.bincount(t.folha[e_total][primeira], minlength=t.n_folhas)
+    ruins = np.flatnonzero(totais != 1)
+    return t.problemas(ruins, 'total_unico', detalhe='linhas TOTAL na aba',
+                       esperado=1.0, obtido=totais[ruins].astype(float))
+
+
+def _soma_dimensao(t, e_total, tolerancia):
+    n_colunas = t.coluna.max() + 1
+    chave = t.folha * n_colunas + t.coluna
+    total = np.full(t.n_folhas * n_colunas, np.nan)
+    total[chave[e_total]] = t.valor[e_total]
+
+    partes = []
+    for dimensao in DIMENSOES_SOMA:
+        mascara = t.dimensao == _codigo(t.dimensoes, dimensao)
+        if not mascara.any():
+            continue
+        somas = np.bincount(chave[mascara], weights=t.valor[mascara], minlength=len(total))
+        parcelas = np.bincount(chave[mascara], minlength=len(total))
+        # Só somas completas: tantos grupos quanto a dimensão tem na aba
+        grupos = np.zeros(t.n_folhas, dtype=np.int64)
+        np.maximum.at(grupos, np.arange(len(total)) // n_colunas, parcelas)
+        completas = (parcelas > 0) & (parcelas == np.repeat(grupos, n_colunas)) & ~np.isnan(total)
+        ruins = np.flatnonzero(completas & (np.abs(somas - total) > _limite(total, parcelas, tolerancia)))
+        partes.append(t.problemas(ruins // n_colunas, 'soma_dimensao', colunas=ruins % n_colunas,
+                                  detalhe=dimensao, esperado=total[ruins], obtido=somas[ruins]))
+    return partes
+
+
+def _soma_respostas(t, tolerancia):
+    n_questoes = len(t.questoes) + 1
+    linha_folha = t.folha * (t.linha.max() + 1) + t.linha
+    grupo, primeira, n_grupos = _compactar(linha_folha * n_questoes + t.questao)
+    somas = np.bincount(grupo, weights=t.valor, minlength=n_grupos)
+    parcelas = np.bincount(grupo, minlength=n_grupos)
+
+    # Respostas de cada questão na aba (colunas distintas)
+    questao_folha = t.folha * n_questoes + t.questao
+    _, primeira_coluna, _ = _compactar(questao_folha * (t.coluna.max() + 1) + t.coluna)
+    respostas_chave, respostas = np.unique(questao_folha[primeira_coluna], return_counts=True)
+    respostas_grupo = respostas[np.searchsorted(respostas_chave, questao_folha[primeira])]
+
+    # Total da linha = mediana das somas das questões completas (uma questão
+    # divergente não contamina a referência das demais)
+    completos = np.flatnonzero(parcelas == respostas_grupo)
+    linhas = linha_folha[primeira][completos]
+    ordem = completos[np.lexsort((somas[completos], linhas))]
+    linhas_ordenadas = linha_folha[primeira][ordem]
+    inicio = np.r_[True, linhas_ordenadas[1:] != linhas_ordenadas[:-1]]
+    bloco = np.cumsum(inicio) - 1
+    tamanhos = np.bincount(bloco)
+    mediana = ordem[np.flatnonzero(inicio) + (tamanhos - 1) // 2]
+    esperado = somas[mediana][bloco]
+    questoes_na_linha = tamanhos[bloco]
+
+    # As duas somas comparadas são arredondadas: parcelas das duas contam
+    ruins = (questoes_na_linha > 1) & (np.abs(somas[ordem] - esperado)
+                                       > _limite(esperado, 2 * parcelas[ordem], tolerancia))
+    indices, esperado = primeira[ordem[ruins]], esperado[ruins]
+    return t.problemas(t.folha[indices], 'soma_respostas', t.linha[indices],
+                       detalhe=np.asarray(t.questoes)[t.questao[indices]],
+                       esperado=esperado, obtido=somas[ordem[ruins]])
+
+
+# ============================================================================
+# API
+# ============================================================================
+
+@instrumentar('validar_fatos', 'validacao')
+def validar_fatos(fatos, tolerancia=TOLERANCIA_RELATIVA):
+    """
+    Valida uma tabela de fatos (uma ou várias abas, um ou vários anos)
+
+    Returns:
+        DataFrame de problemas (ano, aba, regra, linha, coluna, detalhe,
+        esperado, obtido); vazio se a tabela é consistente
+    """
+    partes = [_tipos(fatos)]
+    if len(fatos) and all(coluna in fatos for coluna in ESQUEMA_FATOS):
+        t = _Tabela(fatos)
+        e_total = t.dimensao == _codigo(t.dimensoes, DIMENSAO_TOTAL)
+        partes += [_valores(t), *_linhas_invalidas(t), _total_unico(t, e_total),
+                   *_soma_dimensao(t, e_total, tolerancia), _soma_respostas(t, tolerancia)]
+    partes = [p for p in partes if p is not None and len(p)]
+    if not partes:
+        return pd.DataFrame(columns=COLUNAS_PROBLEMAS)
+    return pd.concat(partes, ignore_index=True)
+
+
+def relatar_problemas(problemas, origem):
+    """
+    Um aviso por chamada com a contagem por regra; os primeiros
+    MAXIMO_DETALHES problemas vão como linhas DEBUG (tabela 'Validação')
+    """
+    if problemas.empty:
+        return
+    contagem = ', '.join(f"{regra}: {n}" for regra, n in problemas['regra'].value_counts().items())
+    log.warning(f"⚠️  {origem}: {len(problemas)} inconsistência(s) ({contagem})")
+    for p in problemas.head(MAXIMO_DETALHES).itertuples(index=False):
+        log.debug(f"  {p.aba} [{p.regra}] linha {p.linha}, coluna {p.coluna}: {p.detalhe} "
+                  f"(esperado {p.esperado:g}, obtido {p.obtido:g})",
+                  extra=linha('Validação', origem=origem, ano=int(p.ano), aba=p.aba, regra=p.regra,
+                              linha=int(p.linha), coluna=int(p.coluna), detalhe=p.detalhe,
+                              esperado=p.esperado, obtido=p.obtido))
+
+
+def main(argv=None):
+    from tic.fatos import AbasComErro, construir_tabela_fatos
+    from tic.log import adicionar_argumentos_log, configurar_log_args
+
+    parser = argparse.ArgumentParser(description='Valida a consistência de workbooks TIC (todas as abas)')
+    parser.add_argument('arquivos', nargs='+', help='Workbooks TIC (.xlsx), um ou vários anos')
+    parser.add_argument('--tolerancia', type=float, default=TOLERANCIA_RELATIVA,
+                        help=f'Tolerância relativa das somas (padrão: {TOLERANCIA_RELATIVA})')
+    adicionar_argumentos_log(parser)
+    args = parser.parse_args(argv)
+    configurar_log_args(args)
+
+    partes, falhas = [], []
+    for arquivo in args.arquivos:
+        with pd.ExcelFile(arquivo) as livro:
+            abas = livro.sheet_names
+        try:
+            partes.append(construir_tabela_fatos(arquivo, abas, validar=False, estrito=True))
+        except AbasComErro as e:
+            falhas += [(Path(arquivo).name, aba, erro) for aba, erro in e.falhas.items()]
+            if e.fatos is not None:
+                partes.append(e.fatos)
+    if not partes:
+        print(f"❌ Nenhuma aba lida ({len(falhas)} com erro)")
+        return 1
+    fatos = aplicar_esquema(pd.concat(partes, ignore_index=True))
+
+    inicio = time.perf_counter()
+    problemas = validar_fatos(fatos, args.tolerancia)
+    duracao = (time.perf_counter() - inicio) * 1000
+
+    n_abas = len(fatos[['ano', 'aba']].drop_duplicates())
+    print(f"\n🔎 {n_abas} abas, {len(fatos):,} fatos validados em {duracao:.0f} ms")
+    if falhas:
+        print(f"❌ {len(falhas)} aba(s) não puderam ser lidas:")
+        for arquivo, aba, erro in falhas:
+            print(f"  {arquivo} / {aba}: {erro}")
+    if problemas.empty:
+        print("✅ Nenhuma inconsistência encontrada")
+        return 1 if falhas else 0
+    print(f"⚠️  {len(problemas)} inconsistência(s):")
+    print(problemas.to_string(index=False, max_rows=200))
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,342 @@
+"""
+VIGIA DA PASTA DE ENTRADA - RECONSTRUÇÃO INCREMENTAL
+TIC Educação 2024
+
+Monitora as pastas de entrada à procura de workbooks tic_educacao_*_tabela_total_*.xlsx
+novos ou alterados e roda só as etapas afetadas, passando o workbook (--arquivo):
+
+- abas de escolas extraídas mudaram  → extração incremental (--abas) + clustering
+- aba de uma análise mudou (A3_1, G6, ...) → essa análise + consolidação
+
+O tipo (escolas/alunos) e o ano vêm do nome do workbook, de qualquer ano ou
+versão: cada workbook alterado roda as análises dele (gravadas no ano dele).
+O clustering é de um ano só (o de ARQUIVOS_PADRAO em tic/cli.py): workbooks de
+escolas de outros anos não disparam a extração, e, se mais de um workbook de
+escolas desse ano mudou, a extração usa o último em ordem de nome (maior versão).
+
+As abas alteradas são descobertas sem abrir o workbook com pandas: um xlsx é
+um zip, e cada aba é uma parte (xl/worksheets/sheetN.xml) cujo CRC e tamanho
+estão no diretório do zip. Se os textos compartilhados (sharedStrings) mudam,
+todas as abas contam como alteradas.
+
+Debounce: a varredura é por polling (só biblioteca padrão) a cada `intervalo`
+segundos; a reconstrução começa quando nenhum arquivo muda há `espera`
+segundos e todos os zips estão completos. Uma rajada de cópias vira uma única
+reconstrução. O estado (assinaturas por aba) fica em .vigia_estado.json em
+cada pasta; na primeira execução ele é só registrado, sem reconstruir. Abas
+cujas etapas falham (o script sai com código ≠ 0) ficam com a assinatura
+anterior, e as etapas que dependem da que falhou são puladas: a próxima
+execução do vigia (ou alteração do workbook) refaz só essas abas.
+
+Uso (na raiz do repositório):
+    python -m tic vigiar
+    python -m tic --diretorio /tmp/tic_sintetico vigiar --espera 5
+    python -m tic vigiar --uma-vez         # uma varredura (ex.: cron) e sai
+"""
+
+import json
+import re
+import time
+import zipfile
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+from tic.cli import (ABAS_ANALISES, ARQUIVOS_PADRAO, PASTA_ANALISES, PASTA_CLUSTERING,
+                     SCRIPTS_ANALISES, SHEETS_PRIORITARIAS, executar_script)
+from tic.log import desativar_relatorio, obter_logger, titulo
+
+PADRAO_WORKBOOK = 'tic_educacao_*_tabela_total_*.xlsx'
+NOME_WORKBOOK = re.compile(r'tic_educacao_(\d{4})_(escolas|alunos)_tabela_total_.+\.xlsx')
+ARQUIVO_ESTADO = '.vigia_estado.json'
+INTERVALO_PADRAO_S = 1.0
+ESPERA_PADRAO_S = 3.0
+
+# Abas de escolas extraídas para o clustering, na ordem da extração
+ABAS_EXTRACAO = [aba for grupo in SHEETS_PRIORITARIAS.values() for aba in grupo]
+
+NS_PLANILHA = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+NS_RELACAO = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+
+log = obter_logger('vigia')
+
+
+# ============================================================================
+# ASSINATURAS
+# ============================================================================
+
+def classificar(nome):
+    """(ano, tipo) do workbook pelo nome, ou None se o pipeline não o lê"""
+    encontrado = NOME_WORKBOOK.fullmatch(nome)
+    return (int(encontrado.group(1)), encontrado.group(2)) if encontrado else None
+
+
+ANO_CLUSTERING = classificar(ARQUIVOS_PADRAO['escolas'])[0]
+
+
+def assinatura(caminho):
+    """(mtime em ns, tamanho) do arquivo"""
+    estado = caminho.stat()
+    return [estado.st_mtime_ns, estado.st_size]
+
+
+def assinaturas_abas(caminho):
+    """
+    Aba → "crc-tamanho-crc_textos" a partir do diretório do zip (sem
+    descompactar). Levanta zipfile.BadZipFile se o arquivo ainda está sendo
+    copiado.
+    """
+    with zipfile.ZipFile(caminho) as z:
+        nomes = set(z.namelist())
+        livro = ET.fromstring(z.read('xl/workbook.xml'))
+        relacoes = ET.fromstring(z.read('xl/_rels/workbook.xml.rels'))
+        alvos = {r.get('Id'): r.get('Target') for r in relacoes}
+        textos = z.getinfo('xl/sharedStrings.xml').CRC if 'xl/sharedStrings.xml' in nomes else 0
+
+        abas = {}
+        for folha in livro.iter(f'{NS_PLANILHA}sheet'):
+            alvo = alvos[folha.get(f'{NS_RELACAO}id')]
+            parte = alvo.lstrip('/') if alvo.startswith('/') else f'xl/{alvo}'
+            info = z.getinfo(parte)
+            abas[folha.get('name')] = f'{info.CRC:08x}-{info.file_size}-{textos:08x}'
+    return abas
+
+
+def abas_alteradas(anteriores, atuais):
+    """Abas novas, removidas ou com conteúdo diferente (todas, sem estado anterior)"""
+    if anteriores is None:
+        return set(atuais)
+    return {aba for aba in set(anteriores) | set(atuais) if anteriores.get(aba) != atuais.get(aba)}
+
+
+# ============================================================================
+# PLANO DE RECONSTRUÇÃO
+# ============================================================================
+
+def planejar(alteracoes, diretorio=None):
+    """
+    Etapas afetadas por {(pasta, nome do workbook): abas alteradas}. Cada
+    etapa recebe o workbook (--arquivo); análises de um workbook que não é o
+    padrão levam o nome dele no nome da etapa.
+
+    Returns:
+        lista de (nome, pasta do script, script, argumentos, etapa da qual depende)
+    """
+    extracao, analises = {}, {}
+    for (pasta, nome), abas in sorted(alteracoes.items()):
+        ano, tipo = classificar(nome)
+        if tipo == 'escolas' and ano == ANO_CLUSTERING and (diretorio or pasta == PASTA_CLUSTERING):
+            if abas & set(ABAS_EXTRACAO):
+                extracao[nome] = abas & set(ABAS_EXTRACAO)
+        if diretorio or pasta == PASTA_ANALISES:
+            for indicador, (tipo_ind, aba) in ABAS_ANALISES.items():
+                if tipo_ind == tipo and aba in abas:
+                    analises.setdefault(indicador, []).append(nome)
+
+    etapas = []
+    if extracao:
+        # Uma extração só (as saídas do clustering são únicas): o último nome (maior versão)
+        nome = max(extracao)
+        if len(extracao) > 1:
+            log.warning(f"⚠️  Extração a partir de {nome}; ignorados: "
+                        f"{', '.join(n for n in sorted(extracao) if n != nome)}")
+        abas = ','.join(a for a in ABAS_EXTRACAO if a in extracao[nome])
+        etapas.append(('extrair', PASTA_CLUSTERING, '01_extrair_dados_escolas.py',
+                       ['--arquivo', nome, '--abas', abas], None))
+    for indicador in SCRIPTS_ANALISES:
+        for nome in analises.get(indicador, []):
+            rotulo = f'analisar {indicador}' if nome in ARQUIVOS_PADRAO.values() else f'analisar {indicador} ({nome})'
+            etapas.append((rotulo, PASTA_ANALISES, SCRIPTS_ANALISES[indicador], ['--arquivo', nome], None))
+    if analises:
+        etapas.append(('consolidar', PASTA_ANALISES, 'consolidador_analises.py', [], 'analisar'))
+    if extracao:
+        etapas.append(('preparar', PASTA_CLUSTERING, '02_preparacao_regioes.py', [], 'extrair'))
+        etapas.append(('clusterizar', PASTA_CLUSTERING, '03_clustering_regioes.py', [], 'preparar'))
+    return etapas
+
+
+def abas_com_falha(alteracoes, falhas, diretorio=None):
+    """
+    Abas alteradas cujas etapas (as de planejar para a aba sozinha) falharam
+    ou foram puladas: {(pasta, nome do workbook): abas}
+    """
+    resultado = {}
+    for (pasta, nome), abas in alteracoes.items():
+        afetadas = {aba for aba in abas
+                    if any(etapa in falhas for etapa, *_ in planejar({(pasta, nome): {aba}}, diretorio))}
+        if afetadas:
+            resultado[(pasta, nome)] = afetadas
+    return resultado
+
+
+# ============================================================================
+# VIGIA
+# ============================================================================
+
+class Vigia:
+    """
+    Estado das pastas vigiadas, alterações pendentes (debounce) e reconstrução
+    """
+
+    def __init__(self, diretorio=None, espera=ESPERA_PADRAO_S):
+        self.diretorio = diretorio
+        self.pastas = [Path(diretorio)] if diretorio else [PASTA_CLUSTERING, PASTA_ANALISES]
+        self.espera = espera
+        self.pendentes = {}   # caminho → (assinatura, instante da última mudança)
+        self.estado = {}      # pasta → {nome do workbook: {'assinatura', 'abas'}}
+        self.vistos = {}      # caminho → assinatura já tratada (com sucesso ou não)
+
+        for pasta in self.pastas:
+            arquivo_estado = pasta / ARQUIVO_ESTADO
+            if arquivo_estado.exists():
+                self.estado[pasta] = json.loads(arquivo_estado.read_text(encoding='utf-8'))
+                for nome, item in self.estado[pasta].items():
+                    self.vistos[pasta / nome] = item['assinatura']
+            else:
+                self._registrar_linha_de_base(pasta)
+
+    def _registrar_linha_de_base(self, pasta):
+        self.estado[pasta] = {}
+        for caminho in sorted(pasta.glob(PADRAO_WORKBOOK)):
+            try:
+                self._guardar(caminho, assinatura(caminho), assinaturas_abas(caminho))
+            except (zipfile.BadZipFile, KeyError):
+                continue
+        self._salvar_estado(pasta)
+        log.info(f"📌 Linha de base registrada: {pasta} ({len(self.estado[pasta])} workbook(s))")
+
+    def _guardar(self, caminho, assin, abas):
+        self.estado[caminho.parent][caminho.name] = {'assinatura': assin, 'abas': abas}
+        self.vistos[caminho] = assin
+
+    def _salvar_estado(self, pasta):
+        (pasta / ARQUIVO_ESTADO).write_text(
+            json.dumps(self.estado[pasta], ensure_ascii=False, indent=2), encoding='utf-8')
+
+    def varrer(self, agora=None):
+        """Registra workbooks novos/alterados; mudanças seguidas adiam a reconstrução"""
+        agora = time.monotonic() if agora is None else agora
+        for pasta in self.pastas:
+            for caminho in pasta.glob(PADRAO_WORKBOOK):
+                try:
+                    assin = assinatura(caminho)
+                except FileNotFoundError:
+                    continue
+                if assin == self.vistos.get(caminho):
+                    continue
+                if caminho not in self.pendentes:
+                    log.info(f"👀 Alterado: {caminho.name} ({pasta.name})")
+                if self.pendentes.get(caminho, (None,))[0] != assin:
+                    self.pendentes[caminho] = (assin, agora)
+
+    def pronto(self, agora=None):
+        """Há pendências e nenhuma mudança há `espera` segundos"""
+        agora = time.monotonic() if agora is None else agora
+        return bool(self.pendentes) and all(agora - t >= self.espera for _, t in self.pendentes.values())
+
+    def reconstruir(self):
+        """
+        Uma reconstrução para todas as pendências. Retorna False se algum
+        workbook ainda está incompleto (fica pendente).
+        """
+        alteracoes, novos = {}, {}
+        for caminho, (assin, _) in self.pendentes.items():
+            try:
+                abas = assinaturas_abas(caminho)
+            except (zipfile.BadZipFile, KeyError, FileNotFoundError):
+                log.info(f"⏳ {caminho.name} ainda incompleto, aguardando")
+                self.pendentes[caminho] = (assin, time.monotonic())
+                return False
+            novos[caminho] = (assin, abas)
+
+            if classificar(caminho.name) is None:
+                log.warning(f"⚠️  {caminho.name} não é lido pelo pipeline "
+                            f"(esperado: {NOME_WORKBOOK.pattern})")
+                continue
+            anteriores = self.estado[caminho.parent].get(caminho.name, {}).get('abas')
+            alteradas = abas_alteradas(anteriores, abas)
+            log.info(f"📄 {caminho.name}: {len(alteradas)} aba(s) alterada(s)"
+                     + (f" ({', '.join(sorted(alteradas)[:10])}{'...' if len(alteradas) > 10 else ''})"
+                        if alteradas else ""))
+            if alteradas:
+                alteracoes[(caminho.parent, caminho.name)] = alteradas
+        self.pendentes.clear()
+
+        etapas = planejar(alteracoes, self.diretorio)
+        if not etapas:
+            log.info("✓ Nenhuma etapa afetada")
+        falhas = self._executar(etapas)
+
+        # Abas cujas etapas falharam mantêm a assinatura anterior (e o workbook,
+        # a assinatura de arquivo anterior): são refeitas na próxima varredura
+        # de um novo processo ou na próxima alteração do workbook
+        pendentes = abas_com_falha(alteracoes, falhas, self.diretorio)
+        for caminho, (assin, abas) in novos.items():
+            falhadas = pendentes.get((caminho.parent, caminho.name))
+            if not falhadas:
+                self._guardar(caminho, assin, abas)
+                continue
+            anterior = self.estado[caminho.parent].get(caminho.name, {})
+            abas_anteriores = anterior.get('abas', {})
+            guardadas = {aba: valor for aba, valor in abas.items() if aba not in falhadas}
+            guardadas.update({aba: abas_anteriores[aba] for aba in falhadas if aba in abas_anteriores})
+            self.estado[caminho.parent][caminho.name] = {'assinatura': anterior.get('assinatura'),
+                                                         'abas': guardadas}
+            self.vistos[caminho] = assin
+            log.warning(f"⚠️  {caminho.name}: {len(falhadas)} aba(s) ficam pendentes "
+                        f"({', '.join(sorted(falhadas))})")
+        for pasta in {caminho.parent for caminho in novos}:
+            self._salvar_estado(pasta)
+        return True
+
+    def _executar(self, etapas):
+        """Roda as etapas em ordem; uma etapa cuja dependência falhou é pulada"""
+        falhas = set()
+        if etapas:
+            titulo(log, f"RECONSTRUÇÃO INCREMENTAL: {', '.join(nome for nome, *_ in etapas)}")
+        for nome, pasta, script, argumentos, depende in etapas:
+            if depende and any(f.startswith(depende) for f in falhas):
+                log.warning(f"⏭️  {nome}: pulada ({depende} falhou)")
+                falhas.add(nome)
+                continue
+            inicio = time.perf_counter()
+            try:
+                executar_script(pasta, script, argumentos, self.diretorio)
+            except SystemExit as e:
+                # O script já registrou o erro; executar_script só repassa código ≠ 0
+                log.error(f"✗ {nome} falhou (código de saída {e.code})")
+                falhas.add(nome)
+                continue
+            except Exception:
+                log.exception(f"✗ {nome} falhou")
+                falhas.add(nome)
+                continue
+            log.info(f"✓ {nome} ({time.perf_counter() - inicio:.1f} s)")
+        if falhas:
+            log.warning(f"⚠️  Etapas com falha: {', '.join(sorted(falhas))}")
+        return falhas
+
+
+def vigiar(diretorio=None, intervalo=INTERVALO_PADRAO_S, espera=ESPERA_PADRAO_S, uma_vez=False):
+    """
+    Laço do vigia (Ctrl+C encerra). Com uma_vez, varre, reconstrói o que
+    estiver pendente e sai.
+    """
+    desativar_relatorio()
+    vigia = Vigia(diretorio, espera)
+    if uma_vez:
+        vigia.varrer()
+        if vigia.pendentes:
+            vigia.reconstruir()
+        return vigia
+
+    log.info(f"👀 Vigiando {', '.join(str(p) for p in vigia.pastas)} "
+             f"({PADRAO_WORKBOOK}, espera {espera:g} s; Ctrl+C encerra)")
+    try:
+        while True:
+            vigia.varrer()
+            if vigia.pronto():
+                vigia.reconstruir()
+            time.sleep(intervalo)
+    except KeyboardInterrupt:
+        log.info("\n✓ Vigia encerrado")
+    return vigia